@@ -1,6 +1,20 @@
-from field_utils_lib import copy_segment_fields_in_range, set_nested_field
+from field_utils_lib import compile_path, copy_segment_fields_in_range
 from hl7apy.core import Message
 
+MSH_PATHS = tuple(
+    compile_path(path)
+    for path in (
+        "msh_3.hd_1",
+        "msh_4.hd_1",
+        "msh_5.hd_1",
+        "msh_6.hd_1",
+        "msh_7.ts_1",
+        "msh_8",
+        "msh_9.msg_1",
+        "msh_9.msg_2",
+    )
+)
+
 
 def map_msh(original_hl7_message: Message, new_message: Message) -> None:
     original_msh = original_hl7_message.msh
@@ -10,14 +24,8 @@ def map_msh(original_hl7_message: Message, new_message: Message) -> None:
     new_message.msh.msh_1 = original_msh.msh_1
     new_message.msh.msh_2 = original_msh.msh_2
 
-    set_nested_field(original_msh, new_message.msh, "msh_3.hd_1")
-    set_nested_field(original_msh, new_message.msh, "msh_4.hd_1")
-    set_nested_field(original_msh, new_message.msh, "msh_5.hd_1")
-    set_nested_field(original_msh, new_message.msh, "msh_6.hd_1")
-    set_nested_field(original_msh, new_message.msh, "msh_7.ts_1")
-    set_nested_field(original_msh, new_message.msh, "msh_8")
-    set_nested_field(original_msh, new_message.msh, "msh_9.msg_1")
-    set_nested_field(original_msh, new_message.msh, "msh_9.msg_2")
+    for path in MSH_PATHS:
+        path.copy(original_msh, new_message.msh)
 
     # Always ensure MSH.9 exists before setting msg_3
     if not getattr(new_message.msh, "msh_9", None):
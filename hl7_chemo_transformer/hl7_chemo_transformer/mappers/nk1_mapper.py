@@ -1,18 +1,25 @@
-from field_utils_lib import set_nested_field
+from field_utils_lib import compile_path
 from hl7apy.core import Message
 
+NK1_PATHS = tuple(
+    compile_path(path)
+    for path in (
+        "nk1_2.xpn_2",
+        "nk1_2.xpn_7",
+        "nk1_3.ce_1",
+        "nk1_4.xad_2",
+        "nk1_4.xad_7",
+        "nk1_5.xtn_1",
+        "nk1_2.xpn_1.fn_1",
+        "nk1_4.xad_1.sad_1",
+    )
+)
+
 
 def map_nk1(original_hl7_message: Message, new_message: Message) -> None:
     original_nk1 = getattr(original_hl7_message, "nk1", None)
     if original_nk1 is None:
         return  # No NK1 segment
 
-    set_nested_field(original_nk1, new_message.nk1, "nk1_2.xpn_2")
-    set_nested_field(original_nk1, new_message.nk1, "nk1_2.xpn_7")
-    set_nested_field(original_nk1, new_message.nk1, "nk1_3.ce_1")
-    set_nested_field(original_nk1, new_message.nk1, "nk1_4.xad_2")
-    set_nested_field(original_nk1, new_message.nk1, "nk1_4.xad_7")
-    set_nested_field(original_nk1, new_message.nk1, "nk1_5.xtn_1")
-
-    set_nested_field(original_nk1, new_message.nk1, "nk1_2.xpn_1.fn_1")
-    set_nested_field(original_nk1, new_message.nk1, "nk1_4.xad_1.sad_1")
+    for path in NK1_PATHS:
+        path.copy(original_nk1, new_message.nk1)
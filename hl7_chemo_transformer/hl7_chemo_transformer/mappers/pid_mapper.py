@@ -1,4 +1,4 @@
-from field_utils_lib import get_hl7_field_value, set_nested_field
+from field_utils_lib import compile_path
 from hl7apy.core import Message
 
 HEALTH_BOARD_MAPPING = {
@@ -8,6 +8,37 @@ HEALTH_BOARD_MAPPING = {
     "245": "SEWCC"
 }
 
+MSH_3_HD_1_PATH = compile_path("msh_3.hd_1")
+MSH_3_PATH = compile_path("msh_3")
+PID_1_PATH = compile_path("pid_1")
+PID_2_CX_1_PATH = compile_path("pid_2.cx_1")
+PID_2_PATH = compile_path("pid_2")
+
+# Copied in this order after PID.3 has been built
+PID_5_TO_11_PATHS = tuple(
+    compile_path(path)
+    for path in (
+        "pid_5.xpn_1.fn_1",
+        *(f"pid_5.{field}" for field in ["xpn_2", "xpn_3", "xpn_4", "xpn_5", "xpn_6", "xpn_7", "xpn_8"]),
+        "pid_5.xpn_9.ce_1",
+        "pid_5.xpn_10",
+        "pid_5.xpn_11",
+        "pid_6.xpn_1.fn_1",
+        "pid_7",
+        "pid_8",
+        "pid_9.xpn_1.fn_1",
+        "pid_10.ce_1",
+        "pid_11.xad_1.sad_1",
+        *(f"pid_11.{field}" for field in ["xad_2", "xad_3", "xad_4", "xad_5", "xad_7", "xad_8"]),
+    )
+)
+# Relative to a PID.13 repetition
+PID_13_PATHS = tuple(compile_path(subfield) for subfield in ["xtn_1", "xtn_2", "xtn_4"])
+PID_14_TO_32_PATHS = tuple(
+    compile_path(path)
+    for path in ("pid_14.xtn_1", "pid_14.xtn_2", "pid_17.ce_1", "pid_22.ce_1", "pid_29.ts_1", "pid_32")
+)
+
 
 def map_pid(original_hl7_message: Message, new_message: Message) -> None:
     original_pid = getattr(original_hl7_message, "pid", None)
@@ -15,14 +46,14 @@ def map_pid(original_hl7_message: Message, new_message: Message) -> None:
         return  # No PD1 segment
 
     # PID
-    set_nested_field(original_pid, new_message.pid, "pid_1")
+    PID_1_PATH.copy(original_pid, new_message.pid)
 
     # if the cx_1 subfield on pid_2 is empty we default to the entire pid_2 field
-    pid2_value = get_hl7_field_value(original_pid, "pid_2.cx_1") or get_hl7_field_value(original_pid, "pid_2")
+    pid2_value = PID_2_CX_1_PATH.get(original_pid) or PID_2_PATH.get(original_pid)
 
     original_msh = original_hl7_message.msh
     # if the hd_1 subfield on msh_3 is empty we default to the entire msh_3 field
-    msh3_value = get_hl7_field_value(original_msh, "msh_3.hd_1") or get_hl7_field_value(original_msh, "msh_3")
+    msh3_value = MSH_3_HD_1_PATH.get(original_msh) or MSH_3_PATH.get(original_msh)
 
     pid3_rep1 = new_message.pid.add_field("pid_3")
     pid3_rep1.cx_4.hd_1 = "NHS"
@@ -43,42 +74,15 @@ def map_pid(original_hl7_message: Message, new_message: Message) -> None:
             if health_board:
                 pid3_rep2.cx_1 = f"{health_board}{pid2_value}"
 
-    set_nested_field(original_pid, new_message.pid, "pid_5.xpn_1.fn_1")
-
-    pid_5_fields = ["xpn_2", "xpn_3", "xpn_4", "xpn_5", "xpn_6", "xpn_7", "xpn_8"]
-    for field in pid_5_fields:
-        set_nested_field(original_pid, new_message.pid, f"pid_5.{field}")
-
-    set_nested_field(original_pid, new_message.pid, "pid_5.xpn_9.ce_1")
-
-    set_nested_field(original_pid, new_message.pid, "pid_5.xpn_10")
-    set_nested_field(original_pid, new_message.pid, "pid_5.xpn_11")
-
-    set_nested_field(original_pid, new_message.pid, "pid_6.xpn_1.fn_1")
-
-    set_nested_field(original_pid, new_message.pid, "pid_7")
-    set_nested_field(original_pid, new_message.pid, "pid_8")
-
-    set_nested_field(original_pid, new_message.pid, "pid_9.xpn_1.fn_1")
-
-    set_nested_field(original_pid, new_message.pid, "pid_10.ce_1")
-
-    set_nested_field(original_pid, new_message.pid, "pid_11.xad_1.sad_1")
-
-    pid_11_fields = ["xad_2", "xad_3", "xad_4", "xad_5", "xad_7", "xad_8"]
-    for field in pid_11_fields:
-        set_nested_field(original_pid, new_message.pid, f"pid_11.{field}")
+    for path in PID_5_TO_11_PATHS:
+        path.copy(original_pid, new_message.pid)
 
     # All repetitions of pid_13 should be mapped as per the mapping rules
     if hasattr(original_pid, "pid_13"):
         for rep_count, original_pid_13 in enumerate(original_pid.pid_13):
             new_pid_13_repetition = new_message.pid.add_field("pid_13")
-            for subfield in ["xtn_1", "xtn_2", "xtn_4"]:
-                set_nested_field(original_pid_13, new_pid_13_repetition, subfield)
-
-    set_nested_field(original_pid, new_message.pid, "pid_14.xtn_1")
-    set_nested_field(original_pid, new_message.pid, "pid_14.xtn_2")
-    set_nested_field(original_pid, new_message.pid, "pid_17.ce_1")
-    set_nested_field(original_pid, new_message.pid, "pid_22.ce_1")
-    set_nested_field(original_pid, new_message.pid, "pid_29.ts_1")
-    set_nested_field(original_pid, new_message.pid, "pid_32")
+            for path in PID_13_PATHS:
+                path.copy(original_pid_13, new_pid_13_repetition)
+
+    for path in PID_14_TO_32_PATHS:
+        path.copy(original_pid, new_message.pid)
@@ -1,4 +1,5 @@
 import logging
+import time
 
 from hl7apy.core import Message
 from hl7apy.exceptions import HL7apyException
@@ -14,9 +15,10 @@ logger = logging.getLogger(__name__)
 
 class GenericHandler(AbstractHandler):
 
-    def __init__(self, msg: Message, sender_client: MessageSenderClient):
+    def __init__(self, msg: Message, sender_client: MessageSenderClient, ack_delay_seconds: float = 0):
         super(GenericHandler, self).__init__(msg)
         self.sender_client = sender_client
+        self.ack_delay_seconds = ack_delay_seconds
 
     def reply(self) -> str:
         try:
@@ -31,6 +33,9 @@ class GenericHandler(AbstractHandler):
             negative_ack = "fail" in self.incoming_message.lower()
             ack_message = self.create_ack(message_control_id, msg, negative_ack)
             logger.info(f"{"N" if negative_ack else ""}ACK generated successfully")
+            if self.ack_delay_seconds > 0:
+                # Simulates a slow receiver, for testing how senders cope with ACK latency.
+                time.sleep(self.ack_delay_seconds)
             return ack_message
         except HL7apyException as e:
             logger.error("HL7 parsing error: %s", e)
@@ -58,6 +58,7 @@ class Hl7MockReceiver:
         self._server_thread: threading.Thread
         self.HOST = os.environ.get("HOST", "127.0.0.1")
         self.PORT = int(os.environ.get("PORT", "2576"))
+        self.ACK_DELAY_SECONDS = float(os.environ.get("ACK_DELAY_SECONDS", "0"))
 
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -78,7 +79,7 @@ class Hl7MockReceiver:
         )
 
         handlers = {
-            GENERIC_HANDLER_KEY: (GenericHandler, self.sender_client),
+            GENERIC_HANDLER_KEY: (GenericHandler, self.sender_client, self.ACK_DELAY_SECONDS),
             ERROR_HANDLER_KEY: (ErrorHandler,),
         }
 
@@ -36,6 +36,15 @@ class TestGenericHandler(unittest.TestCase):
 
         self.mock_sender.send_text_message.assert_called_once_with(VALID_A28_MESSAGE)
 
+    @patch("hl7_mock_receiver.generic_handler.time.sleep")
+    def test_ack_is_delayed_when_configured(self, mock_sleep: MagicMock) -> None:
+        self.handler.reply()
+        mock_sleep.assert_not_called()
+
+        GenericHandler(VALID_A28_MESSAGE, self.mock_sender, 0.5).reply()
+
+        mock_sleep.assert_called_once_with(0.5)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,3 +1,23 @@
+import configparser
+import logging
+
 from transformer_base_lib.app_config import AppConfig
 
-__all__ = ["AppConfig"]
+__all__ = ["AppConfig", "read_er7_mapping"]
+
+logger = logging.getLogger(__name__)
+
+
+def read_er7_mapping(config_path: str) -> bool:
+    """Read ER7_MAPPING from the config file: map messages with PHW_MAPPING_PLAN instead of the hl7apy mappers."""
+    config = configparser.ConfigParser()
+    config.read(config_path)
+    if not config.has_option("DEFAULT", "ER7_MAPPING"):
+        return False
+    try:
+        er7_mapping = config.getboolean("DEFAULT", "ER7_MAPPING")
+    except ValueError as e:
+        logger.warning(f"Failed to parse ER7_MAPPING from config file, using the hl7apy mappers: {e}")
+        return False
+    logger.debug(f"ER7_MAPPING set to {er7_mapping} from config file")
+    return er7_mapping
@@ -1,7 +1,24 @@
 from datetime import datetime
 
+from field_utils_lib.hl7_timestamp import is_hl7_timestamp, iso_to_hl7_timestamp
+
 
 def transform_datetime(date_time: str) -> str:
+    # Hand-rolled fast paths for the two forms senders use. Anything they reject goes through strptime, which also
+    # accepts single-digit fields and raises the errors callers expect.
+    if is_hl7_timestamp(date_time):
+        return date_time
+    try:
+        timestamp = iso_to_hl7_timestamp(date_time)
+        # strftime does not zero-pad years before 1000, so leave those to it.
+        if timestamp[0] != "0":
+            return timestamp
+    except ValueError:
+        pass
+    return _transform_datetime_with_strptime(date_time)
+
+
+def _transform_datetime_with_strptime(date_time: str) -> str:
     required_format = "%Y%m%d%H%M%S"
     try:
         # Check if already in required format
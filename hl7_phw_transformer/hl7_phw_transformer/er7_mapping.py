@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from transformer_base_lib.er7_mapping import (
+    CopyFields,
+    DefaultField,
+    MapField,
+    MessageMapping,
+    SegmentMapping,
+    compile_mapping,
+)
+
+from .date_of_death_transformer import transform_date_of_death
+from .datetime_transformer import transform_datetime
+
+
+def _current_timestamp() -> str:
+    # hl7apy stamps a new message's MSH-7 with the local time when the original carries none.
+    return datetime.now().strftime("%Y%m%d%H%M%S")
+
+
+# ER7-level equivalent of PhwTransformer.transform_message (map_msh, map_evn, map_pid, map_non_specific_segments).
+PHW_MAPPING = MessageMapping(
+    version="2.5",
+    segments=(
+        SegmentMapping(
+            "MSH",
+            (
+                CopyFields(3, 6),
+                MapField(7, transform_datetime, default=_current_timestamp),
+                CopyFields(8, 21),
+                DefaultField(12, "2.5"),
+            ),
+        ),
+        # map_evn copies the whole segment, so trailing empty fields are dropped.
+        SegmentMapping("EVN", (CopyFields(1, keep_empty=False),)),
+        SegmentMapping(
+            "PID",
+            (
+                CopyFields(1, 28),
+                MapField(29, transform_date_of_death),
+                CopyFields(30, 39),
+            ),
+        ),
+    ),
+    # Z segments have no place in the standard structures, so hl7apy drops them while resolving groups.
+    drop_segments=("Z*",),
+    # map_non_specific_segments copies a segment with a repeating field field by field, adding every repetition
+    # once for each repetition.
+    pass_through_rules=(CopyFields(1, duplicate_repetitions=True),),
+)
+
+PHW_MAPPING_PLAN = compile_mapping(PHW_MAPPING)
@@ -1,13 +1,23 @@
-from hl7apy.core import Message
+from field_utils_lib import copy_segment
+from hl7apy.core import Message, Segment
 
 
 def map_non_specific_segments(original_msg: Message, new_msg: Message) -> None:
 
     handled_segments = {"MSH", "EVN", "PID"}
+    same_encoding = original_msg.encoding_chars == new_msg.encoding_chars
 
     for segment in original_msg.children:
         segment_name = segment.name
         if segment_name not in handled_segments:
+            # Copying the segment's ER7 in one go parses it once. Segments with repeated fields, or with fields
+            # beyond the segment's definition, keep the field-by-field copy and its output.
+            if same_encoding and isinstance(segment, Segment):
+                field_names = [field.name for field in segment.children]
+                if None not in field_names and len(set(field_names)) == len(field_names):
+                    copy_segment(segment, new_msg)
+                    continue
+
             new_segment = new_msg.add_segment(segment_name)
             for field in segment.children:
                 field_name = field.name.lower()
@@ -25,4 +35,3 @@ def map_non_specific_segments(original_msg: Message, new_msg: Message) -> None:
                 for i in range(repetitions):
                     new_rep = new_segment.add_field(field_name)
                     new_rep.value = source_field[i].value
-
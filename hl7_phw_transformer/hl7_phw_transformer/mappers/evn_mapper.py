@@ -1,7 +1,9 @@
-from field_utils_lib import set_nested_field
+from field_utils_lib import compile_path
 from hl7apy.core import Message
 
+EVN_PATH = compile_path("evn")
+
 
 def map_evn(original_hl7_message: Message, new_message: Message) -> None:
     # EVN
-    set_nested_field(original_hl7_message, new_message, "evn")
+    EVN_PATH.copy(original_hl7_message, new_message)
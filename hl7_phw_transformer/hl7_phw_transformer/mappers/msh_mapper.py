@@ -1,8 +1,10 @@
-from field_utils_lib import copy_segment_fields_in_range, get_hl7_field_value
+from field_utils_lib import compile_path, copy_segment_fields_in_range
 from hl7apy.core import Message
 
 from ..datetime_transformer import transform_datetime
 
+MSH_7_TS_1_PATH = compile_path("msh_7.ts_1")
+
 
 def map_msh(original_msg: Message, new_msg: Message) -> tuple[str, str] | None:
     msh_segment = original_msg.msh
@@ -19,7 +21,7 @@ def map_msh(original_msg: Message, new_msg: Message) -> tuple[str, str] | None:
     except Exception:
         pass
 
-    created_datetime = get_hl7_field_value(msh_segment, "msh_7.ts_1")
+    created_datetime = MSH_7_TS_1_PATH.get(msh_segment)
     if created_datetime:
         transformed_datetime = transform_datetime(created_datetime)
         new_msh.msh_7.ts_1 = transformed_datetime
@@ -1,8 +1,11 @@
-from field_utils_lib import copy_segment_fields_in_range, get_hl7_field_value
+from field_utils_lib import compile_path, copy_segment, copy_segment_fields_in_range
 from hl7apy.core import Message
 
 from ..date_of_death_transformer import transform_date_of_death
 
+PID_29_TS_1_PATH = compile_path("pid_29.ts_1")
+PID_FIELDS_WITHOUT_DATE_OF_DEATH = (*range(1, 29), *range(30, 40))
+
 
 def map_pid(original_msg: Message, new_msg: Message) -> tuple[str, str] | None:
     segment_names = [s.name for s in original_msg.children]
@@ -10,16 +13,19 @@ def map_pid(original_msg: Message, new_msg: Message) -> tuple[str, str] | None:
         return None
 
     pid_segment = original_msg.pid
-    new_pid = new_msg.add_segment("PID")
 
     # Copy all PID fields except PID.29 (date of death), preserving repetitions.
-    copy_segment_fields_in_range(pid_segment, new_pid, "pid", start=1, end=28)
-    copy_segment_fields_in_range(pid_segment, new_pid, "pid", start=30, end=39)
+    if original_msg.encoding_chars == new_msg.encoding_chars:
+        new_pid = copy_segment(pid_segment, new_msg, fields=PID_FIELDS_WITHOUT_DATE_OF_DEATH)
+    else:
+        new_pid = new_msg.add_segment("PID")
+        copy_segment_fields_in_range(pid_segment, new_pid, "pid", start=1, end=28)
+        copy_segment_fields_in_range(pid_segment, new_pid, "pid", start=30, end=39)
 
     dod_field_value = getattr(pid_segment, "pid_29", None)
 
     if dod_field_value:
-        original_dod = get_hl7_field_value(pid_segment, "pid_29.ts_1")
+        original_dod = PID_29_TS_1_PATH.get(pid_segment)
     else:
         original_dod = None
 
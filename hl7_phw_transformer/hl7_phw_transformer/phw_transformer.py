@@ -4,6 +4,8 @@ from typing import Optional
 from hl7apy.core import Message
 from transformer_base_lib import BaseTransformer
 
+from .app_config import read_er7_mapping
+from .er7_mapping import PHW_MAPPING_PLAN
 from .mappers.additional_segment_mapper import map_non_specific_segments
 from .mappers.evn_mapper import map_evn
 from .mappers.msh_mapper import map_msh
@@ -12,13 +14,17 @@ from .mappers.pid_mapper import map_pid
 
 class PhwTransformer(BaseTransformer):
 
-    def __init__(self) -> None:
+    def __init__(self, er7_mapping: Optional[bool] = None) -> None:
         config_path = os.path.join(os.path.dirname(__file__), "config.ini")
         super().__init__("PHW", config_path)
+        self.er7_mapping = read_er7_mapping(config_path) if er7_mapping is None else er7_mapping
         self._current_datetime_transformation: Optional[tuple[str, str]] = None
         self._current_dod_transformation: Optional[tuple[str, str]] = None
 
     def transform_message(self, hl7_msg: Message) -> Message:
+        if self.er7_mapping:
+            return self._transform_er7(hl7_msg)
+
         new_message = Message(version="2.5")
         self._current_datetime_transformation = map_msh(hl7_msg, new_message)
         map_evn(hl7_msg, new_message)
@@ -26,6 +32,13 @@ class PhwTransformer(BaseTransformer):
         map_non_specific_segments(hl7_msg, new_message)
         return new_message
 
+    def _transform_er7(self, hl7_msg: Message) -> Message:
+        new_message, changes = PHW_MAPPING_PLAN.map_message(hl7_msg)
+        transformations = {(change.segment, change.field): (change.original, change.transformed) for change in changes}
+        self._current_datetime_transformation = transformations.get(("MSH", 7))
+        self._current_dod_transformation = transformations.get(("PID", 29))
+        return new_message
+
     def get_processed_audit_text(self, hl7_msg: Message) -> str:
         transformation_details = []
 
@@ -59,6 +59,25 @@ class TestAdditionalSegmentMapper(unittest.TestCase):
         expected_count = 1 + len(non_msh_pid_segments)  # 1 for auto-created MSH
         self.assertEqual(len([s for s in self.new_message.children]), expected_count)
 
+    def test_map_non_specific_segments_matches_field_by_field_copy(self) -> None:
+        message = parse_message(
+            "MSH|^~\\&|252|252|100|100|2025-05-05 23:23:32||ADT^A31^ADT_A05|1|P|2.5\r"
+            "PID|1\r"
+            "OBX|1|ST|CODE^Result^LN||\\F\\ value|mmol/L||N|||F|^\r"
+            "AL1|1||^^|x~y\r"
+            "ZZZ|a^b&c|",
+            find_groups=False,
+        )
+
+        map_non_specific_segments(message, self.new_message)
+
+        # OBX-11 is present but empty and keeps its place; AL1 has a repeated field and keeps the field-by-field
+        # copy, which adds the repetitions once for each repetition.
+        self.assertEqual(
+            self.new_message.to_er7().split("\r")[1:],
+            ["OBX|1|ST|CODE^Result^LN||\\F\\ value|mmol/L||N|||F|", "AL1|1|||x~y~x~y", "ZZZ|a^b&c"],
+        )
+
     def test_map_non_specific_segments_empty_message(self) -> None:
         minimal_message = parse_message(
             "MSH|^~\\&|252|252|100|100|2025-05-05 23:23:32||ADT^A31^ADT_A05|"
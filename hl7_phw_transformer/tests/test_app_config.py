@@ -1,8 +1,10 @@
+import os
+import tempfile
 import unittest
 from typing import Optional
 from unittest.mock import MagicMock, patch
 
-from hl7_phw_transformer.app_config import AppConfig
+from hl7_phw_transformer.app_config import AppConfig, read_er7_mapping
 
 
 class TestAppConfig(unittest.TestCase):
@@ -38,6 +40,23 @@ class TestAppConfig(unittest.TestCase):
             AppConfig.read_env_config()
         self.assertIn("Missing required configuration", str(context.exception))
 
+    def _read_er7_mapping(self, config: str) -> bool:
+        with tempfile.TemporaryDirectory() as directory:
+            config_path = os.path.join(directory, "config.ini")
+            with open(config_path, "w") as f:
+                f.write(config)
+            return read_er7_mapping(config_path)
+
+    def test_read_er7_mapping_from_config_file(self) -> None:
+        self.assertTrue(self._read_er7_mapping("[DEFAULT]\nER7_MAPPING = true\n"))
+        self.assertFalse(self._read_er7_mapping("[DEFAULT]\nER7_MAPPING = false\n"))
+
+    def test_read_er7_mapping_defaults_to_false(self) -> None:
+        self.assertFalse(self._read_er7_mapping("[DEFAULT]\nMAX_BATCH_SIZE = 100\n"))
+
+    def test_read_er7_mapping_invalid_value_defaults_to_false(self) -> None:
+        self.assertFalse(self._read_er7_mapping("[DEFAULT]\nER7_MAPPING = maybe\n"))
+
 
 if __name__ == "__main__":
     unittest.main()
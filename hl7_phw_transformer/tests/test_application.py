@@ -1,4 +1,5 @@
 import unittest
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 from azure.servicebus import ServiceBusMessage
@@ -26,7 +27,7 @@ class TestProcessPhwMessage(unittest.TestCase):
         self.mock_sender = MagicMock()
         self.mock_event_logger = MagicMock()
 
-        self.process_message_kwargs = {
+        self.process_message_kwargs: dict[str, Any] = {
             "sender_client": self.mock_sender,
             "event_logger": self.mock_event_logger,
             "transform": self.transformer.transform_message,
@@ -59,7 +60,7 @@ class TestProcessPhwMessage(unittest.TestCase):
         self.assertTrue(result)
 
         # Check that the transformed message was sent
-        self.mock_sender.send_message.assert_called_once()
+        self.mock_sender.send_text_message.assert_called_once()
 
         # Verify audit logging
         self.mock_event_logger.log_message_received.assert_called_once_with(
@@ -94,7 +95,7 @@ class TestProcessPhwMessage(unittest.TestCase):
         mock_transform_datetime.return_value = "20250522103000"
         mock_transform_dod.return_value = valid_dod  # No change needed
 
-        process_message_kwargs = {
+        process_message_kwargs: dict[str, Any] = {
             "sender_client": self.mock_sender,
             "event_logger": self.mock_event_logger,
             "transform": self.transformer.transform_message,
@@ -125,7 +126,7 @@ class TestProcessPhwMessage(unittest.TestCase):
         error_reason = "Invalid date"
         mock_transform_datetime.side_effect = ValueError(error_reason)
 
-        process_message_kwargs = {
+        process_message_kwargs: dict[str, Any] = {
             "sender_client": self.mock_sender,
             "event_logger": self.mock_event_logger,
             "transform": self.transformer.transform_message,
@@ -140,7 +141,7 @@ class TestProcessPhwMessage(unittest.TestCase):
 
         # Assert
         mock_transform_datetime.assert_called_once_with(created_datetime)
-        self.mock_sender.send_message.assert_not_called()
+        self.mock_sender.send_text_message.assert_not_called()
 
         self.mock_event_logger.log_message_received.assert_called_once_with(
             hl7_string, "Message received for PHW transformation", correlation_id=None
@@ -1,6 +1,48 @@
+import random
 import unittest
+from typing import Callable, Optional
+from unittest.mock import patch
 
-from hl7_phw_transformer.datetime_transformer import transform_datetime
+from hl7_phw_transformer.datetime_transformer import _transform_datetime_with_strptime, transform_datetime
+
+
+def _component(rng: random.Random, width: int, low: int, high: int) -> str:
+    # Mostly in-range values, with some just outside the range and the odd one-digit field strptime also accepts.
+    roll = rng.random()
+    if roll < 0.05:
+        return str(rng.randint(0, 9))
+    if roll < 0.15:
+        return str(rng.choice([low - 1, high + 1, 0, 10**width - 1])).zfill(width)[-width:]
+    return str(rng.randint(low, high)).zfill(width)
+
+
+def _random_datetime(rng: random.Random) -> str:
+    parts = [
+        _component(rng, 4, 1, 9999) if rng.random() < 0.1 else str(rng.randint(1900, 2100)),
+        _component(rng, 2, 1, 12),
+        _component(rng, 2, 1, 31),
+        _component(rng, 2, 0, 23),
+        _component(rng, 2, 0, 59),
+        _component(rng, 2, 0, 60),
+    ]
+    if rng.random() < 0.5:
+        value = "".join(parts)
+    else:
+        value = "-".join(parts[:3]) + " " + ":".join(parts[3:])
+    roll = rng.random()
+    if roll < 0.05:
+        value = value.translate(str.maketrans("0123456789", "٠١٢٣٤٥٦٧٨٩"))
+    elif roll < 0.1:
+        index = rng.randrange(len(value) + 1)
+        value = value[:index] + rng.choice(["", " ", "+", ".", "0", "T", "²"]) + value[index + 1:]
+    return value
+
+
+def _outcome(func: Callable[[str], str], value: str) -> tuple[Optional[str], Optional[str]]:
+    try:
+        return func(value), None
+    except ValueError as e:
+        return None, str(e)
 
 
 class TestDatetimeTransformer(unittest.TestCase):
@@ -34,6 +76,36 @@ class TestDatetimeTransformer(unittest.TestCase):
         with self.assertRaises(ValueError):
             transform_datetime("2023-02-30 12:00:00")  # Invalid date
 
+    def test_matches_strptime_for_random_values(self) -> None:
+        rng = random.Random(35)
+        for _ in range(5000):
+            value = _random_datetime(rng)
+            with self.subTest(value=value):
+                expected = _outcome(_transform_datetime_with_strptime, value)
+                self.assertEqual(_outcome(transform_datetime, value), expected)
+
+    def test_sender_formats_do_not_fall_back_to_strptime(self) -> None:
+        with patch(
+            "hl7_phw_transformer.datetime_transformer._transform_datetime_with_strptime"
+        ) as mock_strptime:
+            self.assertEqual(transform_datetime("20230115094530"), "20230115094530")
+            self.assertEqual(transform_datetime("2023-01-15 09:45:30"), "20230115094530")
+
+        mock_strptime.assert_not_called()
+
+    def test_other_values_fall_back_to_strptime(self) -> None:
+        with patch(
+            "hl7_phw_transformer.datetime_transformer._transform_datetime_with_strptime",
+            return_value="20230105094530",
+        ) as mock_strptime:
+            # Single-digit fields, and years before 1000 that strftime leaves unpadded.
+            for value in ("2023-1-5 9:45:30", "0099-01-01 00:00:00"):
+                self.assertEqual(transform_datetime(value), "20230105094530")
+
+        self.assertEqual(
+            [call.args for call in mock_strptime.call_args_list],
+            [("2023-1-5 9:45:30",), ("0099-01-01 00:00:00",)],
+        )
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,143 @@
+import os
+import random
+import re
+import unittest
+from typing import List, Optional
+
+from hl7apy.parser import parse_message
+from transformer_base_lib.er7_mapping import Shape, _segment_shapes
+
+from hl7_phw_transformer.er7_mapping import PHW_MAPPING_PLAN
+from hl7_phw_transformer.phw_transformer import PhwTransformer
+
+SAMPLE_PATH = os.path.join(os.path.dirname(__file__), "phw-valid-message.hl7")
+
+_VALUES = ["A", "12", "x y", " B ", "", " ", "  C"]
+
+
+def _value(rng: random.Random, shape: Shape, separator: str = "^") -> str:
+    if shape is None:
+        return rng.choice(_VALUES)
+    count = rng.randint(1, len(shape))
+    if separator == "&":
+        return separator.join(rng.choice(_VALUES) for _ in range(count))
+    return separator.join(_value(rng, shape[index], "&") for index in range(count))
+
+
+def _field(rng: random.Random, shape: Shape, repeat: bool) -> str:
+    value = _value(rng, shape)
+    if repeat and rng.random() < 0.3:
+        value += "~" + _value(rng, shape)
+    return value
+
+
+def _segment(rng: random.Random, name: str, fields: Optional[int] = None) -> List[str]:
+    return [name] + [
+        _field(rng, shape, True) if rng.random() < 0.6 else "" for shape in _segment_shapes(name, "2.5")[:fields]
+    ]
+
+
+def _generated_message(seed: int) -> str:
+    """A PHW-shaped message with random values, and some repetitions, that respect each field's datatype."""
+    rng = random.Random(seed)
+    msh = _segment(rng, "MSH")
+    msh[2] = "^~\\&"
+    msh[7] = rng.choice(["20250101101010", "2025-01-01 10:00:00"])
+    msh[9] = "ADT^A31^ADT_A05"
+    msh[12] = rng.choice(["2.5", "2.5^GBR"])
+    segments = ["MSH|" + "|".join(msh[2:])]
+
+    if rng.random() < 0.8:
+        segments.append("|".join(_segment(rng, "EVN")))
+    pid = _segment(rng, "PID")
+    pid[29] = rng.choice(["", " ", "20240101", " resurrec ", "RESURREC^x"])
+    segments.append("|".join(pid))
+    if rng.random() < 0.5:
+        segments.append("|".join(_segment(rng, "PD1")))
+    if rng.random() < 0.3:
+        segments.append("ZAB|1")
+    if rng.random() < 0.5:
+        segments.append("|".join(_segment(rng, "NK1")))
+    segments.append("|".join(_segment(rng, "PV1")))
+    for set_id in range(1, rng.randint(1, 4)):
+        segments.append(f"OBX|{set_id}|ST|CODE||{_field(rng, None, True)}||||||F")
+    return "\r".join(segments)
+
+
+def _sample_message() -> str:
+    with open(SAMPLE_PATH) as f:
+        return f.read().strip().replace("\n", "\r")
+
+
+class TestPhwEr7Mapping(unittest.TestCase):
+    def setUp(self) -> None:
+        self.transformer = PhwTransformer()
+
+    def _transform(self, er7: str) -> str:
+        return self.transformer.transform_message(parse_message(er7)).to_er7()
+
+    def test_sample_message_matches_transformer(self) -> None:
+        message = _sample_message()
+
+        self.assertEqual(PHW_MAPPING_PLAN.apply(message).er7, self._transform(message))
+
+    def test_generated_messages_match_transformer(self) -> None:
+        for seed in range(20):
+            message = _generated_message(seed)
+            with self.subTest(seed=seed):
+                self.assertEqual(PHW_MAPPING_PLAN.apply(message).er7, self._transform(message))
+
+    def test_changes_match_audit_transformations(self) -> None:
+        segments = _sample_message().split("\r")
+        pid = segments[2].split("|")
+        pid[29] = " resurrec "
+        segments[2] = "|".join(pid)
+        message = "\r".join(segments)
+        self._transform(message)
+
+        changes = PHW_MAPPING_PLAN.apply(message).changes
+
+        self.assertEqual(
+            [(change.original, change.transformed) for change in changes],
+            [
+                self.transformer._current_datetime_transformation,
+                self.transformer._current_dod_transformation,
+            ],
+        )
+
+    def test_missing_message_datetime_is_stamped(self) -> None:
+        result = PHW_MAPPING_PLAN.apply("MSH|^~\\&|252|252|100|100|||ADT^A31^ADT_A05|1|P|2.5\rPID|1")
+
+        self.assertRegex(result.er7.split("|")[6], re.compile(r"^\d{14}$"))
+        self.assertEqual(result.changes, ())
+
+    def test_invalid_message_datetime_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            PHW_MAPPING_PLAN.apply("MSH|^~\\&|252|252|100|100|20250101||ADT^A31^ADT_A05|1|P|2.5")
+
+    def test_transformer_with_er7_mapping_matches_hl7apy_mappers(self) -> None:
+        er7_transformer = PhwTransformer(er7_mapping=True)
+        messages = [_sample_message()] + [_generated_message(seed) for seed in range(30)]
+
+        for index, message in enumerate(messages):
+            with self.subTest(message=index):
+                expected = self.transformer.transform_message(parse_message(message))
+                actual = er7_transformer.transform_message(parse_message(message))
+
+                self.assertEqual(actual.to_er7(), expected.to_er7())
+                self.assertEqual(
+                    er7_transformer.get_processed_audit_text(parse_message(message)),
+                    self.transformer.get_processed_audit_text(parse_message(message)),
+                )
+
+    def test_repeating_fields_of_unmapped_segments_match_transformer(self) -> None:
+        message = _sample_message() + "\rAL1|1||^^|x~y\rPV2||| ~b~C^D^^"
+
+        result = PHW_MAPPING_PLAN.apply(message).er7
+
+        self.assertTrue(result.endswith("\rAL1|1|||x~y~x~y\rPV2|||~b~C^D~~b~C^D~~b~C^D"))
+        self.assertEqual(result, self._transform(message))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,19 +1,23 @@
-from field_utils_lib import get_hl7_field_value, set_nested_field
+from field_utils_lib import compile_path
 from hl7apy.core import Message
 
 from ..utils.remove_timezone_from_datetime import remove_timezone_from_datetime
 
+EVN_1_PATH = compile_path("evn_1")
+EVN_2_TS_1_PATH = compile_path("evn_2.ts_1")
+EVN_6_TS_1_PATH = compile_path("evn_6.ts_1")
+
 
 def map_evn(original_hl7_message: Message, new_message: Message) -> None:
     original_evn = original_hl7_message.evn
-    set_nested_field(original_evn, new_message.evn, "evn_1")
+    EVN_1_PATH.copy(original_evn, new_message.evn)
 
     # EVN.2 - remove timezone from timestamp for MPI compatibility
-    original_evn2_ts1 = get_hl7_field_value(original_evn, "evn_2.ts_1")
+    original_evn2_ts1 = EVN_2_TS_1_PATH.get(original_evn)
     if original_evn2_ts1:
         new_message.evn.evn_2.ts_1 = remove_timezone_from_datetime(original_evn2_ts1)
 
     # EVN.6 - remove timezone from timestamp for MPI compatibility
-    original_evn6_ts1 = get_hl7_field_value(original_evn, "evn_6.ts_1")
+    original_evn6_ts1 = EVN_6_TS_1_PATH.get(original_evn)
     if original_evn6_ts1:
         new_message.evn.evn_6.ts_1 = remove_timezone_from_datetime(original_evn6_ts1)
@@ -1,8 +1,13 @@
-from field_utils_lib import get_hl7_field_value, set_nested_field
+from field_utils_lib import compile_path
 from hl7apy.core import Message
 
 from ..utils.remove_timezone_from_datetime import remove_timezone_from_datetime
 
+MSH_7_TS_1_PATH = compile_path("msh_7.ts_1")
+MSH_8_PATH = compile_path("msh_8")
+MSH_9_MSG_2_PATH = compile_path("msh_9.msg_2")
+MSH_13_PATH = compile_path("msh_13")
+
 
 def map_msh(original_hl7_message: Message, new_message: Message) -> None:
     original_msh = original_hl7_message.msh
@@ -17,11 +22,11 @@ def map_msh(original_hl7_message: Message, new_message: Message) -> None:
     new_message.msh.msh_6.hd_1 = "200"
 
     # MSH.7 - remove timezone from timestamp for MPI compatibility
-    original_msh7_ts1 = get_hl7_field_value(original_msh, "msh_7.ts_1")
+    original_msh7_ts1 = MSH_7_TS_1_PATH.get(original_msh)
     if original_msh7_ts1:
         new_message.msh.msh_7.ts_1 = remove_timezone_from_datetime(original_msh7_ts1)
 
-    set_nested_field(original_msh, new_message.msh, "msh_8")
+    MSH_8_PATH.copy(original_msh, new_message.msh)
 
     # Always ensure MSH.9 exists
     if not getattr(new_message.msh, "msh_9", None):
@@ -29,7 +34,7 @@ def map_msh(original_hl7_message: Message, new_message: Message) -> None:
 
     new_message.msh.msh_9.msg_1 = "ADT"
     # possible values are A04, A08, A28, A31 and A40
-    original_message_type_trigger_event = (get_hl7_field_value(original_msh, "msh_9.msg_2") or "").strip().upper()
+    original_message_type_trigger_event = (MSH_9_MSG_2_PATH.get(original_msh) or "").strip().upper()
 
     # Set msg_2 and msg_3 based on original trigger event (msg_2)
     if original_message_type_trigger_event in {"A04", "A28"}:
@@ -52,7 +57,7 @@ def map_msh(original_hl7_message: Message, new_message: Message) -> None:
         new_message.msh.msh_12 = new_message.msh.add_field("msh_12")
     new_message.msh.msh_12.vid_1 = "2.5"
 
-    set_nested_field(original_msh, new_message.msh, "msh_13")
+    MSH_13_PATH.copy(original_msh, new_message.msh)
 
     new_message.msh.msh_17 = "GBR"
     new_message.msh.msh_19.ce_1 = "EN"
@@ -1,8 +1,11 @@
-from field_utils_lib import get_hl7_field_value, set_nested_field
+from field_utils_lib import compile_path
 from hl7apy.core import Message
 
 from ..utils.message_utils import is_a04_or_a08_trigger_event
 
+PD1_4_XCN_1_PATH = compile_path("pd1_4.xcn_1")
+PD1_4_REP2_XCN_1_PATH = compile_path("pd1_4[1].xcn_1")
+
 
 def map_pd1(original_hl7_message: Message, new_message: Message) -> None:
     original_pd1 = getattr(original_hl7_message, "pd1", None)
@@ -10,7 +13,7 @@ def map_pd1(original_hl7_message: Message, new_message: Message) -> None:
         return  # No PD1 segment
 
     if is_a04_or_a08_trigger_event(original_hl7_message):
-        set_nested_field(original_pd1, new_message.pd1, "pd1_4.xcn_1")
+        PD1_4_XCN_1_PATH.copy(original_pd1, new_message.pd1)
 
         if len(getattr(original_pd1, "pd1_4", [])) > 1:
-            new_message.pd1.pd1_3.xon_3 = get_hl7_field_value(original_pd1, "pd1_4[1].xcn_1")
+            new_message.pd1.pd1_3.xon_3 = PD1_4_REP2_XCN_1_PATH.get(original_pd1)
@@ -1,8 +1,22 @@
-from field_utils_lib import get_hl7_field_value, set_nested_field
+from field_utils_lib import compile_path
 from hl7apy.core import Message
 
 from ..utils.remove_timezone_from_datetime import remove_timezone_from_datetime
 
+PID_3_REP1_CX_1_PATH = compile_path("pid_3[0].cx_1")
+PID_3_REP1_CX_5_PATH = compile_path("pid_3[0].cx_5")
+PID_3_REP2_CX_1_PATH = compile_path("pid_3[1].cx_1")
+PID_3_REP2_CX_5_PATH = compile_path("pid_3[1].cx_5")
+PID_5_XPN_1_FN_1_PATH = compile_path("pid_5.xpn_1.fn_1")
+PID_5_PATHS = tuple(compile_path(f"pid_5.{field}") for field in ["xpn_2", "xpn_3", "xpn_4", "xpn_5"])
+PID_7_TS_1_PATH = compile_path("pid_7.ts_1")
+PID_8_PATH = compile_path("pid_8")
+PID_11_PATHS = tuple(compile_path(f"pid_11.{field}") for field in ["xad_2", "xad_3", "xad_4", "xad_5"])
+# Relative to a PID.13 repetition
+PID_13_XTN_1_PATH = compile_path("xtn_1")
+PID_14_XTN_1_PATH = compile_path("pid_14.xtn_1")
+PID_29_TS_1_PATH = compile_path("pid_29.ts_1")
+
 
 def map_pid(original_hl7_message: Message, new_message: Message) -> None:
     original_pid = getattr(original_hl7_message, "pid", None)
@@ -13,8 +27,8 @@ def map_pid(original_hl7_message: Message, new_message: Message) -> None:
 
     # PID.3[1] (index 0): map if CX.1 is present and CX.5 == 'NI'
     if len(original_pid3_repetitions) >= 1:
-        cx1_rep1 = (get_hl7_field_value(original_pid, "pid_3[0].cx_1") or "").strip()
-        cx5_rep1 = (get_hl7_field_value(original_pid, "pid_3[0].cx_5") or "").strip().upper()
+        cx1_rep1 = (PID_3_REP1_CX_1_PATH.get(original_pid) or "").strip()
+        cx5_rep1 = (PID_3_REP1_CX_5_PATH.get(original_pid) or "").strip().upper()
         if cx1_rep1 and cx5_rep1 == "NI":
             pid3_rep1 = new_message.pid.add_field("pid_3")
             pid3_rep1.cx_1 = cx1_rep1
@@ -23,44 +37,42 @@ def map_pid(original_hl7_message: Message, new_message: Message) -> None:
 
     # PID.3[2] (index 1): map if CX.1 is present and CX.5 == 'PI'
     if len(original_pid3_repetitions) >= 2:
-        cx1_rep2 = (get_hl7_field_value(original_pid, "pid_3[1].cx_1") or "").strip()
-        cx5_rep2 = (get_hl7_field_value(original_pid, "pid_3[1].cx_5") or "").strip().upper()
+        cx1_rep2 = (PID_3_REP2_CX_1_PATH.get(original_pid) or "").strip()
+        cx5_rep2 = (PID_3_REP2_CX_5_PATH.get(original_pid) or "").strip().upper()
         if cx1_rep2 and cx5_rep2 == "PI":
             pid3_rep2 = new_message.pid.add_field("pid_3")
             pid3_rep2.cx_1 = cx1_rep2
             pid3_rep2.cx_4.hd_1 = "103"
             pid3_rep2.cx_5 = "PI"
 
-    set_nested_field(original_pid, new_message.pid, "pid_5.xpn_1.fn_1")
+    PID_5_XPN_1_FN_1_PATH.copy(original_pid, new_message.pid)
 
-    pid_5_fields = ["xpn_2", "xpn_3", "xpn_4", "xpn_5"]
-    for field in pid_5_fields:
-        set_nested_field(original_pid, new_message.pid, f"pid_5.{field}")
+    for path in PID_5_PATHS:
+        path.copy(original_pid, new_message.pid)
 
     # PID.7 - remove timezone from timestamp for MPI compatibility
-    original_pid7_ts1 = get_hl7_field_value(original_pid, "pid_7.ts_1")
+    original_pid7_ts1 = PID_7_TS_1_PATH.get(original_pid)
     if original_pid7_ts1:
         new_message.pid.pid_7.ts_1 = remove_timezone_from_datetime(original_pid7_ts1)
 
-    set_nested_field(original_pid, new_message.pid, "pid_8")
+    PID_8_PATH.copy(original_pid, new_message.pid)
 
     # SAD does not exist in HL7 v2.3.1 so it's mapped manually
     new_message.pid.pid_11.xad_1.sad_1 = original_pid.pid_11.xad_1
 
-    pid_11_fields = ["xad_2", "xad_3", "xad_4", "xad_5"]
-    for field in pid_11_fields:
-        set_nested_field(original_pid, new_message.pid, f"pid_11.{field}")
+    for path in PID_11_PATHS:
+        path.copy(original_pid, new_message.pid)
 
     # Map all repetitions of pid_13
     if hasattr(original_pid, "pid_13"):
         for rep_count, original_pid_13 in enumerate(original_pid.pid_13):
             new_pid_13_repetition = new_message.pid.add_field("pid_13")
-            set_nested_field(original_pid_13, new_pid_13_repetition, "xtn_1")
+            PID_13_XTN_1_PATH.copy(original_pid_13, new_pid_13_repetition)
 
-    set_nested_field(original_pid, new_message.pid, "pid_14.xtn_1")
+    PID_14_XTN_1_PATH.copy(original_pid, new_message.pid)
 
     # Death date and time: trim at first "+" if length > 6, otherwise set to '""'
-    original_pid29_ts1 = get_hl7_field_value(original_pid, "pid_29.ts_1")
+    original_pid29_ts1 = PID_29_TS_1_PATH.get(original_pid)
     new_message.pid.pid_29.ts_1 = (
         remove_timezone_from_datetime(original_pid29_ts1) if len(original_pid29_ts1) > 6 else '""'
     )
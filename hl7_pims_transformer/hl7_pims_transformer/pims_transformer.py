@@ -1,6 +1,6 @@
 import os
 
-from hl7apy.core import Message
+from hl7apy.core import Group, Message
 from hl7apy.parser import parse_message
 from transformer_base_lib import BaseTransformer
 
@@ -20,7 +20,10 @@ def transform_pims_message(original_hl7_msg: Message) -> Message:
     # PID/PD1/MRG/PV1 inside a repeating "PATIENT" group when parsed with hl7apy's default
     # find_groups=True. Reparse as a flat structure so every mapper can access segments
     # directly (e.g. original_hl7_msg.pid) regardless of the incoming message structure.
-    flat_hl7_msg = parse_message(original_hl7_msg.to_er7(), find_groups=False)
+    # PimsTransformer parses flat to begin with, so the reparse is only needed for grouped input.
+    flat_hl7_msg = original_hl7_msg
+    if any(isinstance(child, Group) for child in original_hl7_msg.children):
+        flat_hl7_msg = parse_message(original_hl7_msg.to_er7(), find_groups=False)
 
     map_msh(flat_hl7_msg, new_message)
     map_evn(flat_hl7_msg, new_message)
@@ -35,6 +38,7 @@ def transform_pims_message(original_hl7_msg: Message) -> Message:
 
 
 class PimsTransformer(BaseTransformer):
+    find_groups = False
 
     def __init__(self) -> None:
         config_path = os.path.join(os.path.dirname(__file__), "config.ini")
@@ -22,7 +22,7 @@ class TestProcessPimsMessage(unittest.TestCase):
         self.mock_sender = MagicMock()
         self.mock_event_logger = MagicMock()
 
-        self.process_message_kwargs = {
+        self.process_message_kwargs: dict[str, Any] = {
             "sender_client": self.mock_sender,
             "event_logger": self.mock_event_logger,
             "transform": self.transformer.transform_message,
@@ -59,7 +59,9 @@ class TestProcessPimsMessage(unittest.TestCase):
 
         self.assertTrue(result)
         mock_transform_pims.assert_called_once()
-        self.mock_sender.send_message.assert_called_once_with(expected_message, custom_properties=None)
+        self.mock_sender.send_text_message.assert_called_once_with(
+            expected_message, custom_properties=None, message_id=None
+        )
         self.mock_event_logger.log_message_received.assert_called_once()
         self.mock_event_logger.log_message_processed.assert_called_once_with(
             expected_message, "PIMS transformation applied for SENDING_APP: PIMS", correlation_id=None
@@ -74,7 +76,7 @@ class TestProcessPimsMessage(unittest.TestCase):
         result = process_message(self.service_bus_message, **self.process_message_kwargs)
 
         self.assertFalse(result)
-        self.mock_sender.send_message.assert_not_called()
+        self.mock_sender.send_text_message.assert_not_called()
 
     @patch("hl7_pims_transformer.pims_transformer.transform_pims_message")
     def test_process_message_audit_logging_failure(self, mock_transform_pims: Any) -> None:
@@ -0,0 +1,28 @@
+import unittest
+from pathlib import Path
+
+from transformer_base_lib.golden_corpus import compare_to_golden, generate_variants, load_corpus, transform_er7
+
+from hl7_pims_transformer.pims_transformer import PimsTransformer
+
+SAMPLE_PATH = Path(__file__).parent / "corpus" / "pims-to-mpi.sample.hl7"
+GOLDEN_DIR = Path(__file__).parent / "golden"
+VARIANTS = 4
+
+
+class TestGoldenCorpus(unittest.TestCase):
+    def test_outputs_match_golden_files(self) -> None:
+        # After an intentional output change, rewrite the golden files with the harness's --update-golden option.
+        messages = load_corpus([SAMPLE_PATH])
+        messages += generate_variants(messages, VARIANTS)
+        transformer = PimsTransformer()
+
+        outputs = {message.name: transform_er7(transformer, message.er7)[0] for message in messages}
+        mismatches = compare_to_golden(outputs, GOLDEN_DIR)
+
+        self.assertEqual(len(outputs), 1 + VARIANTS)
+        self.assertEqual([mismatch.description for mismatch in mismatches], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,7 @@ from unittest.mock import Mock, patch
 from field_utils_lib import get_hl7_field_value
 from hl7apy.parser import parse_message
 
-from hl7_pims_transformer.pims_transformer import transform_pims_message
+from hl7_pims_transformer.pims_transformer import PimsTransformer, transform_pims_message
 from tests.pims_messages import pims_messages
 
 
@@ -156,6 +156,24 @@ class TestPimsTransformer(unittest.TestCase):
         self.assertEqual(get_hl7_field_value(transformed_message.mrg, "mrg_1.cx_4.hd_1"), "103")
         self.assertEqual(transformed_message.mrg.mrg_1.cx_5.value, "PI")
 
+    def test_flat_parsed_messages_transform_like_grouped_messages(self) -> None:
+        self.assertFalse(PimsTransformer.find_groups)
+
+        for name, message in pims_messages.items():
+            with self.subTest(message=name):
+                grouped = transform_pims_message(parse_message(message))
+                flat = transform_pims_message(parse_message(message, find_groups=False))
+
+                self.assertEqual(flat.to_er7(), grouped.to_er7())
+
+    @patch("hl7_pims_transformer.pims_transformer.parse_message")
+    def test_flat_parsed_message_is_not_reparsed(self, mock_parse_message: Mock) -> None:
+        original_message = parse_message(pims_messages["a40_adt_a39"], find_groups=False)
+
+        transform_pims_message(original_message)
+
+        mock_parse_message.assert_not_called()
+
     @patch("hl7_pims_transformer.pims_transformer.map_msh")
     @patch("hl7_pims_transformer.pims_transformer.map_pid")
     @patch("hl7_pims_transformer.pims_transformer.map_evn")
@@ -21,6 +21,17 @@ class AppConfig:
     peer_service: str
     ack_timeout_seconds: int
     max_messages_per_minute: int | None
+    mllp_pool_size: int | None = None
+    mllp_idle_timeout_seconds: int = 300
+    mllp_probe_interval_seconds: int = 10
+    mllp_keepalive_idle_seconds: int = 60
+    throttle_burst: int = 1
+    min_messages_per_minute: int | None = None
+    throttle_latency_threshold_seconds: int = 5
+    circuit_breaker_failure_threshold: int | None = None
+    circuit_breaker_probe_interval_seconds: int = 5
+    circuit_breaker_probe_message: str | None = None
+    mllp_window_size: int | None = None
 
     @staticmethod
     def read_env_config() -> AppConfig:
@@ -40,6 +51,19 @@ class AppConfig:
             peer_service=_read_required_env("PEER_SERVICE"),
             ack_timeout_seconds=_read_int_env("ACK_TIMEOUT_SECONDS") or 30,
             max_messages_per_minute=_read_positive_int_env("MAX_MESSAGES_PER_MINUTE"),
+            mllp_pool_size=_read_positive_int_env("MLLP_POOL_SIZE"),
+            mllp_idle_timeout_seconds=_read_positive_int_env("MLLP_IDLE_TIMEOUT_SECONDS") or 300,
+            mllp_probe_interval_seconds=_read_positive_int_env("MLLP_PROBE_INTERVAL_SECONDS") or 10,
+            mllp_keepalive_idle_seconds=_read_positive_int_env("MLLP_KEEPALIVE_IDLE_SECONDS") or 60,
+            throttle_burst=_read_positive_int_env("THROTTLE_BURST") or 1,
+            min_messages_per_minute=_read_positive_int_env("MIN_MESSAGES_PER_MINUTE"),
+            throttle_latency_threshold_seconds=_read_positive_int_env("THROTTLE_LATENCY_THRESHOLD_SECONDS") or 5,
+            circuit_breaker_failure_threshold=_read_positive_int_env("CIRCUIT_BREAKER_FAILURE_THRESHOLD"),
+            circuit_breaker_probe_interval_seconds=(
+                _read_positive_int_env("CIRCUIT_BREAKER_PROBE_INTERVAL_SECONDS") or 5
+            ),
+            circuit_breaker_probe_message=_read_env("CIRCUIT_BREAKER_PROBE_MESSAGE"),
+            mllp_window_size=_read_positive_int_env("MLLP_WINDOW_SIZE"),
         )
 
 
@@ -1,14 +1,19 @@
 import configparser
 import logging
 import os
+import re
+import time
+from contextlib import nullcontext
+from typing import Callable, Sequence
 
-from azure.servicebus import ServiceBusMessage
+from azure.servicebus import ServiceBusMessage, ServiceBusReceivedMessage
 from event_logger_lib import EventLogger
 from health_check_lib.health_check_server import TCPHealthCheckServer
 from hl7_validation import convert_er7_to_xml
-from hl7apy.parser import parse_message
+from hl7apy import check_version
+from hl7apy.exceptions import UnsupportedVersion
 from message_bus_lib.connection_config import ConnectionConfig
-from message_bus_lib.message_receiver_client import MessageReceiverClient
+from message_bus_lib.message_receiver_client import MessageReceiverClient, ReleaseMessages
 from message_bus_lib.message_store_client import MessageStoreClient
 from message_bus_lib.metadata_utils import (
     CORRELATION_ID_KEY,
@@ -20,13 +25,15 @@ from message_bus_lib.metadata_utils import (
 )
 from message_bus_lib.servicebus_client_factory import ServiceBusClientFactory
 from metric_sender_lib.metric_sender import MetricSender
+from mllp_lib import MLLPConnectionPool
 from otel_lib import configure_otel
-from processor_manager_lib import ProcessorManager
+from processor_manager_lib import CircuitBreaker, MessageThrottler, ProcessorManager, StageTimer
 
 from hl7_sender.ack_processor import get_ack_result
 from hl7_sender.app_config import AppConfig
+from hl7_sender.batch_scheduler import BatchScheduler
 from hl7_sender.hl7_sender_client import HL7SenderClient
-from hl7_sender.message_throttler import MessageThrottler
+from hl7_sender.processing_state import ProcessingState, ProcessingStateCache
 
 logging.basicConfig(level=os.environ.get("LOG_LEVEL", "ERROR").upper())
 azure_log_level_str = os.environ.get("AZURE_LOG_LEVEL", "WARN").upper()
@@ -40,6 +47,9 @@ config.read(config_path)
 
 MAX_BATCH_SIZE = config.getint("DEFAULT", "max_batch_size")
 LOCK_RENEWAL_BUFFER_SECONDS = 30
+PROCESSING_STATE_CACHE_SIZE = 10 * MAX_BATCH_SIZE
+SEGMENT_SEPARATORS = re.compile(r"[\r\n]+")
+SEGMENT_NAME = re.compile(r"[A-Za-z][A-Za-z0-9]{2}")
 
 
 def _calculate_batch_size(throttler: MessageThrottler) -> int:
@@ -78,7 +88,13 @@ def main() -> None:
     metric_sender = MetricSender(
         app_config.workflow_id, app_config.microservice_id, app_config.health_board, app_config.peer_service
     )
-    throttler = MessageThrottler(app_config.max_messages_per_minute)
+    throttler = MessageThrottler(
+        app_config.max_messages_per_minute,
+        burst=app_config.throttle_burst,
+        min_messages_per_minute=app_config.min_messages_per_minute,
+        latency_threshold_seconds=app_config.throttle_latency_threshold_seconds,
+        metric_sender=metric_sender,
+    )
 
     message_store_client = factory.create_message_store_client(
         app_config.message_store_queue_name, app_config.microservice_id, app_config.peer_service
@@ -86,10 +102,26 @@ def main() -> None:
 
     with (
         factory.create_message_receiver_client(
-            app_config.ingress_queue_name, app_config.ingress_session_id
+            app_config.ingress_queue_name, app_config.ingress_session_id, time_settling=True
         ) as receiver_client,
+        (
+            MLLPConnectionPool(
+                app_config.receiver_mllp_hostname,
+                app_config.receiver_mllp_port,
+                app_config.ack_timeout_seconds,
+                size=app_config.mllp_pool_size,
+                idle_timeout_seconds=app_config.mllp_idle_timeout_seconds,
+                probe_interval_seconds=app_config.mllp_probe_interval_seconds,
+                keepalive_idle_seconds=app_config.mllp_keepalive_idle_seconds,
+            )
+            if app_config.mllp_pool_size
+            else nullcontext()
+        ) as mllp_pool,
         HL7SenderClient(
-            app_config.receiver_mllp_hostname, app_config.receiver_mllp_port, app_config.ack_timeout_seconds
+            app_config.receiver_mllp_hostname,
+            app_config.receiver_mllp_port,
+            app_config.ack_timeout_seconds,
+            pool=mllp_pool,
         ) as hl7_sender_client,
         TCPHealthCheckServer(app_config.health_check_hostname, app_config.health_check_port) as health_check_server,
         message_store_client,
@@ -97,22 +129,80 @@ def main() -> None:
         logger.info("Processor started.")
         health_check_server.start()
 
-        batch_size = _calculate_batch_size(throttler)
+        processing_states = ProcessingStateCache(PROCESSING_STATE_CACHE_SIZE)
 
-        def message_processor(message: ServiceBusMessage) -> bool:
-            return _process_message(
-                message, hl7_sender_client, event_logger, metric_sender, throttler, message_store_client,
-                app_config.ingress_session_id,
+        batch_scheduler = BatchScheduler(
+            MessageReceiverClient.LOCK_RENEWAL_DURATION_SECONDS - LOCK_RENEWAL_BUFFER_SECONDS,
+            MAX_BATCH_SIZE,
+            throttler,
+            initial_batch_size=_calculate_batch_size(throttler),
+        )
+        circuit_breaker = (
+            CircuitBreaker(
+                app_config.circuit_breaker_failure_threshold,
+                _destination_probe(hl7_sender_client, app_config.circuit_breaker_probe_message),
+                probe_interval_seconds=app_config.circuit_breaker_probe_interval_seconds,
+                metric_sender=metric_sender,
+            )
+            if app_config.circuit_breaker_failure_threshold
+            else None
+        )
+
+        window_size = app_config.mllp_window_size
+        if window_size is not None and window_size > 1:
+            logger.info("Sending with up to %d message(s) awaiting an ACK.", window_size)
+
+            def batch_processor(messages: list[ServiceBusReceivedMessage]) -> int:
+                return _process_message_window(
+                    messages, hl7_sender_client, event_logger, metric_sender, throttler, message_store_client,
+                    app_config.ingress_session_id, window_size, circuit_breaker, batch_scheduler, processing_states,
+                )
+
+            wrapped_batch_processor = processor_manager.wrap_handler(
+                batch_processor, "hl7-sender", app_config.ingress_queue_name
             )
+            while processor_manager.is_running:
+                if circuit_breaker is None or circuit_breaker.wait_until_closed(
+                    lambda: processor_manager.is_running, on_closed=receiver_client.clear_retry_delay
+                ):
+                    receiver_client.receive_messages_batch_partial(
+                        batch_scheduler.batch_size(), wrapped_batch_processor
+                    )
+            return
+
+        def message_processor(message: ServiceBusMessage) -> bool:
+            batch_scheduler.check_lock_window()
+            started_at = time.monotonic()
+            try:
+                return _process_message(
+                    message, hl7_sender_client, event_logger, metric_sender, throttler, message_store_client,
+                    app_config.ingress_session_id, circuit_breaker, processing_states,
+                )
+            finally:
+                batch_scheduler.record_message(time.monotonic() - started_at)
 
         wrapped_processor = processor_manager.wrap_handler(
             message_processor, "hl7-sender", app_config.ingress_queue_name
         )
         while processor_manager.is_running:
-            receiver_client.receive_messages(
-                batch_size,
-                wrapped_processor,
-            )
+            if circuit_breaker is None or circuit_breaker.wait_until_closed(
+                lambda: processor_manager.is_running, on_closed=receiver_client.clear_retry_delay
+            ):
+                receiver_client.receive_messages(
+                    batch_scheduler.batch_size(),
+                    wrapped_processor,
+                    on_batch_received=batch_scheduler.start_batch,
+                    on_messages_released=lambda messages: _mark_released(processing_states, messages),
+                )
+
+
+def _destination_probe(hl7_sender_client: HL7SenderClient, probe_message: str | None) -> Callable[[], bool]:
+    """Check the receiver by connecting to it, or by sending ``probe_message`` and expecting a positive ACK."""
+    if probe_message is None:
+        return hl7_sender_client.check_connection
+    # Segments may be separated by newlines in the environment variable.
+    er7 = "\r".join(probe_message.splitlines())
+    return lambda: get_ack_result(hl7_sender_client.send_message(er7))
 
 
 def _process_message(
@@ -123,11 +213,200 @@ def _process_message(
     throttler: MessageThrottler,
     message_store_client: MessageStoreClient,
     session_id: str,
+    circuit_breaker: CircuitBreaker | None = None,
+    processing_states: ProcessingStateCache | None = None,
 ) -> bool:
+    stage_timer = StageTimer(metric_sender)
+    message_body, metadata, correlation_id_opt = _read_message(message)
+
+    try:
+        message_id = _prepare_message(
+            message, message_body, metadata, event_logger, message_store_client, session_id, processing_states,
+            stage_timer,
+        )
+        stage_timer.mark("prepare")
+
+        throttler.wait_if_needed()
+        stage_timer.mark("throttle")
+        sent_at = time.monotonic()
+        ack_response = hl7_sender_client.send_message(message_body, stage_timer=stage_timer)
+        latency_seconds = time.monotonic() - sent_at
+        stage_timer.mark("ack_wait")
+
+        ack_success = _record_ack(
+            message_body, message_id, ack_response, event_logger, metric_sender, correlation_id_opt, stage_timer
+        )
+        throttler.record_ack(ack_success, latency_seconds)
+        if circuit_breaker is not None:
+            circuit_breaker.record_success()
+        if ack_success and processing_states is not None:
+            processing_states.evict(message)
+        stage_timer.mark("record")
+        return ack_success
+
+    except (TimeoutError, ConnectionError) as e:
+        stage_timer.mark("ack_wait")
+        throttler.record_ack(False)
+        if circuit_breaker is not None:
+            circuit_breaker.record_failure()
+        _log_send_failed(message_body, message_id, e, event_logger, correlation_id_opt)
+        stage_timer.mark("record")
+        return False
+
+    except Exception as e:
+        _log_unexpected_error(message_body, e, event_logger, correlation_id_opt)
+        return False
+
+    finally:
+        stage_timer.finish()
+
+
+def _process_message_window(
+    messages: Sequence[ServiceBusMessage],
+    hl7_sender_client: HL7SenderClient,
+    event_logger: EventLogger,
+    metric_sender: MetricSender,
+    throttler: MessageThrottler,
+    message_store_client: MessageStoreClient,
+    session_id: str,
+    window_size: int,
+    circuit_breaker: CircuitBreaker | None = None,
+    batch_scheduler: BatchScheduler | None = None,
+    processing_states: ProcessingStateCache | None = None,
+) -> int:
+    """
+    Send a batch of messages with up to ``window_size`` awaiting an ACK, and return how many leading ones succeeded.
+
+    Each message is audited and stored as _process_message does, then they are all sent on one connection so the
+    receiver still gets them in order. Messages from the first failure on are abandoned and redelivered in order,
+    including any after it that were already sent.
+
+    With ``batch_scheduler``, the window's throughput is recorded as its ACKs arrive, and once the rest of the batch
+    is not expected to finish inside the lock window no more messages are sent. Once the ones already sent are
+    acknowledged, ReleaseMessages is raised with them as handled, so the rest go back to Service Bus.
+
+    Each message is timed as _process_message times it, with the time it spent waiting for the connection and for
+    room in the window as the "queue" stage.
+    """
+    prepared: list[tuple[str, str, str | None]] = []
+    stage_timers: list[StageTimer] = []
+    try:
+        for message in messages:
+            stage_timer = StageTimer(metric_sender)
+            stage_timers.append(stage_timer)
+            message_body, metadata, correlation_id_opt = _read_message(message)
+            try:
+                message_id = _prepare_message(
+                    message, message_body, metadata, event_logger, message_store_client, session_id,
+                    processing_states, stage_timer,
+                )
+            except Exception as e:
+                _log_unexpected_error(message_body, e, event_logger, correlation_id_opt)
+                break
+            stage_timer.mark("prepare")
+            prepared.append((message_body, message_id, correlation_id_opt))
+
+        if not prepared:
+            return 0
+
+        first_body, first_id, first_correlation_id = prepared[0]
+        released: list[ReleaseMessages] = []
+        sent_count = 1
+        recorded = 0
+        recorded_at = time.monotonic()
+
+        def record_throughput(acknowledged: int) -> None:
+            nonlocal recorded, recorded_at
+            if batch_scheduler is None or acknowledged <= recorded:
+                return
+            now = time.monotonic()
+            # Messages in a window overlap, so the window's throughput is what decides how many fit in the lock window.
+            batch_scheduler.record_messages(acknowledged - recorded, now - recorded_at)
+            recorded, recorded_at = acknowledged, now
+
+        def keep_sending(acknowledged: int) -> bool:
+            nonlocal sent_count
+            record_throughput(acknowledged)
+            if batch_scheduler is not None:
+                try:
+                    batch_scheduler.check_lock_window()
+                except ReleaseMessages as e:
+                    released.append(e)
+                    return False
+            sent_count += 1
+            return True
+
+        if batch_scheduler is not None:
+            batch_scheduler.start_batch(len(prepared))
+        try:
+            acks = hl7_sender_client.send_messages_windowed(
+                [(message_id, message_body) for message_body, message_id, _ in prepared],
+                window_size,
+                before_send=throttler.wait_if_needed,
+                stage_timers=stage_timers[:len(prepared)],
+                keep_sending=keep_sending if batch_scheduler is not None else None,
+            )
+        except (TimeoutError, ConnectionError) as e:
+            stage_timers[0].mark("ack_wait")
+            throttler.record_ack(False)
+            if circuit_breaker is not None:
+                circuit_breaker.record_failure()
+            _log_send_failed(first_body, first_id, e, event_logger, first_correlation_id)
+            stage_timers[0].mark("record")
+            return 0
+        except Exception as e:
+            _log_unexpected_error(first_body, e, event_logger, first_correlation_id)
+            return 0
+
+        record_throughput(len(acks))
+        if circuit_breaker is not None:
+            circuit_breaker.record_success()
+        for index, ack_response in enumerate(acks):
+            message_body, message_id, correlation_id_opt = prepared[index]
+            stage_timer = stage_timers[index]
+            # The time since its ACK arrived was spent recording the messages before it.
+            stage_timer.mark("queue")
+            try:
+                ack_success = _record_ack(
+                    message_body, message_id, ack_response, event_logger, metric_sender, correlation_id_opt,
+                    stage_timer,
+                )
+            except Exception as e:
+                _log_unexpected_error(message_body, e, event_logger, correlation_id_opt)
+                return index
+            # ACK latency is not measured per message in a window, so only the outcome adjusts the rate.
+            throttler.record_ack(ack_success)
+            if ack_success and processing_states is not None:
+                processing_states.evict(messages[index])
+            stage_timer.mark("record")
+            if not ack_success:
+                return index
+
+        if released and len(acks) == sent_count:
+            raise ReleaseMessages(str(released[0]), handled=len(acks))
+        if len(acks) < len(prepared):
+            throttler.record_ack(False)
+            if circuit_breaker is not None:
+                circuit_breaker.record_failure()
+            message_body, message_id, correlation_id_opt = prepared[len(acks)]
+            _log_send_failed(
+                message_body,
+                message_id,
+                ConnectionError("no ACK received before the connection failed"),
+                event_logger,
+                correlation_id_opt,
+            )
+        return len(acks)
+
+    finally:
+        for stage_timer in stage_timers:
+            stage_timer.finish()
+
+
+def _read_message(message: ServiceBusMessage) -> tuple[str, dict[str, str] | None, str | None]:
     message_body = b"".join(message.body).decode("utf-8")
     metadata: dict[str, str] | None = extract_metadata(message)
     meta = get_metadata_log_values(metadata)
-    correlation_id_opt = correlation_id_for_logger(meta)
     logger.info(
         "Message received for HL7 sending - CorrelationId: %s, WorkflowID: %s, SourceSystem: %s, MessageReceivedAt: %s",
         meta["correlation_id"],
@@ -135,68 +414,165 @@ def _process_message(
         meta["source_system"],
         meta["message_received_at"],
     )
+    return message_body, metadata, correlation_id_for_logger(meta)
 
-    try:
-        event_logger.log_message_received(
-            message_body, "Message received for HL7 sending", correlation_id=correlation_id_opt
-        )
 
-        hl7_msg = parse_message(message_body)
-        msh_segment = hl7_msg.msh
-        message_id = msh_segment.msh_10.value
-        logger.info(f"Message ID: {message_id}")
+def _prepare_message(
+    message: ServiceBusMessage,
+    message_body: str,
+    metadata: dict[str, str] | None,
+    event_logger: EventLogger,
+    message_store_client: MessageStoreClient,
+    session_id: str,
+    processing_states: ProcessingStateCache | None = None,
+    stage_timer: StageTimer | None = None,
+) -> str:
+    """
+    Audit the received message, store it on its first delivery and return its message control id.
+
+    With ``processing_states``, a redelivery within this process reuses what its earlier delivery worked out, and
+    retries the message store send if that delivery's send failed. A message released unprepared on its first
+    delivery is stored on its redelivery. With ``stage_timer``, the message store send is
+    marked as the "store" stage and the time before it as "prepare".
+    """
+    meta = get_metadata_log_values(metadata)
+    event_logger.log_message_received(
+        message_body, "Message received for HL7 sending", correlation_id=correlation_id_for_logger(meta)
+    )
 
-        if _is_first_delivery_attempt(message):
-            _send_to_message_store(message_store_client, event_logger, message_body, metadata, session_id)
+    state = processing_states.get(message) if processing_states is not None else None
+    if state is None:
+        state = ProcessingState(_read_message_control_id(message_body))
+        released = processing_states is not None and processing_states.pop_released(message)
+        if released or _is_first_delivery_attempt(message):
+            state.xml_payload = _convert_for_message_store(event_logger, message_body, metadata)
         else:
-            logger.info(
-                "Skipping message store send on retry attempt - CorrelationId: %s, DeliveryCount: %s",
-                meta["correlation_id"],
-                getattr(message, "delivery_count", "N/A"),
-            )
+            # The first delivery was handled before this process saw the message, and stored it then.
+            state.stored = True
+        if processing_states is not None:
+            processing_states.put(message, state)
+
+    message_id = state.message_control_id
+    logger.info(f"Message ID: {message_id}")
+
+    if not state.stored:
+        if stage_timer is not None:
+            stage_timer.mark("prepare")
+        state.stored = _send_to_message_store(
+            message_store_client, message_body, metadata, session_id, state.xml_payload
+        )
+        if stage_timer is not None:
+            stage_timer.mark("store")
+    else:
+        logger.info(
+            "Skipping message store send on retry attempt - CorrelationId: %s, DeliveryCount: %s",
+            meta["correlation_id"],
+            getattr(message, "delivery_count", "N/A"),
+        )
+    return message_id
+
+
+def _read_message_control_id(message_body: str) -> str:
+    """
+    Read MSH-10 from the raw ER7, without parsing the rest of the message.
+
+    The message is checked as far as hl7apy would reject it when parsing: the MSH segment must come first with valid
+    encoding characters and a supported version, and every segment must start with a valid segment name. Anything
+    else raises ValueError, so a malformed message is never sent on.
+    """
+    segments = [segment for segment in SEGMENT_SEPARATORS.split(message_body.strip()) if segment]
+    header = segments[0] if segments else ""
+    if not header.startswith("MSH") or len(header) < 4:
+        raise ValueError("Message does not start with an MSH segment")
+    field_separator = header[3]
+    fields = header.split(field_separator)
+    encoding_chars = fields[1] if len(fields) > 1 else ""
+    if (
+        len(encoding_chars) != 4
+        or len(set(field_separator + encoding_chars)) != 5
+        or any(char.isalnum() for char in field_separator + encoding_chars)
+    ):
+        raise ValueError(f"MSH segment has invalid encoding characters: {encoding_chars!r}")
+    if len(fields) < 10:
+        raise ValueError("MSH segment has no MSH-10 message control id")
+    version = fields[11].split(encoding_chars[0], 1)[0] if len(fields) > 11 else ""
+    if version:
+        try:
+            check_version(version)
+        except UnsupportedVersion as e:
+            raise ValueError(str(e)) from e
+    for segment in segments[1:]:
+        if not SEGMENT_NAME.fullmatch(segment[:3]) or segment[3:4] not in ("", field_separator):
+            raise ValueError(f"Invalid segment: {segment[:10]!r}")
+    return fields[9]
 
-        throttler.wait_if_needed()
-        ack_response = hl7_sender_client.send_message(message_body)
 
-        ack_success = get_ack_result(ack_response)
+def _record_ack(
+    message_body: str,
+    message_id: str,
+    ack_response: str,
+    event_logger: EventLogger,
+    metric_sender: MetricSender,
+    correlation_id_opt: str | None,
+    stage_timer: StageTimer | None = None,
+) -> bool:
+    ack_success = get_ack_result(ack_response)
+    if stage_timer is not None:
+        stage_timer.mark("ack_parse")
 
-        if ack_success:
-            metric_sender.send_message_sent_metric()
+    if ack_success:
+        metric_sender.send_message_sent_metric()
 
-        event_logger.log_message_processed(
-            message_body,
-            f"Message sent successfully, received ACK: {ack_response}",
-            correlation_id=correlation_id_opt,
-        )
-        logger.info(f"Sent message: {message_id}")
+    event_logger.log_message_processed(
+        message_body,
+        f"Message sent successfully, received ACK: {ack_response}",
+        correlation_id=correlation_id_opt,
+    )
+    logger.info(f"Sent message: {message_id}")
 
-        return ack_success
+    return ack_success
 
-    except (TimeoutError, ConnectionError) as e:
-        error_msg = f"Failed to send message {message_id}: {e}"
-        logger.error(error_msg)
 
-        event_logger.log_message_failed(
-            message_body,
-            error_msg,
-            "Message sending failed - connection/timeout error",
-            correlation_id=correlation_id_opt,
-        )
+def _log_send_failed(
+    message_body: str,
+    message_id: str,
+    error: Exception,
+    event_logger: EventLogger,
+    correlation_id_opt: str | None,
+) -> None:
+    error_msg = f"Failed to send message {message_id}: {error}"
+    logger.error(error_msg)
+
+    event_logger.log_message_failed(
+        message_body,
+        error_msg,
+        "Message sending failed - connection/timeout error",
+        correlation_id=correlation_id_opt,
+    )
 
-        return False
 
-    except Exception as e:
-        error_msg = f"Unexpected error while processing message: {e}"
-        logger.error(error_msg)
+def _log_unexpected_error(
+    message_body: str,
+    error: Exception,
+    event_logger: EventLogger,
+    correlation_id_opt: str | None,
+) -> None:
+    error_msg = f"Unexpected error while processing message: {error}"
+    logger.error(error_msg)
+
+    event_logger.log_message_failed(
+        message_body,
+        error_msg,
+        "Unexpected processing error",
+        correlation_id=correlation_id_opt,
+    )
 
-        event_logger.log_message_failed(
-            message_body,
-            error_msg,
-            "Unexpected processing error",
-            correlation_id=correlation_id_opt,
-        )
 
-        return False
+def _mark_released(processing_states: ProcessingStateCache, messages: Sequence[ServiceBusMessage]) -> None:
+    """Mark messages released on their first delivery, whose redelivery must still store them."""
+    for message in messages:
+        if _is_first_delivery_attempt(message):
+            processing_states.mark_released(message)
 
 
 def _is_first_delivery_attempt(message: ServiceBusMessage) -> bool:
@@ -207,30 +583,36 @@ def _is_first_delivery_attempt(message: ServiceBusMessage) -> bool:
         return True
 
 
+def _convert_for_message_store(
+    event_logger: EventLogger,
+    message_body: str,
+    metadata: dict[str, str] | None,
+) -> str | None:
+    """Convert a message to the XML payload for the message store, or return None if it cannot be converted."""
+    try:
+        return convert_er7_to_xml(message_body)
+    except Exception as e:
+        error_msg = f"Failed to generate XML payload for message store: {e}"
+        logger.error(error_msg)
+        event_logger.log_validation_result(
+            message_body,
+            error_msg,
+            is_success=False,
+            correlation_id=(metadata or {}).get(CORRELATION_ID_KEY, ""),
+        )
+        return None
+
+
 def _send_to_message_store(
     message_store_client: MessageStoreClient,
-    event_logger: EventLogger,
     message_body: str,
     metadata: dict[str, str] | None,
     session_id: str,
-) -> None:
-    """Send a message to the message store queue with XML payload."""
+    xml_payload: str | None,
+) -> bool:
+    """Send a message to the message store queue with XML payload, returning whether it was sent."""
     try:
         incoming_metadata = metadata or {}
-
-        xml_payload: str | None = None
-        try:
-            xml_payload = convert_er7_to_xml(message_body)
-        except Exception as e:
-            error_msg = f"Failed to generate XML payload for message store: {e}"
-            logger.error(error_msg)
-            event_logger.log_validation_result(
-                message_body,
-                error_msg,
-                is_success=False,
-                correlation_id=incoming_metadata.get(CORRELATION_ID_KEY, ""),
-            )
-
         message_store_client.send_to_store(
             message_received_at=incoming_metadata.get(MESSAGE_RECEIVED_AT_KEY, ""),
             correlation_id=incoming_metadata.get(CORRELATION_ID_KEY, ""),
@@ -239,8 +621,10 @@ def _send_to_message_store(
             session_id=session_id,
             xml_payload=xml_payload,
         )
+        return True
     except Exception as e:
         logger.error("Failed to send to message store: %s", e)
+        return False
 
 
 if __name__ == "__main__":
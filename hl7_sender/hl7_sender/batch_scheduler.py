@@ -0,0 +1,104 @@
+import logging
+import time
+from typing import Optional
+
+from message_bus_lib.message_receiver_client import ReleaseMessages
+from processor_manager_lib import MessageThrottler
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_MINUTE = 60
+
+
+class BatchScheduler:
+    """
+    Sizes each receive from a moving estimate of how long a message takes to send and acknowledge.
+
+    The estimate is an exponentially weighted average of the time each message took, throttle waits included, and
+    is never below the throttle's current interval. Batches are sized to take ``TARGET_FRACTION`` of
+    ``lock_window_seconds``, so they finish well inside the lock window even if latency rises part way through. Until
+    a message has been timed, batches are ``initial_batch_size``.
+
+    If latency rises so far that the rest of a batch is no longer expected to finish inside the window,
+    check_lock_window raises ReleaseMessages, so those messages go back to Service Bus before their locks run out.
+    The first message of a batch is always sent, so a batch always makes progress.
+    """
+
+    SMOOTHING = 0.3
+    TARGET_FRACTION = 0.5
+
+    def __init__(
+        self,
+        lock_window_seconds: float,
+        max_batch_size: int,
+        throttler: MessageThrottler,
+        initial_batch_size: Optional[int] = None,
+    ):
+        if lock_window_seconds <= 0:
+            raise ValueError("lock_window_seconds must be positive")
+        self.lock_window_seconds = lock_window_seconds
+        self.max_batch_size = max_batch_size
+        self.throttler = throttler
+        self.initial_batch_size = initial_batch_size or max_batch_size
+        self._average_seconds: Optional[float] = None
+        self._batch_started_at: Optional[float] = None
+        self._batch_remaining = 0
+        self._batch_sent = 0
+
+    @property
+    def seconds_per_message(self) -> Optional[float]:
+        """The estimated time to send and acknowledge one message, or None until a message has been timed."""
+        if self._average_seconds is None:
+            return None
+        messages_per_minute = self.throttler.messages_per_minute
+        throttle_interval = SECONDS_PER_MINUTE / messages_per_minute if messages_per_minute else 0.0
+        return max(self._average_seconds, throttle_interval)
+
+    def batch_size(self) -> int:
+        seconds_per_message = self.seconds_per_message
+        if seconds_per_message is None:
+            return self.initial_batch_size
+        if seconds_per_message <= 0:
+            return self.max_batch_size
+        fitting = int(self.lock_window_seconds * self.TARGET_FRACTION // seconds_per_message)
+        return max(1, min(self.max_batch_size, fitting))
+
+    def start_batch(self, message_count: int) -> None:
+        """Start timing a batch of ``message_count`` received messages."""
+        self._batch_started_at = time.monotonic()
+        self._batch_remaining = message_count
+        self._batch_sent = 0
+        logger.debug(
+            "Received %d message(s), estimated %s seconds per message",
+            message_count,
+            self.seconds_per_message,
+        )
+
+    def check_lock_window(self) -> None:
+        """Raise ReleaseMessages if the rest of the batch is not expected to finish inside the lock window."""
+        seconds_per_message = self.seconds_per_message
+        if self._batch_started_at is None or self._batch_sent == 0 or seconds_per_message is None:
+            return
+        elapsed = time.monotonic() - self._batch_started_at
+        expected_finish = elapsed + self._batch_remaining * seconds_per_message
+        if expected_finish > self.lock_window_seconds:
+            raise ReleaseMessages(
+                f"{self._batch_remaining} message(s) would take until {expected_finish:.0f}s, past the "
+                f"{self.lock_window_seconds:.0f}s lock window, at {seconds_per_message:.2f}s per message"
+            )
+
+    def record_message(self, seconds: float) -> None:
+        """Record the time one message took to send and acknowledge."""
+        self.record_messages(1, seconds)
+
+    def record_messages(self, count: int, seconds: float) -> None:
+        """Record the time ``count`` messages sent together took."""
+        if count <= 0:
+            return
+        self._batch_sent += count
+        self._batch_remaining = max(0, self._batch_remaining - count)
+        sample = seconds / count
+        if self._average_seconds is None:
+            self._average_seconds = sample
+        else:
+            self._average_seconds += self.SMOOTHING * (sample - self._average_seconds)
@@ -1,42 +1,71 @@
+from __future__ import annotations
+
 import logging
-import os
-import select
 import socket
-from typing import Any, Optional, Type
+import time
+from itertools import takewhile
+from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence, Type
 
-from hl7.client import MLLPClient
+from hl7.client import CR, EB, SB, MLLPClient
 from hl7apy.consts import MLLP_ENCODING_CHARS
+from mllp_lib import is_socket_closed
+
+if TYPE_CHECKING:
+    from mllp_lib import MLLPConnectionPool
+    from processor_manager_lib import StageTimer
 
 logger = logging.getLogger(__name__)
 ENCODING_CHARS = MLLP_ENCODING_CHARS.SB + MLLP_ENCODING_CHARS.EB + MLLP_ENCODING_CHARS.CR
-WINDOWS_OS = "nt"
-
-
-def is_socket_closed(sock: socket.socket) -> bool:
-    try:
-        # Check if the socket is readable (may indicate data or EOF)
-        readable, _, _ = select.select([sock], [], [], 0)
-        if readable:
-            # this will try to read bytes without blocking and also without removing them from buffer (peek only)
-            flags = socket.MSG_PEEK if os.name == WINDOWS_OS else socket.MSG_DONTWAIT | socket.MSG_PEEK
-            data = sock.recv(16, flags)
-            return len(data) == 0
-        return False  # no data, but socket is fine
-    except BlockingIOError:
-        return False  # socket is open and reading from it would block
-    except ConnectionResetError:
-        return True  # socket was closed for some other reason
-    except Exception:
-        logger.exception("unexpected exception when checking if a socket is closed")
-        return False
+
+
+def _read_mllp_frame(sock: socket.socket, buffer: bytes, deadline: Optional[float] = None) -> tuple[bytes, bytes]:
+    """
+    Read from *sock* until *buffer* holds a whole MLLP frame; return the frame and the bytes after it.
+
+    With ``deadline``, a ``time.monotonic()`` time, socket.timeout is raised once it passes, however many reads the
+    frame takes.
+    """
+    while (end := buffer.find(EB + CR)) < 0:
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise socket.timeout("timed out")
+            sock.settimeout(remaining)
+        data = sock.recv(4096)
+        if not data:
+            raise ConnectionError("Connection closed by the receiver before an ACK was received")
+        buffer += data
+    return buffer[:end], buffer[end + len(EB + CR):]
+
+
+def _acknowledged_control_id(ack: str) -> str:
+    """Return MSA-2 of an ER7 ACK, the control id of the message it acknowledges, or "" if there is none."""
+    field_separator = ack[3:4]
+    for segment in ack.split("\r"):
+        if segment.startswith("MSA") and field_separator:
+            fields = segment.split(field_separator)
+            if len(fields) > 2:
+                return fields[2]
+    return ""
+
 
 class HL7SenderClient:
 
-    def __init__(self, receiver_mllp_hostname: str, receiver_mllp_port: int, ack_timeout_seconds: int):
+    def __init__(
+        self,
+        receiver_mllp_hostname: str,
+        receiver_mllp_port: int,
+        ack_timeout_seconds: int,
+        pool: Optional[MLLPConnectionPool] = None,
+    ):
         self.receiver_mllp_hostname = receiver_mllp_hostname
         self.receiver_mllp_port = receiver_mllp_port
         self.ack_timeout_seconds = ack_timeout_seconds
-        self.mllp_client: MLLPClient = self._create_mllp_client()
+        # With a pool, connections are taken from it for each send and its background prober checks them, so
+        # there is no per-send socket check and no connection of this client's own.
+        self.pool = pool
+        if pool is None:
+            self.mllp_client: MLLPClient = self._create_mllp_client()
 
     def _close_mllp_client(self) -> None:
         try:
@@ -53,10 +82,23 @@ class HL7SenderClient:
         self._close_mllp_client()
         return self._create_mllp_client()
 
-    def send_message(self, message: str, _retry_attempted: bool = False) -> str:
+    def send_message(
+        self, message: str, _retry_attempted: bool = False, stage_timer: Optional[StageTimer] = None
+    ) -> str:
+        """
+        Send ``message`` and return its ACK.
+
+        With ``stage_timer``, the time until a connection is ready is marked as the "connect" stage. The caller marks
+        the rest, writing the message and waiting for its ACK.
+        """
+        if self.pool is not None:
+            return self._send_pooled_message(self.pool, message, _retry_attempted, stage_timer)
+
         if is_socket_closed(self.mllp_client.socket):
             logger.info("creating new MLLP client connection")
             self.mllp_client = self._close_and_create_new_mllp_client()
+        if stage_timer is not None:
+            stage_timer.mark("connect")
 
         try:
             ack_response = self.mllp_client.send_message(message).decode("utf-8")
@@ -65,15 +107,183 @@ class HL7SenderClient:
         except socket.timeout:
             if not _retry_attempted:
                 logger.warning("Socket timeout occurred, attempting retry with new connection...")
+                if stage_timer is not None:
+                    stage_timer.mark("ack_wait")
                 self.mllp_client = self._close_and_create_new_mllp_client()
-                return self.send_message(message, _retry_attempted=True)
+                return self.send_message(message, _retry_attempted=True, stage_timer=stage_timer)
             self._close_mllp_client()
             raise TimeoutError(f"No ACK received within {self.ack_timeout_seconds} seconds")
         except Exception as e:
             self.mllp_client = self._close_and_create_new_mllp_client()
             raise ConnectionError(f"Connection error while sending message: {e}")
 
-    def __enter__(self) -> "HL7SenderClient":
+    def _send_pooled_message(
+        self,
+        pool: MLLPConnectionPool,
+        message: str,
+        retry_attempted: bool,
+        stage_timer: Optional[StageTimer] = None,
+    ) -> str:
+        try:
+            mllp_client = pool.acquire()
+        except Exception as e:
+            raise ConnectionError(f"Connection error while sending message: {e}")
+        if stage_timer is not None:
+            stage_timer.mark("connect")
+
+        try:
+            ack_response = mllp_client.send_message(message).decode("utf-8")
+        except socket.timeout:
+            pool.discard(mllp_client)
+            if not retry_attempted:
+                logger.warning("Socket timeout occurred, attempting retry with new connection...")
+                if stage_timer is not None:
+                    stage_timer.mark("ack_wait")
+                return self._send_pooled_message(pool, message, True, stage_timer)
+            raise TimeoutError(f"No ACK received within {self.ack_timeout_seconds} seconds")
+        except Exception as e:
+            pool.discard(mllp_client)
+            raise ConnectionError(f"Connection error while sending message: {e}")
+
+        if not ack_response:
+            # The receiver closed the connection between probes, so the message may not have been read.
+            pool.discard(mllp_client)
+            raise ConnectionError("Connection closed by the receiver before an ACK was received")
+        pool.release(mllp_client)
+        return ack_response.strip(ENCODING_CHARS)
+
+    def send_messages_windowed(
+        self,
+        messages: Sequence[tuple[str, str]],
+        window_size: int,
+        before_send: Optional[Callable[[], None]] = None,
+        stage_timers: Optional[Sequence[StageTimer]] = None,
+        keep_sending: Optional[Callable[[int], bool]] = None,
+    ) -> list[str]:
+        """
+        Send messages on one connection with up to ``window_size`` of them waiting for an ACK at once.
+
+        ``messages`` are (message control id, ER7) pairs, sent in order. ACKs are matched to messages by MSA-2, so the
+        receiver may answer them in any order. An ACK whose MSA-2 matches no waiting message, such as a rejection
+        with an empty MSA-2, is taken as the ACK for the oldest waiting message. A message is not sent while another
+        with the same control id is waiting, and none waits longer than ``ack_timeout_seconds`` for its ACK.
+        ``before_send`` is called before each message is written, for throttling.
+
+        ``keep_sending`` is called before each message after the first with the number of ACKs received so far. Once
+        it returns False no more messages are sent, and the ACKs for those already sent are still awaited.
+
+        With ``stage_timers``, one for each message, a message's wait for the connection and for room in the window
+        is marked as its "queue" stage, ``before_send`` as "throttle" and the time until its ACK as "ack_wait".
+
+        Returns the ACKs, stripped as send_message strips them, for the longest leading run of acknowledged messages.
+        Without a failure, that is every message sent.
+        A timeout or connection failure ends the run early and the connection is replaced. TimeoutError or
+        ConnectionError is raised only if the first message was not acknowledged.
+        """
+        acks: list[Optional[str]] = [None] * len(messages)
+        sent_at: list[float] = [0.0] * len(messages)
+        in_flight: dict[str, int] = {}
+        buffer = b""
+        next_index = 0
+        end_index = len(messages)
+        received = 0
+        try:
+            mllp_client = self._acquire_mllp_client()
+        except Exception as e:
+            raise ConnectionError(f"Connection error while sending message: {e}")
+
+        error: Exception
+        try:
+            while next_index < end_index or in_flight:
+                while (
+                    next_index < end_index
+                    and len(in_flight) < window_size
+                    and messages[next_index][0] not in in_flight
+                ):
+                    if next_index > 0 and keep_sending is not None and not keep_sending(received):
+                        end_index = next_index
+                        break
+                    control_id, er7 = messages[next_index]
+                    if stage_timers is not None:
+                        stage_timers[next_index].mark("queue")
+                    if before_send is not None:
+                        before_send()
+                    if stage_timers is not None:
+                        stage_timers[next_index].mark("throttle")
+                    mllp_client.socket.sendall(SB + er7.encode(mllp_client.encoding) + EB + CR)
+                    sent_at[next_index] = time.monotonic()
+                    in_flight[control_id] = next_index
+                    next_index += 1
+                if not in_flight:
+                    break
+
+                # Messages are sent in order, so the one with the lowest index has waited longest.
+                oldest_id = min(in_flight, key=in_flight.__getitem__)
+                deadline = sent_at[in_flight[oldest_id]] + self.ack_timeout_seconds
+                frame, buffer = _read_mllp_frame(mllp_client.socket, buffer, deadline)
+                ack = frame.decode("utf-8").strip(ENCODING_CHARS)
+                index = in_flight.pop(_acknowledged_control_id(ack), None)
+                if index is None:
+                    # Receivers that do not echo MSA-2 answer in order, as does one rejecting a message it could not
+                    # read the control id of.
+                    if len(in_flight) > 1:
+                        logger.warning("ACK matches no message waiting for one, taking it for %s: %s", oldest_id, ack)
+                    index = in_flight.pop(oldest_id)
+                acks[index] = ack
+                received += 1
+                if stage_timers is not None:
+                    stage_timers[index].mark("ack_wait")
+        except socket.timeout:
+            error = TimeoutError(f"No ACK received within {self.ack_timeout_seconds} seconds")
+        except Exception as e:
+            error = ConnectionError(f"Connection error while sending message: {e}")
+        else:
+            mllp_client.socket.settimeout(self.ack_timeout_seconds)
+            self._release_mllp_client(mllp_client)
+            return [ack for ack in acks if ack is not None]
+
+        self._discard_mllp_client(mllp_client)
+        acknowledged = [ack for ack in takewhile(lambda ack: ack is not None, acks) if ack is not None]
+        if not acknowledged:
+            raise error
+        logger.warning(
+            "Windowed send stopped after %d of %d acknowledged message(s): %s", len(acknowledged), len(messages), error
+        )
+        return acknowledged
+
+    def _acquire_mllp_client(self) -> MLLPClient:
+        if self.pool is not None:
+            return self.pool.acquire()
+        if is_socket_closed(self.mllp_client.socket):
+            logger.info("creating new MLLP client connection")
+            self.mllp_client = self._close_and_create_new_mllp_client()
+        return self.mllp_client
+
+    def _release_mllp_client(self, mllp_client: MLLPClient) -> None:
+        if self.pool is not None:
+            self.pool.release(mllp_client)
+
+    def _discard_mllp_client(self, mllp_client: MLLPClient) -> None:
+        if self.pool is not None:
+            self.pool.discard(mllp_client)
+            return
+        try:
+            self.mllp_client = self._close_and_create_new_mllp_client()
+        except Exception as e:
+            logger.error(f"Error reconnecting after a failed send: {e}")
+
+    def check_connection(self) -> bool:
+        """Return whether a connection to the receiver can be opened, without sending anything on it."""
+        try:
+            socket.create_connection(
+                (self.receiver_mllp_hostname, self.receiver_mllp_port), timeout=self.ack_timeout_seconds
+            ).close()
+        except OSError as e:
+            logger.debug(f"Connection check failed: {e}")
+            return False
+        return True
+
+    def __enter__(self) -> HL7SenderClient:
         return self
 
     def __exit__(
@@ -82,4 +292,5 @@ class HL7SenderClient:
         exc_val: Optional[BaseException],
         exc_tb: Optional[Any],
     ) -> None:
-        self.mllp_client.close()
+        if self.pool is None:
+            self.mllp_client.close()
@@ -0,0 +1,85 @@
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from azure.servicebus import ServiceBusMessage
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProcessingState:
+    """What has already been worked out for a message, kept across its redeliveries."""
+
+    message_control_id: str
+    xml_payload: Optional[str] = None
+    stored: bool = False
+
+
+class ProcessingStateCache:
+    """
+    Keeps each message's ProcessingState while it is redelivered to this process.
+
+    Entries are keyed by Service Bus message ID, which stays the same across redeliveries while the delivery count
+    goes up. A message that was negatively acknowledged or timed out comes back with its state, so its control ID
+    is not read again, and a message store send that failed is retried without converting the message to XML again.
+    Entries are evicted once the message is completed, and the least recently used are dropped beyond
+    ``max_entries``, so messages that are dead-lettered or locked by another instance do not accumulate.
+
+    Messages released back to Service Bus before they were prepared are marked, with the same limit, so their
+    redelivery is still treated as a first delivery although Service Bus counted the release as a delivery.
+
+    Messages without a message ID are never cached.
+    """
+
+    def __init__(self, max_entries: int = 1000):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._states: OrderedDict[str, ProcessingState] = OrderedDict()
+        self._released: OrderedDict[str, None] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def get(self, message: ServiceBusMessage) -> Optional[ProcessingState]:
+        """Return the state kept for an earlier delivery of ``message``, if there is one."""
+        key = message.message_id
+        if key is None or key not in self._states:
+            return None
+        self._states.move_to_end(key)
+        return self._states[key]
+
+    def put(self, message: ServiceBusMessage, state: ProcessingState) -> None:
+        key = message.message_id
+        if key is None:
+            return
+        self._states[key] = state
+        self._states.move_to_end(key)
+        while len(self._states) > self.max_entries:
+            evicted, _ = self._states.popitem(last=False)
+            logger.debug("Dropped processing state for message %s to stay within %d entries", evicted, self.max_entries)
+
+    def mark_released(self, message: ServiceBusMessage) -> None:
+        """Mark ``message`` as handed back to Service Bus before anything was done with it."""
+        key = message.message_id
+        if key is None or key in self._states:
+            return
+        self._released[key] = None
+        self._released.move_to_end(key)
+        while len(self._released) > self.max_entries:
+            self._released.popitem(last=False)
+
+    def pop_released(self, message: ServiceBusMessage) -> bool:
+        """Return whether ``message`` was marked as released, and clear the mark."""
+        key = message.message_id
+        if key is None or key not in self._released:
+            return False
+        del self._released[key]
+        return True
+
+    def evict(self, message: ServiceBusMessage) -> None:
+        """Forget ``message`` once it has been completed."""
+        if message.message_id is not None:
+            self._states.pop(message.message_id, None)
@@ -39,6 +39,80 @@ class TestAppConfig(unittest.TestCase):
         self.assertEqual(config.health_board, "test health board")
         self.assertEqual(config.peer_service, "test-service")
         self.assertEqual(config.ack_timeout_seconds, 30)
+        self.assertIsNone(config.mllp_pool_size)
+        self.assertEqual(config.throttle_burst, 1)
+        self.assertIsNone(config.min_messages_per_minute)
+        self.assertIsNone(config.circuit_breaker_failure_threshold)
+        self.assertEqual(config.mllp_idle_timeout_seconds, 300)
+        self.assertIsNone(config.mllp_window_size)
+
+    @patch("hl7_sender.app_config.os.getenv")
+    def test_read_env_config_mllp_pool(self, mock_getenv: Mock) -> None:
+        values = {
+            "INGRESS_QUEUE_NAME": "ingress_queue",
+            "INGRESS_SESSION_ID": "ingress_session",
+            "RECEIVER_MLLP_HOST": "localhost",
+            "RECEIVER_MLLP_PORT": "1234",
+            "MESSAGE_STORE_QUEUE_NAME": "messagestore-queue",
+            "WORKFLOW_ID": "test-workflow",
+            "MICROSERVICE_ID": "test-microservice",
+            "HEALTH_BOARD": "test health board",
+            "PEER_SERVICE": "test-service",
+            "MLLP_POOL_SIZE": "2",
+            "MLLP_IDLE_TIMEOUT_SECONDS": "120",
+            "MLLP_PROBE_INTERVAL_SECONDS": "5",
+            "MLLP_KEEPALIVE_IDLE_SECONDS": "30",
+            "MLLP_WINDOW_SIZE": "8",
+        }
+        mock_getenv.side_effect = values.get
+
+        config = AppConfig.read_env_config()
+
+        self.assertEqual(config.mllp_pool_size, 2)
+        self.assertEqual(config.mllp_idle_timeout_seconds, 120)
+        self.assertEqual(config.mllp_probe_interval_seconds, 5)
+        self.assertEqual(config.mllp_keepalive_idle_seconds, 30)
+        self.assertEqual(config.mllp_window_size, 8)
+
+        values["MLLP_POOL_SIZE"] = "0"
+        with self.assertRaises(ValueError):
+            AppConfig.read_env_config()
+
+    @patch("hl7_sender.app_config.os.getenv")
+    def test_read_env_config_throttle_and_circuit_breaker(self, mock_getenv: Mock) -> None:
+        values = {
+            "INGRESS_QUEUE_NAME": "ingress_queue",
+            "INGRESS_SESSION_ID": "ingress_session",
+            "RECEIVER_MLLP_HOST": "localhost",
+            "RECEIVER_MLLP_PORT": "1234",
+            "MESSAGE_STORE_QUEUE_NAME": "messagestore-queue",
+            "WORKFLOW_ID": "test-workflow",
+            "MICROSERVICE_ID": "test-microservice",
+            "HEALTH_BOARD": "test health board",
+            "PEER_SERVICE": "test-service",
+            "MAX_MESSAGES_PER_MINUTE": "120",
+            "THROTTLE_BURST": "5",
+            "MIN_MESSAGES_PER_MINUTE": "30",
+            "THROTTLE_LATENCY_THRESHOLD_SECONDS": "2",
+            "CIRCUIT_BREAKER_FAILURE_THRESHOLD": "3",
+            "CIRCUIT_BREAKER_PROBE_INTERVAL_SECONDS": "10",
+            "CIRCUIT_BREAKER_PROBE_MESSAGE": "MSH|^~\\&|PROBE",
+        }
+        mock_getenv.side_effect = values.get
+
+        config = AppConfig.read_env_config()
+
+        self.assertEqual(config.max_messages_per_minute, 120)
+        self.assertEqual(config.throttle_burst, 5)
+        self.assertEqual(config.min_messages_per_minute, 30)
+        self.assertEqual(config.throttle_latency_threshold_seconds, 2)
+        self.assertEqual(config.circuit_breaker_failure_threshold, 3)
+        self.assertEqual(config.circuit_breaker_probe_interval_seconds, 10)
+        self.assertEqual(config.circuit_breaker_probe_message, "MSH|^~\\&|PROBE")
+
+        values["THROTTLE_BURST"] = "0"
+        with self.assertRaises(ValueError):
+            AppConfig.read_env_config()
 
     @patch("hl7_sender.app_config.os.getenv")
     def test_read_env_config_missing_required_env_var_raises_error(self, mock_getenv: Mock) -> None:
@@ -1,16 +1,22 @@
 import unittest
-from unittest.mock import MagicMock, Mock, patch
+from typing import Any, Callable
+from unittest.mock import ANY, MagicMock, Mock, patch
 
 from azure.servicebus import ServiceBusMessage
 from hl7apy.core import Message
+from message_bus_lib.message_receiver_client import ReleaseMessages
 
 from hl7_sender.app_config import AppConfig
 from hl7_sender.application import (
     MAX_BATCH_SIZE,
     _calculate_batch_size,
+    _mark_released,
     _process_message,
+    _process_message_window,
+    _read_message_control_id,
     main,
 )
+from hl7_sender.processing_state import ProcessingStateCache
 
 
 def _setup() -> tuple[ServiceBusMessage, Message, str, MagicMock, MagicMock, MagicMock, MagicMock, MagicMock]:
@@ -52,9 +58,8 @@ class TestProcessMessage(unittest.TestCase):
         mock_metric_sender.send_message_sent_metric.assert_not_called()
         self.assertFalse(result)
 
-    @patch("hl7_sender.application.parse_message")
     @patch("hl7_sender.application.get_ack_result")
-    def test_process_message_success(self, mock_ack_processor: Mock, mock_parse_message: Mock) -> None:
+    def test_process_message_success(self, mock_ack_processor: Mock) -> None:
         (
             service_bus_message,
             hl7_message,
@@ -65,7 +70,6 @@ class TestProcessMessage(unittest.TestCase):
             mock_throttler,
             mock_message_store,
         ) = _setup()
-        mock_parse_message.return_value = hl7_message
         hl7_ack_message = "HL7 ack message"
         mock_hl7_sender_client.send_message.return_value = hl7_ack_message
         mock_ack_processor.return_value = True
@@ -80,19 +84,20 @@ class TestProcessMessage(unittest.TestCase):
             TEST_SESSION_ID,
         )
 
-        mock_parse_message.assert_called_once_with(hl7_string)
         mock_ack_processor.assert_called_once_with(hl7_ack_message)
         mock_event_logger.log_message_received.assert_called_once()
         mock_event_logger.log_message_processed.assert_called_once()
         mock_metric_sender.send_message_sent_metric.assert_called_once()
         mock_throttler.wait_if_needed.assert_called_once()
+        mock_throttler.record_ack.assert_called_once()
+        self.assertTrue(mock_throttler.record_ack.call_args.args[0])
+        self.assertGreaterEqual(mock_throttler.record_ack.call_args.args[1], 0)
 
         self.assertTrue(result)
 
-    @patch("hl7_sender.application.parse_message")
     @patch("hl7_sender.application.get_ack_result")
     def test_process_message_success_with_negative_ack(
-        self, mock_ack_processor: Mock, mock_parse_message: Mock
+        self, mock_ack_processor: Mock
     ) -> None:
         (
             service_bus_message,
@@ -104,7 +109,6 @@ class TestProcessMessage(unittest.TestCase):
             mock_throttler,
             mock_message_store,
         ) = _setup()
-        mock_parse_message.return_value = hl7_message
         hl7_ack_message = "HL7 ack message"
         mock_hl7_sender_client.send_message.return_value = hl7_ack_message
         mock_ack_processor.return_value = False
@@ -119,17 +123,16 @@ class TestProcessMessage(unittest.TestCase):
             TEST_SESSION_ID,
         )
 
-        mock_parse_message.assert_called_once_with(hl7_string)
         mock_ack_processor.assert_called_once_with(hl7_ack_message)
         mock_event_logger.log_message_received.assert_called_once()
         mock_event_logger.log_message_processed.assert_called_once()
         mock_metric_sender.send_message_sent_metric.assert_not_called()
         mock_throttler.wait_if_needed.assert_called_once()
+        self.assertFalse(mock_throttler.record_ack.call_args.args[0])
 
         self.assertFalse(result)
 
-    @patch("hl7_sender.application.parse_message")
-    def test_process_message_send_errors(self, mock_parse_message: Mock) -> None:
+    def test_process_message_send_errors(self) -> None:
         error_cases = [
             {"description": "timeout_error", "error": TimeoutError("No ACK received within 30 seconds")},
             {"description": "connection_error", "error": ConnectionError("Connection failed")},
@@ -147,7 +150,6 @@ class TestProcessMessage(unittest.TestCase):
                     mock_throttler,
                     mock_message_store,
                 ) = _setup()
-                mock_parse_message.return_value = hl7_message
                 mock_hl7_sender_client.send_message.side_effect = case["error"]
 
                 result = _process_message(
@@ -162,9 +164,9 @@ class TestProcessMessage(unittest.TestCase):
 
                 self._assert_error_handling(result, mock_event_logger, mock_metric_sender)
                 mock_throttler.wait_if_needed.assert_called_once()
+                mock_throttler.record_ack.assert_called_once_with(False)
 
-    @patch("hl7_sender.application.parse_message")
-    def test_process_message_unexpected_error(self, mock_parse_message: Mock) -> None:
+    def test_process_message_unexpected_error(self) -> None:
         (
             service_bus_message,
             hl7_message,
@@ -175,7 +177,7 @@ class TestProcessMessage(unittest.TestCase):
             mock_throttler,
             mock_message_store,
         ) = _setup()
-        mock_parse_message.side_effect = Exception("Unexpected error")
+        service_bus_message = ServiceBusMessage(body="not an HL7 message")
 
         result = _process_message(
             service_bus_message,
@@ -233,17 +235,17 @@ class TestProcessMessage(unittest.TestCase):
             main()
 
             mock_health_check.assert_called_once_with("localhost", 9000)
+            mock_hl7_sender.assert_called_once_with("test-hostname", 2575, 30, pool=None)
             mock_health_server.start.assert_called_once()
             mock_health_check_ctx.__exit__.assert_called_once()
             mock_factory.return_value.create_message_store_client.assert_called_once_with(
                 "test-messagestore-queue", "test_microservice_id", "test-service"
             )
 
-    @patch("hl7_sender.application.parse_message")
     @patch("hl7_sender.application.get_ack_result")
     @patch("hl7_sender.application.convert_er7_to_xml")
     def test_process_message_sends_to_message_store_before_sending(
-        self, mock_convert_xml: Mock, mock_ack_processor: Mock, mock_parse_message: Mock
+        self, mock_convert_xml: Mock, mock_ack_processor: Mock
     ) -> None:
         (
             service_bus_message,
@@ -255,7 +257,6 @@ class TestProcessMessage(unittest.TestCase):
             mock_throttler,
             mock_message_store,
         ) = _setup()
-        mock_parse_message.return_value = hl7_message
         mock_ack_processor.return_value = True
         mock_convert_xml.return_value = "<xml>content</xml>"
         message_stored = {"value": False}
@@ -281,7 +282,7 @@ class TestProcessMessage(unittest.TestCase):
         )
 
         mock_message_store.send_to_store.assert_called_once()
-        mock_hl7_sender_client.send_message.assert_called_once_with(hl7_string)
+        mock_hl7_sender_client.send_message.assert_called_once_with(hl7_string, stage_timer=ANY)
         call_kwargs = mock_message_store.send_to_store.call_args.kwargs
         self.assertEqual(call_kwargs["raw_payload"], hl7_string)
         self.assertEqual(call_kwargs["xml_payload"], "<xml>content</xml>")
@@ -289,11 +290,10 @@ class TestProcessMessage(unittest.TestCase):
         self.assertIn("correlation_id", call_kwargs)
         self.assertEqual(call_kwargs["session_id"], TEST_SESSION_ID)
 
-    @patch("hl7_sender.application.parse_message")
     @patch("hl7_sender.application.get_ack_result")
     @patch("hl7_sender.application.convert_er7_to_xml")
     def test_message_store_skipped_on_retry_delivery(
-        self, mock_convert_xml: Mock, mock_ack_processor: Mock, mock_parse_message: Mock
+        self, mock_convert_xml: Mock, mock_ack_processor: Mock
     ) -> None:
         (
             service_bus_message,
@@ -306,7 +306,6 @@ class TestProcessMessage(unittest.TestCase):
             mock_message_store,
         ) = _setup()
         service_bus_message.delivery_count = 1  # type: ignore[attr-defined]  # Simulate a retry delivery attempt
-        mock_parse_message.return_value = hl7_message
         mock_hl7_sender_client.send_message.return_value = "ACK"
         mock_ack_processor.return_value = True
         mock_convert_xml.return_value = "<xml/>"
@@ -323,13 +322,12 @@ class TestProcessMessage(unittest.TestCase):
 
         self.assertTrue(result)
         mock_message_store.send_to_store.assert_not_called()
-        mock_hl7_sender_client.send_message.assert_called_once_with(hl7_string)
+        mock_hl7_sender_client.send_message.assert_called_once_with(hl7_string, stage_timer=ANY)
 
-    @patch("hl7_sender.application.parse_message")
     @patch("hl7_sender.application.get_ack_result")
     @patch("hl7_sender.application.convert_er7_to_xml")
     def test_message_store_xml_generation_failure_still_sends(
-        self, mock_convert_xml: Mock, mock_ack_processor: Mock, mock_parse_message: Mock
+        self, mock_convert_xml: Mock, mock_ack_processor: Mock
     ) -> None:
         (
             service_bus_message,
@@ -341,7 +339,6 @@ class TestProcessMessage(unittest.TestCase):
             mock_throttler,
             mock_message_store,
         ) = _setup()
-        mock_parse_message.return_value = hl7_message
         mock_hl7_sender_client.send_message.return_value = "ACK"
         mock_ack_processor.return_value = True
         mock_convert_xml.side_effect = ValueError("Cannot parse")
@@ -367,11 +364,10 @@ class TestProcessMessage(unittest.TestCase):
             correlation_id=call_kwargs.get("correlation_id", ""),
         )
 
-    @patch("hl7_sender.application.parse_message")
     @patch("hl7_sender.application.get_ack_result")
     @patch("hl7_sender.application.convert_er7_to_xml")
     def test_message_store_failure_does_not_block_result(
-        self, mock_convert_xml: Mock, mock_ack_processor: Mock, mock_parse_message: Mock
+        self, mock_convert_xml: Mock, mock_ack_processor: Mock
     ) -> None:
         (
             service_bus_message,
@@ -383,7 +379,6 @@ class TestProcessMessage(unittest.TestCase):
             mock_throttler,
             mock_message_store,
         ) = _setup()
-        mock_parse_message.return_value = hl7_message
         mock_hl7_sender_client.send_message.return_value = "ACK"
         mock_ack_processor.return_value = True
         mock_convert_xml.return_value = "<xml/>"
@@ -402,11 +397,10 @@ class TestProcessMessage(unittest.TestCase):
         self.assertTrue(result)
         mock_event_logger.log_message_processed.assert_called_once()
 
-    @patch("hl7_sender.application.parse_message")
     @patch("hl7_sender.application.get_ack_result")
     @patch("hl7_sender.application.convert_er7_to_xml")
     def test_message_store_forwards_upstream_metadata(
-        self, mock_convert_xml: Mock, mock_ack_processor: Mock, mock_parse_message: Mock
+        self, mock_convert_xml: Mock, mock_ack_processor: Mock
     ) -> None:
         (
             service_bus_message,
@@ -429,7 +423,6 @@ class TestProcessMessage(unittest.TestCase):
             "FlowName": "phw",
         }
 
-        mock_parse_message.return_value = hl7_message
         mock_hl7_sender_client.send_message.return_value = "ACK"
         mock_ack_processor.return_value = True
         mock_convert_xml.return_value = "<xml/>"
@@ -453,6 +446,431 @@ class TestProcessMessage(unittest.TestCase):
         self.assertEqual(call_kwargs["source_system"], "PHW")
         self.assertEqual(call_kwargs["session_id"], TEST_SESSION_ID)
 
+class TestProcessMessageWindow(unittest.TestCase):
+    def setUp(self) -> None:
+        self.hl7_sender_client = MagicMock()
+        self.event_logger = MagicMock()
+        self.metric_sender = MagicMock()
+        self.throttler = MagicMock()
+        self.message_store = MagicMock()
+        self.bodies = []
+        for control_id in ("MSG1", "MSG2", "MSG3"):
+            hl7_message = Message("ADT_A01")
+            hl7_message.msh.msh_10 = control_id
+            self.bodies.append(hl7_message.to_er7())
+
+    def _process(self) -> int:
+        return _process_message_window(
+            [ServiceBusMessage(body=body) for body in self.bodies],
+            self.hl7_sender_client,
+            self.event_logger,
+            self.metric_sender,
+            self.throttler,
+            self.message_store,
+            TEST_SESSION_ID,
+            2,
+        )
+
+    @patch("hl7_sender.application.get_ack_result")
+    def test_all_messages_are_sent_in_one_window_and_audited_in_order(self, mock_ack_processor: Mock) -> None:
+        self.hl7_sender_client.send_messages_windowed.return_value = ["ACK1", "ACK2", "ACK3"]
+        mock_ack_processor.return_value = True
+
+        handled = self._process()
+
+        self.assertEqual(handled, 3)
+        self.hl7_sender_client.send_messages_windowed.assert_called_once_with(
+            [("MSG1", self.bodies[0]), ("MSG2", self.bodies[1]), ("MSG3", self.bodies[2])],
+            2,
+            before_send=self.throttler.wait_if_needed,
+            stage_timers=ANY,
+            keep_sending=None,
+        )
+        self.assertEqual(self.message_store.send_to_store.call_count, 3)
+        self.assertEqual(self.metric_sender.send_message_sent_metric.call_count, 3)
+        self.assertEqual(
+            [call.args for call in self.event_logger.log_message_processed.call_args_list],
+            [
+                (body, f"Message sent successfully, received ACK: ACK{index}")
+                for index, body in enumerate(self.bodies, 1)
+            ],
+        )
+
+    @patch("hl7_sender.application.get_ack_result")
+    def test_window_throughput_is_recorded_on_the_batch_scheduler(self, mock_ack_processor: Mock) -> None:
+        self.hl7_sender_client.send_messages_windowed.return_value = ["ACK1", "ACK2"]
+        mock_ack_processor.return_value = True
+        batch_scheduler = MagicMock()
+
+        _process_message_window(
+            [ServiceBusMessage(body=body) for body in self.bodies],
+            self.hl7_sender_client,
+            self.event_logger,
+            self.metric_sender,
+            self.throttler,
+            self.message_store,
+            TEST_SESSION_ID,
+            2,
+            batch_scheduler=batch_scheduler,
+        )
+
+        batch_scheduler.start_batch.assert_called_once_with(3)
+        self.assertEqual(batch_scheduler.record_messages.call_args.args[0], 2)
+
+    @patch("hl7_sender.application.get_ack_result", return_value=True)
+    def test_rest_of_the_batch_is_released_once_it_would_outlast_the_lock_window(self, _mock_ack: Mock) -> None:
+        batch_scheduler = MagicMock()
+        batch_scheduler.check_lock_window.side_effect = [None, ReleaseMessages("past the lock window")]
+
+        def send_messages_windowed(
+            messages: list[tuple[str, str]], window_size: int, keep_sending: Callable[[int], bool], **kwargs: Any
+        ) -> list[str]:
+            self.assertTrue(keep_sending(0))
+            self.assertFalse(keep_sending(1))
+            return ["ACK1", "ACK2"]
+
+        self.hl7_sender_client.send_messages_windowed.side_effect = send_messages_windowed
+
+        with self.assertRaises(ReleaseMessages) as context:
+            _process_message_window(
+                [ServiceBusMessage(body=body) for body in self.bodies],
+                self.hl7_sender_client,
+                self.event_logger,
+                self.metric_sender,
+                self.throttler,
+                self.message_store,
+                TEST_SESSION_ID,
+                2,
+                batch_scheduler=batch_scheduler,
+            )
+
+        self.assertEqual(context.exception.handled, 2)
+        self.assertEqual(self.event_logger.log_message_processed.call_count, 2)
+        self.event_logger.log_message_failed.assert_not_called()
+        self.assertEqual(sum(c.args[0] for c in batch_scheduler.record_messages.call_args_list), 2)
+
+    @patch("hl7_sender.application.get_ack_result")
+    def test_negative_ack_stops_the_batch_at_that_message(self, mock_ack_processor: Mock) -> None:
+        self.hl7_sender_client.send_messages_windowed.return_value = ["ACK1", "NACK2", "ACK3"]
+        mock_ack_processor.side_effect = [True, False, True]
+
+        handled = self._process()
+
+        self.assertEqual(handled, 1)
+        self.assertEqual(self.event_logger.log_message_processed.call_count, 2)
+        self.metric_sender.send_message_sent_metric.assert_called_once()
+        self.assertEqual([call.args for call in self.throttler.record_ack.call_args_list], [(True,), (False,)])
+
+    @patch("hl7_sender.application.get_ack_result")
+    def test_unacknowledged_message_is_audited_as_a_send_failure(self, mock_ack_processor: Mock) -> None:
+        self.hl7_sender_client.send_messages_windowed.return_value = ["ACK1"]
+        mock_ack_processor.return_value = True
+
+        handled = self._process()
+
+        self.assertEqual(handled, 1)
+        self.event_logger.log_message_failed.assert_called_once()
+        self.assertEqual(self.event_logger.log_message_failed.call_args.args[0], self.bodies[1])
+        self.assertEqual(
+            self.event_logger.log_message_failed.call_args.args[2], "Message sending failed - connection/timeout error"
+        )
+
+    def test_send_failure_handles_no_messages(self) -> None:
+        self.hl7_sender_client.send_messages_windowed.side_effect = TimeoutError("No ACK received")
+
+        handled = self._process()
+
+        self.assertEqual(handled, 0)
+        self.event_logger.log_message_failed.assert_called_once()
+        self.assertEqual(self.event_logger.log_message_failed.call_args.args[0], self.bodies[0])
+
+    @patch("hl7_sender.application.get_ack_result")
+    def test_unparseable_message_ends_the_window_before_it(self, mock_ack_processor: Mock) -> None:
+        self.bodies[1] = "not an HL7 message"
+        self.hl7_sender_client.send_messages_windowed.return_value = ["ACK1"]
+        mock_ack_processor.return_value = True
+
+        handled = self._process()
+
+        self.assertEqual(handled, 1)
+        self.hl7_sender_client.send_messages_windowed.assert_called_once_with(
+            [("MSG1", self.bodies[0])], 2, before_send=self.throttler.wait_if_needed, stage_timers=ANY,
+            keep_sending=None,
+        )
+        self.assertEqual(len(self.hl7_sender_client.send_messages_windowed.call_args.kwargs["stage_timers"]), 1)
+        self.assertEqual(self.event_logger.log_message_failed.call_args.args[2], "Unexpected processing error")
+
+
+class TestCircuitBreakerIntegration(unittest.TestCase):
+    def test_send_outcomes_are_recorded_on_the_circuit_breaker(self) -> None:
+        for error, expected in ((None, "record_success"), (TimeoutError("No ACK"), "record_failure")):
+            with self.subTest(error=error):
+                (
+                    service_bus_message,
+                    hl7_message,
+                    _,
+                    mock_sender_client,
+                    mock_event_logger,
+                    mock_metric_sender,
+                    mock_throttler,
+            mock_message_store,
+                ) = _setup()
+                mock_sender_client.send_message.side_effect = error
+                circuit_breaker = MagicMock()
+
+                _process_message(
+                    service_bus_message,
+                    mock_sender_client,
+                    mock_event_logger,
+                    mock_metric_sender,
+                    mock_throttler,
+            mock_message_store,
+            TEST_SESSION_ID,
+                    circuit_breaker=circuit_breaker,
+                )
+
+                getattr(circuit_breaker, expected).assert_called_once_with()
+                self.assertEqual(len(circuit_breaker.method_calls), 1)
+
+
+class TestProcessingStates(unittest.TestCase):
+    @patch("hl7_sender.application.get_ack_result")
+    @patch("hl7_sender.application.convert_er7_to_xml")
+    def test_redelivery_reuses_the_xml_payload_and_retries_a_failed_store(
+        self, mock_convert_xml: Mock, mock_ack_processor: Mock
+    ) -> None:
+        (
+            _,
+            _,
+            hl7_string,
+            mock_hl7_sender_client,
+            mock_event_logger,
+            mock_metric_sender,
+            mock_throttler,
+            mock_message_store,
+        ) = _setup()
+        mock_convert_xml.return_value = "<xml/>"
+        mock_message_store.send_to_store.side_effect = [Exception("Store unavailable"), None]
+        mock_ack_processor.side_effect = [False, True]
+        processing_states = ProcessingStateCache()
+
+        for delivery_count in range(2):
+            service_bus_message = ServiceBusMessage(body=hl7_string, message_id="sb-1")
+            service_bus_message.delivery_count = delivery_count  # type: ignore[attr-defined]
+            _process_message(
+                service_bus_message,
+                mock_hl7_sender_client,
+                mock_event_logger,
+                mock_metric_sender,
+                mock_throttler,
+                mock_message_store,
+                TEST_SESSION_ID,
+                processing_states=processing_states,
+            )
+            if delivery_count == 0:
+                self.assertEqual(len(processing_states), 1)
+
+        mock_convert_xml.assert_called_once_with(hl7_string)
+        self.assertEqual(
+            [call.kwargs["xml_payload"] for call in mock_message_store.send_to_store.call_args_list], ["<xml/>"] * 2
+        )
+        self.assertEqual(len(processing_states), 0)
+
+    @patch("hl7_sender.application.get_ack_result", return_value=True)
+    @patch("hl7_sender.application.convert_er7_to_xml", return_value="<xml/>")
+    def test_message_released_on_its_first_delivery_is_stored_when_redelivered(
+        self, _mock_convert_xml: Mock, _mock_ack_processor: Mock
+    ) -> None:
+        (
+            _, _, hl7_string, mock_hl7_sender_client, mock_event_logger, mock_metric_sender, mock_throttler,
+            mock_message_store,
+        ) = _setup()
+        processing_states = ProcessingStateCache()
+        released, retried = (ServiceBusMessage(body=hl7_string, message_id=f"sb-{index}") for index in range(2))
+        released.delivery_count = 0  # type: ignore[attr-defined]
+        retried.delivery_count = 1  # type: ignore[attr-defined]
+
+        # The batch scheduler hands both back before either is prepared; only the first was on its first delivery.
+        _mark_released(processing_states, [released, retried])
+        for message in (released, retried):
+            message.delivery_count += 1  # type: ignore[attr-defined]
+            _process_message(
+                message, mock_hl7_sender_client, mock_event_logger, mock_metric_sender, mock_throttler,
+                mock_message_store, TEST_SESSION_ID, processing_states=processing_states,
+            )
+
+        mock_message_store.send_to_store.assert_called_once()
+        self.assertEqual(mock_message_store.send_to_store.call_args.kwargs["xml_payload"], "<xml/>")
+        self.assertEqual(mock_hl7_sender_client.send_message.call_count, 2)
+
+    @patch("hl7_sender.application.get_ack_result")
+    def test_completed_messages_are_evicted_from_a_window(self, mock_ack_processor: Mock) -> None:
+        bodies = []
+        for control_id in ("MSG1", "MSG2"):
+            hl7_message = Message("ADT_A01")
+            hl7_message.msh.msh_10 = control_id
+            bodies.append(hl7_message.to_er7())
+        hl7_sender_client = MagicMock()
+        hl7_sender_client.send_messages_windowed.return_value = ["ACK1", "NACK2"]
+        mock_ack_processor.side_effect = [True, False]
+        processing_states = ProcessingStateCache()
+        messages = [ServiceBusMessage(body=body, message_id=f"sb-{index}") for index, body in enumerate(bodies)]
+
+        _process_message_window(
+            messages,
+            hl7_sender_client,
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
+            TEST_SESSION_ID,
+            2,
+            processing_states=processing_states,
+        )
+
+        self.assertIsNone(processing_states.get(messages[0]))
+        self.assertIsNotNone(processing_states.get(messages[1]))
+
+    def test_message_control_id_is_read_from_the_raw_header(self) -> None:
+        self.assertEqual(
+            _read_message_control_id("MSH#^~\\&#SENDER##RECEIVER##20250101000000##ADT^A01#CTRL1#P#2.5\rPID#1"),
+            "CTRL1",
+        )
+        for body in (
+            "",
+            "PID|1",
+            "MSH|^~\\&|SENDER",
+            "MSH|^~|||||20250101000000||ADT^A01|CTRL1|P|2.5",
+            "MSH|^~\\&#|||||20250101000000||ADT^A01|CTRL1|P|2.5",
+            "MSH|^~\\&|||||20250101000000||ADT^A01|CTRL1|P|9.9",
+            "MSH|^~\\&|||||20250101000000||ADT^A01|CTRL1|P|2.5\rPI|1",
+        ):
+            with self.subTest(body=body), self.assertRaises(ValueError):
+                _read_message_control_id(body)
+
+    def test_message_control_id_allows_what_hl7apy_parses(self) -> None:
+        for body in (
+            "MSH|^~\\&|||||20250101000000||ADT^A01|CTRL1|P",
+            "MSH|^~\\&|||||20250101000000||ADT^A01|CTRL1|P|2.5.1\r\rZZ1|a\nPID",
+        ):
+            with self.subTest(body=body):
+                self.assertEqual(_read_message_control_id(body), "CTRL1")
+
+    def test_malformed_message_is_neither_stored_nor_sent(self) -> None:
+        (_, _, _, mock_hl7_sender_client, mock_event_logger, mock_metric_sender, mock_throttler, mock_message_store) = (
+            _setup()
+        )
+
+        result = _process_message(
+            ServiceBusMessage(body="MSH|^~|SENDER||RECEIVER||20250101000000||ADT^A01|CTRL1|P|2.5"),
+            mock_hl7_sender_client,
+            mock_event_logger,
+            mock_metric_sender,
+            mock_throttler,
+            mock_message_store,
+            TEST_SESSION_ID,
+        )
+
+        self.assertFalse(result)
+        mock_message_store.send_to_store.assert_not_called()
+        mock_hl7_sender_client.send_message.assert_not_called()
+        self.assertEqual(mock_event_logger.log_message_failed.call_args.args[2], "Unexpected processing error")
+
+
+class TestStageTiming(unittest.TestCase):
+    @patch("hl7_sender.application.get_ack_result", return_value=True)
+    @patch("hl7_sender.application.convert_er7_to_xml", return_value="<xml/>")
+    def test_each_stage_is_sent_as_a_histogram_metric(self, _mock_convert_xml: Mock, _mock_ack: Mock) -> None:
+        (
+            service_bus_message, _, _, mock_hl7_sender_client, mock_event_logger, mock_metric_sender, mock_throttler,
+            mock_message_store,
+        ) = _setup()
+
+        _process_message(
+            service_bus_message, mock_hl7_sender_client, mock_event_logger, mock_metric_sender, mock_throttler,
+            mock_message_store, TEST_SESSION_ID,
+        )
+
+        stages = [
+            call.args[2]["stage"] for call in mock_metric_sender.send_gauge_metric.call_args_list
+            if call.args[0] == "message_stage_seconds"
+        ]
+        self.assertEqual(stages, ["prepare", "store", "throttle", "ack_wait", "ack_parse", "record"])
+
+    def test_a_failed_send_is_timed_as_the_ack_wait(self) -> None:
+        (
+            service_bus_message, _, _, mock_hl7_sender_client, mock_event_logger, mock_metric_sender, mock_throttler,
+            mock_message_store,
+        ) = _setup()
+        mock_hl7_sender_client.send_message.side_effect = TimeoutError("no ACK")
+
+        with patch("hl7_sender.application.StageTimer") as mock_stage_timer_cls:
+            _process_message(
+                service_bus_message, mock_hl7_sender_client, mock_event_logger, mock_metric_sender, mock_throttler,
+                mock_message_store, TEST_SESSION_ID,
+            )
+
+        stage_timer = mock_stage_timer_cls.return_value
+        mock_hl7_sender_client.send_message.assert_called_once_with(ANY, stage_timer=stage_timer)
+        self.assertEqual([c.args[0] for c in stage_timer.mark.call_args_list][-2:], ["ack_wait", "record"])
+        stage_timer.finish.assert_called_once()
+
+    def _window_stages(self, mock_metric_sender: Mock) -> list[str]:
+        return [
+            call.args[2]["stage"] for call in mock_metric_sender.send_gauge_metric.call_args_list
+            if call.args[0] == "message_stage_seconds"
+        ]
+
+    @patch("hl7_sender.application.get_ack_result", return_value=True)
+    @patch("hl7_sender.application.convert_er7_to_xml", return_value="<xml/>")
+    def test_each_message_in_a_window_is_timed(self, _mock_convert_xml: Mock, _mock_ack: Mock) -> None:
+        (
+            service_bus_message, _, _, mock_hl7_sender_client, mock_event_logger, mock_metric_sender, mock_throttler,
+            mock_message_store,
+        ) = _setup()
+
+        def send_messages_windowed(
+            messages: list[tuple[str, str]],
+            window_size: int,
+            before_send: Mock,
+            stage_timers: list[Mock],
+            keep_sending: None,
+        ) -> list[str]:
+            for stage_timer in stage_timers:
+                for stage in ("queue", "throttle", "ack_wait"):
+                    stage_timer.mark(stage)
+            return ["ACK"] * len(messages)
+
+        mock_hl7_sender_client.send_messages_windowed.side_effect = send_messages_windowed
+
+        handled = _process_message_window(
+            [service_bus_message, service_bus_message], mock_hl7_sender_client, mock_event_logger,
+            mock_metric_sender, mock_throttler, mock_message_store, TEST_SESSION_ID, 2,
+        )
+
+        self.assertEqual(handled, 2)
+        message_stages = ["prepare", "store", "queue", "throttle", "ack_wait", "ack_parse", "record"]
+        self.assertEqual(self._window_stages(mock_metric_sender), message_stages * 2)
+
+    @patch("hl7_sender.application.convert_er7_to_xml", return_value="<xml/>")
+    def test_a_failed_window_is_timed_as_the_first_message_ack_wait(self, _mock_convert_xml: Mock) -> None:
+        (
+            service_bus_message, _, _, mock_hl7_sender_client, mock_event_logger, mock_metric_sender, mock_throttler,
+            mock_message_store,
+        ) = _setup()
+        mock_hl7_sender_client.send_messages_windowed.side_effect = TimeoutError("no ACK")
+
+        handled = _process_message_window(
+            [service_bus_message, service_bus_message], mock_hl7_sender_client, mock_event_logger,
+            mock_metric_sender, mock_throttler, mock_message_store, TEST_SESSION_ID, 2,
+        )
+
+        self.assertEqual(handled, 0)
+        self.assertEqual(
+            self._window_stages(mock_metric_sender), ["prepare", "store", "ack_wait", "record", "prepare", "store"]
+        )
+
+
 class TestBatchSizing(unittest.TestCase):
     def test_uses_max_batch_when_no_throttle(self) -> None:
         throttler = MagicMock(interval_seconds=None)
@@ -0,0 +1,136 @@
+import socket
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from message_bus_lib.message_receiver_client import ReleaseMessages
+
+from hl7_sender.batch_scheduler import BatchScheduler
+from hl7_sender.hl7_sender_client import HL7SenderClient
+
+
+class _SlowReceiver:
+    """Accepts one MLLP connection on a local port and acknowledges each message after ``ack_delay_seconds``."""
+
+    def __init__(self, ack_delay_seconds: float) -> None:
+        self.ack_delay_seconds = ack_delay_seconds
+        self.server = socket.create_server(("127.0.0.1", 0))
+        self.port = self.server.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self) -> None:
+        try:
+            connection, _ = self.server.accept()
+        except OSError:
+            return
+        with connection:
+            buffer = b""
+            while data := connection.recv(65536):
+                buffer += data
+                while b"\x1c\r" in buffer:
+                    frame, buffer = buffer.split(b"\x1c\r", 1)
+                    control_id = frame.decode().split("\r")[0].split("|")[9]
+                    time.sleep(self.ack_delay_seconds)
+                    ack = f"MSH|^~\\&|RECEIVER||SENDER||20250101000000||ACK|A{control_id}|P|2.5\rMSA|AA|{control_id}"
+                    connection.sendall(b"\x0b" + ack.encode() + b"\x1c\r")
+
+    def close(self) -> None:
+        self.server.close()
+
+
+class TestBatchScheduler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.throttler = MagicMock(messages_per_minute=None)
+        self.scheduler = BatchScheduler(100, 50, self.throttler, initial_batch_size=20)
+
+    def test_initial_batch_size_until_a_message_is_timed(self) -> None:
+        self.assertIsNone(self.scheduler.seconds_per_message)
+        self.assertEqual(self.scheduler.batch_size(), 20)
+
+    def test_batches_take_half_the_lock_window(self) -> None:
+        self.scheduler.record_message(5.0)
+
+        self.assertEqual(self.scheduler.batch_size(), 10)
+
+        self.scheduler.record_message(0.001)
+        self.assertEqual(self.scheduler.batch_size(), 14)  # the average moves 30% of the way
+
+        for _ in range(50):
+            self.scheduler.record_message(0.001)
+        self.assertEqual(self.scheduler.batch_size(), 50)  # capped at the maximum batch size
+
+    def test_throttle_interval_is_the_lowest_estimate(self) -> None:
+        self.throttler.messages_per_minute = 12  # 5 seconds between messages
+        self.scheduler.record_message(0.01)
+
+        self.assertEqual(self.scheduler.seconds_per_message, 5.0)
+        self.assertEqual(self.scheduler.batch_size(), 10)
+
+    def test_windowed_sends_are_recorded_by_throughput(self) -> None:
+        self.scheduler.record_messages(10, 5.0)
+
+        self.assertEqual(self.scheduler.seconds_per_message, 0.5)
+        self.scheduler.record_messages(0, 5.0)
+        self.assertEqual(self.scheduler.seconds_per_message, 0.5)
+
+    @patch("hl7_sender.batch_scheduler.time")
+    def test_releases_the_rest_of_a_batch_that_would_outlast_the_lock_window(self, mock_time: MagicMock) -> None:
+        mock_time.monotonic.return_value = 0.0
+        self.scheduler.record_message(5.0)
+        self.scheduler.start_batch(10)
+
+        self.scheduler.check_lock_window()  # the first message is always sent
+        self.scheduler.record_message(5.0)
+        mock_time.monotonic.return_value = 5.0
+        self.scheduler.check_lock_window()  # 5s + 9 x 5s fits in 100s
+
+        self.scheduler.record_message(40.0)  # latency spike: the estimate rises to 15.5s
+        mock_time.monotonic.return_value = 45.0
+        with self.assertRaises(ReleaseMessages):
+            self.scheduler.check_lock_window()  # 45s + 8 x 15.5s does not
+
+    def test_lock_window_must_be_positive(self) -> None:
+        with self.assertRaises(ValueError):
+            BatchScheduler(0, 50, self.throttler)
+
+
+class TestBatchSchedulerSimulatedLatency(unittest.TestCase):
+    """Sends to a local receiver that delays its ACKs, with a one second lock window."""
+
+    LOCK_WINDOW_SECONDS = 1.0
+
+    def _send_batch(self, scheduler: BatchScheduler, client: HL7SenderClient, count: int) -> int:
+        """Send up to ``count`` messages as application.main does, returning how many were sent before a release."""
+        scheduler.start_batch(count)
+        for index in range(count):
+            try:
+                scheduler.check_lock_window()
+            except ReleaseMessages:
+                return index
+            started_at = time.monotonic()
+            client.send_message(f"MSH|^~\\&|SENDER||RECEIVER||20250101000000||ADT^A01|{index}|P|2.5\rPID|1")
+            scheduler.record_message(time.monotonic() - started_at)
+        return count
+
+    def test_batches_follow_the_receiver_latency(self) -> None:
+        receiver = _SlowReceiver(ack_delay_seconds=0.01)
+        self.addCleanup(receiver.close)
+        scheduler = BatchScheduler(self.LOCK_WINDOW_SECONDS, 100, MagicMock(messages_per_minute=None), 5)
+
+        with HL7SenderClient("127.0.0.1", receiver.port, 5) as client:
+            self.assertEqual(self._send_batch(scheduler, client, scheduler.batch_size()), 5)
+            fast_batch_size = scheduler.batch_size()
+
+            # The receiver slows down part way through a batch sized for the fast receiver.
+            receiver.ack_delay_seconds = 0.2
+            sent = self._send_batch(scheduler, client, fast_batch_size)
+            slow_batch_size = scheduler.batch_size()
+
+        self.assertGreater(fast_batch_size, 10)
+        self.assertLess(sent, fast_batch_size)
+        self.assertLess(slow_batch_size, fast_batch_size / 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,129 +1,70 @@
-import os
 import socket
+import threading
+import time
 import unittest
 from typing import Any, Callable, Dict
 from unittest.mock import Mock, patch
 
-from hl7_sender.hl7_sender_client import HL7SenderClient, is_socket_closed
+from hl7_sender.hl7_sender_client import HL7SenderClient
 
-WINDOWS_OS = "nt"
 
+def _message(control_id: str) -> str:
+    return f"MSH|^~\\&|SENDER||RECEIVER||20250101000000||ADT^A01|{control_id}|P|2.5\rPID|1"
 
-class TestIsSocketClosed(unittest.TestCase):
 
-    @patch('hl7_sender.hl7_sender_client.select.select')
-    def test_socket_not_readable_no_data_available(self, mock_select: Mock) -> None:
-        # Arrange
-        mock_socket = Mock(spec=socket.socket)
-        # Simulate select.select returning empty readable list (no data available)
-        mock_select.return_value = ([], [], [])
+def _ack(control_id: str) -> str:
+    return f"MSH|^~\\&|RECEIVER||SENDER||20250101000000||ACK|A{control_id}|P|2.5\rMSA|AA|{control_id}"
 
-        # Act
-        result = is_socket_closed(mock_socket)
 
-        # Assert
-        self.assertFalse(result)
-        mock_select.assert_called_once_with([mock_socket], [], [], 0)
-        # recv should not be called when socket is not readable
-        mock_socket.recv.assert_not_called()
+def _rejection() -> str:
+    return "MSH|^~\\&|RECEIVER||SENDER||20250101000000||ACK|R|P|2.5\rMSA|AR|"
 
-    @patch('hl7_sender.hl7_sender_client.select.select')
-    def test_socket_readable_with_data_socket_open(self, mock_select: Mock) -> None:
-        # Arrange
-        mock_socket = Mock(spec=socket.socket)
-        # Simulate select.select returning the socket in readable list
-        mock_select.return_value = ([mock_socket], [], [])
-        mock_socket.recv.return_value = b'some data here'
 
-        # Act
-        result = is_socket_closed(mock_socket)
+class _PipeliningReceiver:
+    """
+    Accepts one MLLP connection on a local port and acknowledges messages by MSA-2.
 
-        # Assert
-        self.assertFalse(result)
-        mock_select.assert_called_once_with([mock_socket], [], [], 0)
-        if os.name == WINDOWS_OS:
-            mock_socket.recv.assert_called_once_with(16, socket.MSG_PEEK)
-        else:
-            mock_socket.recv.assert_called_once_with(16, socket.MSG_DONTWAIT | socket.MSG_PEEK)  # type: ignore
-
-    @patch('hl7_sender.hl7_sender_client.select.select')
-    def test_socket_readable_with_empty_data_socket_closed(self, mock_select: Mock) -> None:
-        # Arrange
-        mock_socket = Mock(spec=socket.socket)
-        # Simulate select.select returning the socket in readable list
-        mock_select.return_value = ([mock_socket], [], [])
-        # Simulate recv returning empty data (EOF - socket closed)
-        mock_socket.recv.return_value = b''
+    Messages are answered ``hold`` at a time in reverse order, so ACKs arrive out of order. Those in ``reject`` are
+    answered with an AR whose MSA-2 is empty. After ``close_after`` messages the connection is closed without
+    answering the rest.
+    """
 
-        # Act
-        result = is_socket_closed(mock_socket)
+    def __init__(self, hold: int = 1, close_after: int | None = None, reject: tuple[str, ...] = ()) -> None:
+        self.hold = hold
+        self.close_after = close_after
+        self.reject = reject
+        self.received: list[str] = []
+        self.server = socket.create_server(("127.0.0.1", 0))
+        self.port = self.server.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
 
-        # Assert
-        self.assertTrue(result)
-        mock_select.assert_called_once_with([mock_socket], [], [], 0)
-        if os.name == WINDOWS_OS:
-            mock_socket.recv.assert_called_once_with(16, socket.MSG_PEEK)
-        else:
-            mock_socket.recv.assert_called_once_with(16, socket.MSG_DONTWAIT | socket.MSG_PEEK)  # type: ignore
-
-    @patch('hl7_sender.hl7_sender_client.select.select')
-    def test_socket_recv_raises_blocking_io_error(self, mock_select: Mock) -> None:
-        # Arrange
-        mock_socket = Mock(spec=socket.socket)
-        mock_select.return_value = ([mock_socket], [], [])
-        mock_socket.recv.side_effect = BlockingIOError
+    def _serve(self) -> None:
+        try:
+            connection, _ = self.server.accept()
+        except OSError:
+            return
+        with connection:
+            buffer = b""
+            held: list[str] = []
+            while data := connection.recv(65536):
+                buffer += data
+                while b"\x1c\r" in buffer:
+                    frame, buffer = buffer.split(b"\x1c\r", 1)
+                    control_id = frame.decode().split("\r")[0].split("|")[9]
+                    self.received.append(control_id)
+                    if len(self.received) == self.close_after:
+                        connection.sendall(b"\x0b" + _ack(control_id).encode() + b"\x1c\r")
+                        return
+                    held.append(control_id)
+                    if len(held) == self.hold:
+                        for held_id in reversed(held):
+                            ack = _rejection() if held_id in self.reject else _ack(held_id)
+                            connection.sendall(b"\x0b" + ack.encode() + b"\x1c\r")
+                        held.clear()
 
-        # Act
-        result = is_socket_closed(mock_socket)
+    def close(self) -> None:
+        self.server.close()
 
-        # Assert
-        self.assertFalse(result)
-        mock_select.assert_called_once_with([mock_socket], [], [], 0)
-
-    @patch('hl7_sender.hl7_sender_client.select.select')
-    def test_socket_recv_raises_connection_reset_error(self, mock_select: Mock) -> None:
-        # Arrange
-        mock_socket = Mock(spec=socket.socket)
-        mock_select.return_value = ([mock_socket], [], [])
-        mock_socket.recv.side_effect = ConnectionResetError
-
-        # Act
-        result = is_socket_closed(mock_socket)
-
-        # Assert
-        self.assertTrue(result)
-        mock_select.assert_called_once_with([mock_socket], [], [], 0)
-
-    @patch('hl7_sender.hl7_sender_client.select.select')
-    def test_socket_unexpected_exception_during_check(self, mock_select: Mock) -> None:
-        # Arrange
-        mock_socket = Mock(spec=socket.socket)
-        mock_select.return_value = ([mock_socket], [], [])
-        mock_socket.recv.side_effect = RuntimeError("Some unexpected error")
-
-        # Act & Assert
-        with self.assertLogs('hl7_sender.hl7_sender_client', level='ERROR') as log:
-            result = is_socket_closed(mock_socket)
-
-            self.assertFalse(result)
-            self.assertIn("unexpected exception", log.output[0])
-
-        mock_select.assert_called_once_with([mock_socket], [], [], 0)
-
-    @patch('hl7_sender.hl7_sender_client.select.select')
-    def test_select_itself_raises_exception(self, mock_select: Mock) -> None:
-        # Arrange
-        mock_socket = Mock(spec=socket.socket)
-        mock_select.side_effect = OSError("select failed")
-
-        # Act & Assert
-        with self.assertLogs('hl7_sender.hl7_sender_client', level='ERROR') as log:
-            result = is_socket_closed(mock_socket)
-
-            self.assertFalse(result)
-            self.assertIn("unexpected exception", log.output[0])
-
-        mock_select.assert_called_once_with([mock_socket], [], [], 0)
 
 class TestHL7SenderClient(unittest.TestCase):
 
@@ -332,5 +273,211 @@ class TestHL7SenderClient(unittest.TestCase):
                                      f"Failed for {test_case['description']}")
 
 
+class TestHL7SenderClientWithPool(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.pool = Mock()
+        self.mllp_client = Mock()
+        self.pool.acquire.return_value = self.mllp_client
+
+    @patch('hl7_sender.hl7_sender_client.MLLPClient')
+    @patch('hl7_sender.hl7_sender_client.is_socket_closed')
+    def test_send_message_uses_a_pooled_connection_without_checking_it(
+        self, mock_is_socket_closed: Mock, mock_mllp_cls: Mock
+    ) -> None:
+        self.mllp_client.send_message.return_value = b'\x0bACK\x1c\r'
+
+        with HL7SenderClient('localhost', 1234, 30, pool=self.pool) as client:
+            response = client.send_message('MSH|...')
+
+        self.assertEqual(response, 'ACK')
+        mock_mllp_cls.assert_not_called()
+        mock_is_socket_closed.assert_not_called()
+        self.pool.release.assert_called_once_with(self.mllp_client)
+        self.mllp_client.close.assert_not_called()
+
+    def test_send_message_timeout_retries_once_on_another_connection(self) -> None:
+        retry_client = Mock()
+        retry_client.send_message.side_effect = socket.timeout
+        self.mllp_client.send_message.side_effect = socket.timeout
+        self.pool.acquire.side_effect = [self.mllp_client, retry_client]
+
+        client = HL7SenderClient('localhost', 1234, 30, pool=self.pool)
+        with self.assertRaises(TimeoutError):
+            client.send_message('MSH|...')
+
+        self.assertEqual([c.args[0] for c in self.pool.discard.call_args_list], [self.mllp_client, retry_client])
+        self.pool.release.assert_not_called()
+
+    def test_send_message_connection_closed_by_receiver_raises_connection_error(self) -> None:
+        self.mllp_client.send_message.return_value = b''
+
+        client = HL7SenderClient('localhost', 1234, 30, pool=self.pool)
+        with self.assertRaises(ConnectionError):
+            client.send_message('MSH|...')
+
+        self.pool.discard.assert_called_once_with(self.mllp_client)
+
+    def test_send_message_connect_failure_raises_connection_error(self) -> None:
+        self.pool.acquire.side_effect = ConnectionRefusedError("refused")
+
+        client = HL7SenderClient('localhost', 1234, 30, pool=self.pool)
+        with self.assertRaises(ConnectionError) as context:
+            client.send_message('MSH|...')
+
+        self.assertIn("refused", str(context.exception))
+
+    def test_send_message_marks_the_connect_stage_for_each_attempt(self) -> None:
+        retry_client = Mock()
+        retry_client.send_message.return_value = b'\x0bACK\x1c\r'
+        self.mllp_client.send_message.side_effect = socket.timeout
+        self.pool.acquire.side_effect = [self.mllp_client, retry_client]
+        stage_timer = Mock()
+
+        client = HL7SenderClient('localhost', 1234, 30, pool=self.pool)
+        client.send_message('MSH|...', stage_timer=stage_timer)
+
+        # The timed-out wait is marked before the retry's connect.
+        self.assertEqual([c.args[0] for c in stage_timer.mark.call_args_list], ["connect", "ack_wait", "connect"])
+
+
+class TestHL7SenderClientWindowed(unittest.TestCase):
+
+    def _client(self, receiver: _PipeliningReceiver, ack_timeout_seconds: int = 5) -> HL7SenderClient:
+        self.addCleanup(receiver.close)
+        client = HL7SenderClient('127.0.0.1', receiver.port, ack_timeout_seconds)
+        self.addCleanup(client.__exit__, None, None, None)
+        return client
+
+    def test_out_of_order_acks_are_returned_in_message_order(self) -> None:
+        receiver = _PipeliningReceiver(hold=2)
+        client = self._client(receiver)
+        messages = [(str(index), _message(str(index))) for index in range(6)]
+        before_send = Mock()
+
+        acks = client.send_messages_windowed(messages, 2, before_send=before_send)
+
+        self.assertEqual(acks, [_ack(str(index)) for index in range(6)])
+        self.assertEqual(receiver.received, [str(index) for index in range(6)])
+        self.assertEqual(before_send.call_count, 6)
+
+    def test_each_message_in_a_window_is_timed(self) -> None:
+        receiver = _PipeliningReceiver(hold=2)
+        client = self._client(receiver)
+        messages = [(str(index), _message(str(index))) for index in range(4)]
+        stage_timers = [Mock() for _ in messages]
+
+        client.send_messages_windowed(messages, 2, stage_timers=stage_timers)
+
+        for stage_timer in stage_timers:
+            self.assertEqual(
+                [c.args[0] for c in stage_timer.mark.call_args_list], ["queue", "throttle", "ack_wait"]
+            )
+
+    def test_ack_matching_no_message_is_taken_for_the_oldest_waiting(self) -> None:
+        receiver = _PipeliningReceiver(hold=2, reject=('2',))
+        client = self._client(receiver, ack_timeout_seconds=1)
+        messages = [(str(index), _message(str(index))) for index in range(4)]
+
+        acks = client.send_messages_windowed(messages, 2)
+
+        self.assertEqual(acks, [_ack('0'), _ack('1'), _rejection(), _ack('3')])
+
+    def test_window_stops_sending_when_keep_sending_returns_false(self) -> None:
+        receiver = _PipeliningReceiver()
+        client = self._client(receiver)
+        messages = [(str(index), _message(str(index))) for index in range(4)]
+        keep_sending = Mock(side_effect=[True, False])
+
+        acks = client.send_messages_windowed(messages, 2, keep_sending=keep_sending)
+
+        self.assertEqual(acks, [_ack('0'), _ack('1')])
+        self.assertEqual(receiver.received, ['0', '1'])
+        self.assertEqual([c.args[0] for c in keep_sending.call_args_list], [0, 1])
+
+    def test_ack_timeout_bounds_the_wait_however_the_ack_is_split(self) -> None:
+        server = socket.create_server(("127.0.0.1", 0))
+        self.addCleanup(server.close)
+
+        def trickle() -> None:
+            connection, _ = server.accept()
+            with connection:
+                connection.recv(65536)
+                try:
+                    for _ in range(25):
+                        connection.sendall(b"x")
+                        time.sleep(0.2)
+                except OSError:
+                    pass  # the client gave up and closed the connection
+
+        threading.Thread(target=trickle, daemon=True).start()
+        client = HL7SenderClient('127.0.0.1', server.getsockname()[1], 1)
+        self.addCleanup(client.__exit__, None, None, None)
+
+        started_at = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            client.send_messages_windowed([('1', _message('1'))], 2)
+
+        self.assertLess(time.monotonic() - started_at, 3)
+
+    def test_no_more_than_window_size_messages_await_an_ack(self) -> None:
+        receiver = _PipeliningReceiver(hold=3)
+        client = self._client(receiver, ack_timeout_seconds=1)
+        messages = [(str(index), _message(str(index))) for index in range(3)]
+
+        with self.assertRaises(TimeoutError):
+            client.send_messages_windowed(messages, 2)
+
+        self.assertEqual(receiver.received, ['0', '1'])
+
+    def test_connection_closed_by_receiver_returns_the_acknowledged_prefix(self) -> None:
+        receiver = _PipeliningReceiver(close_after=2)
+        client = self._client(receiver)
+        messages = [(str(index), _message(str(index))) for index in range(4)]
+
+        with self.assertLogs('hl7_sender.hl7_sender_client', level='WARNING'):
+            acks = client.send_messages_windowed(messages, 4)
+
+        self.assertEqual(acks, [_ack('0'), _ack('1')])
+
+    def test_duplicate_control_id_waits_for_the_first_ack(self) -> None:
+        receiver = _PipeliningReceiver()
+        client = self._client(receiver)
+        messages = [('1', _message('1')), ('1', _message('1')), ('2', _message('2'))]
+
+        acks = client.send_messages_windowed(messages, 3)
+
+        self.assertEqual(acks, [_ack('1'), _ack('1'), _ack('2')])
+
+    def test_pooled_connection_is_released_after_a_windowed_send(self) -> None:
+        pool = Mock()
+        mllp_client = pool.acquire.return_value
+        mllp_client.encoding = 'utf-8'
+        mllp_client.socket.recv.return_value = b'\x0b' + _ack('1').encode() + b'\x1c\r'
+
+        client = HL7SenderClient('localhost', 1234, 30, pool=pool)
+        acks = client.send_messages_windowed([('1', _message('1'))], 2)
+
+        self.assertEqual(acks, [_ack('1')])
+        pool.release.assert_called_once_with(mllp_client)
+        pool.discard.assert_not_called()
+
+
+class TestHL7SenderClientCheckConnection(unittest.TestCase):
+
+    def test_check_connection_opens_and_closes_a_connection(self) -> None:
+        with socket.create_server(('127.0.0.1', 0)) as server:
+            client = HL7SenderClient('127.0.0.1', server.getsockname()[1], 5, pool=Mock())
+
+            self.assertTrue(client.check_connection())
+
+    def test_check_connection_returns_false_when_refused(self) -> None:
+        with socket.create_server(('127.0.0.1', 0)) as server:
+            port = server.getsockname()[1]
+        client = HL7SenderClient('127.0.0.1', port, 5, pool=Mock())
+
+        self.assertFalse(client.check_connection())
+
+
 if __name__ == '__main__':
     unittest.main()
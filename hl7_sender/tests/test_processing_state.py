@@ -0,0 +1,70 @@
+import unittest
+from unittest.mock import MagicMock
+
+from azure.servicebus import ServiceBusMessage
+
+from hl7_sender.processing_state import ProcessingState, ProcessingStateCache
+
+
+class TestProcessingStateCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = ProcessingStateCache(max_entries=2)
+
+    def test_state_is_kept_by_message_id_until_evicted(self) -> None:
+        message = ServiceBusMessage(body="MSH", message_id="sb-1")
+        state = ProcessingState("CTRL1", xml_payload="<xml/>")
+        self.cache.put(message, state)
+
+        self.assertIs(self.cache.get(ServiceBusMessage(body="MSH", message_id="sb-1")), state)
+
+        self.cache.evict(message)
+        self.assertIsNone(self.cache.get(message))
+
+    def test_messages_without_an_id_are_not_cached(self) -> None:
+        message = MagicMock(message_id=None)
+        self.cache.put(message, ProcessingState("CTRL1"))
+
+        self.assertIsNone(self.cache.get(message))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_least_recently_used_state_is_dropped_beyond_the_limit(self) -> None:
+        messages = [ServiceBusMessage(body="MSH", message_id=f"sb-{index}") for index in range(3)]
+        self.cache.put(messages[0], ProcessingState("CTRL0"))
+        self.cache.put(messages[1], ProcessingState("CTRL1"))
+        self.cache.get(messages[0])
+
+        self.cache.put(messages[2], ProcessingState("CTRL2"))
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.get(messages[1]))
+        self.assertIsNotNone(self.cache.get(messages[0]))
+
+    def test_released_mark_is_cleared_when_read(self) -> None:
+        message = ServiceBusMessage(body="MSH", message_id="sb-1")
+        self.cache.mark_released(message)
+
+        self.assertTrue(self.cache.pop_released(message))
+        self.assertFalse(self.cache.pop_released(message))
+
+    def test_messages_with_state_are_not_marked_released(self) -> None:
+        message = ServiceBusMessage(body="MSH", message_id="sb-1")
+        self.cache.put(message, ProcessingState("CTRL1"))
+
+        self.cache.mark_released(message)
+
+        self.assertFalse(self.cache.pop_released(message))
+
+    def test_oldest_released_mark_is_dropped_beyond_the_limit(self) -> None:
+        messages = [ServiceBusMessage(body="MSH", message_id=f"sb-{index}") for index in range(3)]
+        for message in messages:
+            self.cache.mark_released(message)
+
+        self.assertEqual([self.cache.pop_released(message) for message in messages], [False, True, True])
+
+    def test_max_entries_must_be_positive(self) -> None:
+        with self.assertRaises(ValueError):
+            ProcessingStateCache(max_entries=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -25,6 +25,10 @@ class AppConfig:
     hl7_validation_flow: str | None = None
     hl7_validation_standard: str | None = None
     max_message_size_bytes: int = DEFAULT_MAX_MESSAGE_SIZE_BYTES
+    validation_cache_max_bytes: int | None = None
+    fused_transformer: str | None = None
+    fused_transformer_microservice_id: str | None = None
+    fused_egress_session_id: str | None = None
 
     @staticmethod
     def read_env_config() -> AppConfig:
@@ -37,6 +41,9 @@ class AppConfig:
         if egress_queue_name and egress_topic_name:
             raise RuntimeError("Cannot specify both EGRESS_QUEUE_NAME and EGRESS_TOPIC_NAME.")
 
+        # Opt-in per flow: when set, the server transforms messages itself and the egress is the transformer's.
+        fused_transformer = _read_env("FUSED_TRANSFORMER") or None
+
         return AppConfig(
             connection_string=_read_env("SERVICE_BUS_CONNECTION_STRING"),
             egress_queue_name=egress_queue_name,
@@ -55,6 +62,12 @@ class AppConfig:
             hl7_validation_flow=_read_env("HL7_VALIDATION_FLOW"),
             hl7_validation_standard=_read_env("HL7_VALIDATION_STANDARD"),
             max_message_size_bytes=_read_and_validate_message_size(),
+            validation_cache_max_bytes=_read_validation_cache_max_bytes(),
+            fused_transformer=fused_transformer,
+            fused_transformer_microservice_id=(
+                _read_required_env("FUSED_TRANSFORMER_MICROSERVICE_ID") if fused_transformer else None
+            ),
+            fused_egress_session_id=_read_env("FUSED_EGRESS_SESSION_ID") if fused_transformer else None,
         )
 
 
@@ -76,6 +89,14 @@ def _read_and_validate_message_size() -> int:
     return configured_size
 
 
+def _read_validation_cache_max_bytes() -> int | None:
+    # Opt-in: the validation result cache is only created when a positive size limit is configured.
+    configured_size = _read_int_env("VALIDATION_CACHE_MAX_BYTES")
+    if configured_size is None or configured_size <= 0:
+        return None
+    return configured_size
+
+
 def _read_message_store_queue_name() -> str | None:
     return _read_env("MESSAGE_STORE_QUEUE_NAME")
 
@@ -1,5 +1,4 @@
-from datetime import datetime
-
+from field_utils_lib.hl7_timestamp import parse_hl7_date
 from hl7apy.core import Message
 
 from hl7_server.exceptions.validation_exception import ValidationException
@@ -19,8 +18,8 @@ def _validate_pid7_date_of_birth(message: Message) -> None:
         raise ValidationException("PID.7 (Date of birth) must be a valid date in YYYYMMDD format for PHW.")
 
     try:
-        birthdate = datetime.strptime(dob, "%Y%m%d")
-        if birthdate.year < 1800:
-            raise ValidationException("PID.7 (Date of birth) - year of birth must be 1800 or later for PHW.")
+        birthdate = parse_hl7_date(dob)
     except ValueError:
         raise ValidationException("PID.7 (Date of birth) must be a valid date in YYYYMMDD format for PHW.")
+    if birthdate.year < 1800:
+        raise ValidationException("PID.7 (Date of birth) - year of birth must be 1800 or later for PHW.")
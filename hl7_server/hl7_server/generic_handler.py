@@ -1,8 +1,13 @@
+from __future__ import annotations
+
 import logging
+from typing import TYPE_CHECKING
 
 from event_logger_lib.event_logger import EventLogger
 from field_utils_lib import get_hl7_field_value
 from hl7_validation import (
+    ValidationResult,
+    ValidationResultCache,
     XmlValidationError,
     convert_er7_to_xml,
     validate_and_convert_parsed_message_with_flow_schema,
@@ -27,6 +32,9 @@ from hl7_server.custom_message_properties import FLOW_PROPERTY_BUILDERS, build_c
 from .hl7_ack_builder import HL7AckBuilder
 from .hl7_validator import HL7Validator, ValidationException
 
+if TYPE_CHECKING:
+    from transformer_base_lib import FusedTransformer
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,6 +52,8 @@ class GenericHandler(AbstractHandler):
         egress_session_id: str,
         flow_name: str | None = None,
         standard_version: str | None = None,
+        validation_cache: ValidationResultCache | None = None,
+        fused_transformer: FusedTransformer | None = None,
     ):
         super(GenericHandler, self).__init__(msg)
         self.sender_client = sender_client
@@ -56,6 +66,8 @@ class GenericHandler(AbstractHandler):
         self.egress_session_id = egress_session_id
         self.flow_name: str | None = flow_name
         self.standard_version: str | None = standard_version
+        self.validation_cache = validation_cache
+        self.fused_transformer = fused_transformer
 
     def reply(self) -> str:
         try:
@@ -81,9 +93,7 @@ class GenericHandler(AbstractHandler):
             # Flow validation also generates XML, used for the message store
             if self.flow_name and self.flow_name != "mpi":
                 try:
-                    validation_result = validate_and_convert_parsed_message_with_flow_schema(
-                        msg, self.incoming_message, self.flow_name
-                    )
+                    validation_result = self._validate_and_convert_with_flow_schema(msg, self.flow_name)
                     if not validation_result.is_valid:
                         raise XmlValidationError(validation_result.error_message or "Unknown XML validation error")
 
@@ -111,7 +121,7 @@ class GenericHandler(AbstractHandler):
             # For flows without schema-aware XML (e.g. MPI) or no flow, try and generate basic XML
             if xml_payload is None:
                 try:
-                    xml_payload = convert_er7_to_xml(self.incoming_message)
+                    xml_payload = self._convert_to_xml()
                 except Exception as e:
                     error_msg = (
                         f"Failed to generate XML payload for message store: {e} (CorrelationId: {correlation_id})"
@@ -157,7 +167,17 @@ class GenericHandler(AbstractHandler):
             # Non-blocking: attempt to store first so there is a persisted copy before forwarding.
             self._send_to_message_store(tracking_metadata_properties, xml_payload)
 
-            self._send_to_service_bus(message_control_id, tracking_metadata_properties)
+            if self.fused_transformer is not None:
+                # The original is stored above as usual; only the transformed message is published.
+                self.fused_transformer.transform_and_send(
+                    self.incoming_message,
+                    tracking_metadata_properties,
+                    self.sender_client,
+                    flat_message=msg,
+                    message_id=message_control_id,
+                )
+            else:
+                self._send_to_service_bus(message_control_id, tracking_metadata_properties)
 
             ack_message = self.create_ack(message_control_id, msg)
 
@@ -187,6 +207,17 @@ class GenericHandler(AbstractHandler):
             self.event_logger.log_message_failed(self.incoming_message, error_msg)
             raise
 
+    def _validate_and_convert_with_flow_schema(self, msg: Message, flow_name: str) -> ValidationResult:
+        # Replays and upstream resends repeat identical payloads, so reuse earlier outcomes when caching is enabled.
+        if self.validation_cache is not None:
+            return self.validation_cache.validate_and_convert(self.incoming_message, flow_name, parsed_message=msg)
+        return validate_and_convert_parsed_message_with_flow_schema(msg, self.incoming_message, flow_name)
+
+    def _convert_to_xml(self) -> str:
+        if self.validation_cache is not None:
+            return self.validation_cache.convert(self.incoming_message)
+        return convert_er7_to_xml(self.incoming_message)
+
     def create_ack(self, message_control_id: str, msg: Message) -> str:
         ack_builder = HL7AckBuilder()
         ack_msg = ack_builder.build_ack(message_control_id, msg)
@@ -2,10 +2,11 @@ import logging
 import os
 import signal
 import threading
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from event_logger_lib.event_logger import EventLogger
 from health_check_lib.health_check_server import TCPHealthCheckServer
+from hl7_validation import ValidationResultCache
 from message_bus_lib.connection_config import ConnectionConfig
 from message_bus_lib.message_sender_client import MessageSenderClient
 from message_bus_lib.message_store_client import MessageStoreClient
@@ -19,6 +20,9 @@ from .app_config import AppConfig
 from .error_handler import ErrorHandler
 from .generic_handler import GenericHandler
 
+if TYPE_CHECKING:
+    from transformer_base_lib import FusedTransformer
+
 # Configure logging
 log_level_str = os.environ.get("LOG_LEVEL", "INFO").upper()
 log_level = getattr(logging, log_level_str, logging.INFO)
@@ -39,6 +43,8 @@ class Hl7ServerApplication:
         self.metric_sender: MetricSender = None
         self._server_thread: threading.Thread | None = None
         self.health_check_server: TCPHealthCheckServer = None
+        self.validation_cache: ValidationResultCache | None = None
+        self.fused_transformer: FusedTransformer | None = None
         self.HOST = os.environ.get("HOST", "127.0.0.1")
         self.PORT = int(os.environ.get("PORT", "2575"))
 
@@ -56,15 +62,13 @@ class Hl7ServerApplication:
         client_config = ConnectionConfig(app_config.connection_string, app_config.service_bus_namespace)
         factory = ServiceBusClientFactory(client_config)
 
+        # A fused server publishes the transformer's output, so it uses the transformer's egress session.
+        sender_session_id = app_config.fused_egress_session_id or app_config.egress_session_id
         if app_config.egress_topic_name:
-            self.sender_client = factory.create_topic_sender_client(
-                app_config.egress_topic_name, app_config.egress_session_id
-            )
+            self.sender_client = factory.create_topic_sender_client(app_config.egress_topic_name, sender_session_id)
             logger.info(f"Configured to send messages to topic: {app_config.egress_topic_name}")
         elif app_config.egress_queue_name:
-            self.sender_client = factory.create_queue_sender_client(
-                app_config.egress_queue_name, app_config.egress_session_id
-            )
+            self.sender_client = factory.create_queue_sender_client(app_config.egress_queue_name, sender_session_id)
             logger.info(f"Configured to send messages to queue: {app_config.egress_queue_name}")
 
         self.message_store_client = factory.create_message_store_client(
@@ -83,6 +87,23 @@ class Hl7ServerApplication:
         flow_name = app_config.hl7_validation_flow
         standard_version = app_config.hl7_validation_standard
 
+        if app_config.validation_cache_max_bytes:
+            self.validation_cache = ValidationResultCache(
+                max_bytes=app_config.validation_cache_max_bytes, metric_sink=self.metric_sender
+            )
+            logger.info(
+                "Validation result cache enabled with a limit of %d bytes", app_config.validation_cache_max_bytes
+            )
+
+        if app_config.fused_transformer and app_config.fused_transformer_microservice_id:
+            # Only a server image that also installs the flow's transformer package can host it.
+            from transformer_base_lib import FusedTransformer  # noqa: PLC0415
+
+            self.fused_transformer = FusedTransformer.load(
+                app_config.fused_transformer, app_config.workflow_id, app_config.fused_transformer_microservice_id
+            )
+            logger.info("Messages will be transformed in-process by %s", self.fused_transformer.name)
+
         generic_handler_args = (
             GenericHandler,
             self.sender_client,
@@ -95,6 +116,8 @@ class Hl7ServerApplication:
             app_config.egress_session_id,
             flow_name,
             standard_version,
+            self.validation_cache,
+            self.fused_transformer,
         )
 
         handlers = {
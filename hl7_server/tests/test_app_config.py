@@ -210,10 +210,63 @@ class TestAppConfig(unittest.TestCase):
         self.assertIsNone(config.health_check_port)
         self.assertIsNone(config.hl7_validation_flow)
         self.assertIsNone(config.hl7_validation_standard)
+        self.assertIsNone(config.validation_cache_max_bytes)
+        self.assertIsNone(config.fused_transformer)
 
         # Verify message size uses default when not configured
         self.assertEqual(config.max_message_size_bytes, DEFAULT_MAX_MESSAGE_SIZE_BYTES)
 
+    @patch("hl7_server.app_config.os.getenv")
+    def test_read_env_config_validation_cache_size(self, mock_getenv: Mock) -> None:
+        base_values: Dict[str, str] = {
+            "EGRESS_QUEUE_NAME": "egress_queue",
+            "EGRESS_SESSION_ID": "test-session",
+            "WORKFLOW_ID": "test-workflow",
+            "MICROSERVICE_ID": "test-microservice",
+            "HEALTH_BOARD": "test-health-board",
+            "PEER_SERVICE": "test-service",
+        }
+        # Zero or negative sizes leave the cache disabled
+        for configured, expected in [("33554432", 33554432), ("0", None), ("-1", None)]:
+            with self.subTest(configured=configured):
+                values = {**base_values, "VALIDATION_CACHE_MAX_BYTES": configured}
+                mock_getenv.side_effect = values.get
+
+                config = AppConfig.read_env_config()
+
+                self.assertEqual(config.validation_cache_max_bytes, expected)
+
+    @patch("hl7_server.app_config.os.getenv")
+    def test_read_env_config_fused_transformer(self, mock_getenv: Mock) -> None:
+        values: Dict[str, str] = {
+            "EGRESS_QUEUE_NAME": "mpi-sender-ingress",
+            "EGRESS_SESSION_ID": "phw-to-mpi",
+            "WORKFLOW_ID": "phw-to-mpi",
+            "MICROSERVICE_ID": "phw_hl7_server",
+            "HEALTH_BOARD": "PHW",
+            "PEER_SERVICE": "MPI",
+            "FUSED_TRANSFORMER": "hl7_phw_transformer.phw_transformer:PhwTransformer",
+            "FUSED_TRANSFORMER_MICROSERVICE_ID": "phw_hl7_transformer",
+            "FUSED_EGRESS_SESSION_ID": "mpi",
+        }
+        mock_getenv.side_effect = values.get
+
+        config = AppConfig.read_env_config()
+
+        self.assertEqual(config.fused_transformer, "hl7_phw_transformer.phw_transformer:PhwTransformer")
+        self.assertEqual(config.fused_transformer_microservice_id, "phw_hl7_transformer")
+        self.assertEqual(config.fused_egress_session_id, "mpi")
+        self.assertEqual(config.egress_session_id, "phw-to-mpi")
+
+        del values["FUSED_TRANSFORMER_MICROSERVICE_ID"]
+        with self.assertRaises(RuntimeError):
+            AppConfig.read_env_config()
+
+        del values["FUSED_TRANSFORMER"]
+        config = AppConfig.read_env_config()
+        self.assertIsNone(config.fused_transformer)
+        self.assertIsNone(config.fused_egress_session_id)
+
 
 if __name__ == "__main__":
     unittest.main()
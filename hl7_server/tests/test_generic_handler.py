@@ -103,6 +103,51 @@ class TestGenericHandler(unittest.TestCase):
         mock_logger.error.assert_called_once_with(f"HL7 validation error: {exception}")
         self.mock_event_logger.log_message_failed.assert_called_once_with(message, f"HL7 validation error: {exception}")
 
+    def _fused_handler(self, fused_transformer: MagicMock) -> GenericHandler:
+        return GenericHandler(
+            VALID_A28_MESSAGE,
+            self.mock_sender,
+            self.mock_event_logger,
+            self.mock_metric_sender,
+            self.validator,
+            workflow_id="test-workflow",
+            sending_app="252",
+            message_store_client=self.mock_message_store,
+            egress_session_id="test-session",
+            fused_transformer=fused_transformer,
+        )
+
+    def test_fused_transformer_publishes_instead_of_the_original(self) -> None:
+        fused_transformer = MagicMock()
+
+        with patch(ACK_BUILDER_ATTRIBUTE):
+            self._fused_handler(fused_transformer).reply()
+
+        self.mock_sender.send_text_message.assert_not_called()
+        fused_transformer.transform_and_send.assert_called_once_with(
+            VALID_A28_MESSAGE, ANY, self.mock_sender, flat_message=ANY, message_id="202505052323364444"
+        )
+        properties = fused_transformer.transform_and_send.call_args[0][1]
+        self.assertEqual(properties["SourceSystem"], "252")
+        flat_message = fused_transformer.transform_and_send.call_args[1]["flat_message"]
+        self.assertEqual(flat_message.msh.msh_10.value, "202505052323364444")
+        # The original message is still stored, with the server's session id.
+        self.mock_message_store.send_to_store.assert_called_once()
+        self.assertEqual(self.mock_message_store.send_to_store.call_args[1]["raw_payload"], VALID_A28_MESSAGE)
+        self.assertEqual(self.mock_message_store.send_to_store.call_args[1]["session_id"], "test-session")
+
+    def test_fused_transformer_failure_is_not_acknowledged(self) -> None:
+        fused_transformer = MagicMock()
+        fused_transformer.transform_and_send.side_effect = RuntimeError("transformation failed")
+
+        with patch(ACK_BUILDER_ATTRIBUTE) as mock_builder:
+            with self.assertRaises(RuntimeError):
+                self._fused_handler(fused_transformer).reply()
+
+        mock_builder.return_value.build_ack.assert_not_called()
+        self.mock_message_store.send_to_store.assert_called_once()
+        self.mock_event_logger.log_message_failed.assert_called_once()
+
     def test_message_sent_to_service_bus(self) -> None:
         self.handler.reply()
 
@@ -442,6 +487,31 @@ class TestGenericHandler(unittest.TestCase):
         failed_call_args = self.mock_event_logger.log_message_failed.call_args_list[0][0]
         self.assertIn("CorrelationId:", failed_call_args[1])
 
+    @patch("hl7_server.generic_handler.validate_and_convert_parsed_message_with_flow_schema")
+    def test_validation_cache_is_used_when_configured(self, mock_validate_flow: MagicMock) -> None:
+        validation_cache = MagicMock()
+        validation_cache.validate_and_convert.return_value = MagicMock(is_valid=True, xml_string="<xml/>")
+
+        with patch(ACK_BUILDER_ATTRIBUTE):
+            handler = GenericHandler(
+                VALID_A28_MESSAGE,
+                self.mock_sender,
+                self.mock_event_logger,
+                self.mock_metric_sender,
+                self.validator,
+                workflow_id="test-workflow",
+                sending_app="252",
+                message_store_client=self.mock_message_store,
+                egress_session_id="test-session",
+                flow_name="phw",
+                validation_cache=validation_cache,
+            )
+            handler.reply()
+
+        mock_validate_flow.assert_not_called()
+        validation_cache.validate_and_convert.assert_called_once_with(VALID_A28_MESSAGE, "phw", parsed_message=ANY)
+        self.assertEqual(self.mock_message_store.send_to_store.call_args.kwargs["xml_payload"], "<xml/>")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,6 @@
 import os
 import signal
+import sys
 import unittest
 from typing import Dict
 from unittest.mock import MagicMock, patch
@@ -150,6 +151,38 @@ class TestHl7ServerApplicationQueue(unittest.TestCase):
 
         self._assert_shutdown(server, thread, health_check)
 
+    def test_fused_transformer_is_passed_to_handlers(
+        self,
+        mock_thread: MagicMock,
+        mock_factory: MagicMock,
+        mock_mllp_server: MagicMock,
+        mock_health_check: MagicMock,
+    ) -> None:
+        server, thread, health_check = self._setup_mocks(mock_thread, mock_mllp_server, mock_health_check)
+        mock_factory_instance = mock_factory.return_value
+        # transformer_base_lib is only installed in server images that host a transformer.
+        transformer_base_lib = MagicMock()
+        fused_env = {
+            "FUSED_TRANSFORMER": "hl7_phw_transformer.phw_transformer:PhwTransformer",
+            "FUSED_TRANSFORMER_MICROSERVICE_ID": "test-transformer",
+            "FUSED_EGRESS_SESSION_ID": "fused-session",
+        }
+
+        with patch.dict(os.environ, fused_env), patch.dict(sys.modules, {"transformer_base_lib": transformer_base_lib}):
+            self.app.start_server()
+
+        load = transformer_base_lib.FusedTransformer.load
+        load.assert_called_once_with(
+            "hl7_phw_transformer.phw_transformer:PhwTransformer", "test-workflow", "test-transformer"
+        )
+        mock_factory_instance.create_queue_sender_client.assert_called_once_with("egress_queue", "fused-session")
+        handlers = mock_mllp_server.call_args[0][2]
+        self.assertIs(handlers["ADT^A31^ADT_A05"][-1], load.return_value)
+
+        self.app.stop_server()
+
+        self._assert_shutdown(server, thread, health_check)
+
 
 @patch.dict(os.environ, ENV_VARS_TOPIC)
 @patch("hl7_server.hl7_server_application.TCPHealthCheckServer")
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+import json
 import os
+from collections.abc import Mapping
 from dataclasses import dataclass
 
+# Settings every destination in a process shares.
+SHARED_SETTINGS = frozenset(
+    {"SERVICE_BUS_CONNECTION_STRING", "SERVICE_BUS_NAMESPACE", "HEALTH_CHECK_HOST", "HEALTH_CHECK_PORT"}
+)
+
 
 @dataclass
 class AppConfig:
@@ -21,49 +28,107 @@ class AppConfig:
     max_messages_per_minute: int | None
     ingress_topic_name: str
     ingress_subscription_name: str
+    mllp_pool_size: int | None = None
+    mllp_idle_timeout_seconds: int = 300
+    mllp_probe_interval_seconds: int = 10
+    mllp_keepalive_idle_seconds: int = 60
+    throttle_burst: int = 1
+    min_messages_per_minute: int | None = None
+    throttle_latency_threshold_seconds: int = 5
+    circuit_breaker_failure_threshold: int | None = None
+    circuit_breaker_probe_interval_seconds: int = 5
+    circuit_breaker_probe_message: str | None = None
 
     @staticmethod
-    def read_env_config() -> AppConfig:
+    def read_env_config(overrides: Mapping[str, str] | None = None) -> AppConfig:
+        """Read the configuration from the environment, with ``overrides`` taking precedence over it."""
         return AppConfig(
-            connection_string=_read_env("SERVICE_BUS_CONNECTION_STRING"),
-            ingress_session_id=_read_env("INGRESS_SESSION_ID"),
-            service_bus_namespace=_read_env("SERVICE_BUS_NAMESPACE"),
-            receiver_mllp_hostname=_read_required_env("RECEIVER_MLLP_HOST"),
-            receiver_mllp_port=_read_required_int_env("RECEIVER_MLLP_PORT"),
-            health_check_hostname=_read_env("HEALTH_CHECK_HOST"),
-            health_check_port=_read_int_env("HEALTH_CHECK_PORT"),
-            workflow_id=_read_required_env("WORKFLOW_ID"),
-            microservice_id=_read_required_env("MICROSERVICE_ID"),
-            health_board=_read_required_env("HEALTH_BOARD"),
-            peer_service=_read_required_env("PEER_SERVICE"),
-            ack_timeout_seconds=_read_int_env("ACK_TIMEOUT_SECONDS") or 30,
-            max_messages_per_minute=_read_positive_int_env("MAX_MESSAGES_PER_MINUTE"),
-            ingress_topic_name=_read_required_env("INGRESS_TOPIC_NAME"),
-            ingress_subscription_name=_read_required_env("INGRESS_SUBSCRIPTION_NAME"),
+            connection_string=_read_env("SERVICE_BUS_CONNECTION_STRING", overrides),
+            ingress_session_id=_read_env("INGRESS_SESSION_ID", overrides),
+            service_bus_namespace=_read_env("SERVICE_BUS_NAMESPACE", overrides),
+            receiver_mllp_hostname=_read_required_env("RECEIVER_MLLP_HOST", overrides),
+            receiver_mllp_port=_read_required_int_env("RECEIVER_MLLP_PORT", overrides),
+            health_check_hostname=_read_env("HEALTH_CHECK_HOST", overrides),
+            health_check_port=_read_int_env("HEALTH_CHECK_PORT", overrides),
+            workflow_id=_read_required_env("WORKFLOW_ID", overrides),
+            microservice_id=_read_required_env("MICROSERVICE_ID", overrides),
+            health_board=_read_required_env("HEALTH_BOARD", overrides),
+            peer_service=_read_required_env("PEER_SERVICE", overrides),
+            ack_timeout_seconds=_read_int_env("ACK_TIMEOUT_SECONDS", overrides) or 30,
+            max_messages_per_minute=_read_positive_int_env("MAX_MESSAGES_PER_MINUTE", overrides),
+            ingress_topic_name=_read_required_env("INGRESS_TOPIC_NAME", overrides),
+            ingress_subscription_name=_read_required_env("INGRESS_SUBSCRIPTION_NAME", overrides),
+            mllp_pool_size=_read_positive_int_env("MLLP_POOL_SIZE", overrides),
+            mllp_idle_timeout_seconds=_read_positive_int_env("MLLP_IDLE_TIMEOUT_SECONDS", overrides) or 300,
+            mllp_probe_interval_seconds=_read_positive_int_env("MLLP_PROBE_INTERVAL_SECONDS", overrides) or 10,
+            mllp_keepalive_idle_seconds=_read_positive_int_env("MLLP_KEEPALIVE_IDLE_SECONDS", overrides) or 60,
+            throttle_burst=_read_positive_int_env("THROTTLE_BURST", overrides) or 1,
+            min_messages_per_minute=_read_positive_int_env("MIN_MESSAGES_PER_MINUTE", overrides),
+            throttle_latency_threshold_seconds=(
+                _read_positive_int_env("THROTTLE_LATENCY_THRESHOLD_SECONDS", overrides) or 5
+            ),
+            circuit_breaker_failure_threshold=_read_positive_int_env("CIRCUIT_BREAKER_FAILURE_THRESHOLD", overrides),
+            circuit_breaker_probe_interval_seconds=(
+                _read_positive_int_env("CIRCUIT_BREAKER_PROBE_INTERVAL_SECONDS", overrides) or 5
+            ),
+            circuit_breaker_probe_message=_read_env("CIRCUIT_BREAKER_PROBE_MESSAGE", overrides),
         )
 
+    @staticmethod
+    def read_destination_configs() -> list[AppConfig]:
+        """
+        Read one configuration per destination.
+
+        ``DESTINATIONS`` holds a JSON list of objects, each mapping environment variable names to the values that
+        destination uses instead of the environment's, for example its subscription, receiver and throttle rate.
+        Service Bus and health check settings are shared, so they cannot be overridden. Without ``DESTINATIONS`` the
+        environment describes a single destination.
+        """
+        destinations = _read_env("DESTINATIONS")
+        if destinations is None:
+            return [AppConfig.read_env_config()]
+
+        try:
+            entries = json.loads(destinations)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"DESTINATIONS is not valid JSON: {e}")
+        if not isinstance(entries, list) or not entries or not all(isinstance(entry, dict) for entry in entries):
+            raise ValueError("DESTINATIONS must be a non-empty JSON list of objects")
+        for entry in entries:
+            shared = SHARED_SETTINGS.intersection(entry)
+            if shared:
+                raise ValueError(f"DESTINATIONS cannot override shared settings: {', '.join(sorted(shared))}")
+
+        configs = [AppConfig.read_env_config({name: str(value) for name, value in entry.items()}) for entry in entries]
+        subscriptions = [(c.ingress_topic_name, c.ingress_subscription_name, c.ingress_session_id) for c in configs]
+        if len(set(subscriptions)) != len(subscriptions):
+            raise ValueError("DESTINATIONS must not read the same subscription more than once")
+        return configs
+
 
-def _read_env(name: str) -> str | None:
+def _read_env(name: str, overrides: Mapping[str, str] | None = None) -> str | None:
+    if overrides is not None and name in overrides:
+        return overrides[name]
     return os.getenv(name)
 
 
-def _read_required_env(name: str) -> str:
-    value = os.getenv(name)
+def _read_required_env(name: str, overrides: Mapping[str, str] | None = None) -> str:
+    value = _read_env(name, overrides)
     if value is None or value.strip() == "":
         raise RuntimeError(f"Missing required configuration: {name}")
     else:
         return value
 
 
-def _read_int_env(name: str) -> int | None:
-    value = os.getenv(name)
+def _read_int_env(name: str, overrides: Mapping[str, str] | None = None) -> int | None:
+    value = _read_env(name, overrides)
     if value is None:
         return None
     return int(value)
 
 
-def _read_positive_int_env(name: str) -> int | None:
-    value = _read_int_env(name)
+def _read_positive_int_env(name: str, overrides: Mapping[str, str] | None = None) -> int | None:
+    value = _read_int_env(name, overrides)
     if value is None:
         return None
     if value <= 0:
@@ -71,8 +136,8 @@ def _read_positive_int_env(name: str) -> int | None:
     return value
 
 
-def _read_required_int_env(name: str) -> int:
-    value = _read_required_env(name)
+def _read_required_int_env(name: str, overrides: Mapping[str, str] | None = None) -> int:
+    value = _read_required_env(name, overrides)
     try:
         return int(value)
     except ValueError:
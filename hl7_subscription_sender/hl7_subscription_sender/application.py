@@ -1,6 +1,10 @@
 import configparser
 import logging
 import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Callable
 
 from azure.servicebus import ServiceBusMessage
 from event_logger_lib import EventLogger
@@ -11,12 +15,12 @@ from message_bus_lib.metadata_utils import correlation_id_for_logger, extract_me
 from message_bus_lib.servicebus_client_factory import ServiceBusClientFactory
 from message_bus_lib.subscription_receiver_client import SubscriptionReceiverClient
 from metric_sender_lib.metric_sender import MetricSender
-from processor_manager_lib import ProcessorManager
+from mllp_lib import MLLPConnectionPool
+from processor_manager_lib import CircuitBreaker, MessageThrottler, ProcessorManager, StageTimer
 
 from hl7_subscription_sender.ack_processor import get_ack_result
 from hl7_subscription_sender.app_config import AppConfig
 from hl7_subscription_sender.hl7_subscription_sender_client import HL7SubscriptionSenderClient
-from hl7_subscription_sender.message_throttler import MessageThrottler
 
 logging.basicConfig(level=os.environ.get("LOG_LEVEL", "ERROR").upper())
 azure_log_level_str = os.environ.get("AZURE_LOG_LEVEL", "WARN").upper()
@@ -60,14 +64,63 @@ def _calculate_batch_size(throttler: MessageThrottler) -> int:
 def main() -> None:
     processor_manager = ProcessorManager()
 
-    app_config = AppConfig.read_env_config()
-    client_config = ConnectionConfig(app_config.connection_string, app_config.service_bus_namespace)
+    app_configs = AppConfig.read_destination_configs()
+    # Service Bus and health check settings are the same for every destination.
+    shared_config = app_configs[0]
+    client_config = ConnectionConfig(shared_config.connection_string, shared_config.service_bus_namespace)
     factory = ServiceBusClientFactory(client_config)
+
+    with TCPHealthCheckServer(
+        shared_config.health_check_hostname, shared_config.health_check_port
+    ) as health_check_server:
+        health_check_server.start()
+        if len(app_configs) == 1:
+            _run_destination(shared_config, factory, processor_manager)
+        else:
+            _run_destinations(app_configs, factory, processor_manager)
+
+
+def _run_destinations(
+    app_configs: list[AppConfig], factory: ServiceBusClientFactory, processor_manager: ProcessorManager
+) -> None:
+    """Run each destination on its own thread, stopping them all if any of them fails."""
+    failures: list[Exception] = []
+
+    def run(app_config: AppConfig) -> None:
+        try:
+            with factory.create_worker_factory() as worker_factory:
+                _run_destination(app_config, worker_factory, processor_manager)
+        except Exception as e:
+            logger.exception("Sending to subscription %s failed, stopping", app_config.ingress_subscription_name)
+            failures.append(e)
+            processor_manager.stop()
+
+    workers = [
+        threading.Thread(target=run, args=(app_config,), name=app_config.ingress_subscription_name)
+        for app_config in app_configs
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    if failures:
+        raise RuntimeError(f"{len(failures)} of {len(workers)} destination(s) failed") from failures[0]
+
+
+def _run_destination(
+    app_config: AppConfig, factory: ServiceBusClientFactory, processor_manager: ProcessorManager
+) -> None:
     event_logger = EventLogger(app_config.workflow_id, app_config.microservice_id)
     metric_sender = MetricSender(
         app_config.workflow_id, app_config.microservice_id, app_config.health_board, app_config.peer_service
     )
-    throttler = MessageThrottler(app_config.max_messages_per_minute)
+    throttler = MessageThrottler(
+        app_config.max_messages_per_minute,
+        burst=app_config.throttle_burst,
+        min_messages_per_minute=app_config.min_messages_per_minute,
+        latency_threshold_seconds=app_config.throttle_latency_threshold_seconds,
+        metric_sender=metric_sender,
+    )
 
     logger.info(
         f"Connecting to Azure Service Bus subscription: "
@@ -79,30 +132,68 @@ def main() -> None:
             app_config.ingress_topic_name,
             app_config.ingress_subscription_name,
             app_config.ingress_session_id,
+            time_settling=True,
         ) as subscription_receiver_client,
+        (
+            MLLPConnectionPool(
+                app_config.receiver_mllp_hostname,
+                app_config.receiver_mllp_port,
+                app_config.ack_timeout_seconds,
+                size=app_config.mllp_pool_size,
+                idle_timeout_seconds=app_config.mllp_idle_timeout_seconds,
+                probe_interval_seconds=app_config.mllp_probe_interval_seconds,
+                keepalive_idle_seconds=app_config.mllp_keepalive_idle_seconds,
+            )
+            if app_config.mllp_pool_size
+            else nullcontext()
+        ) as mllp_pool,
         HL7SubscriptionSenderClient(
             app_config.receiver_mllp_hostname,
             app_config.receiver_mllp_port,
             app_config.ack_timeout_seconds,
+            pool=mllp_pool,
         ) as hl7_subscription_sender_client,
-        TCPHealthCheckServer(app_config.health_check_hostname, app_config.health_check_port) as health_check_server,
     ):
         logger.info("Subscription processor started.")
-        health_check_server.start()
 
         batch_size = _calculate_batch_size(throttler)
+        circuit_breaker = (
+            CircuitBreaker(
+                app_config.circuit_breaker_failure_threshold,
+                _destination_probe(hl7_subscription_sender_client, app_config.circuit_breaker_probe_message),
+                probe_interval_seconds=app_config.circuit_breaker_probe_interval_seconds,
+                metric_sender=metric_sender,
+            )
+            if app_config.circuit_breaker_failure_threshold
+            else None
+        )
 
         while processor_manager.is_running:
-            subscription_receiver_client.receive_messages(
-                batch_size,
-                lambda message: _process_message(
-                    message,
-                    hl7_subscription_sender_client,
-                    event_logger,
-                    metric_sender,
-                    throttler,
-                ),
-            )
+            if circuit_breaker is None or circuit_breaker.wait_until_closed(
+                lambda: processor_manager.is_running, on_closed=subscription_receiver_client.clear_retry_delay
+            ):
+                subscription_receiver_client.receive_messages(
+                    batch_size,
+                    lambda message: _process_message(
+                        message,
+                        hl7_subscription_sender_client,
+                        event_logger,
+                        metric_sender,
+                        throttler,
+                        circuit_breaker=circuit_breaker,
+                    ),
+                )
+
+
+def _destination_probe(
+    hl7_subscription_sender_client: HL7SubscriptionSenderClient, probe_message: str | None
+) -> Callable[[], bool]:
+    """Check the receiver by connecting to it, or by sending ``probe_message`` and expecting a positive ACK."""
+    if probe_message is None:
+        return hl7_subscription_sender_client.check_connection
+    # Segments may be separated by newlines in the environment variable.
+    er7 = "\r".join(probe_message.splitlines())
+    return lambda: get_ack_result(hl7_subscription_sender_client.send_message(er7))
 
 
 def _process_message(
@@ -111,7 +202,9 @@ def _process_message(
     event_logger: EventLogger,
     metric_sender: MetricSender,
     throttler: MessageThrottler,
+    circuit_breaker: CircuitBreaker | None = None,
 ) -> bool:
+    stage_timer = StageTimer(metric_sender)
     message_body = b"".join(message.body).decode("utf-8")
     metadata: dict[str, str] | None = extract_metadata(message)
     meta = get_metadata_log_values(metadata)
@@ -133,11 +226,20 @@ def _process_message(
         msh_segment = hl7_msg.msh
         message_id = msh_segment.msh_10.value
         logger.info(f"Message ID: {message_id}")
+        stage_timer.mark("prepare")
 
         throttler.wait_if_needed()
-        ack_response = hl7_subscription_sender_client.send_message(message_body)
+        stage_timer.mark("throttle")
+        sent_at = time.monotonic()
+        ack_response = hl7_subscription_sender_client.send_message(message_body, stage_timer=stage_timer)
+        latency_seconds = time.monotonic() - sent_at
+        stage_timer.mark("ack_wait")
 
         ack_success = get_ack_result(ack_response)
+        stage_timer.mark("ack_parse")
+        throttler.record_ack(ack_success, latency_seconds)
+        if circuit_breaker is not None:
+            circuit_breaker.record_success()
 
         if ack_success:
             metric_sender.send_message_sent_metric()
@@ -148,10 +250,15 @@ def _process_message(
             correlation_id=correlation_id_opt,
         )
         logger.info(f"Sent message: {message_id}")
+        stage_timer.mark("record")
 
         return ack_success
 
     except (TimeoutError, ConnectionError) as e:
+        stage_timer.mark("ack_wait")
+        throttler.record_ack(False)
+        if circuit_breaker is not None:
+            circuit_breaker.record_failure()
         error_msg = f"Failed to send message {message_id}: {e}"
         logger.error(error_msg)
 
@@ -161,6 +268,7 @@ def _process_message(
             "Message sending failed - connection/timeout error",
             correlation_id=correlation_id_opt,
         )
+        stage_timer.mark("record")
 
         return False
 
@@ -176,6 +284,9 @@ def _process_message(
         )
         return False
 
+    finally:
+        stage_timer.finish()
+
 
 if __name__ == "__main__":
     main()
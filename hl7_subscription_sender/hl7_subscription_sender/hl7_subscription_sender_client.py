@@ -1,42 +1,37 @@
+from __future__ import annotations
+
 import logging
-import os
-import select
 import socket
-from typing import Any, Optional, Type
+from typing import TYPE_CHECKING, Any, Optional, Type
 
 from hl7.client import MLLPClient
 from hl7apy.consts import MLLP_ENCODING_CHARS
+from mllp_lib import is_socket_closed
+
+if TYPE_CHECKING:
+    from mllp_lib import MLLPConnectionPool
+    from processor_manager_lib import StageTimer
 
 logger = logging.getLogger(__name__)
 ENCODING_CHARS = MLLP_ENCODING_CHARS.SB + MLLP_ENCODING_CHARS.EB + MLLP_ENCODING_CHARS.CR
-WINDOWS_OS = "nt"
-
-
-def is_socket_closed(sock: socket.socket) -> bool:
-    try:
-        # Check if the socket is readable (may indicate data or EOF)
-        readable, _, _ = select.select([sock], [], [], 0)
-        if readable:
-            # this will try to read bytes without blocking and also without removing them from buffer (peek only)
-            flags = socket.MSG_PEEK if os.name == WINDOWS_OS else socket.MSG_DONTWAIT | socket.MSG_PEEK
-            data = sock.recv(16, flags)
-            return len(data) == 0
-        return False  # no data, but socket is fine
-    except BlockingIOError:
-        return False  # socket is open and reading from it would block
-    except ConnectionResetError:
-        return True  # socket was closed for some other reason
-    except Exception:
-        logger.exception("unexpected exception when checking if a socket is closed")
-        return False
 
 
 class HL7SubscriptionSenderClient:
-    def __init__(self, receiver_mllp_hostname: str, receiver_mllp_port: int, ack_timeout_seconds: int):
+    def __init__(
+        self,
+        receiver_mllp_hostname: str,
+        receiver_mllp_port: int,
+        ack_timeout_seconds: int,
+        pool: Optional[MLLPConnectionPool] = None,
+    ):
         self.receiver_mllp_hostname = receiver_mllp_hostname
         self.receiver_mllp_port = receiver_mllp_port
         self.ack_timeout_seconds = ack_timeout_seconds
-        self.mllp_client: MLLPClient = self._create_mllp_client()
+        # With a pool, connections are taken from it for each send and its background prober checks them, so
+        # there is no per-send socket check and no connection of this client's own.
+        self.pool = pool
+        if pool is None:
+            self.mllp_client: MLLPClient = self._create_mllp_client()
 
     def _close_mllp_client(self) -> None:
         try:
@@ -53,10 +48,23 @@ class HL7SubscriptionSenderClient:
         self._close_mllp_client()
         return self._create_mllp_client()
 
-    def send_message(self, message: str, _retry_attempted: bool = False) -> str:
+    def send_message(
+        self, message: str, _retry_attempted: bool = False, stage_timer: Optional[StageTimer] = None
+    ) -> str:
+        """
+        Send ``message`` and return its ACK.
+
+        With ``stage_timer``, the time until a connection is ready is marked as the "connect" stage. The caller marks
+        the rest, writing the message and waiting for its ACK.
+        """
+        if self.pool is not None:
+            return self._send_pooled_message(self.pool, message, _retry_attempted, stage_timer)
+
         if is_socket_closed(self.mllp_client.socket):
             logger.info("creating new MLLP client connection")
             self.mllp_client = self._close_and_create_new_mllp_client()
+        if stage_timer is not None:
+            stage_timer.mark("connect")
 
         try:
             ack_response = self.mllp_client.send_message(message).decode("utf-8")
@@ -65,15 +73,63 @@ class HL7SubscriptionSenderClient:
         except socket.timeout:
             if not _retry_attempted:
                 logger.warning("Socket timeout occurred, attempting retry with new connection...")
+                if stage_timer is not None:
+                    stage_timer.mark("ack_wait")
                 self.mllp_client = self._close_and_create_new_mllp_client()
-                return self.send_message(message, _retry_attempted=True)
+                return self.send_message(message, _retry_attempted=True, stage_timer=stage_timer)
             self._close_mllp_client()
             raise TimeoutError(f"No ACK received within {self.ack_timeout_seconds} seconds")
         except Exception as e:
             self.mllp_client = self._close_and_create_new_mllp_client()
             raise ConnectionError(f"Connection error while sending message: {e}")
 
-    def __enter__(self) -> "HL7SubscriptionSenderClient":
+    def _send_pooled_message(
+        self,
+        pool: MLLPConnectionPool,
+        message: str,
+        retry_attempted: bool,
+        stage_timer: Optional[StageTimer] = None,
+    ) -> str:
+        try:
+            mllp_client = pool.acquire()
+        except Exception as e:
+            raise ConnectionError(f"Connection error while sending message: {e}")
+        if stage_timer is not None:
+            stage_timer.mark("connect")
+
+        try:
+            ack_response = mllp_client.send_message(message).decode("utf-8")
+        except socket.timeout:
+            pool.discard(mllp_client)
+            if not retry_attempted:
+                logger.warning("Socket timeout occurred, attempting retry with new connection...")
+                if stage_timer is not None:
+                    stage_timer.mark("ack_wait")
+                return self._send_pooled_message(pool, message, True, stage_timer)
+            raise TimeoutError(f"No ACK received within {self.ack_timeout_seconds} seconds")
+        except Exception as e:
+            pool.discard(mllp_client)
+            raise ConnectionError(f"Connection error while sending message: {e}")
+
+        if not ack_response:
+            # The receiver closed the connection between probes, so the message may not have been read.
+            pool.discard(mllp_client)
+            raise ConnectionError("Connection closed by the receiver before an ACK was received")
+        pool.release(mllp_client)
+        return ack_response.strip(ENCODING_CHARS)
+
+    def check_connection(self) -> bool:
+        """Return whether a connection to the receiver can be opened, without sending anything on it."""
+        try:
+            socket.create_connection(
+                (self.receiver_mllp_hostname, self.receiver_mllp_port), timeout=self.ack_timeout_seconds
+            ).close()
+        except OSError as e:
+            logger.debug(f"Connection check failed: {e}")
+            return False
+        return True
+
+    def __enter__(self) -> HL7SubscriptionSenderClient:
         return self
 
     def __exit__(
@@ -82,4 +138,5 @@ class HL7SubscriptionSenderClient:
         exc_val: Optional[BaseException],
         exc_tb: Optional[Any],
     ) -> None:
-        self.mllp_client.close()
+        if self.pool is None:
+            self.mllp_client.close()
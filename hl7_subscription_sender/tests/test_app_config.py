@@ -1,3 +1,4 @@
+import json
 import unittest
 from typing import Optional
 from unittest.mock import Mock, patch
@@ -37,9 +38,78 @@ class TestAppConfig(unittest.TestCase):
         self.assertEqual(config.health_board, "test health board")
         self.assertEqual(config.peer_service, "test-service")
         self.assertEqual(config.ack_timeout_seconds, 30)
+        self.assertIsNone(config.mllp_pool_size)
+        self.assertEqual(config.throttle_burst, 1)
+        self.assertIsNone(config.min_messages_per_minute)
+        self.assertIsNone(config.circuit_breaker_failure_threshold)
+        self.assertEqual(config.mllp_idle_timeout_seconds, 300)
         self.assertEqual(config.ingress_topic_name, "test-topic")
         self.assertEqual(config.ingress_subscription_name, "test-subscription")
 
+    @patch("hl7_subscription_sender.app_config.os.getenv")
+    def test_read_env_config_mllp_pool(self, mock_getenv: Mock) -> None:
+        values = {
+            "RECEIVER_MLLP_HOST": "localhost",
+            "RECEIVER_MLLP_PORT": "1234",
+            "WORKFLOW_ID": "test-workflow",
+            "MICROSERVICE_ID": "test-microservice",
+            "HEALTH_BOARD": "test health board",
+            "PEER_SERVICE": "test-service",
+            "INGRESS_TOPIC_NAME": "test-topic",
+            "INGRESS_SUBSCRIPTION_NAME": "test-subscription",
+            "MLLP_POOL_SIZE": "2",
+            "MLLP_IDLE_TIMEOUT_SECONDS": "120",
+            "MLLP_PROBE_INTERVAL_SECONDS": "5",
+            "MLLP_KEEPALIVE_IDLE_SECONDS": "30",
+        }
+        mock_getenv.side_effect = values.get
+
+        config = AppConfig.read_env_config()
+
+        self.assertEqual(config.mllp_pool_size, 2)
+        self.assertEqual(config.mllp_idle_timeout_seconds, 120)
+        self.assertEqual(config.mllp_probe_interval_seconds, 5)
+        self.assertEqual(config.mllp_keepalive_idle_seconds, 30)
+
+        values["MLLP_POOL_SIZE"] = "0"
+        with self.assertRaises(ValueError):
+            AppConfig.read_env_config()
+
+    @patch("hl7_subscription_sender.app_config.os.getenv")
+    def test_read_env_config_throttle_and_circuit_breaker(self, mock_getenv: Mock) -> None:
+        values = {
+            "RECEIVER_MLLP_HOST": "localhost",
+            "RECEIVER_MLLP_PORT": "1234",
+            "WORKFLOW_ID": "test-workflow",
+            "MICROSERVICE_ID": "test-microservice",
+            "HEALTH_BOARD": "test health board",
+            "PEER_SERVICE": "test-service",
+            "INGRESS_TOPIC_NAME": "test-topic",
+            "INGRESS_SUBSCRIPTION_NAME": "test-subscription",
+            "MAX_MESSAGES_PER_MINUTE": "120",
+            "THROTTLE_BURST": "5",
+            "MIN_MESSAGES_PER_MINUTE": "30",
+            "THROTTLE_LATENCY_THRESHOLD_SECONDS": "2",
+            "CIRCUIT_BREAKER_FAILURE_THRESHOLD": "3",
+            "CIRCUIT_BREAKER_PROBE_INTERVAL_SECONDS": "10",
+            "CIRCUIT_BREAKER_PROBE_MESSAGE": "MSH|^~\\&|PROBE",
+        }
+        mock_getenv.side_effect = values.get
+
+        config = AppConfig.read_env_config()
+
+        self.assertEqual(config.max_messages_per_minute, 120)
+        self.assertEqual(config.throttle_burst, 5)
+        self.assertEqual(config.min_messages_per_minute, 30)
+        self.assertEqual(config.throttle_latency_threshold_seconds, 2)
+        self.assertEqual(config.circuit_breaker_failure_threshold, 3)
+        self.assertEqual(config.circuit_breaker_probe_interval_seconds, 10)
+        self.assertEqual(config.circuit_breaker_probe_message, "MSH|^~\\&|PROBE")
+
+        values["THROTTLE_BURST"] = "0"
+        with self.assertRaises(ValueError):
+            AppConfig.read_env_config()
+
     @patch("hl7_subscription_sender.app_config.os.getenv")
     def test_read_env_config_missing_required_env_var_raises_error(self, mock_getenv: Mock) -> None:
         mock_getenv.return_value = None
@@ -47,6 +117,96 @@ class TestAppConfig(unittest.TestCase):
             AppConfig.read_env_config()
         self.assertIn("Missing required configuration", str(context.exception))
 
+    @patch("hl7_subscription_sender.app_config.os.getenv")
+    def test_read_destination_configs_without_destinations(self, mock_getenv: Mock) -> None:
+        values = {
+            "RECEIVER_MLLP_HOST": "localhost",
+            "RECEIVER_MLLP_PORT": "1234",
+            "WORKFLOW_ID": "test-workflow",
+            "MICROSERVICE_ID": "test-microservice",
+            "HEALTH_BOARD": "test health board",
+            "PEER_SERVICE": "test-service",
+            "INGRESS_TOPIC_NAME": "test-topic",
+            "INGRESS_SUBSCRIPTION_NAME": "test-subscription",
+        }
+        mock_getenv.side_effect = values.get
+
+        configs = AppConfig.read_destination_configs()
+
+        self.assertEqual(configs, [AppConfig.read_env_config()])
+
+    @patch("hl7_subscription_sender.app_config.os.getenv")
+    def test_read_destination_configs_overrides_the_environment(self, mock_getenv: Mock) -> None:
+        values = {
+            "WORKFLOW_ID": "test-workflow",
+            "MICROSERVICE_ID": "test-microservice",
+            "HEALTH_BOARD": "test health board",
+            "INGRESS_TOPIC_NAME": "test-topic",
+            "HEALTH_CHECK_PORT": "9000",
+            "MAX_MESSAGES_PER_MINUTE": "60",
+            "DESTINATIONS": json.dumps(
+                [
+                    {
+                        "INGRESS_SUBSCRIPTION_NAME": "sub-a",
+                        "RECEIVER_MLLP_HOST": "host-a",
+                        "RECEIVER_MLLP_PORT": 2575,
+                        "PEER_SERVICE": "service-a",
+                    },
+                    {
+                        "INGRESS_SUBSCRIPTION_NAME": "sub-b",
+                        "RECEIVER_MLLP_HOST": "host-b",
+                        "RECEIVER_MLLP_PORT": "2576",
+                        "PEER_SERVICE": "service-b",
+                        "MAX_MESSAGES_PER_MINUTE": "600",
+                    },
+                ]
+            ),
+        }
+        mock_getenv.side_effect = values.get
+
+        first, second = AppConfig.read_destination_configs()
+
+        self.assertEqual(
+            (first.ingress_subscription_name, first.receiver_mllp_hostname, first.receiver_mllp_port),
+            ("sub-a", "host-a", 2575),
+        )
+        self.assertEqual(first.max_messages_per_minute, 60)
+        self.assertEqual(second.peer_service, "service-b")
+        self.assertEqual(second.max_messages_per_minute, 600)
+        self.assertEqual(first.health_check_port, second.health_check_port)
+
+    @patch("hl7_subscription_sender.app_config.os.getenv")
+    def test_read_destination_configs_rejects_invalid_destinations(self, mock_getenv: Mock) -> None:
+        destination = {
+            "INGRESS_SUBSCRIPTION_NAME": "sub-a",
+            "RECEIVER_MLLP_HOST": "host-a",
+            "RECEIVER_MLLP_PORT": "2575",
+            "PEER_SERVICE": "service-a",
+        }
+        values = {
+            "WORKFLOW_ID": "test-workflow",
+            "MICROSERVICE_ID": "test-microservice",
+            "HEALTH_BOARD": "test health board",
+            "INGRESS_TOPIC_NAME": "test-topic",
+        }
+        mock_getenv.side_effect = values.get
+
+        for destinations in (
+            "not json",
+            "[]",
+            json.dumps(destination),
+            json.dumps([destination, destination]),
+            json.dumps([{**destination, "HEALTH_CHECK_PORT": "9001"}]),
+        ):
+            with self.subTest(destinations=destinations):
+                values["DESTINATIONS"] = destinations
+                with self.assertRaises(ValueError):
+                    AppConfig.read_destination_configs()
+
+        values["DESTINATIONS"] = json.dumps([{"INGRESS_SUBSCRIPTION_NAME": "sub-a"}])
+        with self.assertRaises(RuntimeError):
+            AppConfig.read_destination_configs()
+
 
 if __name__ == "__main__":
     unittest.main()
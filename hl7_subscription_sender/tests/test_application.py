@@ -1,5 +1,6 @@
 import unittest
-from unittest.mock import MagicMock, Mock, patch
+from dataclasses import replace
+from unittest.mock import MagicMock, Mock, call, patch
 
 from azure.servicebus import ServiceBusMessage  # type: ignore
 from hl7apy.core import Message  # type: ignore
@@ -9,6 +10,7 @@ from hl7_subscription_sender.application import (
     MAX_BATCH_SIZE,
     _calculate_batch_size,
     _process_message,
+    _run_destinations,
     main,
 )
 
@@ -77,6 +79,9 @@ class TestProcessMessage(unittest.TestCase):
         mock_event_logger.log_message_processed.assert_called_once()
         mock_metric_sender.send_message_sent_metric.assert_called_once()
         mock_throttler.wait_if_needed.assert_called_once()
+        mock_throttler.record_ack.assert_called_once()
+        self.assertTrue(mock_throttler.record_ack.call_args.args[0])
+        self.assertGreaterEqual(mock_throttler.record_ack.call_args.args[1], 0)
 
         self.assertTrue(result)
 
@@ -113,6 +118,7 @@ class TestProcessMessage(unittest.TestCase):
         mock_event_logger.log_message_processed.assert_called_once()
         mock_metric_sender.send_message_sent_metric.assert_not_called()
         mock_throttler.wait_if_needed.assert_called_once()
+        self.assertFalse(mock_throttler.record_ack.call_args.args[0])
 
         self.assertFalse(result)
 
@@ -147,6 +153,7 @@ class TestProcessMessage(unittest.TestCase):
 
                 self._assert_error_handling(result, mock_event_logger, mock_metric_sender)
                 mock_throttler.wait_if_needed.assert_called_once()
+                mock_throttler.record_ack.assert_called_once_with(False)
 
     @patch("hl7_subscription_sender.application.parse_message")
     def test_process_message_unexpected_error(self, mock_parse_message: Mock) -> None:
@@ -191,9 +198,42 @@ class TestProcessMessage(unittest.TestCase):
         mock_health_check_ctx = MagicMock()
         mock_health_check_ctx.__enter__.return_value = mock_health_server
         mock_health_check.return_value = mock_health_check_ctx
-        mock_app_config.read_env_config.return_value = AppConfig(
+        mock_app_config.read_destination_configs.return_value = [
+            AppConfig(
+                connection_string=None,
+                ingress_session_id="test-session-id",
+                service_bus_namespace=None,
+                receiver_mllp_hostname="test-hostname",
+                receiver_mllp_port=2575,
+                health_check_hostname="localhost",
+                health_check_port=9000,
+                workflow_id="test_workflow_id",
+                microservice_id="test_microservice_id",
+                health_board="test-health-board",
+                peer_service="test-service",
+                ack_timeout_seconds=30,
+                max_messages_per_minute=None,
+                ingress_topic_name="test-topic",
+                ingress_subscription_name="test-subscription",
+            )
+        ]
+        with patch("hl7_subscription_sender.application.ProcessorManager") as mock_processor_manager:
+            mock_instance = mock_processor_manager.return_value
+            mock_instance.is_running = False
+
+            main()
+
+            mock_health_check.assert_called_once_with("localhost", 9000)
+            mock_health_server.start.assert_called_once()
+            mock_health_check_ctx.__exit__.assert_called_once()
+            mock_hl7_subscription_sender_client.assert_called_once_with("test-hostname", 2575, 30, pool=None)
+
+
+class TestRunDestinations(unittest.TestCase):
+    def setUp(self) -> None:
+        app_config = AppConfig(
             connection_string=None,
-            ingress_session_id="test-session-id",
+            ingress_session_id=None,
             service_bus_namespace=None,
             receiver_mllp_hostname="test-hostname",
             receiver_mllp_port=2575,
@@ -208,15 +248,90 @@ class TestProcessMessage(unittest.TestCase):
             ingress_topic_name="test-topic",
             ingress_subscription_name="test-subscription",
         )
-        with patch("hl7_subscription_sender.application.ProcessorManager") as mock_processor_manager:
-            mock_instance = mock_processor_manager.return_value
-            mock_instance.is_running = False
+        self.app_configs = [replace(app_config, ingress_subscription_name=name) for name in ("sub-a", "sub-b")]
+        self.factory = MagicMock()
+        self.processor_manager = MagicMock()
+
+    @patch("hl7_subscription_sender.application._run_destination")
+    def test_each_destination_runs_with_its_own_worker_factory(self, mock_run_destination: Mock) -> None:
+        _run_destinations(self.app_configs, self.factory, self.processor_manager)
+
+        self.assertEqual(self.factory.create_worker_factory.call_count, 2)
+        worker_factory = self.factory.create_worker_factory.return_value.__enter__.return_value
+        mock_run_destination.assert_has_calls(
+            [call(app_config, worker_factory, self.processor_manager) for app_config in self.app_configs],
+            any_order=True,
+        )
+        self.processor_manager.stop.assert_not_called()
 
-            main()
+    @patch("hl7_subscription_sender.application._run_destination")
+    def test_a_failed_destination_stops_the_others(self, mock_run_destination: Mock) -> None:
+        def run_destination(app_config: AppConfig, *_: object) -> None:
+            if app_config.ingress_subscription_name == "sub-a":
+                raise ConnectionError("Service Bus unavailable")
 
-            mock_health_check.assert_called_once_with("localhost", 9000)
-            mock_health_server.start.assert_called_once()
-            mock_health_check_ctx.__exit__.assert_called_once()
+        mock_run_destination.side_effect = run_destination
+
+        with self.assertLogs("hl7_subscription_sender.application", level="ERROR"):
+            with self.assertRaises(RuntimeError) as context:
+                _run_destinations(self.app_configs, self.factory, self.processor_manager)
+
+        self.assertIsInstance(context.exception.__cause__, ConnectionError)
+        self.processor_manager.stop.assert_called_once()
+        self.assertEqual(self.factory.create_worker_factory.return_value.__exit__.call_count, 2)
+
+
+class TestCircuitBreakerIntegration(unittest.TestCase):
+    @patch("hl7_subscription_sender.application.parse_message")
+    def test_send_outcomes_are_recorded_on_the_circuit_breaker(self, mock_parse_message: Mock) -> None:
+        for error, expected in ((None, "record_success"), (TimeoutError("No ACK"), "record_failure")):
+            with self.subTest(error=error):
+                (
+                    service_bus_message,
+                    hl7_message,
+                    _,
+                    mock_sender_client,
+                    mock_event_logger,
+                    mock_metric_sender,
+                    mock_throttler,
+                ) = _setup()
+                mock_parse_message.return_value = hl7_message
+                mock_sender_client.send_message.side_effect = error
+                circuit_breaker = MagicMock()
+
+                _process_message(
+                    service_bus_message,
+                    mock_sender_client,
+                    mock_event_logger,
+                    mock_metric_sender,
+                    mock_throttler,
+                    circuit_breaker=circuit_breaker,
+                )
+
+                getattr(circuit_breaker, expected).assert_called_once_with()
+                self.assertEqual(len(circuit_breaker.method_calls), 1)
+
+
+class TestStageTiming(unittest.TestCase):
+    @patch("hl7_subscription_sender.application.get_ack_result", return_value=True)
+    def test_each_stage_is_sent_as_a_histogram_metric(self, _mock_ack: Mock) -> None:
+        (
+            service_bus_message, _, _, mock_hl7_subscription_sender_client, mock_event_logger, mock_metric_sender,
+            mock_throttler,
+        ) = _setup()
+
+        _process_message(
+            service_bus_message, mock_hl7_subscription_sender_client, mock_event_logger, mock_metric_sender,
+            mock_throttler,
+        )
+
+        stages = [
+            c.args[2]["stage"] for c in mock_metric_sender.send_gauge_metric.call_args_list
+            if c.args[0] == "message_stage_seconds"
+        ]
+        self.assertEqual(stages, ["prepare", "throttle", "ack_wait", "ack_parse", "record"])
+        stage_timer = mock_hl7_subscription_sender_client.send_message.call_args.kwargs["stage_timer"]
+        self.assertIsNotNone(stage_timer)
 
 
 class TestBatchSizing(unittest.TestCase):
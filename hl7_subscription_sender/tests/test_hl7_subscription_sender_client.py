@@ -1,156 +1,9 @@
-import os
 import socket
 import unittest
 from typing import Any, Callable, Dict
 from unittest.mock import Mock, patch
 
-from hl7_subscription_sender.hl7_subscription_sender_client import HL7SubscriptionSenderClient, is_socket_closed
-
-WINDOWS_OS = "nt"
-
-
-class TestIsSocketClosed(unittest.TestCase):
-    @patch("hl7_subscription_sender.hl7_subscription_sender_client.select.select")
-    def test_socket_not_readable_no_data_available(self, mock_select: Mock) -> None:
-
-        mock_socket = Mock(spec=socket.socket)
-        # Simulate select.select returning empty readable list (no data available)
-        mock_select.return_value = ([], [], [])
-
-
-        result = is_socket_closed(mock_socket)
-
-
-        self.assertFalse(result)
-        mock_select.assert_called_once_with([mock_socket], [], [], 0)
-        # recv should not be called when socket is not readable
-        mock_socket.recv.assert_not_called()
-
-    @patch("hl7_subscription_sender.hl7_subscription_sender_client.select.select")
-    def test_socket_readable_with_data_socket_open(self, mock_select: Mock) -> None:
-
-        mock_socket = Mock(spec=socket.socket)
-        # Simulate select.select returning the socket in readable list
-        mock_select.return_value = ([mock_socket], [], [])
-        mock_socket.recv.return_value = b"some data here"
-
-
-        result = is_socket_closed(mock_socket)
-
-
-        self.assertFalse(result)
-        mock_select.assert_called_once_with([mock_socket], [], [], 0)
-        if os.name == WINDOWS_OS:
-            mock_socket.recv.assert_called_once_with(16, socket.MSG_PEEK)
-        else:
-            mock_socket.recv.assert_called_once_with(16, socket.MSG_DONTWAIT | socket.MSG_PEEK)  # type: ignore
-
-    @patch("hl7_subscription_sender.hl7_subscription_sender_client.select.select")
-    def test_socket_readable_with_empty_data_socket_closed(self, mock_select: Mock) -> None:
-
-        mock_socket = Mock(spec=socket.socket)
-        # Simulate select.select returning the socket in readable list
-        mock_select.return_value = ([mock_socket], [], [])
-        # Simulate recv returning empty data (EOF - socket closed)
-        mock_socket.recv.return_value = b""
-
-
-        result = is_socket_closed(mock_socket)
-
-
-        self.assertTrue(result)
-        mock_select.assert_called_once_with([mock_socket], [], [], 0)
-        if os.name == WINDOWS_OS:
-            mock_socket.recv.assert_called_once_with(16, socket.MSG_PEEK)
-        else:
-            mock_socket.recv.assert_called_once_with(16, socket.MSG_DONTWAIT | socket.MSG_PEEK)  # type: ignore
-
-    @patch("hl7_subscription_sender.hl7_subscription_sender_client.select.select")
-    def test_socket_recv_raises_blocking_io_error(self, mock_select: Mock) -> None:
-
-        mock_socket = Mock(spec=socket.socket)
-        mock_select.return_value = ([mock_socket], [], [])
-        mock_socket.recv.side_effect = BlockingIOError
-
-
-        result = is_socket_closed(mock_socket)
-
-
-        self.assertFalse(result)
-        mock_select.assert_called_once_with([mock_socket], [], [], 0)
-
-    @patch("hl7_subscription_sender.hl7_subscription_sender_client.select.select")
-    def test_socket_recv_raises_connection_reset_error(self, mock_select: Mock) -> None:
-
-        mock_socket = Mock(spec=socket.socket)
-        mock_select.return_value = ([mock_socket], [], [])
-        mock_socket.recv.side_effect = ConnectionResetError
-
-
-        result = is_socket_closed(mock_socket)
-
-
-        self.assertTrue(result)
-        mock_select.assert_called_once_with([mock_socket], [], [], 0)
-
-    @patch("hl7_subscription_sender.hl7_subscription_sender_client.select.select")
-    def test_socket_unexpected_exception_during_check(self, mock_select: Mock) -> None:
-
-        mock_socket = Mock(spec=socket.socket)
-        mock_select.return_value = ([mock_socket], [], [])
-        mock_socket.recv.side_effect = RuntimeError("Some unexpected error")
-
-
-        with self.assertLogs("hl7_subscription_sender.hl7_subscription_sender_client", level="ERROR") as log:
-            result = is_socket_closed(mock_socket)
-
-            self.assertFalse(result)
-            self.assertIn("unexpected exception", log.output[0])
-
-        mock_select.assert_called_once_with([mock_socket], [], [], 0)
-
-    @patch("hl7_subscription_sender.hl7_subscription_sender_client.select.select")
-    def test_select_itself_raises_exception(self, mock_select: Mock) -> None:
-
-        mock_socket = Mock(spec=socket.socket)
-        mock_select.side_effect = OSError("select failed")
-
-
-        with self.assertLogs("hl7_subscription_sender.hl7_subscription_sender_client", level="ERROR") as log:
-            result = is_socket_closed(mock_socket)
-
-            self.assertFalse(result)
-            self.assertIn("unexpected exception", log.output[0])
-
-        mock_select.assert_called_once_with([mock_socket], [], [], 0)
-
-    @patch("hl7_subscription_sender.hl7_subscription_sender_client.os.name", "nt")
-    @patch("hl7_subscription_sender.hl7_subscription_sender_client.select.select")
-    def test_socket_readable_uses_msg_peek_only_on_windows(self, mock_select: Mock) -> None:
-        """Test that Windows OS uses MSG_PEEK flag only (without MSG_DONTWAIT)."""
-        mock_socket = Mock(spec=socket.socket)
-        mock_select.return_value = ([mock_socket], [], [])
-        mock_socket.recv.return_value = b"data"
-
-        result = is_socket_closed(mock_socket)
-
-        self.assertFalse(result)
-        # Verify Windows uses only MSG_PEEK (no MSG_DONTWAIT)
-        mock_socket.recv.assert_called_once_with(16, socket.MSG_PEEK)
-
-    @patch("hl7_subscription_sender.hl7_subscription_sender_client.os.name", "posix")
-    @patch("hl7_subscription_sender.hl7_subscription_sender_client.select.select")
-    def test_socket_readable_uses_msg_peek_and_dontwait_on_non_windows(self, mock_select: Mock) -> None:
-        """Test that non-Windows OS uses MSG_PEEK | MSG_DONTWAIT flags."""
-        mock_socket = Mock(spec=socket.socket)
-        mock_select.return_value = ([mock_socket], [], [])
-        mock_socket.recv.return_value = b"data"
-
-        result = is_socket_closed(mock_socket)
-
-        self.assertFalse(result)
-        # Verify non-Windows uses MSG_PEEK | MSG_DONTWAIT
-        mock_socket.recv.assert_called_once_with(16, socket.MSG_DONTWAIT | socket.MSG_PEEK)  # type: ignore
+from hl7_subscription_sender.hl7_subscription_sender_client import HL7SubscriptionSenderClient
 
 
 class TestHL7SenderClient(unittest.TestCase):
@@ -223,6 +76,22 @@ class TestHL7SenderClient(unittest.TestCase):
                 mock_mllp2.send_message.assert_called_once_with("MSH|...")
                 mock_mllp2.socket.settimeout.assert_called_once_with(30)
 
+    @patch("hl7_subscription_sender.hl7_subscription_sender_client.MLLPClient")
+    def test_send_message_marks_the_connect_stage_for_each_attempt(self, mock_mllp_cls: Mock) -> None:
+        mock_mllp1 = Mock()
+        mock_mllp1.send_message.side_effect = socket.timeout
+        mock_mllp2 = Mock()
+        mock_mllp2.send_message.return_value = b"ACK"
+        mock_mllp_cls.side_effect = [mock_mllp1, mock_mllp2]
+        stage_timer = Mock()
+
+        with patch("hl7_subscription_sender.hl7_subscription_sender_client.is_socket_closed", return_value=False):
+            client = HL7SubscriptionSenderClient("localhost", 1234, 30)
+            client.send_message("MSH|...", stage_timer=stage_timer)
+
+        # The timed-out wait is marked before the reconnect that the retry's connect stage covers.
+        self.assertEqual([c.args[0] for c in stage_timer.mark.call_args_list], ["connect", "ack_wait", "connect"])
+
     @patch("hl7_subscription_sender.hl7_subscription_sender_client.MLLPClient")
     def test_send_message_timeout_retry_fails_and_raises_timeout_error(self, mock_mllp_cls: Mock) -> None:
         """Test that second timeout raises error without further retry."""
@@ -360,5 +229,76 @@ class TestHL7SenderClient(unittest.TestCase):
                     self.assertEqual(result, ack_content, f"Failed for {test_case['description']}")
 
 
+class TestHL7SubscriptionSenderClientWithPool(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.pool = Mock()
+        self.mllp_client = Mock()
+        self.pool.acquire.return_value = self.mllp_client
+
+    @patch("hl7_subscription_sender.hl7_subscription_sender_client.MLLPClient")
+    @patch("hl7_subscription_sender.hl7_subscription_sender_client.is_socket_closed")
+    def test_send_message_uses_a_pooled_connection_without_checking_it(
+        self, mock_is_socket_closed: Mock, mock_mllp_cls: Mock
+    ) -> None:
+        self.mllp_client.send_message.return_value = b"\x0bACK\x1c\r"
+
+        with HL7SubscriptionSenderClient("localhost", 1234, 30, pool=self.pool) as client:
+            response = client.send_message("MSH|...")
+
+        self.assertEqual(response, "ACK")
+        mock_mllp_cls.assert_not_called()
+        mock_is_socket_closed.assert_not_called()
+        self.pool.release.assert_called_once_with(self.mllp_client)
+        self.mllp_client.close.assert_not_called()
+
+    def test_send_message_timeout_retries_once_on_another_connection(self) -> None:
+        retry_client = Mock()
+        retry_client.send_message.side_effect = socket.timeout
+        self.mllp_client.send_message.side_effect = socket.timeout
+        self.pool.acquire.side_effect = [self.mllp_client, retry_client]
+
+        client = HL7SubscriptionSenderClient("localhost", 1234, 30, pool=self.pool)
+        with self.assertRaises(TimeoutError):
+            client.send_message("MSH|...")
+
+        self.assertEqual([c.args[0] for c in self.pool.discard.call_args_list], [self.mllp_client, retry_client])
+        self.pool.release.assert_not_called()
+
+    def test_send_message_connection_closed_by_receiver_raises_connection_error(self) -> None:
+        self.mllp_client.send_message.return_value = b""
+
+        client = HL7SubscriptionSenderClient("localhost", 1234, 30, pool=self.pool)
+        with self.assertRaises(ConnectionError):
+            client.send_message("MSH|...")
+
+        self.pool.discard.assert_called_once_with(self.mllp_client)
+
+    def test_send_message_connect_failure_raises_connection_error(self) -> None:
+        self.pool.acquire.side_effect = ConnectionRefusedError("refused")
+
+        client = HL7SubscriptionSenderClient("localhost", 1234, 30, pool=self.pool)
+        with self.assertRaises(ConnectionError) as context:
+            client.send_message("MSH|...")
+
+        self.assertIn("refused", str(context.exception))
+
+
+class TestHL7SubscriptionSenderClientCheckConnection(unittest.TestCase):
+
+    def test_check_connection_opens_and_closes_a_connection(self) -> None:
+        with socket.create_server(("127.0.0.1", 0)) as server:
+            client = HL7SubscriptionSenderClient("127.0.0.1", server.getsockname()[1], 5, pool=Mock())
+
+            self.assertTrue(client.check_connection())
+
+    def test_check_connection_returns_false_when_refused(self) -> None:
+        with socket.create_server(("127.0.0.1", 0)) as server:
+            port = server.getsockname()[1]
+        client = HL7SubscriptionSenderClient("127.0.0.1", port, 5, pool=Mock())
+
+        self.assertFalse(client.check_connection())
+
+
 if __name__ == "__main__":
     unittest.main()
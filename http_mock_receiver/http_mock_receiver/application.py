@@ -13,6 +13,7 @@ returns valid SOAP responses.
 """
 from __future__ import annotations
 
+import gzip
 import logging
 import os
 from collections.abc import AsyncGenerator
@@ -115,7 +116,10 @@ async def soap_endpoint(request: Request) -> Response:
     Service Bus forwarding is attempted when configured; failures are logged
     but do not change the SOAP response returned to the caller.
     """
-    raw_body = (await request.body()).decode("utf-8", errors="replace")
+    body_bytes = await request.body()
+    if request.headers.get("content-encoding", "").lower() == "gzip":
+        body_bytes = gzip.decompress(body_bytes)
+    raw_body = body_bytes.decode("utf-8", errors="replace")
 
     print()
     print("── SOAP REQUEST ─────────────────────────────────────")
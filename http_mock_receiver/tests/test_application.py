@@ -1,6 +1,7 @@
 """Integration tests for the FastAPI application endpoints."""
 from __future__ import annotations
 
+import gzip
 import unittest
 
 from fastapi.testclient import TestClient
@@ -54,6 +55,15 @@ class TestSoapEndpoint(unittest.TestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+    def test_gzip_request_body_is_decompressed(self) -> None:
+        response = _client.post(
+            "/soap",
+            content=gzip.compress(_SOAP_11_BODY.encode("utf-8")),
+            headers={"Content-Type": "text/xml; charset=utf-8", "Content-Encoding": "gzip"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("MSG001", response.text)
+
     def test_valid_soap_returns_xml(self) -> None:
         response = _client.post(
             "/soap",
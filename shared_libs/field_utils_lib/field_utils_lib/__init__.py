@@ -1,15 +1,37 @@
 from .field_utils import (
+    FieldPath,
+    append_segment_er7,
+    compile_path,
+    copy_segment,
     copy_segment_fields_in_range,
     get_cx_4_hd_1_segment_codes_from_pid_field,
     get_hl7_field_value,
     set_nested_field,
 )
+from .hl7_timestamp import (
+    HL7Timestamp,
+    format_hl7_date,
+    format_hl7_timestamp,
+    is_hl7_timestamp,
+    parse_hl7_date,
+    parse_hl7_timestamp,
+)
 
 __all__ = [
+    "FieldPath",
+    "compile_path",
+    "append_segment_er7",
+    "copy_segment",
     "get_hl7_field_value",
     "set_nested_field",
     "copy_segment_fields_in_range",
     "get_cx_4_hd_1_segment_codes_from_pid_field",
+    "HL7Timestamp",
+    "format_hl7_date",
+    "format_hl7_timestamp",
+    "is_hl7_timestamp",
+    "parse_hl7_date",
+    "parse_hl7_timestamp",
 ]
 
 
@@ -0,0 +1,163 @@
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import NamedTuple, Optional
+
+# Number of digits before any fraction or offset for each DTM/TS precision: YYYY, YYYYMM, ... YYYYMMDDHHMMSS.
+YEAR_PRECISION = 4
+MONTH_PRECISION = 6
+DAY_PRECISION = 8
+HOUR_PRECISION = 10
+MINUTE_PRECISION = 12
+SECOND_PRECISION = 14
+
+_YEAR = "(?!0000)[0-9]{4}"
+_MONTH = "(?:0[1-9]|1[0-2])"
+_HOUR = "(?:[01][0-9]|2[0-3])"
+_MINUTE = _SECOND = "[0-5][0-9]"
+
+
+def _month_day(separator: str = "") -> str:
+    # Only the days each month can have; 29 February is checked against the year separately.
+    return (
+        f"(?:(?:0[13578]|1[02]){separator}(?:0[1-9]|[12][0-9]|3[01])"
+        f"|(?:0[469]|11){separator}(?:0[1-9]|[12][0-9]|30)"
+        f"|02{separator}(?:0[1-9]|1[0-9]|2[0-9]))"
+    )
+
+
+_TIMESTAMP_PATTERNS = {
+    YEAR_PRECISION: re.compile(_YEAR),
+    MONTH_PRECISION: re.compile(_YEAR + _MONTH),
+    DAY_PRECISION: re.compile(_YEAR + _month_day()),
+    HOUR_PRECISION: re.compile(_YEAR + _month_day() + _HOUR),
+    MINUTE_PRECISION: re.compile(_YEAR + _month_day() + _HOUR + _MINUTE),
+    SECOND_PRECISION: re.compile(_YEAR + _month_day() + _HOUR + _MINUTE + _SECOND),
+}
+_ISO_DATETIME_PATTERN = re.compile(f"{_YEAR}-{_month_day('-')} {_HOUR}:{_MINUTE}:{_SECOND}")
+_OFFSET_PATTERN = re.compile("[+-](?:[01][0-9]|2[0-3])[0-5][0-9]")
+_FRACTION_PATTERN = re.compile("[0-9]{1,4}")
+# Month, day, hour, minute and second for components below a value's precision.
+_COMPONENT_DEFAULTS = (1, 1, 0, 0, 0)
+
+
+class HL7Timestamp(NamedTuple):
+    """A parsed HL7 DTM/TS value. Components below the value's precision default to their minimum."""
+
+    year: int
+    month: int = 1
+    day: int = 1
+    hour: int = 0
+    minute: int = 0
+    second: int = 0
+    microsecond: int = 0
+    precision: int = YEAR_PRECISION
+    fraction_digits: int = 0
+    offset_minutes: Optional[int] = None
+
+    def to_datetime(self) -> datetime:
+        tzinfo = None if self.offset_minutes is None else timezone(timedelta(minutes=self.offset_minutes))
+        return datetime(
+            self.year, self.month, self.day, self.hour, self.minute, self.second, self.microsecond, tzinfo=tzinfo
+        )
+
+
+def _is_leap_day_valid(timestamp: str) -> bool:
+    if timestamp[4:8] != "0229":
+        return True
+    year = int(timestamp[:4])
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def is_hl7_timestamp(value: str, precision: int = SECOND_PRECISION) -> bool:
+    """
+    Whether ``value`` is a valid HL7 DTM/TS of exactly ``precision`` digits, with no fraction or offset.
+
+    This runs one precompiled pattern and converts nothing to integers except the year of a 29 February, so it is
+    the cheapest way to check a value that does not need to be parsed.
+    """
+    pattern = _TIMESTAMP_PATTERNS.get(precision)
+    return pattern is not None and pattern.fullmatch(value) is not None and _is_leap_day_valid(value)
+
+
+def parse_hl7_timestamp(value: str) -> HL7Timestamp:
+    """
+    Parse an HL7 DTM/TS value: YYYY[MM[DD[HH[MM[SS[.S[S[S[S]]]]]]]]][+/-ZZZZ].
+
+    Raises ValueError when the value does not have one of the HL7 forms or names a date or time that does not exist.
+    """
+    text = value
+    offset_minutes = None
+    if len(text) > 5 and text[-5] in "+-":
+        if _OFFSET_PATTERN.fullmatch(text, len(text) - 5) is None:
+            raise ValueError(f"Invalid HL7 timestamp offset: {value!r}")
+        offset_minutes = int(text[-4:-2]) * 60 + int(text[-2:])
+        if text[-5] == "-":
+            offset_minutes = -offset_minutes
+        text = text[:-5]
+
+    microsecond = 0
+    fraction_digits = 0
+    if "." in text:
+        text, fraction = text.split(".", 1)
+        if len(text) != SECOND_PRECISION or _FRACTION_PATTERN.fullmatch(fraction) is None:
+            raise ValueError(f"Invalid HL7 timestamp fraction: {value!r}")
+        fraction_digits = len(fraction)
+        microsecond = int(fraction.ljust(6, "0"))
+
+    precision = len(text)
+    if not is_hl7_timestamp(text, precision):
+        raise ValueError(f"Invalid HL7 timestamp: {value!r}")
+
+    components = [int(text[index:index + 2]) for index in range(4, precision, 2)]
+    components.extend(_COMPONENT_DEFAULTS[len(components):])
+    month, day, hour, minute, second = components
+    return HL7Timestamp(
+        int(text[:4]), month, day, hour, minute, second, microsecond, precision, fraction_digits, offset_minutes
+    )
+
+
+def parse_hl7_date(value: str) -> date:
+    """Parse an HL7 DT value at day precision (YYYYMMDD)."""
+    if not is_hl7_timestamp(value, DAY_PRECISION):
+        raise ValueError(f"Invalid HL7 date: {value!r}")
+    return date(int(value[:4]), int(value[4:6]), int(value[6:]))
+
+
+def iso_to_hl7_timestamp(value: str) -> str:
+    """Rewrite ``YYYY-MM-DD HH:MM:SS`` as the equivalent HL7 timestamp (YYYYMMDDHHMMSS)."""
+    if _ISO_DATETIME_PATTERN.fullmatch(value) is None:
+        raise ValueError(f"Invalid datetime: {value!r}")
+    timestamp = value.replace("-", "").replace(" ", "").replace(":", "")
+    if not _is_leap_day_valid(timestamp):
+        raise ValueError(f"Invalid datetime: {value!r}")
+    return timestamp
+
+
+def format_hl7_timestamp(value: datetime, precision: int = SECOND_PRECISION, fraction_digits: int = 0) -> str:
+    """
+    Format a datetime as an HL7 DTM/TS value, truncated to ``precision`` digits.
+
+    ``fraction_digits`` (1-4) adds fractional seconds at second precision. A UTC offset is appended when the
+    datetime is timezone-aware.
+    """
+    if precision not in _TIMESTAMP_PATTERNS:
+        raise ValueError(f"Invalid HL7 timestamp precision: {precision}")
+    text = (
+        f"{value.year:04d}{value.month:02d}{value.day:02d}{value.hour:02d}{value.minute:02d}{value.second:02d}"
+    )[:precision]
+    if fraction_digits:
+        if precision != SECOND_PRECISION or not 1 <= fraction_digits <= 4:
+            raise ValueError("Fractional seconds need second precision and 1-4 digits")
+        text += "." + f"{value.microsecond:06d}"[:fraction_digits]
+    offset = value.utcoffset()
+    if offset is not None:
+        total_minutes = int(offset.total_seconds()) // 60
+        sign = "-" if total_minutes < 0 else "+"
+        hours, minutes = divmod(abs(total_minutes), 60)
+        text += f"{sign}{hours:02d}{minutes:02d}"
+    return text
+
+
+def format_hl7_date(value: date) -> str:
+    """Format a date as an HL7 DT value (YYYYMMDD)."""
+    return f"{value.year:04d}{value.month:02d}{value.day:02d}"
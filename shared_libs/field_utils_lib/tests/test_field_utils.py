@@ -8,6 +8,9 @@ from hl7apy.parser import parse_message
 from field_utils_lib.field_utils import (
     _extract_cx_4_hd_1,
     _normalize_repetitions,
+    append_segment_er7,
+    compile_path,
+    copy_segment,
     copy_segment_fields_in_range,
     get_cx_4_hd_1_segment_codes_from_pid_field,
     get_hl7_field_value,
@@ -129,6 +132,58 @@ class TestSetNestedField(unittest.TestCase):
         self.assertFalse(result)
 
 
+class TestCompilePath(unittest.TestCase):
+    def setUp(self) -> None:
+        self.original_message = parse_message(
+            "MSH|^~\\&|SEND_APP|SEND_FAC|REC_APP|REC_FAC|20250505||ADT^A31^ADT_A05|MSG123|P|2.5\r"
+            "PID|||8888^^^252^PI~4444^^^NHS^NH||SURNAME^FNAME^MNAME^^MR||19990101|M|||"
+            "99 ROAD^PLACE^CITY^COUNTY^SA99 1XX^^H||^^^home~^^^work\r"
+        )
+
+    def test_compiled_paths_are_cached(self) -> None:
+        self.assertIs(compile_path("pid_5.xpn_1.fn_1"), compile_path("pid_5.xpn_1.fn_1"))
+
+    def test_parses_bracket_notation(self) -> None:
+        path = compile_path("pid_13[1].xtn_4")
+
+        self.assertEqual(path.hops, (("pid_13", 1), ("xtn_4", None)))
+        self.assertEqual(path.names, ("pid_13[1]", "xtn_4"))
+
+    def test_invalid_index_reads_as_empty(self) -> None:
+        path = compile_path("pid_3[x].cx_1")
+
+        self.assertFalse(path.readable)
+        self.assertEqual(path.get(self.original_message.pid), "")
+
+    def test_get_matches_get_hl7_field_value(self) -> None:
+        pid = self.original_message.pid
+        for field_path in ["pid_5.xpn_1.fn_1", "pid_3[1].cx_1", "pid_3[2].cx_1", "pid_11", "pid_29.ts_1", "pid_99"]:
+            with self.subTest(field_path=field_path):
+                self.assertEqual(compile_path(field_path).get(pid), get_hl7_field_value(pid, field_path))
+
+    def test_copy_composite_field(self) -> None:
+        new_pid = Message(version="2.5").add_segment("PID")
+
+        self.assertTrue(compile_path("pid_11").copy(self.original_message.pid, new_pid))
+
+        self.assertEqual(new_pid.pid_11.to_er7(), self.original_message.pid.pid_11.to_er7())
+        new_pid.pid_11.xad_1 = "CHANGED"
+        self.assertEqual(get_hl7_field_value(self.original_message.pid, "pid_11.xad_1"), "99 ROAD")
+
+    def test_copy_sub_component(self) -> None:
+        new_pid = Message(version="2.5").add_segment("PID")
+
+        self.assertTrue(compile_path("pid_5.xpn_1.fn_1").copy(self.original_message.pid, new_pid))
+
+        self.assertEqual(get_hl7_field_value(new_pid, "pid_5.xpn_1.fn_1"), "SURNAME")
+
+    def test_copy_missing_field_returns_false(self) -> None:
+        new_pid = Message(version="2.5").add_segment("PID")
+
+        self.assertFalse(compile_path("pid_29.ts_1").copy(self.original_message.pid, new_pid))
+        self.assertFalse(compile_path("pid_not_a_field").copy(self.original_message.pid, new_pid))
+
+
 class TestCopySegmentFieldsInRange(unittest.TestCase):
     def setUp(self) -> None:
         self.hl7_message = (
@@ -296,6 +351,57 @@ class TestCopySegmentFieldsInRange(unittest.TestCase):
         self.assertEqual(len(new_pid.pid_13), len(original_pid.pid_13))
 
 
+class TestCopySegment(unittest.TestCase):
+    def setUp(self) -> None:
+        self.original_message = parse_message(
+            "MSH|^~\\&|SEND_APP|SEND_FAC|REC_APP|REC_FAC|20250505||ADT^A31^ADT_A05|MSG123|P|2.5\r"
+            "PID|1||8888^^^252^PI~4444^^^NHS^NH||SURNAME^FNAME||19990101|M|||\\F\\ ROAD^^CITY|||||||||||||||||"
+            "20240101||^\r",
+            find_groups=False,
+        )
+        self.source_pid = self.original_message.pid
+
+    def _copy_field_by_field(self, start: int, end: int) -> str:
+        new_pid = Message(version="2.5").add_segment("PID")
+        copy_segment_fields_in_range(self.source_pid, new_pid, "pid", start=start, end=end)
+        return new_pid.to_er7()
+
+    def test_copies_whole_segment(self) -> None:
+        new_msg = Message(version="2.5")
+
+        new_pid = copy_segment(self.source_pid, new_msg)
+
+        self.assertIs(new_msg.children[-1], new_pid)
+        self.assertEqual(new_pid.to_er7(), self._copy_field_by_field(1, 39))
+        self.assertEqual(get_hl7_field_value(new_pid, "pid_3[1].cx_1"), "4444")
+
+    def test_copies_selected_fields(self) -> None:
+        new_pid = copy_segment(self.source_pid, Message(version="2.5"), fields=range(1, 11))
+
+        self.assertEqual(new_pid.to_er7(), self._copy_field_by_field(1, 10))
+
+    def test_keeps_present_empty_trailing_field(self) -> None:
+        self.source_pid.add_field("pid_34").value = ""
+
+        new_pid = copy_segment(self.source_pid, Message(version="2.5"))
+
+        self.assertTrue(new_pid.to_er7().endswith("|20240101||^||||"))
+        self.assertEqual(new_pid.to_er7(), self._copy_field_by_field(1, 39))
+
+    def test_applies_overrides(self) -> None:
+        new_pid = copy_segment(self.source_pid, Message(version="2.5"), fields=[1], overrides={5: "NEW^NAME", 45: ""})
+
+        self.assertEqual(new_pid.to_er7(), "PID|1||||NEW^NAME")
+
+    def test_append_segment_er7(self) -> None:
+        new_msg = Message(version="2.5")
+
+        segment = append_segment_er7(new_msg, "OBX|1|ST|CODE^Text||5")
+
+        self.assertEqual(new_msg.obx.obx_5.value, "5")
+        self.assertEqual(segment.to_er7(), "OBX|1|ST|CODE^Text||5")
+
+
 class TestGetCx4Hd1SegmentCodes(unittest.TestCase):
     def _rep_with_hd1(self, code: str) -> SimpleNamespace:
         return SimpleNamespace(
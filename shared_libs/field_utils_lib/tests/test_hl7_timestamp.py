@@ -0,0 +1,193 @@
+import random
+import unittest
+from datetime import date, datetime, timedelta, timezone
+
+from field_utils_lib.hl7_timestamp import (
+    DAY_PRECISION,
+    HOUR_PRECISION,
+    MINUTE_PRECISION,
+    MONTH_PRECISION,
+    SECOND_PRECISION,
+    YEAR_PRECISION,
+    HL7Timestamp,
+    format_hl7_date,
+    format_hl7_timestamp,
+    is_hl7_timestamp,
+    iso_to_hl7_timestamp,
+    parse_hl7_date,
+    parse_hl7_timestamp,
+)
+
+
+def _random_digits(rng: random.Random, length: int) -> str:
+    # Mostly plausible timestamps, with every field occasionally pushed out of range.
+    fields = [
+        str(rng.randint(1, 9999)).zfill(4) if rng.random() < 0.1 else str(rng.randint(1900, 2100)),
+        str(rng.randint(0, 13)).zfill(2),
+        str(rng.randint(0, 32)).zfill(2),
+        str(rng.randint(0, 24)).zfill(2),
+        str(rng.randint(0, 60)).zfill(2),
+        str(rng.randint(0, 60)).zfill(2),
+    ]
+    return "".join(fields)[:length]
+
+
+def _strptime_or_none(value: str, fmt: str) -> datetime | None:
+    try:
+        return datetime.strptime(value, fmt)
+    except ValueError:
+        return None
+
+
+class TestParseHl7Timestamp(unittest.TestCase):
+    def test_parses_each_precision(self) -> None:
+        cases = {
+            "2024": HL7Timestamp(2024, precision=YEAR_PRECISION),
+            "202403": HL7Timestamp(2024, 3, precision=MONTH_PRECISION),
+            "20240315": HL7Timestamp(2024, 3, 15, precision=DAY_PRECISION),
+            "2024031509": HL7Timestamp(2024, 3, 15, 9, precision=HOUR_PRECISION),
+            "202403150945": HL7Timestamp(2024, 3, 15, 9, 45, precision=MINUTE_PRECISION),
+            "20240315094530": HL7Timestamp(2024, 3, 15, 9, 45, 30, precision=SECOND_PRECISION),
+        }
+        for value, expected in cases.items():
+            with self.subTest(value=value):
+                self.assertEqual(parse_hl7_timestamp(value), expected)
+
+    def test_parses_fraction_and_offset(self) -> None:
+        parsed = parse_hl7_timestamp("20240315094530.25+0130")
+
+        self.assertEqual(parsed.microsecond, 250000)
+        self.assertEqual(parsed.fraction_digits, 2)
+        self.assertEqual(parsed.offset_minutes, 90)
+        self.assertEqual(
+            parsed.to_datetime(), datetime(2024, 3, 15, 9, 45, 30, 250000, tzinfo=timezone(timedelta(minutes=90)))
+        )
+
+    def test_parses_negative_offset_at_lower_precision(self) -> None:
+        parsed = parse_hl7_timestamp("20240315-0500")
+
+        self.assertEqual(parsed.precision, DAY_PRECISION)
+        self.assertEqual(parsed.offset_minutes, -300)
+
+    def test_leap_days(self) -> None:
+        self.assertEqual(parse_hl7_timestamp("20240229").day, 29)
+        self.assertEqual(parse_hl7_timestamp("20000229").day, 29)
+        for value in ["20230229", "19000229"]:
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    parse_hl7_timestamp(value)
+
+    def test_rejects_invalid_values(self) -> None:
+        invalid = [
+            "",
+            "202",
+            "20240",
+            "0000",
+            "20241301",
+            "20240431",
+            "20240315240000",
+            "20240315096000",
+            "202403150945301",
+            "20240315.5",
+            "20240315094530.",
+            "20240315094530.12345",
+            "20240315094530+2400",
+            "20240315094530+01",
+            "2024-03-15",
+            "٢٠٢٤٠٣١٥",
+        ]
+        for value in invalid:
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    parse_hl7_timestamp(value)
+
+    def test_matches_strptime_for_random_values(self) -> None:
+        formats = {DAY_PRECISION: "%Y%m%d", SECOND_PRECISION: "%Y%m%d%H%M%S"}
+        rng = random.Random(35)
+        for _ in range(2000):
+            precision = rng.choice(list(formats))
+            value = _random_digits(rng, precision)
+            with self.subTest(value=value):
+                expected = _strptime_or_none(value, formats[precision])
+                try:
+                    actual: datetime | None = parse_hl7_timestamp(value).to_datetime()
+                except ValueError:
+                    actual = None
+                self.assertEqual(actual, expected)
+
+
+class TestIsHl7Timestamp(unittest.TestCase):
+    def test_checks_the_requested_precision(self) -> None:
+        self.assertTrue(is_hl7_timestamp("20240315094530"))
+        self.assertTrue(is_hl7_timestamp("20240315", DAY_PRECISION))
+        self.assertFalse(is_hl7_timestamp("20240315"))
+        self.assertFalse(is_hl7_timestamp("20240315094530", DAY_PRECISION))
+        self.assertFalse(is_hl7_timestamp("2024031509453", 13))
+
+    def test_rejects_impossible_dates(self) -> None:
+        self.assertFalse(is_hl7_timestamp("20230229", DAY_PRECISION))
+        self.assertFalse(is_hl7_timestamp("20240631", DAY_PRECISION))
+
+
+class TestParseHl7Date(unittest.TestCase):
+    def test_parses_date(self) -> None:
+        self.assertEqual(parse_hl7_date("19991231"), date(1999, 12, 31))
+
+    def test_matches_strptime_for_random_values(self) -> None:
+        rng = random.Random(35)
+        for _ in range(2000):
+            value = _random_digits(rng, DAY_PRECISION)
+            with self.subTest(value=value):
+                expected = _strptime_or_none(value, "%Y%m%d")
+                try:
+                    actual: date | None = parse_hl7_date(value)
+                except ValueError:
+                    actual = None
+                self.assertEqual(actual, expected.date() if expected else None)
+
+
+class TestIsoToHl7Timestamp(unittest.TestCase):
+    def test_rewrites_iso_datetime(self) -> None:
+        self.assertEqual(iso_to_hl7_timestamp("2023-01-15 09:45:30"), "20230115094530")
+
+    def test_rejects_other_forms(self) -> None:
+        for value in ["2023-01-15T09:45:30", "2023-02-30 12:00:00", "2023-1-15 09:45:30", "20230115094530"]:
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    iso_to_hl7_timestamp(value)
+
+
+class TestFormatHl7Timestamp(unittest.TestCase):
+    def test_formats_each_precision(self) -> None:
+        value = datetime(2024, 3, 5, 7, 8, 9)
+        self.assertEqual(format_hl7_timestamp(value), "20240305070809")
+        self.assertEqual(format_hl7_timestamp(value, DAY_PRECISION), "20240305")
+        self.assertEqual(format_hl7_timestamp(value, YEAR_PRECISION), "2024")
+
+    def test_formats_fraction_and_offset(self) -> None:
+        value = datetime(2024, 3, 5, 7, 8, 9, 123456, tzinfo=timezone(timedelta(hours=-5, minutes=-30)))
+
+        self.assertEqual(format_hl7_timestamp(value, fraction_digits=3), "20240305070809.123-0530")
+
+    def test_pads_early_years(self) -> None:
+        self.assertEqual(format_hl7_timestamp(datetime(999, 1, 2), DAY_PRECISION), "09990102")
+        self.assertEqual(format_hl7_date(date(999, 1, 2)), "09990102")
+
+    def test_rejects_invalid_arguments(self) -> None:
+        with self.assertRaises(ValueError):
+            format_hl7_timestamp(datetime(2024, 1, 1), precision=7)
+        with self.assertRaises(ValueError):
+            format_hl7_timestamp(datetime(2024, 1, 1), precision=DAY_PRECISION, fraction_digits=2)
+
+    def test_round_trips_random_values(self) -> None:
+        rng = random.Random(35)
+        start = datetime(1800, 1, 1)
+        for _ in range(1000):
+            value = start + timedelta(seconds=rng.randrange(400 * 365 * 24 * 3600))
+            with self.subTest(value=value):
+                self.assertEqual(parse_hl7_timestamp(format_hl7_timestamp(value)).to_datetime(), value)
+                self.assertEqual(parse_hl7_date(format_hl7_date(value.date())), value.date())
+
+
+if __name__ == "__main__":
+    unittest.main()
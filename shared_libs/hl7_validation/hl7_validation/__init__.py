@@ -1,4 +1,6 @@
-from .convert import convert_er7_to_xml, xml_to_er7
+from .convert import convert_er7_to_xml, iter_xml_to_er7_segments, xml_to_er7
+from .result_cache import ValidationCacheStats, ValidationResultCache
+from .standard_rules import compile_standard_rules
 from .standard_validate import (
     validate_er7_with_standard,
     validate_parsed_message_with_standard,
@@ -13,13 +15,20 @@ from .validate import (
     validate_parsed_message_with_flow_schema,
     validate_xml,
 )
+from .validation_pool import ValidationPool, ValidationPoolStats
 from .validation_result import ValidationResult
 
 __all__ = [
+    "ValidationCacheStats",
+    "ValidationPool",
+    "ValidationPoolStats",
     "ValidationResult",
+    "ValidationResultCache",
     "XmlValidationError",
+    "compile_standard_rules",
     "convert_er7_to_xml",
     "convert_er7_to_xml_with_flow_schema",
+    "iter_xml_to_er7_segments",
     "validate_and_convert_er7_with_flow_schema",
     "validate_and_convert_parsed_message_with_flow_schema",
     "validate_er7_with_flow_schema",
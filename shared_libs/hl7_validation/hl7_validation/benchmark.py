@@ -0,0 +1,302 @@
+"""
+Throughput and peak-memory benchmarks for parsing, conversion and validation.
+
+Run from the library directory, recording a baseline on this machine first:
+
+    python -m hl7_validation.benchmark --sizes tiny small --baseline benchmarks/baseline.json --update-baseline
+    python -m hl7_validation.benchmark --sizes tiny small --baseline benchmarks/baseline.json
+
+Each flow is measured on a generated corpus (see ``hl7_validation.corpus``) for every requested size class and
+stage. The ``standard_rules`` and ``standard_hl7apy`` stages validate the same parsed messages against the HL7
+standard, with the compiled rule tables and with hl7apy's ``msg.validate()``, so their throughputs compare the
+two. Results can be compared against a stored baseline; any stage whose throughput drops, or whose peak memory
+grows, by more than the tolerance is reported as a regression and the command exits non-zero.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from hl7apy.exceptions import ValidationError
+
+from .convert import xml_to_er7
+from .corpus import SIZE_CLASSES, generate_corpus
+from .schemas import list_schema_groups
+from .standard_rules import validate_message_with_rules
+from .utils.message_utils import parse_er7_message
+from .validate import convert_er7_to_xml_with_flow_schema, validate_er7_with_flow_schema
+
+logger = logging.getLogger(__name__)
+
+BASELINE_FORMAT = 1
+DEFAULT_SIZE_CLASSES = ("tiny", "small")
+DEFAULT_TOLERANCE = 0.3
+
+STAGES = ("parse", "convert", "validate", "xml_to_er7", "standard_rules", "standard_hl7apy")
+# Stages that take parsed messages rather than ER7.
+PARSED_STAGES = ("standard_rules", "standard_hl7apy")
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    flow: str
+    size_class: str
+    stage: str
+    messages: int
+    total_bytes: int
+    seconds: float
+    peak_memory_bytes: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.flow}/{self.size_class}/{self.stage}"
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.messages / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.total_bytes / 1_000_000 / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass(frozen=True)
+class Regression:
+    key: str
+    metric: str
+    baseline: float
+    current: float
+
+
+def _standard_validation(validate: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    # Generated messages need not meet the standard; an error is as much a result to time as a pass.
+    def run(msg: Any) -> Any:
+        try:
+            return validate(msg)
+        except ValidationError as e:
+            return e
+
+    return run
+
+
+def _stage_runner(stage: str, flow_name: str) -> Callable[[Any], Any]:
+    if stage == "parse":
+        return parse_er7_message
+    if stage == "convert":
+        return lambda payload: convert_er7_to_xml_with_flow_schema(payload, flow_name)
+    if stage == "validate":
+        return lambda payload: validate_er7_with_flow_schema(payload, flow_name)
+    if stage == "xml_to_er7":
+        return xml_to_er7
+    if stage == "standard_rules":
+        return _standard_validation(validate_message_with_rules)
+    if stage == "standard_hl7apy":
+        return _standard_validation(lambda msg: msg.validate())
+    raise ValueError(f"Unknown stage '{stage}'. Available: {', '.join(STAGES)}")
+
+
+def _measure_peak_memory(run: Callable[[Any], Any], payloads: Sequence[Any]) -> int:
+    tracemalloc.start()
+    try:
+        peak = 0
+        for payload in payloads:
+            tracemalloc.reset_peak()
+            run(payload)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+        return peak
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmarks(
+    flows: Optional[Iterable[str]] = None,
+    size_classes: Iterable[str] = DEFAULT_SIZE_CLASSES,
+    stages: Iterable[str] = STAGES,
+    repeat: int = 3,
+    messages_per_size: int = 1,
+    seed: int = 0,
+) -> List[BenchmarkResult]:
+    """
+    Benchmark each stage on a generated corpus for every flow and size class.
+
+    Every stage runs once untimed first, so schema compilation and other one-off caches are excluded.
+
+    Args:
+        flows: Flow names (all bundled flows by default)
+        size_classes: Keys of corpus.SIZE_CLASSES
+        stages: Stages from STAGES
+        repeat: Timed passes over the corpus; the fastest pass is reported
+        messages_per_size: Distinct generated messages per structure and size class
+        seed: Corpus seed
+
+    Returns:
+        One BenchmarkResult per flow, size class and stage
+    """
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1")
+    selected_stages = list(stages)
+    for stage in selected_stages:
+        _stage_runner(stage, "")
+
+    results: List[BenchmarkResult] = []
+    for flow_name in flows if flows is not None else list_schema_groups():
+        for size_class in size_classes:
+            messages = [
+                corpus_message.er7
+                for corpus_message in generate_corpus([flow_name], [size_class], seed, messages_per_size)
+            ]
+            xml_payloads: List[str] = []
+            if "xml_to_er7" in selected_stages:
+                xml_payloads = [convert_er7_to_xml_with_flow_schema(er7, flow_name) for er7 in messages]
+            # hl7apy cannot resolve every structure (e.g. ADT_A40 in v2.3.1); only resolved messages can be validated.
+            parsed: List[Any] = []
+            if any(stage in PARSED_STAGES for stage in selected_stages):
+                parsed = [(er7, msg) for er7, msg in ((er7, parse_er7_message(er7)) for er7 in messages) if msg.name]
+
+            for stage in selected_stages:
+                run = _stage_runner(stage, flow_name)
+                payloads: Sequence[Any] = messages
+                sources: Sequence[str] = messages
+                if stage == "xml_to_er7":
+                    payloads = sources = xml_payloads
+                elif stage in PARSED_STAGES:
+                    payloads = [msg for _, msg in parsed]
+                    sources = [er7 for er7, _ in parsed]
+                for payload in payloads:
+                    run(payload)
+
+                best = float("inf")
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    for payload in payloads:
+                        run(payload)
+                    best = min(best, time.perf_counter() - start)
+
+                result = BenchmarkResult(
+                    flow=flow_name,
+                    size_class=size_class,
+                    stage=stage,
+                    messages=len(payloads),
+                    total_bytes=sum(len(source.encode("utf-8")) for source in sources),
+                    seconds=best,
+                    peak_memory_bytes=_measure_peak_memory(run, payloads),
+                )
+                logger.info(
+                    "%s: %.1f msg/s, %.2f MB/s, peak %d KiB",
+                    result.key,
+                    result.messages_per_second,
+                    result.megabytes_per_second,
+                    result.peak_memory_bytes // 1024,
+                )
+                results.append(result)
+    return results
+
+
+def results_to_baseline(results: Iterable[BenchmarkResult]) -> Dict[str, Any]:
+    return {
+        "format": BASELINE_FORMAT,
+        "results": {
+            result.key: {
+                **asdict(result),
+                "messages_per_second": result.messages_per_second,
+                "megabytes_per_second": result.megabytes_per_second,
+            }
+            for result in results
+        },
+    }
+
+
+def compare_to_baseline(
+    results: Iterable[BenchmarkResult], baseline: Dict[str, Any], tolerance: float = DEFAULT_TOLERANCE
+) -> List[Regression]:
+    """
+    Compare results to a stored baseline.
+
+    Results without a baseline entry are ignored, so new flows or size classes do not fail the comparison.
+
+    Args:
+        results: Current benchmark results
+        baseline: Baseline produced by results_to_baseline
+        tolerance: Allowed relative throughput drop or peak memory growth (0.3 means 30%)
+
+    Returns:
+        The regressions found, empty if none
+    """
+    if baseline.get("format") != BASELINE_FORMAT:
+        raise ValueError(f"Unsupported baseline format {baseline.get('format')!r}")
+
+    regressions: List[Regression] = []
+    stored = baseline.get("results", {})
+    for result in results:
+        entry = stored.get(result.key)
+        if entry is None:
+            continue
+        if result.messages_per_second < entry["messages_per_second"] * (1 - tolerance):
+            regressions.append(
+                Regression(result.key, "messages_per_second", entry["messages_per_second"], result.messages_per_second)
+            )
+        if result.peak_memory_bytes > entry["peak_memory_bytes"] * (1 + tolerance):
+            regressions.append(
+                Regression(result.key, "peak_memory_bytes", entry["peak_memory_bytes"], result.peak_memory_bytes)
+            )
+    return regressions
+
+
+def _format_table(results: Iterable[BenchmarkResult]) -> str:
+    lines = [f"{'benchmark':<32} {'msgs':>6} {'msg/s':>10} {'MB/s':>8} {'peak KiB':>10}"]
+    for result in results:
+        lines.append(
+            f"{result.key:<32} {result.messages:>6} {result.messages_per_second:>10.1f} "
+            f"{result.megabytes_per_second:>8.2f} {result.peak_memory_bytes // 1024:>10}"
+        )
+    return "\n".join(lines)
+
+
+def _parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flows", nargs="+", choices=list_schema_groups(), help="flows to benchmark (default: all)")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZE_CLASSES), default=list(DEFAULT_SIZE_CLASSES))
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--repeat", type=int, default=3, help="timed passes; the fastest is reported")
+    parser.add_argument("--messages", type=int, default=1, help="messages per structure and size class")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", type=Path, help="baseline JSON to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results to --baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(argv)
+    results = run_benchmarks(args.flows, args.sizes, args.stages, args.repeat, args.messages, args.seed)
+    sys.stdout.write(_format_table(results) + "\n")
+
+    if args.baseline is None:
+        return 0
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results_to_baseline(results), indent=2, sort_keys=True) + "\n")
+        logger.info("Baseline written to %s", args.baseline)
+        return 0
+
+    regressions = compare_to_baseline(results, json.loads(args.baseline.read_text()), args.tolerance)
+    for regression in regressions:
+        logger.error(
+            "Regression in %s: %s %.1f -> %.1f",
+            regression.key,
+            regression.metric,
+            regression.baseline,
+            regression.current,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sys.exit(main())
@@ -1,9 +1,11 @@
+import io
 from collections import defaultdict
 from functools import lru_cache
-from typing import Any, DefaultDict, Dict, List, Optional, Set, Tuple, Union
+from typing import IO, Any, DefaultDict, Dict, Iterator, List, Optional, Set, Tuple, Union
 from xml.etree.ElementTree import Element as XElem  # nosec B405
 
-from defusedxml.ElementTree import fromstring, tostring
+from defusedxml import DefusedXmlException
+from defusedxml.ElementTree import ParseError, iterparse, tostring
 from hl7apy.core import Message
 
 from .utils.extract_string import _get_field_text
@@ -35,6 +37,8 @@ PV1_SEGMENT = "PV1"
 SFT_SEGMENT = "SFT"
 PV1_DEFAULT_VALUE = "U"
 
+XmlSource = Union[str, bytes, IO[Any]]
+
 
 def _qname(tag: str) -> str:
     return f"{{{HL7_XML_NAMESPACE}}}{tag}"
@@ -599,50 +603,99 @@ def _is_segment_tag(tag: str) -> bool:
     return tag[2].isupper() or tag[2].isdigit()
 
 
-def _process_group_element(group_elem: XElem) -> List[str]:
-    """Process a group element and return list of segment ER7 strings."""
-    segments: List[str] = []
+class _StringChunkReader:
+    """
+    Minimal read-only file interface over an in-memory string.
 
-    for child in group_elem:
-        tag = _strip_namespace(child.tag)
+    ``io.StringIO`` copies its initial value into an internal buffer, which would double
+    the memory held for large payloads. Slicing the original string on demand means
+    ``iterparse`` only ever sees one chunk at a time.
+    """
 
-        if _is_segment_tag(tag):
-            segments.append(_process_segment_element(child, tag))
-        else:
-            segments.extend(_process_group_element(child))
+    def __init__(self, text: str) -> None:
+        self._text = text
+        self._position = 0
 
-    return segments
+    def read(self, size: int = -1) -> str:
+        start = self._position
+        end = len(self._text) if size is None or size < 0 else min(start + size, len(self._text))
+        self._position = end
+        return self._text[start:end]
 
 
-def xml_to_er7(xml_string: str) -> str:
+def _open_xml_source(source: XmlSource) -> Any:
+    """Wrap in-memory XML in a file-like object so it can be fed to ``iterparse`` in chunks."""
+    if isinstance(source, str):
+        return _StringChunkReader(source)
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    return source
+
+
+def iter_xml_to_er7_segments(source: XmlSource) -> Iterator[str]:
     """
-    Convert HL7v2 XML format back to ER7 format.
+    Stream HL7v2 XML and yield one ER7 segment string at a time.
 
-    This function converts an HL7v2 XML message back to ER7 (pipe-delimited) format.
-    The XML should be in the standard HL7v2 XML namespace format.
+    The document is read with ``iterparse`` rather than being loaded as a whole tree.
+    Each segment element is converted as soon as its closing tag has been seen and is
+    then detached from its parent, so only the segment currently being read (plus the
+    chain of open group elements above it) is ever held in memory. Memory use therefore
+    stays roughly constant regardless of how many segments the payload contains.
+
+    A segment is any element below the root whose tag looks like a segment name and
+    which is not itself nested inside another segment. All other elements between the
+    root and a segment are treated as groups and contribute no output of their own.
 
     Args:
-        xml_string: The HL7 message in HL7v2 XML format
+        source: HL7v2 XML as a string, bytes or a readable file-like object
 
-    Returns:
-        The HL7 message in ER7 format (pipe-delimited, CR-separated)
+    Yields:
+        ER7-formatted segment strings in document order
 
     Raises:
         ValueError: If the XML cannot be parsed or is invalid
     """
+    stream = _open_xml_source(source)
+    open_elements: List[XElem] = []
+    segment_depth: Optional[int] = None
+
     try:
-        root = fromstring(xml_string)
-    except Exception as e:
+        for event, elem in iterparse(stream, events=("start", "end")):
+            if event == "start":
+                if segment_depth is None and open_elements and _is_segment_tag(_strip_namespace(elem.tag)):
+                    segment_depth = len(open_elements)
+                open_elements.append(elem)
+                continue
+
+            open_elements.pop()
+            if segment_depth is None or len(open_elements) != segment_depth:
+                continue
+
+            segment_depth = None
+            yield _process_segment_element(elem, _strip_namespace(elem.tag))
+            # Detach the finished segment so neither it nor its fields stay reachable from the root.
+            open_elements[-1].remove(elem)
+    except (ParseError, DefusedXmlException) as e:
         raise ValueError(f"Failed to parse XML: {e}") from e
 
-    segments: List[str] = []
 
-    for child in root:
-        tag = _strip_namespace(child.tag)
+def xml_to_er7(xml_string: XmlSource) -> str:
+    """
+    Convert HL7v2 XML format back to ER7 format.
 
-        if _is_segment_tag(tag):
-            segments.append(_process_segment_element(child, tag))
-        else:
-            segments.extend(_process_group_element(child))
+    This function converts an HL7v2 XML message back to ER7 (pipe-delimited) format.
+    The XML should be in the standard HL7v2 XML namespace format. Conversion is
+    streamed segment by segment (see ``iter_xml_to_er7_segments``), so large payloads
+    are never materialised as a complete element tree.
+
+    Args:
+        xml_string: The HL7 message in HL7v2 XML format, as a string, bytes or
+            readable file-like object
+
+    Returns:
+        The HL7 message in ER7 format (pipe-delimited, CR-separated)
 
-    return "\r".join(segments)
+    Raises:
+        ValueError: If the XML cannot be parsed or is invalid
+    """
+    return "\r".join(iter_xml_to_er7_segments(xml_string))
@@ -0,0 +1,275 @@
+"""
+Deterministic synthetic HL7 corpus generated from the bundled flow XSDs.
+
+Messages are built from each flow's message structure, segment and datatype schemas, so every generated
+message has the shape the flow schema expects: required segments, fields and components are always
+present, optional ones are included at random, and primitive values match their HL7 datatype. The same
+flow, structure, size and seed always produce the same ER7.
+
+Larger size classes are reached by repeating a repeatable segment (or group) of the structure, the way
+results-heavy or history-heavy messages grow in practice.
+"""
+
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .convert import _resolve_type_children
+from .schemas import get_schema_xsd_path_for, list_schema_groups, list_schemas_for_group
+from .utils.structure_detection import _detect_base_prefix, _load_complex_sequences, _resolve_base_dir
+from .utils.xml_schema_maps import _load_hl7_type_maps, _load_segment_sequences, _load_simple_content_bases
+
+SIZE_CLASSES: Dict[str, int] = {
+    "tiny": 0,
+    "small": 4 * 1024,
+    "medium": 64 * 1024,
+    "large": 1024 * 1024,
+    "huge": 4 * 1024 * 1024,
+}
+
+OPTIONAL_SEGMENT_RATE = 0.25
+OPTIONAL_FIELD_RATE = 0.3
+OPTIONAL_COMPONENT_RATE = 0.5
+FIELD_REPEAT_RATE = 0.2
+
+# Segments preferred for padding, in order, when the structure allows them to repeat.
+_PADDING_SEGMENTS = ("OBX", "NK1", "AL1", "DG1", "ROL")
+
+# Values hl7apy needs to interpret the rest of the segment (OBX-5 is typed by OBX-2).
+_FIXED_FIELD_VALUES = {"OBX.2": "ST", "OBX.11": "F"}
+
+_WORDS = (
+    "ABERTAWE", "BANGOR", "CARDIFF", "DAVIES", "EVANS", "GWENT", "HOWELLS", "JONES", "LLOYD", "MORGAN",
+    "NEWPORT", "OWEN", "PARRY", "PRICE", "REES", "ROBERTS", "SWANSEA", "THOMAS", "VAUGHAN", "WILLIAMS",
+)
+_CODES = ("A", "C", "F", "H", "I", "M", "N", "O", "P", "U", "Y")
+
+MaxOccurs = Union[int, str]
+SequenceItem = Tuple[str, int | str, MaxOccurs]
+
+
+@dataclass(frozen=True)
+class CorpusMessage:
+    flow: str
+    structure: str
+    size_class: str
+    er7: str
+
+
+@dataclass(frozen=True)
+class _FlowStructure:
+    flow: str
+    structure: str
+    version: str
+    sequences: Dict[str, List[SequenceItem]]
+    segment_sequences: Dict[str, List[SequenceItem]]
+    element_to_type: Dict[str, str]
+    type_children: Dict[str, List[str]]
+    type_base: Dict[str, str]
+    simple_bases: Dict[str, str]
+
+
+def flow_structures(flow_name: str) -> List[str]:
+    """Message structures with a bundled XSD for the flow (base datatype/segment/field XSDs excluded)."""
+    return sorted(key for key in list_schemas_for_group(flow_name) if not key[0].isdigit())
+
+
+@lru_cache(maxsize=64)
+def _load_flow_structure(flow_name: str, structure: str) -> _FlowStructure:
+    xsd_path = get_schema_xsd_path_for(flow_name, structure)
+    base_dir = _resolve_base_dir(xsd_path)
+    base_prefix = _detect_base_prefix(xsd_path)
+    element_to_type, type_children, type_base = _load_hl7_type_maps(base_dir, base_prefix)
+    return _FlowStructure(
+        flow=flow_name,
+        structure=structure,
+        version=base_prefix.replace("_", "."),
+        sequences=_load_complex_sequences(xsd_path),
+        segment_sequences=_load_segment_sequences(base_dir, base_prefix),
+        element_to_type=element_to_type,
+        type_children=type_children,
+        type_base=type_base,
+        simple_bases=_load_simple_content_bases(base_dir, base_prefix),
+    )
+
+
+class _MessageBuilder:
+    def __init__(self, schema: _FlowStructure, rng: random.Random) -> None:
+        self.schema = schema
+        self.rng = rng
+        self.set_ids: Dict[str, int] = {}
+
+    def _primitive_value(self, primitive: str) -> str:
+        rng = self.rng
+        if primitive == "DT":
+            return f"{rng.randint(1930, 2024)}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}"
+        if primitive in ("DTM", "TSComponentOne"):
+            return (
+                f"{rng.randint(2020, 2025)}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}"
+                f"{rng.randint(0, 23):02d}{rng.randint(0, 59):02d}{rng.randint(0, 59):02d}"
+            )
+        if primitive == "TM":
+            return f"{rng.randint(0, 23):02d}{rng.randint(0, 59):02d}{rng.randint(0, 59):02d}"
+        if primitive == "NM":
+            return str(rng.randint(1, 9999))
+        if primitive == "SI":
+            return "1"
+        if primitive in ("ID", "IS"):
+            return rng.choice(_CODES)
+        if primitive == "GenericPrimitive":
+            return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(4, 24)))
+        return rng.choice(_WORDS)
+
+    def _leaf_primitive(self, element_name: str) -> str:
+        type_name = self.schema.element_to_type.get(element_name, "ST")
+        return self.schema.simple_bases.get(type_name, type_name)
+
+    def _children(self, element_name: str) -> List[str]:
+        return _resolve_type_children(
+            self.schema.element_to_type.get(element_name), self.schema.type_children, self.schema.type_base
+        )
+
+    def _component_value(self, element_name: str) -> str:
+        # Sub-components are left to their first part: the converter splits components on '^' only.
+        children = self._children(element_name)
+        if children:
+            return self._component_value(children[0])
+        return self._primitive_value(self._leaf_primitive(element_name))
+
+    def _field_value(self, element_name: str) -> str:
+        if element_name in _FIXED_FIELD_VALUES:
+            return _FIXED_FIELD_VALUES[element_name]
+        children = self._children(element_name)
+        if not children:
+            return self._primitive_value(self._leaf_primitive(element_name))
+
+        components = [self._component_value(children[0])]
+        for child in children[1:4]:
+            components.append(self._component_value(child) if self.rng.random() < OPTIONAL_COMPONENT_RATE else "")
+        return "^".join(components).rstrip("^")
+
+    def segment(self, segment_name: str) -> str:
+        set_id = self.set_ids.get(segment_name, 0) + 1
+        self.set_ids[segment_name] = set_id
+
+        fields: List[str] = []
+        for ref, min_occurs, max_occurs in self.schema.segment_sequences.get(segment_name, []):
+            required = isinstance(min_occurs, int) and min_occurs >= 1
+            if ref == f"{segment_name}.1" and self._leaf_primitive(ref) == "SI":
+                fields.append(str(set_id))
+            elif required or self.rng.random() < OPTIONAL_FIELD_RATE:
+                repeats = 2 if max_occurs == "unbounded" and self.rng.random() < FIELD_REPEAT_RATE else 1
+                fields.append("~".join(self._field_value(ref) for _ in range(repeats)))
+            else:
+                fields.append("")
+        return "|".join([segment_name] + fields).rstrip("|")
+
+    def msh(self, control_id: str) -> str:
+        structure = self.schema.structure
+        message_type, _, trigger = structure.partition("_")
+        timestamp = self._primitive_value("DTM")
+        return (
+            f"MSH|^~\\&|{self.schema.flow.upper()}|252|HUB|100|{timestamp}||{message_type}^{trigger}^{structure}|"
+            f"{control_id}|P|{self.schema.version}"
+        )
+
+    def items(self, sequence: List[SequenceItem], control_id: str) -> List[List[str]]:
+        """Build one list of segments per sequence item, so padding can later extend a single slot."""
+        slots: List[List[str]] = []
+        for ref, min_occurs, _ in sequence:
+            required = isinstance(min_occurs, int) and min_occurs >= 1
+            if required or self.rng.random() < OPTIONAL_SEGMENT_RATE:
+                slots.append(self.item(ref, control_id))
+            else:
+                slots.append([])
+        return slots
+
+    def item(self, ref: str, control_id: str) -> List[str]:
+        group_sequence = self.schema.sequences.get(f"{ref}.CONTENT")
+        if group_sequence is not None and "." in ref:
+            return [segment for slot in self.items(group_sequence, control_id) for segment in slot]
+        if ref == "MSH":
+            return [self.msh(control_id)]
+        return [self.segment(ref)]
+
+
+def _padding_index(sequence: List[SequenceItem]) -> Optional[int]:
+    repeatable = [index for index, (ref, _, max_occurs) in enumerate(sequence) if max_occurs == "unbounded"]
+    for preferred in _PADDING_SEGMENTS:
+        for index in repeatable:
+            if sequence[index][0] == preferred:
+                return index
+    groups = [index for index in repeatable if "." in sequence[index][0]]
+    if groups:
+        return groups[0]
+    return repeatable[-1] if repeatable else None
+
+
+def generate_message(flow_name: str, structure: str, target_bytes: int = 0, seed: int = 0) -> str:
+    """
+    Generate one ER7 message for a flow's message structure.
+
+    Args:
+        flow_name: Flow whose XSDs describe the message, e.g. "phw"
+        structure: Message structure with a bundled XSD, e.g. "ADT_A05"
+        target_bytes: Minimum message size; a repeatable segment is added until it is reached
+        seed: Seed for the deterministic generator
+
+    Returns:
+        The message in ER7 format with '\\r' segment separators
+
+    Raises:
+        ValueError: If the flow has no XSD for the structure
+    """
+    schema = _load_flow_structure(flow_name, structure)
+    sequence = schema.sequences.get(f"{structure}.CONTENT")
+    if not sequence:
+        raise ValueError(f"No message structure '{structure}' in the '{flow_name}' XSDs")
+
+    rng = random.Random(f"{flow_name}:{structure}:{target_bytes}:{seed}")
+    builder = _MessageBuilder(schema, rng)
+    control_id = f"{flow_name.upper()}{seed:06d}{rng.randint(0, 999999):06d}"
+    slots = builder.items(sequence, control_id)
+
+    size = sum(len(segment) + 1 for slot in slots for segment in slot)
+    padding_index = _padding_index(sequence)
+    if padding_index is not None:
+        padding_ref = sequence[padding_index][0]
+        while size < target_bytes:
+            added = builder.item(padding_ref, control_id)
+            slots[padding_index].extend(added)
+            size += sum(len(segment) + 1 for segment in added)
+
+    return "\r".join(segment for slot in slots for segment in slot)
+
+
+def generate_corpus(
+    flows: Optional[Iterable[str]] = None,
+    size_classes: Optional[Iterable[str]] = None,
+    seed: int = 0,
+    messages_per_size: int = 1,
+) -> Iterator[CorpusMessage]:
+    """
+    Generate messages for every structure of every requested flow and size class.
+
+    Args:
+        flows: Flow names to cover (all bundled flows by default)
+        size_classes: Keys of SIZE_CLASSES to cover (all by default)
+        seed: Base seed; message ``n`` of a size class uses ``seed + n``
+        messages_per_size: Number of distinct messages per flow, structure and size class
+
+    Yields:
+        CorpusMessage entries in flow, structure, size class order
+    """
+    selected_sizes = list(size_classes) if size_classes is not None else list(SIZE_CLASSES)
+    unknown = [name for name in selected_sizes if name not in SIZE_CLASSES]
+    if unknown:
+        raise ValueError(f"Unknown size classes: {', '.join(unknown)}")
+
+    for flow_name in flows if flows is not None else list_schema_groups():
+        for structure in flow_structures(flow_name):
+            for size_class in selected_sizes:
+                for offset in range(messages_per_size):
+                    er7 = generate_message(flow_name, structure, SIZE_CLASSES[size_class], seed + offset)
+                    yield CorpusMessage(flow=flow_name, structure=structure, size_class=size_class, er7=er7)
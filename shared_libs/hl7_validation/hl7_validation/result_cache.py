@@ -0,0 +1,350 @@
+"""
+Opt-in memoisation of flow validation and ER7 to XML conversion results.
+
+Replays, duplicate resends from upstream systems and Service Bus redeliveries all present the
+same ER7 again, and without a cache each one is re-converted and re-validated from scratch.
+``ValidationResultCache`` keys results on a BLAKE2b digest of the ER7 together with the flow,
+a fingerprint of that flow's XSD files and any trigger mapping, so a schema change can never
+serve a result produced by an older schema.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from importlib.resources import files
+from typing import Any, Callable, Dict, Optional, Protocol, Tuple, Union, cast
+
+from hl7apy.core import Message
+
+from .convert import _compute_structure_requirements, convert_er7_to_xml
+from .corpus import _load_flow_structure
+from .schemas import list_schema_groups, list_schemas_for_group
+from .utils.structure_detection import _detect_base_prefix, _load_complex_sequences, _load_message_structure
+from .utils.xml_schema_maps import (
+    _load_hl7_type_maps,
+    _load_segment_occurs_map,
+    _load_segment_sequences,
+    _load_segments_info,
+    _load_simple_content_bases,
+)
+from .validate import (
+    XmlValidationError,
+    _get_compiled_schema,
+    convert_er7_to_xml_with_flow_schema,
+    validate_and_convert_er7_with_flow_schema,
+    validate_and_convert_parsed_message_with_flow_schema,
+)
+from .validation_result import ValidationResult
+
+logger = logging.getLogger(__name__)
+
+CACHE_LOOKUP_METRIC = "hl7_validation_cache_lookups"
+DEFAULT_MAX_CACHE_BYTES = 64 * 1024 * 1024
+DEFAULT_SCHEMA_CHECK_INTERVAL_SECONDS = 30.0
+
+# Rough per-entry bookkeeping cost (key tuple, digest, OrderedDict node, entry object).
+_ENTRY_OVERHEAD_BYTES = 400
+
+TriggerMapping = Optional[Dict[Tuple[str, str], str]]
+_CacheKey = Tuple[str, str, str, str, bytes]
+
+
+class CounterMetricSink(Protocol):
+    """Anything that can increment a counter, e.g. ``metric_sender_lib.MetricSender``."""
+
+    def send_metric(self, key: str, value: int = 1, attributes: Optional[Dict[str, Any]] = None) -> None: ...
+
+
+@dataclass
+class ValidationCacheStats:
+    """
+    Snapshot of ``ValidationResultCache`` usage.
+
+    Attributes:
+        hits: Lookups answered from the cache
+        misses: Lookups that had to convert/validate the message
+        evictions: Entries dropped to stay within the size limits
+        invalidations: Times a flow's entries were dropped because its schemas changed
+        entries: Number of entries currently cached
+        size_bytes: Estimated memory held by cached entries
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass(frozen=True)
+class _CacheEntry:
+    value: Union[ValidationResult, str, None]
+    error_message: Optional[str]
+    size_bytes: int
+
+
+def _estimate_size(value: Union[ValidationResult, str, None], error_message: Optional[str]) -> int:
+    size = _ENTRY_OVERHEAD_BYTES
+    if isinstance(value, ValidationResult):
+        size += sys.getsizeof(value.xml_string) + sys.getsizeof(value.error_message or "")
+    elif value is not None:
+        size += sys.getsizeof(value)
+    if error_message:
+        size += sys.getsizeof(error_message)
+    return size
+
+
+def _digest_er7(er7_message: str) -> bytes:
+    return hashlib.blake2b(er7_message.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def _trigger_mapping_key(trigger_mapping: TriggerMapping) -> str:
+    if not trigger_mapping:
+        return ""
+    return repr(sorted(trigger_mapping.items()))
+
+
+def _schema_file_signature(flow_name: str) -> Tuple[Tuple[str, int, int], ...]:
+    """Cheap change detector for a flow's XSDs: file names, sizes and modification times."""
+    flow_dir = str(files("hl7_validation.resources") / flow_name)
+    try:
+        entries = [entry for entry in os.scandir(flow_dir) if entry.name.lower().endswith(".xsd")]
+    except OSError:
+        return ()
+    signature = []
+    for entry in entries:
+        stat = entry.stat()
+        signature.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(signature))
+
+
+@lru_cache(maxsize=64)
+def _schema_content_fingerprint(flow_name: str, signature: Tuple[Tuple[str, int, int], ...]) -> str:
+    """Hash the XSD contents of a flow; memoised per file signature so files are only read on change."""
+    flow_dir = str(files("hl7_validation.resources") / flow_name)
+    digest = hashlib.blake2b(digest_size=16)
+    for name, _, _ in signature:
+        digest.update(name.encode("utf-8"))
+        with open(os.path.join(flow_dir, name), "rb") as schema_file:
+            digest.update(schema_file.read())
+    return digest.hexdigest()
+
+
+def clear_schema_caches() -> None:
+    """Drop every compiled schema and derived structure map so changed XSDs are reloaded."""
+    for cached_function in (
+        list_schema_groups,
+        list_schemas_for_group,
+        _get_compiled_schema,
+        _compute_structure_requirements,
+        _detect_base_prefix,
+        _load_complex_sequences,
+        _load_message_structure,
+        _load_hl7_type_maps,
+        _load_segments_info,
+        _load_segment_occurs_map,
+        _load_segment_sequences,
+        _load_simple_content_bases,
+        _load_flow_structure,
+    ):
+        cached_function.cache_clear()
+
+
+class ValidationResultCache:
+    """
+    Bounded, thread-safe LRU cache of validation outcomes and generated XML.
+
+    Both successful and failed outcomes are cached: a schema failure is returned as the same
+    ``ValidationResult`` with ``is_valid=False``, and a message that could not be parsed raises
+    the same ``XmlValidationError`` again. Returned ``ValidationResult`` objects are copies, so
+    callers may modify them freely.
+
+    Entries are evicted least-recently-used first once either ``max_bytes`` (estimated memory held
+    by cached strings) or ``max_entries`` is exceeded. Every ``schema_check_interval_seconds`` the
+    XSD files of a flow are re-checked; if they have changed, that flow's entries and all compiled
+    schema caches are dropped.
+
+    Example:
+        cache = ValidationResultCache(max_bytes=32 * 1024 * 1024, metric_sink=metric_sender)
+        result = cache.validate_and_convert(er7_message, "phw")
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+        max_entries: Optional[int] = None,
+        metric_sink: Optional[CounterMetricSink] = None,
+        schema_check_interval_seconds: float = DEFAULT_SCHEMA_CHECK_INTERVAL_SECONDS,
+    ) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive number of bytes")
+        if max_entries is not None and max_entries <= 0:
+            raise ValueError("max_entries must be positive when provided")
+
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.schema_check_interval_seconds = schema_check_interval_seconds
+        self._metric_sink = metric_sink
+        self._entries: "OrderedDict[_CacheKey, _CacheEntry]" = OrderedDict()
+        self._stats = ValidationCacheStats()
+        self._flow_fingerprints: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> ValidationCacheStats:
+        with self._lock:
+            return replace(self._stats, entries=len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats.size_bytes = 0
+
+    def validate_and_convert(
+        self,
+        er7_message: str,
+        flow_name: str,
+        trigger_mapping: TriggerMapping = None,
+        parsed_message: Optional[Message] = None,
+    ) -> ValidationResult:
+        """
+        Cached ``validate_and_convert_er7_with_flow_schema``.
+
+        If the caller has already parsed the message, pass it as ``parsed_message`` so a cache
+        miss reuses it instead of parsing again. The cache key is always derived from the ER7.
+
+        Raises:
+            XmlValidationError: If the message cannot be parsed (cached like any other outcome)
+        """
+
+        def compute() -> ValidationResult:
+            if parsed_message is not None:
+                return validate_and_convert_parsed_message_with_flow_schema(
+                    parsed_message, er7_message, flow_name, trigger_mapping
+                )
+            return validate_and_convert_er7_with_flow_schema(er7_message, flow_name, trigger_mapping)
+
+        result = self._get_or_compute("validate", er7_message, flow_name, trigger_mapping, compute)
+        return replace(cast(ValidationResult, result))
+
+    def convert(self, er7_message: str, flow_name: Optional[str] = None, trigger_mapping: TriggerMapping = None) -> str:
+        """
+        Cached ER7 to XML conversion; without ``flow_name`` the schema-less converter is used.
+
+        Raises:
+            XmlValidationError: If the message cannot be parsed (flow conversion only)
+            ValueError: If the structure cannot be determined (schema-less conversion only)
+        """
+
+        def compute() -> str:
+            if flow_name:
+                return convert_er7_to_xml_with_flow_schema(er7_message, flow_name, trigger_mapping)
+            return convert_er7_to_xml(er7_message)
+
+        return cast(str, self._get_or_compute("convert", er7_message, flow_name, trigger_mapping, compute))
+
+    def _get_or_compute(
+        self,
+        operation: str,
+        er7_message: str,
+        flow_name: Optional[str],
+        trigger_mapping: TriggerMapping,
+        compute: Callable[[], Union[ValidationResult, str]],
+    ) -> Union[ValidationResult, str, None]:
+        key: _CacheKey = (
+            operation,
+            flow_name or "",
+            self._current_fingerprint(flow_name),
+            _trigger_mapping_key(trigger_mapping),
+            _digest_er7(er7_message),
+        )
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+            else:
+                self._stats.misses += 1
+        self._send_lookup_metric(operation, hit=entry is not None)
+
+        if entry is None:
+            # Computed outside the lock: concurrent misses for the same message may both compute,
+            # which is cheaper than serialising every conversion behind one lock.
+            try:
+                value: Union[ValidationResult, str, None] = compute()
+                error_message: Optional[str] = None
+            except XmlValidationError as e:
+                value, error_message = None, e.message
+            entry = _CacheEntry(value, error_message, _estimate_size(value, error_message))
+            self._store(key, entry)
+
+        if entry.error_message is not None:
+            raise XmlValidationError(entry.error_message)
+        return entry.value
+
+    def _store(self, key: _CacheKey, entry: _CacheEntry) -> None:
+        if entry.size_bytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._stats.size_bytes -= previous.size_bytes
+            self._entries[key] = entry
+            self._stats.size_bytes += entry.size_bytes
+            while self._entries and (
+                self._stats.size_bytes > self.max_bytes
+                or (self.max_entries is not None and len(self._entries) > self.max_entries)
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._stats.size_bytes -= evicted.size_bytes
+                self._stats.evictions += 1
+
+    def _current_fingerprint(self, flow_name: Optional[str]) -> str:
+        if not flow_name:
+            return ""
+
+        now = time.monotonic()
+        with self._lock:
+            known = self._flow_fingerprints.get(flow_name)
+        if known is not None and now - known[1] < self.schema_check_interval_seconds:
+            return known[0]
+
+        fingerprint = _schema_content_fingerprint(flow_name, _schema_file_signature(flow_name))
+        with self._lock:
+            self._flow_fingerprints[flow_name] = (fingerprint, now)
+            if known is not None and known[0] != fingerprint:
+                self._invalidate_flow_locked(flow_name)
+        return fingerprint
+
+    def _invalidate_flow_locked(self, flow_name: str) -> None:
+        logger.info("Schemas for flow '%s' changed; dropping cached validation results", flow_name)
+        stale_keys = [key for key in self._entries if key[1] == flow_name]
+        for key in stale_keys:
+            self._stats.size_bytes -= self._entries.pop(key).size_bytes
+        self._stats.invalidations += 1
+        clear_schema_caches()
+
+    def _send_lookup_metric(self, operation: str, hit: bool) -> None:
+        if self._metric_sink is None:
+            return
+        try:
+            self._metric_sink.send_metric(
+                CACHE_LOOKUP_METRIC, 1, {"operation": operation, "result": "hit" if hit else "miss"}
+            )
+        except Exception as e:
+            logger.warning("Failed to send validation cache metric: %s", e)
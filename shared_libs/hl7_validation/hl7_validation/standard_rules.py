@@ -0,0 +1,375 @@
+"""
+Compiled rule tables for standard HL7 validation.
+
+hl7apy's ``Validator.validate`` re-resolves the reference model for every element of every message: each
+child lookup goes through the element's structure search and each complex datatype is re-loaded from the
+version library. The rules themselves never change for a given hl7apy release, so this module compiles the
+reference structure of a message type once into a flat table of nodes (child cardinalities, leaf datatypes,
+table values and maximum lengths) and then validates a parsed message in a single pass over its children.
+
+Errors are produced with the same text and in the same order as hl7apy, and the first one is raised, so
+callers see an identical ``ValidationError``. Table and length checks only ever produce warnings in hl7apy;
+they are evaluated here only when warnings are requested. Element shapes the tables do not describe (custom
+references, complex datatypes outside the reference, complex Z fields) fall back to hl7apy's validator.
+
+Compiled tables are persisted as JSON under a cache directory keyed by hl7apy version, so new processes
+skip the compile step as well.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError
+from importlib.metadata import version as package_version
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Union
+
+from hl7apy import load_library, load_reference
+from hl7apy.core import Element, Field, Message, Segment
+from hl7apy.exceptions import ChildNotFound, ValidationError, ValidationWarning
+from hl7apy.validation import Validator
+
+logger = logging.getLogger(__name__)
+
+RULE_TABLE_FORMAT = 1
+
+DEFAULT_RULE_CACHE_DIR = Path(tempfile.gettempdir()) / "hl7_validation_rules"
+
+_SEQUENCE_KINDS = ("sequence", "choice")
+
+
+@dataclass(frozen=True)
+class _LeafRule:
+    name: Optional[str]  # hl7apy quotes ref[1] in datatype errors; it is None for standard leaves
+    datatype: str
+    table: Optional[str]
+    table_values: Optional[FrozenSet[str]]
+    max_length: int
+
+
+@dataclass(frozen=True)
+class _SequenceRule:
+    valid_children: FrozenSet[str]
+    children: Tuple[Tuple[str, int, int, "_Rule"], ...]
+
+
+_Rule = Union[_LeafRule, _SequenceRule]
+
+
+@dataclass(frozen=True)
+class StandardRuleTable:
+    """Compiled validation rules for one message structure of one HL7 version."""
+
+    version: str
+    structure: str
+    root: _SequenceRule
+    base_datatypes: FrozenSet[str]
+
+
+class _UncompiledShape(Exception):
+    """Raised when a message contains an element the compiled tables cannot describe."""
+
+
+def _hl7apy_version() -> str:
+    try:
+        return package_version("hl7apy")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def _rule_cache_path(cache_dir: Path, version: str, structure: str) -> Path:
+    return cache_dir / f"hl7apy-{_hl7apy_version()}" / f"v{version}" / f"{structure}.json"
+
+
+def _compile_nodes(message_ref: Any, version: str) -> Dict[str, Any]:
+    """Flatten a hl7apy reference tree into a JSON-serialisable node list."""
+    nodes: List[List[Any]] = []
+    tables: Dict[str, Optional[List[str]]] = {}
+    seen: Dict[int, int] = {}
+
+    def compile_ref(ref: Any) -> int:
+        # Segment and datatype references are shared across the tree, so compile each object once.
+        ref_id = id(ref)
+        if ref_id in seen:
+            return seen[ref_id]
+
+        index = len(nodes)
+        seen[ref_id] = index
+        if ref[0] in _SEQUENCE_KINDS:
+            node: List[Any] = ["S", []]
+            nodes.append(node)
+            node[1] = [[child[0], child[2][0], child[2][1], compile_ref(child[1])] for child in ref[1]]
+        else:
+            table = ref[4]
+            if table is not None and table not in tables:
+                try:
+                    tables[table] = list(load_reference(table, "Table", version)[1])
+                except ChildNotFound:
+                    tables[table] = None
+            nodes.append(["L", ref[1], ref[2], table, ref[5]])
+        return index
+
+    root = compile_ref(message_ref)
+    return {"root": root, "nodes": nodes, "tables": tables}
+
+
+def _load_nodes(payload: Dict[str, Any]) -> _SequenceRule:
+    """Rebuild the linked rule objects from a flat node list."""
+    raw_nodes = payload["nodes"]
+    tables = {name: frozenset(values) if values is not None else None for name, values in payload["tables"].items()}
+    built: Dict[int, _Rule] = {}
+
+    def build(index: int) -> _Rule:
+        if index in built:
+            return built[index]
+        raw = raw_nodes[index]
+        rule: _Rule
+        if raw[0] == "S":
+            children = tuple((name, min_reps, max_reps, build(child)) for name, min_reps, max_reps, child in raw[1])
+            rule = _SequenceRule(valid_children=frozenset(child[0] for child in children), children=children)
+        else:
+            _, name, datatype, table, max_length = raw
+            rule = _LeafRule(
+                name=name,
+                datatype=datatype,
+                table=table,
+                table_values=tables.get(table) if table is not None else None,
+                max_length=max_length,
+            )
+        built[index] = rule
+        return rule
+
+    root = build(payload["root"])
+    if not isinstance(root, _SequenceRule):
+        raise ValueError("Rule table root must be a sequence")
+    return root
+
+
+def _read_cached_payload(path: Path, version: str, structure: str) -> Optional[Dict[str, Any]]:
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable rule table cache %s: %s", path, e)
+        return None
+
+    expected = (RULE_TABLE_FORMAT, _hl7apy_version(), version, structure)
+    found = (payload.get("format"), payload.get("hl7apy"), payload.get("version"), payload.get("structure"))
+    if found != expected:
+        logger.warning("Ignoring stale rule table cache %s", path)
+        return None
+    return payload
+
+
+def _write_cached_payload(path: Path, payload: Dict[str, Any]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a sibling file and rename so concurrent processes never read a partial table.
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, separators=(",", ":"))
+        os.replace(tmp_name, path)
+    except OSError as e:
+        logger.debug("Could not persist rule table cache %s: %s", path, e)
+
+
+@lru_cache(maxsize=None)
+def _compile_standard_rules(structure: str, version: str, cache_dir: Optional[str]) -> StandardRuleTable:
+    path = _rule_cache_path(Path(cache_dir), version, structure) if cache_dir is not None else None
+    payload = _read_cached_payload(path, version, structure) if path is not None else None
+
+    if payload is None:
+        try:
+            message_ref = load_reference(structure, "Message", version)
+        except ChildNotFound as e:
+            raise ValueError(f"Unknown HL7 v{version} message structure '{structure}'") from e
+        payload = {
+            "format": RULE_TABLE_FORMAT,
+            "hl7apy": _hl7apy_version(),
+            "version": version,
+            "structure": structure,
+            **_compile_nodes(message_ref, version),
+        }
+        if path is not None:
+            _write_cached_payload(path, payload)
+
+    return StandardRuleTable(
+        version=version,
+        structure=structure,
+        root=_load_nodes(payload),
+        base_datatypes=frozenset(load_library(version).get_base_datatypes()),
+    )
+
+
+def compile_standard_rules(
+    structure: str, version: str, cache_dir: Optional[Union[str, Path]] = DEFAULT_RULE_CACHE_DIR
+) -> StandardRuleTable:
+    """
+    Compile (or load from cache) the standard validation rules for a message structure.
+
+    Args:
+        structure: HL7 message structure, e.g. ``ADT_A05``
+        version: HL7 version string, e.g. ``2.5``
+        cache_dir: Directory for persisted rule tables, or None to keep them in memory only
+
+    Returns:
+        The compiled rule table, shared between callers
+
+    Raises:
+        ValueError: If hl7apy has no such message structure for the version
+    """
+    return _compile_standard_rules(structure, version, str(cache_dir) if cache_dir is not None else None)
+
+
+def _check_leaf(
+    el: Element,
+    rule: _LeafRule,
+    base_datatypes: FrozenSet[str],
+    errors: List[ValidationError],
+    warnings: Optional[List[ValidationWarning]],
+) -> None:
+    if warnings is not None:
+        if rule.table_values is not None and el.to_er7() not in rule.table_values:
+            warnings.append(
+                ValidationWarning(
+                    f"Value {el.to_er7()} not in table {rule.table} in element {el.parent.name}.{el.name}"
+                )
+            )
+        if -1 < rule.max_length < len(el.to_er7()):
+            warnings.append(ValidationWarning(f"Exceeded max length ({rule.max_length}) of {el.parent.name}.{el.name}"))
+
+    datatype = el.datatype
+    if datatype == "varies":
+        return
+    if datatype != rule.datatype:
+        errors.append(
+            ValidationError(
+                f"Datatype {datatype} is not correct for {el.parent.name}.{el.name} (it must be {rule.name})"
+            )
+        )
+    if datatype is not None and datatype not in base_datatypes:
+        raise _UncompiledShape(f"complex datatype {datatype} on leaf {el.name}")
+
+
+def _check_z_element(el: Element, base_datatypes: FrozenSet[str]) -> None:
+    if isinstance(el, Field):
+        if el.datatype in base_datatypes or el.datatype == "varies":
+            return
+        raise _UncompiledShape(f"Z field {el.name} of type {el.datatype}")
+    if not isinstance(el, Segment):
+        raise _UncompiledShape(f"Z element {el.name}")
+    for child in el.children:
+        if child.is_unknown() or not child.is_z_element():
+            raise _UncompiledShape(f"child {child.name} of Z segment {el.name}")
+        _check_z_element(child, base_datatypes)
+
+
+def _check_element(
+    el: Element,
+    rule: _Rule,
+    base_datatypes: FrozenSet[str],
+    errors: List[ValidationError],
+    warnings: Optional[List[ValidationWarning]],
+) -> None:
+    if isinstance(rule, _LeafRule):
+        _check_leaf(el, rule, base_datatypes, errors, warnings)
+        return
+
+    children = el.children
+    z_children = []
+    element_children = set()
+    for child in children:
+        if child.is_z_element():
+            z_children.append(child)
+        else:
+            element_children.add(child.name)
+
+    if not element_children <= rule.valid_children:
+        errors.append(
+            ValidationError(f"Invalid children detected for {el}: {list(element_children - rule.valid_children)}")
+        )
+
+    # ElementList.get() resolves each name through the element structure before reading these indexes;
+    # reading them directly returns the same children without the per-name lookup.
+    indexes = children.indexes
+    for child_name, min_reps, max_reps, child_rule in rule.children:
+        occurrences = indexes.get(child_name, ())
+        count = len(occurrences)
+        if count < min_reps:
+            errors.append(ValidationError(f"Missing required child {el.name}.{child_name}"))
+        elif max_reps != -1 and count > max_reps:
+            errors.append(ValidationError(f"Child limit exceeded {el.name}.{child_name}"))
+        for child in occurrences:
+            _validate_child(child, child_rule, base_datatypes, errors, warnings)
+
+    for child in z_children:
+        if child.is_unknown():
+            errors.append(ValidationError(f"Unknown element found: {child.parent}.{child}"))
+        else:
+            _check_z_element(child, base_datatypes)
+
+
+def _validate_child(
+    el: Element,
+    rule: _Rule,
+    base_datatypes: FrozenSet[str],
+    errors: List[ValidationError],
+    warnings: Optional[List[ValidationWarning]],
+) -> None:
+    if el.is_unknown():
+        errors.append(ValidationError(f"Unknown element found: {el.parent}.{el}"))
+        return
+    if el.is_z_element():
+        _check_z_element(el, base_datatypes)
+        return
+    _check_element(el, rule, base_datatypes, errors, warnings)
+
+
+def validate_message_with_rules(
+    msg: Message,
+    collect_warnings: bool = False,
+    cache_dir: Optional[Union[str, Path]] = DEFAULT_RULE_CACHE_DIR,
+) -> List[ValidationWarning]:
+    """
+    Validate a parsed message against its compiled standard rule table.
+
+    Equivalent to hl7apy's ``msg.validate()``: the first validation error is raised with the same message.
+
+    Args:
+        msg: Parsed hl7apy message
+        collect_warnings: Also evaluate table value and maximum length rules
+        cache_dir: Directory for persisted rule tables, or None to keep them in memory only
+
+    Returns:
+        Table and length warnings when ``collect_warnings`` is set, otherwise an empty list
+
+    Raises:
+        ValidationError: The first validation error found in the message
+    """
+    try:
+        table = compile_standard_rules(msg.name, msg.version, cache_dir)
+    except ValueError:
+        table = None
+
+    # Messages built against a message profile or a non-standard structure keep their own reference.
+    if table is None or msg.reference is not load_reference(msg.name, "Message", msg.version):
+        Validator.validate(msg, reference=msg.reference)
+        return []
+
+    errors: List[ValidationError] = []
+    warnings: Optional[List[ValidationWarning]] = [] if collect_warnings else None
+    try:
+        _validate_child(msg, table.root, table.base_datatypes, errors, warnings)
+    except _UncompiledShape as e:
+        logger.debug("Falling back to hl7apy validation for %s: %s", msg.name, e)
+        Validator.validate(msg, reference=msg.reference)
+        return []
+
+    if errors:
+        raise errors[0]
+    return warnings if warnings is not None else []
@@ -5,6 +5,7 @@ from hl7apy.parser import parse_message
 
 from .constants import PARSE_ERROR_MSG
 from .convert import xml_to_er7
+from .standard_rules import validate_message_with_rules
 from .validate import XmlValidationError
 
 SUPPORTED_VERSIONS = frozenset({"2.4", "2.5", "2.5.1", "2.6"})
@@ -44,7 +45,7 @@ def validate_er7_with_standard(er7_string: str, version: str) -> None:
         raise XmlValidationError(f"{PARSE_ERROR_MSG}: {e}") from e
 
     try:
-        msg.validate()
+        validate_message_with_rules(msg)
     except (ValidationError, HL7apyException) as e:
         raise XmlValidationError(f"Standard HL7 v{version} validation failed: {e}") from e
 
@@ -69,7 +70,7 @@ def validate_parsed_message_with_standard(msg: Message, version: str) -> None:
         raise XmlValidationError(f"Message version {msg_version} does not match requested version {version}")
 
     try:
-        msg.validate()
+        validate_message_with_rules(msg)
     except (ValidationError, HL7apyException) as e:
         raise XmlValidationError(f"Standard HL7 v{version} validation failed: {e}") from e
 
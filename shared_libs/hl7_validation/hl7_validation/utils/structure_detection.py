@@ -35,10 +35,7 @@ def _detect_base_prefix(structure_xsd_path: Optional[str]) -> str:
 
 
 @lru_cache(maxsize=64)
-def _load_message_structure(
-    structure_xsd_path: str,
-    structure_id: str,
-) -> Tuple[List[Tuple[str, int | str, int | str]] | None, Dict[str, List[str]]]:
+def _load_complex_sequences(structure_xsd_path: str) -> Dict[str, List[Tuple[str, int | str, int | str]]]:
     tree = ET.parse(structure_xsd_path)
     root = tree.getroot()
     xs = "{http://www.w3.org/2001/XMLSchema}"
@@ -72,6 +69,16 @@ def _load_message_structure(
         if items:
             complex_sequences[type_name] = items
 
+    return complex_sequences
+
+
+@lru_cache(maxsize=64)
+def _load_message_structure(
+    structure_xsd_path: str,
+    structure_id: str,
+) -> Tuple[List[Tuple[str, int | str, int | str]] | None, Dict[str, List[str]]]:
+    complex_sequences = _load_complex_sequences(structure_xsd_path)
+
     desired_type = f"{structure_id}.CONTENT"
     root_sequence: List[Tuple[str, int | str, int | str]] | None = complex_sequences.get(desired_type)
 
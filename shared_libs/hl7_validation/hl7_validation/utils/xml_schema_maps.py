@@ -128,3 +128,16 @@ def _load_segment_sequences(
     return sequences
 
 
+@lru_cache(maxsize=8)
+def _load_simple_content_bases(base_dir: str, base_prefix: str) -> Dict[str, str]:
+    """Map complex types with simple content (e.g. ``HD.1.CONTENT``) to their primitive base (e.g. ``IS``)."""
+    types_path = os.path.join(base_dir, f"{base_prefix}_types.xsd")
+    types_root = ET.parse(types_path).getroot()
+
+    bases: Dict[str, str] = {}
+    for ctype in types_root.findall(f"{XS_NS}complexType"):
+        type_name = ctype.get("name")
+        ext = ctype.find(f"{XS_NS}simpleContent/{XS_NS}extension")
+        if type_name and ext is not None and ext.get("base"):
+            bases[type_name] = ext.get("base")  # type: ignore[assignment]
+    return bases
@@ -0,0 +1,330 @@
+"""
+Process-pool-backed ER7 to XML conversion and flow schema validation.
+
+Conversion and ``xmlschema`` validation are pure-Python, CPU-bound work that holds the GIL,
+so a threaded server or a store consumer can only ever use one core for them. ``ValidationPool``
+moves that work into worker processes. Each worker compiles the XSDs for the configured flows
+once, in its initializer, so individual calls never pay the (multi-second) schema compilation cost.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.context import BaseContext
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple, TypeVar, Union
+
+from .convert import _load_schema_maps, convert_er7_to_xml
+from .schemas import get_schema_xsd_path_for, list_schema_groups, list_schemas_for_group
+from .validate import (
+    _get_compiled_schema,
+    convert_er7_to_xml_with_flow_schema,
+    validate_and_convert_er7_with_flow_schema,
+)
+from .validation_result import ValidationResult
+
+logger = logging.getLogger(__name__)
+
+QUEUE_WAIT_METRIC = "hl7_validation_pool_queue_wait"
+CALL_LATENCY_METRIC = "hl7_validation_pool_call_latency"
+
+TriggerMapping = Optional[Dict[Tuple[str, str], str]]
+T = TypeVar("T")
+
+
+class GaugeMetricSink(Protocol):
+    """Anything that can record a timing sample, e.g. ``metric_sender_lib.MetricSender``."""
+
+    def send_gauge_metric(self, key: str, value: float, attributes: Optional[Dict[str, Any]] = None) -> None: ...
+
+
+@dataclass
+class _TaskOutcome:
+    """Value returned from a worker along with the monotonic timestamps needed for metrics."""
+
+    value: Any
+    started_at: float
+    finished_at: float
+
+
+@dataclass
+class ValidationPoolStats:
+    """
+    Cumulative timing statistics for a ``ValidationPool``.
+
+    Attributes:
+        calls: Number of completed calls (successful or failed)
+        failures: Number of calls that raised an exception in the worker
+        total_queue_wait_seconds: Sum of time calls spent waiting for a free worker
+        max_queue_wait_seconds: Longest single queue wait observed
+        total_call_seconds: Sum of time spent executing calls inside workers
+        max_call_seconds: Longest single call observed
+    """
+
+    calls: int = 0
+    failures: int = 0
+    total_queue_wait_seconds: float = 0.0
+    max_queue_wait_seconds: float = 0.0
+    total_call_seconds: float = 0.0
+    max_call_seconds: float = 0.0
+
+    @property
+    def mean_queue_wait_seconds(self) -> float:
+        return self.total_queue_wait_seconds / self.calls if self.calls else 0.0
+
+    @property
+    def mean_call_seconds(self) -> float:
+        return self.total_call_seconds / self.calls if self.calls else 0.0
+
+
+class _WorkerFailure(Exception):
+    """Carries a worker exception back to the parent together with the call timings."""
+
+    def __init__(self, error: BaseException, started_at: float, finished_at: float) -> None:
+        super().__init__(error, started_at, finished_at)
+        self.error = error
+        self.started_at = started_at
+        self.finished_at = finished_at
+
+
+def _structure_ids_for_flow(flow_name: str) -> List[str]:
+    # Base datatype/segment/field XSDs (e.g. "2_5_fields") sit alongside the message structure XSDs.
+    return [key for key in list_schemas_for_group(flow_name) if not key[0].isdigit()]
+
+
+def _preload_flow_schemas(flow_names: Sequence[str]) -> None:
+    """Compile and cache every structure XSD (and its conversion maps) for the given flows."""
+    for flow_name in flow_names:
+        for structure_id in _structure_ids_for_flow(flow_name):
+            xsd_path = get_schema_xsd_path_for(flow_name, structure_id)
+            _get_compiled_schema(xsd_path)
+            _load_schema_maps(xsd_path)
+
+
+def _initialise_worker(flow_names: Tuple[str, ...]) -> None:
+    started_at = time.monotonic()
+    _preload_flow_schemas(flow_names)
+    logger.info(
+        "Validation pool worker %d preloaded schemas for %s in %.2fs",
+        os.getpid(),
+        ", ".join(flow_names) or "<none>",
+        time.monotonic() - started_at,
+    )
+
+
+def _run_convert(er7_message: str, flow_name: Optional[str], trigger_mapping: TriggerMapping) -> _TaskOutcome:
+    started_at = time.monotonic()
+    try:
+        if flow_name:
+            xml_string = convert_er7_to_xml_with_flow_schema(er7_message, flow_name, trigger_mapping)
+        else:
+            xml_string = convert_er7_to_xml(er7_message)
+    except Exception as e:
+        raise _WorkerFailure(e, started_at, time.monotonic()) from None
+    return _TaskOutcome(xml_string, started_at, time.monotonic())
+
+
+def _run_validate(er7_message: str, flow_name: str, trigger_mapping: TriggerMapping) -> _TaskOutcome:
+    started_at = time.monotonic()
+    try:
+        result = validate_and_convert_er7_with_flow_schema(er7_message, flow_name, trigger_mapping)
+    except Exception as e:
+        raise _WorkerFailure(e, started_at, time.monotonic()) from None
+    return _TaskOutcome(result, started_at, time.monotonic())
+
+
+class ValidationPool:
+    """
+    Spread ER7 to XML conversion and flow schema validation across worker processes.
+
+    Every worker is initialised with compiled schemas for ``flow_names`` (all bundled flows by
+    default). Calls return the same values and raise the same exceptions as the single-message
+    functions they wrap: ``convert_er7_to_xml``/``convert_er7_to_xml_with_flow_schema`` and
+    ``validate_and_convert_er7_with_flow_schema``.
+
+    For each call the pool records how long it waited for a free worker (queue wait) and how long
+    the worker spent on it (call latency). Totals are available from ``stats`` and, if a metric sink
+    is supplied, every sample is also sent via ``send_gauge_metric``.
+
+    Example:
+        with ValidationPool(flow_names=["phw"]) as pool:
+            results = pool.validate_many(er7_messages, "phw")
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        flow_names: Optional[Iterable[str]] = None,
+        metric_sink: Optional[GaugeMetricSink] = None,
+        mp_context: Optional[BaseContext] = None,
+    ) -> None:
+        self.flow_names: Tuple[str, ...] = tuple(flow_names) if flow_names is not None else tuple(list_schema_groups())
+        self._metric_sink = metric_sink
+        self._stats = ValidationPoolStats()
+        self._stats_lock = threading.Lock()
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=mp_context,
+            initializer=_initialise_worker,
+            initargs=(self.flow_names,),
+        )
+
+    def __enter__(self) -> "ValidationPool":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.shutdown()
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    @property
+    def stats(self) -> ValidationPoolStats:
+        """Snapshot of the cumulative call statistics."""
+        with self._stats_lock:
+            return ValidationPoolStats(**vars(self._stats))
+
+    def submit_convert(
+        self,
+        er7_message: str,
+        flow_name: Optional[str] = None,
+        trigger_mapping: TriggerMapping = None,
+    ) -> "Future[str]":
+        """Queue an ER7 to XML conversion; without ``flow_name`` the schema-less converter is used."""
+        return self._submit("convert", _run_convert, er7_message, flow_name, trigger_mapping)
+
+    def submit_validate(
+        self,
+        er7_message: str,
+        flow_name: str,
+        trigger_mapping: TriggerMapping = None,
+    ) -> "Future[ValidationResult]":
+        """Queue a flow schema validation that also returns the generated XML."""
+        return self._submit("validate", _run_validate, er7_message, flow_name, trigger_mapping)
+
+    def convert_many(
+        self,
+        er7_messages: Iterable[str],
+        flow_name: Optional[str] = None,
+        trigger_mapping: TriggerMapping = None,
+        return_exceptions: bool = False,
+    ) -> List[Union[str, Exception]]:
+        """
+        Convert a batch of ER7 messages to XML, returning results in input order.
+
+        Args:
+            er7_messages: Messages in ER7 format
+            flow_name: Optional flow whose schema drives the conversion
+            trigger_mapping: Optional (message_type, trigger) to structure_id mapping
+            return_exceptions: If True, a failing message yields its exception in place of a
+                result; otherwise the first failure (in input order) is raised
+
+        Returns:
+            XML strings (or exceptions, see ``return_exceptions``) in the same order as the input
+        """
+        futures = [self.submit_convert(er7, flow_name, trigger_mapping) for er7 in er7_messages]
+        return _gather(futures, return_exceptions)
+
+    def validate_many(
+        self,
+        er7_messages: Iterable[str],
+        flow_name: str,
+        trigger_mapping: TriggerMapping = None,
+        return_exceptions: bool = False,
+    ) -> List[Union[ValidationResult, Exception]]:
+        """
+        Validate a batch of ER7 messages against a flow schema, returning results in input order.
+
+        Schema failures are reported through ``ValidationResult.is_valid`` exactly as for
+        ``validate_and_convert_er7_with_flow_schema``. Messages that cannot be parsed raise
+        ``XmlValidationError``; see ``return_exceptions``.
+
+        Args:
+            er7_messages: Messages in ER7 format
+            flow_name: Flow identifier for schema selection
+            trigger_mapping: Optional (message_type, trigger) to structure_id mapping
+            return_exceptions: If True, a failing message yields its exception in place of a
+                result; otherwise the first failure (in input order) is raised
+
+        Returns:
+            ValidationResults (or exceptions, see ``return_exceptions``) in input order
+        """
+        futures = [self.submit_validate(er7, flow_name, trigger_mapping) for er7 in er7_messages]
+        return _gather(futures, return_exceptions)
+
+    async def convert_async(
+        self, er7_message: str, flow_name: Optional[str] = None, trigger_mapping: TriggerMapping = None
+    ) -> str:
+        """Awaitable variant of ``submit_convert`` for asyncio callers."""
+        return await asyncio.wrap_future(self.submit_convert(er7_message, flow_name, trigger_mapping))
+
+    async def validate_async(
+        self, er7_message: str, flow_name: str, trigger_mapping: TriggerMapping = None
+    ) -> ValidationResult:
+        """Awaitable variant of ``submit_validate`` for asyncio callers."""
+        return await asyncio.wrap_future(self.submit_validate(er7_message, flow_name, trigger_mapping))
+
+    def _submit(self, operation: str, task: Any, *args: Any) -> "Future[Any]":
+        submitted_at = time.monotonic()
+        worker_future = self._executor.submit(task, *args)
+        caller_future: "Future[Any]" = Future()
+        caller_future.set_running_or_notify_cancel()
+
+        def _on_done(done: "Future[_TaskOutcome]") -> None:
+            try:
+                outcome = done.result()
+            except _WorkerFailure as failure:
+                self._record(operation, submitted_at, failure.started_at, failure.finished_at, failed=True)
+                caller_future.set_exception(failure.error)
+                return
+            except BaseException as e:
+                # Pool-level failures (e.g. a worker process died) carry no timings.
+                caller_future.set_exception(e)
+                return
+            self._record(operation, submitted_at, outcome.started_at, outcome.finished_at, failed=False)
+            caller_future.set_result(outcome.value)
+
+        worker_future.add_done_callback(_on_done)
+        return caller_future
+
+    def _record(self, operation: str, submitted_at: float, started_at: float, finished_at: float, failed: bool) -> None:
+        # CLOCK_MONOTONIC is system-wide, so worker timestamps are comparable with the parent's.
+        queue_wait = max(0.0, started_at - submitted_at)
+        call_latency = max(0.0, finished_at - started_at)
+
+        with self._stats_lock:
+            stats = self._stats
+            stats.calls += 1
+            stats.failures += int(failed)
+            stats.total_queue_wait_seconds += queue_wait
+            stats.max_queue_wait_seconds = max(stats.max_queue_wait_seconds, queue_wait)
+            stats.total_call_seconds += call_latency
+            stats.max_call_seconds = max(stats.max_call_seconds, call_latency)
+
+        if self._metric_sink is None:
+            return
+        attributes = {"operation": operation, "outcome": "failure" if failed else "success"}
+        try:
+            self._metric_sink.send_gauge_metric(QUEUE_WAIT_METRIC, queue_wait, attributes)
+            self._metric_sink.send_gauge_metric(CALL_LATENCY_METRIC, call_latency, attributes)
+        except Exception as e:
+            # Metrics must never turn a successful conversion into a failure.
+            logger.warning("Failed to send validation pool metrics: %s", e)
+
+
+def _gather(futures: List["Future[T]"], return_exceptions: bool) -> List[Union[T, Exception]]:
+    results: List[Union[T, Exception]] = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            results.append(e)
+    return results
+
@@ -0,0 +1,92 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from hl7_validation.benchmark import (
+    STAGES,
+    BenchmarkResult,
+    compare_to_baseline,
+    main,
+    results_to_baseline,
+    run_benchmarks,
+)
+
+
+def _result(seconds: float = 1.0, peak: int = 1000, stage: str = "parse") -> BenchmarkResult:
+    return BenchmarkResult(
+        flow="phw",
+        size_class="tiny",
+        stage=stage,
+        messages=10,
+        total_bytes=10_000,
+        seconds=seconds,
+        peak_memory_bytes=peak,
+    )
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_run_benchmarks_measures_every_stage(self) -> None:
+        results = run_benchmarks(flows=["phw"], size_classes=["tiny"], repeat=1)
+
+        self.assertEqual([result.stage for result in results], list(STAGES))
+        for result in results:
+            with self.subTest(stage=result.stage):
+                self.assertEqual(result.key, f"phw/tiny/{result.stage}")
+                self.assertEqual(result.messages, 2)
+                self.assertGreater(result.messages_per_second, 0)
+                self.assertGreater(result.peak_memory_bytes, 0)
+
+    def test_standard_stages_validate_the_same_messages(self) -> None:
+        results = run_benchmarks(
+            flows=["pims"], size_classes=["tiny"], stages=["parse", "standard_rules", "standard_hl7apy"], repeat=1
+        )
+
+        parse, rules, hl7apy = results
+        self.assertEqual((rules.messages, rules.total_bytes), (hl7apy.messages, hl7apy.total_bytes))
+        self.assertLessEqual(rules.messages, parse.messages)
+        self.assertGreater(rules.messages, 0)
+
+    def test_unknown_stage_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            run_benchmarks(flows=["phw"], size_classes=["tiny"], stages=["serialise"])
+
+    def test_throughput_and_memory_regressions_are_reported(self) -> None:
+        baseline = results_to_baseline([_result(), _result(stage="convert")])
+
+        regressions = compare_to_baseline(
+            [_result(seconds=2.0), _result(peak=2000, stage="convert")], baseline, tolerance=0.3
+        )
+
+        self.assertEqual(
+            [(regression.key, regression.metric) for regression in regressions],
+            [("phw/tiny/parse", "messages_per_second"), ("phw/tiny/convert", "peak_memory_bytes")],
+        )
+
+    def test_changes_within_tolerance_and_new_keys_pass(self) -> None:
+        baseline = results_to_baseline([_result()])
+
+        regressions = compare_to_baseline(
+            [_result(seconds=1.2, peak=1200), _result(stage="validate", seconds=50.0)], baseline, tolerance=0.3
+        )
+
+        self.assertEqual(regressions, [])
+
+    def test_unsupported_baseline_format_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            compare_to_baseline([_result()], {"format": 99, "results": {}})
+
+    def test_cli_writes_and_checks_baseline(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline_path = Path(tmp) / "baseline.json"
+            args = ["--flows", "wds", "--sizes", "tiny", "--stages", "xml_to_er7", "--repeat", "1"]
+
+            self.assertEqual(main(args + ["--baseline", str(baseline_path), "--update-baseline"]), 0)
+            stored = json.loads(baseline_path.read_text())
+            self.assertIn("wds/tiny/xml_to_er7", stored["results"])
+
+            self.assertEqual(main(args + ["--baseline", str(baseline_path), "--tolerance", "0.99"]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
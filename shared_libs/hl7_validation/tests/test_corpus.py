@@ -0,0 +1,56 @@
+import unittest
+
+from hl7_validation import validate_er7_with_flow_schema
+from hl7_validation.corpus import SIZE_CLASSES, flow_structures, generate_corpus, generate_message
+from hl7_validation.schemas import list_schema_groups
+
+
+class TestCorpus(unittest.TestCase):
+    def test_generation_is_deterministic_per_seed(self) -> None:
+        first = generate_message("phw", "ADT_A05", 2000, seed=3)
+
+        self.assertEqual(generate_message("phw", "ADT_A05", 2000, seed=3), first)
+        self.assertNotEqual(generate_message("phw", "ADT_A05", 2000, seed=4), first)
+
+    def test_every_flow_structure_passes_its_flow_schema(self) -> None:
+        messages = list(generate_corpus(size_classes=["tiny"]))
+
+        covered = {(message.flow, message.structure) for message in messages}
+        expected = {(flow, structure) for flow in list_schema_groups() for structure in flow_structures(flow)}
+        self.assertEqual(covered, expected)
+        for message in messages:
+            with self.subTest(flow=message.flow, structure=message.structure):
+                validate_er7_with_flow_schema(message.er7, message.flow)
+
+    def test_size_classes_grow_by_repeating_segments(self) -> None:
+        for structure, repeated in (("ADT_A05", "OBX"), ("ADT_A39", "PID")):
+            with self.subTest(structure=structure):
+                tiny = generate_message("phw", structure, SIZE_CLASSES["tiny"])
+                small = generate_message("phw", structure, SIZE_CLASSES["small"])
+
+                self.assertGreaterEqual(len(small), SIZE_CLASSES["small"])
+                segment_names = [segment[:3] for segment in small.split("\r")]
+                self.assertGreater(segment_names.count(repeated), 5)
+                self.assertTrue(tiny.startswith("MSH|^~\\&|PHW|"))
+
+    def test_padded_messages_stay_schema_valid(self) -> None:
+        for flow_name in ("pims", "chemo"):
+            for structure in flow_structures(flow_name):
+                with self.subTest(flow=flow_name, structure=structure):
+                    validate_er7_with_flow_schema(generate_message(flow_name, structure, 8000), flow_name)
+
+    def test_messages_per_size_use_distinct_seeds(self) -> None:
+        messages = list(generate_corpus(["wds"], ["tiny"], messages_per_size=2))
+
+        self.assertEqual(len(messages), 2 * len(flow_structures("wds")))
+        self.assertNotEqual(messages[0].er7, messages[1].er7)
+
+    def test_unknown_inputs_are_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            list(generate_corpus(["phw"], ["gigantic"]))
+        with self.assertRaises(ValueError):
+            generate_message("phw", "ORU_R01")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+import shutil
+import tempfile
+import unittest
+from importlib.resources import files
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from hl7_validation import (
+    ValidationResultCache,
+    XmlValidationError,
+    convert_er7_to_xml,
+    convert_er7_to_xml_with_flow_schema,
+    validate_and_convert_er7_with_flow_schema,
+)
+from hl7_validation.convert import _compute_structure_requirements
+from hl7_validation.result_cache import CACHE_LOOKUP_METRIC, clear_schema_caches
+from hl7_validation.utils.message_utils import parse_er7_message
+
+VALID_PHW_A05 = "\r".join(
+    [
+        "MSH|^~\\&|252|252|100|100|2025-05-05 23:23:30||ADT^A31^ADT_A05|"
+        "202505052323300000000000|P|2.5|||||GBR||EN",
+        "EVN|A05|20250502092900|20250505232330|||20250505232330",
+        "PID|||8888888^^^252^PI~4444444444^^^NHS^NH||SURNAME^FORENAME",
+        "PV1||",
+    ]
+)
+
+OTHER_VALID_PHW_A05 = VALID_PHW_A05.replace("SURNAME^FORENAME", "OTHER^PATIENT")
+
+SCHEMA_INVALID_PHW_A05 = VALID_PHW_A05 + "\rNK1|1|NEXT^OF^KIN"
+
+UNPARSEABLE = "this is not an HL7 message"
+
+VALIDATE_TARGET = "hl7_validation.result_cache.validate_and_convert_er7_with_flow_schema"
+
+
+class TestValidationResultCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.metric_sink = MagicMock()
+        self.cache = ValidationResultCache(metric_sink=self.metric_sink)
+
+    def test_repeated_validation_is_served_from_cache(self) -> None:
+        expected = validate_and_convert_er7_with_flow_schema(VALID_PHW_A05, "phw")
+
+        with patch(VALIDATE_TARGET, wraps=validate_and_convert_er7_with_flow_schema) as validate:
+            first = self.cache.validate_and_convert(VALID_PHW_A05, "phw")
+            second = self.cache.validate_and_convert(VALID_PHW_A05, "phw")
+
+        self.assertEqual(first, expected)
+        self.assertEqual(second, expected)
+        validate.assert_called_once()
+        stats = self.cache.stats
+        self.assertEqual((stats.hits, stats.misses, stats.entries), (1, 1, 1))
+        self.assertEqual(stats.hit_ratio, 0.5)
+
+    def test_returned_results_are_copies(self) -> None:
+        first = self.cache.validate_and_convert(VALID_PHW_A05, "phw")
+        first.is_valid = False
+
+        self.assertTrue(self.cache.validate_and_convert(VALID_PHW_A05, "phw").is_valid)
+
+    def test_schema_failures_are_cached_as_invalid_results(self) -> None:
+        with patch(VALIDATE_TARGET, wraps=validate_and_convert_er7_with_flow_schema) as validate:
+            first = self.cache.validate_and_convert(SCHEMA_INVALID_PHW_A05, "phw")
+            second = self.cache.validate_and_convert(SCHEMA_INVALID_PHW_A05, "phw")
+
+        self.assertFalse(first.is_valid)
+        self.assertEqual(first, second)
+        validate.assert_called_once()
+
+    def test_parse_failures_are_cached_and_re_raised(self) -> None:
+        with patch(VALIDATE_TARGET, wraps=validate_and_convert_er7_with_flow_schema) as validate:
+            for _ in range(2):
+                with self.assertRaises(XmlValidationError) as context:
+                    self.cache.validate_and_convert(UNPARSEABLE, "phw")
+                self.assertIn("Unable to parse ER7 message", str(context.exception))
+
+        validate.assert_called_once()
+
+    def test_parsed_message_is_used_on_miss(self) -> None:
+        msg = parse_er7_message(VALID_PHW_A05)
+
+        with patch(VALIDATE_TARGET) as validate:
+            result = self.cache.validate_and_convert(VALID_PHW_A05, "phw", parsed_message=msg)
+
+        validate.assert_not_called()
+        self.assertTrue(result.is_valid)
+
+    def test_key_includes_flow_operation_and_trigger_mapping(self) -> None:
+        self.cache.validate_and_convert(VALID_PHW_A05, "phw")
+        self.cache.validate_and_convert(VALID_PHW_A05, "wds")
+        self.cache.validate_and_convert(VALID_PHW_A05, "phw", trigger_mapping={("ADT", "A31"): "ADT_A05"})
+        xml_string = self.cache.convert(VALID_PHW_A05, "phw")
+
+        self.assertEqual(self.cache.stats.misses, 4)
+        self.assertEqual(xml_string, convert_er7_to_xml_with_flow_schema(VALID_PHW_A05, "phw"))
+
+    def test_convert_without_flow_uses_schema_less_converter(self) -> None:
+        self.assertEqual(self.cache.convert(VALID_PHW_A05), convert_er7_to_xml(VALID_PHW_A05))
+        self.assertEqual(self.cache.convert(VALID_PHW_A05), convert_er7_to_xml(VALID_PHW_A05))
+        self.assertEqual(self.cache.stats.hits, 1)
+
+    def test_entry_limit_evicts_least_recently_used(self) -> None:
+        cache = ValidationResultCache(max_entries=1)
+
+        cache.convert(VALID_PHW_A05)
+        cache.convert(OTHER_VALID_PHW_A05)
+        cache.convert(VALID_PHW_A05)
+
+        stats = cache.stats
+        self.assertEqual((stats.hits, stats.misses, stats.evictions, stats.entries), (0, 3, 2, 1))
+
+    def test_memory_cap_is_respected(self) -> None:
+        probe = ValidationResultCache()
+        probe.convert(VALID_PHW_A05)
+        single_entry_bytes = probe.stats.size_bytes
+
+        cache = ValidationResultCache(max_bytes=single_entry_bytes + 10)
+        cache.convert(VALID_PHW_A05)
+        cache.convert(OTHER_VALID_PHW_A05)
+
+        self.assertLessEqual(cache.stats.size_bytes, single_entry_bytes + 10)
+        self.assertEqual(cache.stats.entries, 1)
+
+    def test_oversized_results_are_not_cached(self) -> None:
+        cache = ValidationResultCache(max_bytes=1)
+
+        cache.convert(VALID_PHW_A05)
+
+        self.assertEqual(cache.stats.entries, 0)
+        self.assertEqual(cache.stats.size_bytes, 0)
+
+    def test_schema_change_invalidates_flow_entries(self) -> None:
+        cache = ValidationResultCache(schema_check_interval_seconds=0)
+        cache.validate_and_convert(VALID_PHW_A05, "phw")
+        cache.validate_and_convert(VALID_PHW_A05, "wds")
+
+        changed_signature = (("ADT_A05.xsd", 1, 1),)
+        with (
+            patch("hl7_validation.result_cache._schema_file_signature", return_value=changed_signature),
+            patch("hl7_validation.result_cache._schema_content_fingerprint", return_value="changed"),
+            patch("hl7_validation.result_cache.clear_schema_caches") as clear_schema_caches,
+            patch(VALIDATE_TARGET, wraps=validate_and_convert_er7_with_flow_schema) as validate,
+        ):
+            cache.validate_and_convert(VALID_PHW_A05, "phw")
+
+        validate.assert_called_once()
+        clear_schema_caches.assert_called()
+        self.assertGreaterEqual(cache.stats.invalidations, 1)
+
+    def test_clear_schema_caches_reloads_edited_xsds(self) -> None:
+        self.addCleanup(clear_schema_caches)
+        with tempfile.TemporaryDirectory() as tmp:
+            flow_dir = Path(tmp) / "phw"
+            shutil.copytree(str(files("hl7_validation.resources") / "phw"), flow_dir)
+            structure_path = flow_dir / "ADT_A05.xsd"
+
+            *_, required, _ = _compute_structure_requirements(str(structure_path), "ADT_A05")
+            self.assertTrue(required["EVN"])
+
+            xsd = structure_path.read_text()
+            structure_path.write_text(xsd.replace('<xsd:element ref="EVN"/>', '<xsd:element ref="EVN" minOccurs="0"/>'))
+            clear_schema_caches()
+
+            *_, required, _ = _compute_structure_requirements(str(structure_path), "ADT_A05")
+            self.assertFalse(required["EVN"])
+
+    def test_lookup_metrics_are_sent(self) -> None:
+        self.cache.convert(VALID_PHW_A05)
+        self.cache.convert(VALID_PHW_A05)
+
+        results = [call.args[2]["result"] for call in self.metric_sink.send_metric.call_args_list]
+        self.assertEqual(results, ["miss", "hit"])
+        self.assertEqual(self.metric_sink.send_metric.call_args.args[0], CACHE_LOOKUP_METRIC)
+
+    def test_metric_failures_do_not_fail_lookups(self) -> None:
+        self.metric_sink.send_metric.side_effect = RuntimeError("exporter down")
+
+        self.assertEqual(self.cache.convert(VALID_PHW_A05), convert_er7_to_xml(VALID_PHW_A05))
+
+    def test_invalid_limits_are_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            ValidationResultCache(max_bytes=0)
+        with self.assertRaises(ValueError):
+            ValidationResultCache(max_entries=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Callable, List, Optional
+from unittest.mock import patch
+
+from hl7apy import consts
+from hl7apy.core import Message
+from hl7apy.exceptions import ValidationError
+from hl7apy.parser import parse_message
+from hl7apy.validation import Validator
+
+from hl7_validation import compile_standard_rules
+from hl7_validation.standard_rules import _compile_standard_rules, _rule_cache_path, validate_message_with_rules
+
+VERSIONS = ["2.4", "2.5", "2.5.1", "2.6"]
+
+BASE_SEGMENTS = [
+    "EVN|A05|20250101010101",
+    "PID|1||123456^^^MR~4444444444^^^NHS^NH||DOE^JOHN^M^^MR||19800101|X|||1 ROAD^PLACE^CITY^^SA1 1AA^^H",
+    "PD1|||^^123^|G999999",
+    "NK1|1|KIN^NEXT",
+    "PV1||Q|WARD^BED^ROOM||||C123^DOC^TOR",
+    "OBX|1|CE|CODE^TEXT||A^B^C||||||F",
+    "OBX|2|ST|CODE||hello||||||F",
+    "AL1|1||ALG",
+    "ZAB|1|X",
+]
+
+CASES = {
+    "valid": BASE_SEGMENTS,
+    "missing_required_segment": [s for s in BASE_SEGMENTS if not s.startswith("PV1")],
+    "missing_required_field": ["EVN|A05"] + BASE_SEGMENTS[1:],
+    "child_limit_exceeded": BASE_SEGMENTS + ["PV1||I"],
+    "segment_only_valid_in_group": BASE_SEGMENTS + ["IN1|1"],
+}
+
+
+def _message(version: str, segments: List[str], structure: str = "ADT_A05") -> Message:
+    msh = f"MSH|^~\\&|S|F|R|F|20250101010101||ADT^A05^{structure}|MSG123|P|{version}|||AL|NE"
+    return parse_message("\r".join([msh] + segments), validation_level=consts.VALIDATION_LEVEL.TOLERANT,
+                         find_groups=False)
+
+
+def _error_text(func: Callable[[Message], object], msg: Message) -> Optional[str]:
+    try:
+        func(msg)
+    except ValidationError as e:
+        return str(e)
+    return None
+
+
+def _hl7apy_warnings(msg: Message) -> List[str]:
+    with tempfile.TemporaryDirectory() as tmp:
+        report = Path(tmp) / "report.txt"
+        try:
+            Validator.validate(msg, reference=msg.reference, report_file=str(report))
+        except ValidationError:
+            pass
+        return [line[len("Warning: "):].rstrip("\n") for line in report.read_text().splitlines(True)
+                if line.startswith("Warning: ")]
+
+
+class TestStandardRules(unittest.TestCase):
+    def test_errors_match_hl7apy_validator(self) -> None:
+        for version in VERSIONS:
+            for case, segments in CASES.items():
+                for structure in ("ADT_A05", "ADT_A01"):
+                    with self.subTest(version=version, case=case, structure=structure):
+                        msg = _message(version, segments, structure)
+
+                        expected = _error_text(lambda m: m.validate(), msg)
+
+                        self.assertEqual(_error_text(validate_message_with_rules, msg), expected)
+                        if case == "valid":
+                            self.assertIsNone(expected)
+                        else:
+                            self.assertIsNotNone(expected)
+
+    def test_warnings_match_hl7apy_report(self) -> None:
+        for version in VERSIONS:
+            with self.subTest(version=version):
+                msg = _message(version, BASE_SEGMENTS)
+
+                warnings = [str(w) for w in validate_message_with_rules(msg, collect_warnings=True)]
+
+                self.assertEqual(warnings, _hl7apy_warnings(msg))
+                self.assertTrue(any("not in table" in w for w in warnings))
+
+    def test_warnings_are_skipped_by_default(self) -> None:
+        self.assertEqual(validate_message_with_rules(_message("2.5", BASE_SEGMENTS)), [])
+
+    def test_non_standard_reference_falls_back_to_hl7apy(self) -> None:
+        msg = _message("2.5", BASE_SEGMENTS)
+        msg.reference = ("sequence", msg.reference[1])
+
+        with patch("hl7_validation.standard_rules.Validator.validate", return_value=True) as validate:
+            validate_message_with_rules(msg)
+
+        validate.assert_called_once_with(msg, reference=msg.reference)
+
+    def test_complex_z_field_falls_back_to_hl7apy(self) -> None:
+        msg = _message("2.5", BASE_SEGMENTS)
+        msg.children[-1].children[0].datatype = "CX"
+
+        with patch("hl7_validation.standard_rules.Validator.validate", return_value=True) as validate:
+            validate_message_with_rules(msg)
+
+        validate.assert_called_once()
+
+    def test_compiled_tables_are_persisted_and_reloaded(self) -> None:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            compiled = compile_standard_rules("ADT_A05", "2.5", cache_dir)
+            cache_file = _rule_cache_path(Path(cache_dir), "2.5", "ADT_A05")
+            self.assertTrue(cache_file.exists())
+
+            _compile_standard_rules.cache_clear()
+            with patch("hl7_validation.standard_rules._compile_nodes") as compile_nodes:
+                reloaded = compile_standard_rules("ADT_A05", "2.5", cache_dir)
+
+            compile_nodes.assert_not_called()
+            self.assertEqual(reloaded, compiled)
+
+    def test_corrupt_or_stale_cache_is_recompiled(self) -> None:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            expected = compile_standard_rules("ADT_A05", "2.5", None)
+            cache_file = _rule_cache_path(Path(cache_dir), "2.5", "ADT_A05")
+            cache_file.parent.mkdir(parents=True)
+
+            for content in ["{not json", '{"format": 0}']:
+                with self.subTest(content=content):
+                    cache_file.write_text(content)
+                    _compile_standard_rules.cache_clear()
+
+                    self.assertEqual(compile_standard_rules("ADT_A05", "2.5", cache_dir), expected)
+
+    def test_unknown_structure_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            compile_standard_rules("ADT_X99", "2.5", None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import io
+import tracemalloc
+import unittest
+from typing import Any, List
+
+from defusedxml.ElementTree import fromstring
+
+from hl7_validation import xml_to_er7
+from hl7_validation.convert import (
+    _is_segment_tag,
+    _process_segment_element,
+    _strip_namespace,
+    er7_to_hl7v2xml,
+    iter_xml_to_er7_segments,
+)
+from hl7_validation.schemas import get_schema_xsd_path_for, list_schema_groups, list_schemas_for_group
+
+FLOW_VERSIONS = {
+    "chemo": "2.4",
+    "mosaiq": "2.5",
+    "paris": "2.5.1",
+    "phw": "2.5",
+    "pims": "2.3.1",
+    "wds": "2.5",
+}
+
+
+def _build_er7(structure_id: str, version: str) -> str:
+    segments = [
+        f"MSH|^~\\&|252|252|100|100|20250505232330||ADT^A31^{structure_id}|MSG0001|P|{version}|||||GBR||EN",
+        "EVN|A31|20250502092900|20250505232330|||20250505232330",
+        "PID|1||8888888^^^252^PI~4444444444^^^NHS^NH||SURNAME^FORENAME^MIDDLE^^MR||19990101|M|||"
+        "99, MY ROAD^MY PLACE^MY CITY^MY COUNTY^SA99 1XX^^H",
+        "PD1|||^^W00000^|G999999",
+    ]
+    if structure_id in ("ADT_A39", "ADT_A40"):
+        segments.append("MRG|7777777^^^252^PI~5555555555^^^NHS^NH")
+    segments.append("PV1||I")
+    return "\r".join(segments)
+
+
+def _structure_ids(flow_name: str) -> List[str]:
+    # Base datatype/segment/field XSDs (e.g. 2_5_fields) live alongside the message structure XSDs.
+    return sorted(key for key in list_schemas_for_group(flow_name) if not key[0].isdigit())
+
+
+def _tree_xml_to_er7(xml_string: str) -> str:
+    """Reference conversion that loads the whole document as a tree before rebuilding ER7."""
+
+    def walk(parent: Any) -> List[str]:
+        segments: List[str] = []
+        for child in parent:
+            tag = _strip_namespace(child.tag)
+            if _is_segment_tag(tag):
+                segments.append(_process_segment_element(child, tag))
+            else:
+                segments.extend(walk(child))
+        return segments
+
+    return "\r".join(walk(fromstring(xml_string)))
+
+
+class _ChunkedReader(io.StringIO):
+    """StringIO that never returns more than a few characters per read, splitting tags across chunks."""
+
+    def read(self, size: int | None = -1) -> str:
+        return super().read(7)
+
+
+class TestStreamingXmlToEr7(unittest.TestCase):
+    def test_round_trip_matches_tree_conversion_for_every_flow(self) -> None:
+        # Every flow shipped in resources must be covered so new flows are not silently skipped.
+        self.assertEqual(set(list_schema_groups()), set(FLOW_VERSIONS))
+
+        for flow_name in list_schema_groups():
+            for structure_id in _structure_ids(flow_name):
+                with self.subTest(flow=flow_name, structure=structure_id):
+                    er7 = _build_er7(structure_id, FLOW_VERSIONS[flow_name])
+                    xsd_path = get_schema_xsd_path_for(flow_name, structure_id)
+                    xml_string = er7_to_hl7v2xml(er7, structure_xsd_path=xsd_path)
+
+                    streamed = xml_to_er7(xml_string)
+
+                    self.assertEqual(streamed, _tree_xml_to_er7(xml_string))
+                    original_segment_names = [segment[:3] for segment in er7.split("\r")]
+                    streamed_segment_names = [segment[:3] for segment in streamed.split("\r")]
+                    self.assertEqual(streamed_segment_names, original_segment_names)
+
+    def test_grouped_structure_flattens_groups_in_document_order(self) -> None:
+        xml_string = (
+            '<ADT_A39 xmlns="urn:hl7-org:v2xml">'
+            "<MSH><MSH.1>|</MSH.1><MSH.2>^~\\&amp;</MSH.2><MSH.9><MSG.1>ADT</MSG.1><MSG.2>A40</MSG.2></MSH.9></MSH>"
+            "<ADT_A39.PATIENT><PID><PID.3><CX.1>123</CX.1></PID.3></PID>"
+            "<MRG><MRG.1><CX.1>456</CX.1></MRG.1></MRG></ADT_A39.PATIENT>"
+            "<ADT_A39.PATIENT><PID><PID.3><CX.1>789</CX.1></PID.3></PID></ADT_A39.PATIENT>"
+            "</ADT_A39>"
+        )
+
+        segments = list(iter_xml_to_er7_segments(xml_string))
+
+        self.assertEqual(segments, ["MSH|^~\\&|||||||ADT^A40", "PID|||123", "MRG|456", "PID|||789"])
+
+    def test_accepts_bytes_and_chunked_file_like_sources(self) -> None:
+        er7 = _build_er7("ADT_A05", "2.5")
+        xml_string = er7_to_hl7v2xml(er7, structure_xsd_path=get_schema_xsd_path_for("phw", "ADT_A05"))
+        expected = xml_to_er7(xml_string)
+
+        self.assertEqual(xml_to_er7(xml_string.encode("utf-8")), expected)
+        self.assertEqual(xml_to_er7(_ChunkedReader(xml_string)), expected)
+
+    def test_malformed_xml_raises_value_error(self) -> None:
+        for bad_xml in ["", "<ADT_A05><MSH>", "not xml"]:
+            with self.subTest(xml=bad_xml):
+                with self.assertRaises(ValueError) as context:
+                    xml_to_er7(bad_xml)
+                self.assertIn("Failed to parse XML", str(context.exception))
+
+    def test_entity_declarations_are_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            xml_to_er7('<!DOCTYPE x [<!ENTITY a "b">]><ADT_A05><MSH>&a;</MSH></ADT_A05>')
+
+    def test_peak_memory_does_not_scale_with_tree_size(self) -> None:
+        # Large payloads with many repeated segments: the streaming converter should only ever hold one
+        # segment, whereas a full tree load holds all of them at once.
+        segment = "<OBX><OBX.1>1</OBX.1><OBX.5>" + "X" * 200 + "</OBX.5></OBX>"
+        xml_string = '<ORU_R01 xmlns="urn:hl7-org:v2xml">' + segment * 5000 + "</ORU_R01>"
+
+        tracemalloc.start()
+        try:
+            fromstring(xml_string)
+            _, tree_peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            for _ in iter_xml_to_er7_segments(xml_string):
+                pass
+            _, streaming_peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertLess(streaming_peak * 5, tree_peak)
+
+
+if __name__ == "__main__":
+    unittest.main()
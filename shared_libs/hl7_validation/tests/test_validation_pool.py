@@ -0,0 +1,123 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+
+from hl7_validation import (
+    ValidationPool,
+    XmlValidationError,
+    convert_er7_to_xml,
+    convert_er7_to_xml_with_flow_schema,
+    validate_and_convert_er7_with_flow_schema,
+)
+from hl7_validation.validation_pool import CALL_LATENCY_METRIC, QUEUE_WAIT_METRIC
+
+VALID_PHW_A05 = "\r".join(
+    [
+        "MSH|^~\\&|252|252|100|100|2025-05-05 23:23:30||ADT^A31^ADT_A05|"
+        "202505052323300000000000|P|2.5|||||GBR||EN",
+        "EVN|A05|20250502092900|20250505232330|||20250505232330",
+        "PID|||8888888^^^252^PI~4444444444^^^NHS^NH||SURNAME^FORENAME",
+        "PV1||",
+    ]
+)
+
+SCHEMA_INVALID_PHW_A05 = "\r".join(
+    [
+        "MSH|^~\\&|252|252|100|100|2025-05-05 23:23:30||ADT^A31^ADT_A05|"
+        "202505052323300000000000|P|2.5|||||GBR||EN",
+        "EVN|A05|20250502092900|20250505232330|||20250505232330",
+        "PID|||8888888^^^252^PI~4444444444^^^NHS^NH||SURNAME^FORENAME",
+        "PV1||",
+        "NK1|1|NEXT^OF^KIN",  # NK1 is not part of the PHW ADT_A05 schema
+    ]
+)
+
+UNPARSEABLE = "this is not an HL7 message"
+
+
+class TestValidationPool(unittest.TestCase):
+    pool: ValidationPool
+    metric_sink: MagicMock
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Compiling schemas is the expensive part of worker start-up, so share one pool and
+        # restrict preloading to the flow these tests use.
+        cls.metric_sink = MagicMock()
+        cls.pool = ValidationPool(max_workers=2, flow_names=["phw"], metric_sink=cls.metric_sink)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.pool.shutdown()
+
+    def test_validate_many_matches_single_message_api_in_input_order(self) -> None:
+        messages = [VALID_PHW_A05, SCHEMA_INVALID_PHW_A05, VALID_PHW_A05]
+
+        results = self.pool.validate_many(messages, "phw")
+
+        expected = [validate_and_convert_er7_with_flow_schema(er7, "phw") for er7 in messages]
+        self.assertEqual(results, expected)
+        self.assertEqual([bool(result) for result in results], [True, False, True])
+
+    def test_convert_many_with_and_without_flow_schema(self) -> None:
+        self.assertEqual(
+            self.pool.convert_many([VALID_PHW_A05], "phw"),
+            [convert_er7_to_xml_with_flow_schema(VALID_PHW_A05, "phw")],
+        )
+        self.assertEqual(self.pool.convert_many([VALID_PHW_A05]), [convert_er7_to_xml(VALID_PHW_A05)])
+
+    def test_validate_many_raises_first_failure_by_default(self) -> None:
+        with self.assertRaises(XmlValidationError) as context:
+            self.pool.validate_many([VALID_PHW_A05, UNPARSEABLE], "phw")
+        self.assertIn("Unable to parse ER7 message", str(context.exception))
+
+    def test_validate_many_can_return_exceptions_in_place(self) -> None:
+        results = self.pool.validate_many([UNPARSEABLE, VALID_PHW_A05], "phw", return_exceptions=True)
+
+        self.assertIsInstance(results[0], XmlValidationError)
+        self.assertTrue(results[1])
+
+    def test_empty_batch_returns_empty_list(self) -> None:
+        self.assertEqual(self.pool.validate_many([], "phw"), [])
+        self.assertEqual(self.pool.convert_many([]), [])
+
+    def test_async_apis(self) -> None:
+        async def run() -> tuple:
+            return await asyncio.gather(
+                self.pool.validate_async(VALID_PHW_A05, "phw"),
+                self.pool.convert_async(VALID_PHW_A05, "phw"),
+            )
+
+        result, xml_string = asyncio.run(run())
+
+        self.assertTrue(result.is_valid)
+        self.assertEqual(xml_string, result.xml_string)
+
+    def test_records_queue_wait_and_call_latency(self) -> None:
+        before = self.pool.stats
+        self.metric_sink.reset_mock()
+
+        self.pool.validate_many([VALID_PHW_A05, UNPARSEABLE], "phw", return_exceptions=True)
+
+        after = self.pool.stats
+        self.assertEqual(after.calls - before.calls, 2)
+        self.assertEqual(after.failures - before.failures, 1)
+        self.assertGreater(after.total_call_seconds, before.total_call_seconds)
+        self.assertGreaterEqual(after.max_queue_wait_seconds, 0.0)
+
+        recorded_keys = [call.args[0] for call in self.metric_sink.send_gauge_metric.call_args_list]
+        self.assertEqual(recorded_keys.count(QUEUE_WAIT_METRIC), 2)
+        self.assertEqual(recorded_keys.count(CALL_LATENCY_METRIC), 2)
+        outcomes = {call.args[2]["outcome"] for call in self.metric_sink.send_gauge_metric.call_args_list}
+        self.assertEqual(outcomes, {"success", "failure"})
+
+    def test_metric_sink_errors_do_not_fail_calls(self) -> None:
+        failing_sink = MagicMock()
+        failing_sink.send_gauge_metric.side_effect = RuntimeError("exporter down")
+
+        with ValidationPool(max_workers=1, flow_names=[], metric_sink=failing_sink) as pool:
+            self.assertEqual(pool.convert_many([VALID_PHW_A05]), [convert_er7_to_xml(VALID_PHW_A05)])
+
+
+if __name__ == "__main__":
+    unittest.main()
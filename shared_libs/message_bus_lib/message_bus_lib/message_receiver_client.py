@@ -1,31 +1,71 @@
 import logging
 import os
 import time
+from collections import OrderedDict
 from contextlib import AbstractContextManager
 from types import TracebackType
-from typing import Callable, Optional
+from typing import Any, Callable, Optional, Union
 
 import opentelemetry.context as otel_context
 from azure.servicebus import (
+    NEXT_AVAILABLE_SESSION,
     AutoLockRenewer,
     ServiceBusClient,
     ServiceBusMessage,
     ServiceBusReceivedMessage,
     ServiceBusReceiveMode,
     ServiceBusReceiver,
+    ServiceBusSessionFilter,
 )
-from azure.servicebus.exceptions import ServiceBusError, SessionCannotBeLockedError
+from azure.servicebus.exceptions import OperationTimeoutError, ServiceBusError, SessionCannotBeLockedError
 from metric_sender_lib.metric_sender import MetricSender
 from otel_lib import extract_trace_context
 
 logger = logging.getLogger(__name__)
 
+# The session a receiver locks: a session ID, or NEXT_AVAILABLE_SESSION for whichever session next has messages.
+SessionId = Union[str, ServiceBusSessionFilter]
+
+
+class PoisonMessageError(Exception):
+    """
+    Raised by a message processor when the message itself cannot be processed, such as a message that cannot be
+    parsed or transformed. Failures that may pass on retry, like a downstream outage, should not raise it.
+
+    A processor passed to receive_messages_batch_partial sets ``handled`` to the number of leading messages it
+    handled before the poison message.
+    """
+
+    def __init__(self, message: str, reason: str = "PoisonMessage", handled: int = 0) -> None:
+        super().__init__(message)
+        self.reason = reason
+        self.handled = handled
+
+
+class ReleaseMessages(Exception):
+    """
+    Raised by a message processor to hand messages back to Service Bus unprocessed, for example because finishing
+    the batch would outlast its locks. Unlike a failure, it does not delay the next receive.
+
+    receive_messages abandons the message being processed and those after it. A processor passed to
+    receive_messages_batch_partial sets ``handled`` to the number of leading messages it handled, which are
+    completed before the rest are abandoned.
+    """
+
+    def __init__(self, message: str, handled: int = 0) -> None:
+        super().__init__(message)
+        self.handled = handled
+
 
 class MessageReceiverClient:
     MAX_DELAY_SECONDS = 15 * 60  # 15 minutes
     INITIAL_DELAY_SECONDS = 5
     MAX_WAIT_TIME_SECONDS = 60
     LOCK_RENEWAL_DURATION_SECONDS = 5 * 60  # default AutoLockRenewer limit
+    MAX_TRACKED_POISON_MESSAGES = 1000
+    DEAD_LETTER_DESCRIPTION_MAX_LENGTH = 1024
+    # Histogram that processor_manager_lib's StageTimer records a message's other stages in.
+    STAGE_METRIC = "message_stage_seconds"
 
     DEFAULT_WORKFLOW_ID = "unknown-workflow"
     DEFAULT_MICROSERVICE_ID = "unknown-microservice"
@@ -36,13 +76,15 @@ class MessageReceiverClient:
         self,
         sb_client: ServiceBusClient,
         queue_name: str,
-        session_id: Optional[str] = None,
+        session_id: Optional[SessionId] = None,
         propagate_trace_context: bool = True,
         workflow_id: Optional[str] = None,
         microservice_id: Optional[str] = None,
         health_board: Optional[str] = None,
         peer_service: Optional[str] = None,
         recreate_sb_client: Optional[Callable[[], ServiceBusClient]] = None,
+        max_delivery_attempts: Optional[int] = None,
+        time_settling: bool = False,
     ):
         self.sb_client = sb_client
         self._recreate_sb_client = recreate_sb_client
@@ -52,6 +94,13 @@ class MessageReceiverClient:
         self.retry_attempt = 0
         self.delay = self.INITIAL_DELAY_SECONDS
         self.next_retry_time: Optional[float] = None
+        # A message whose processor raises PoisonMessageError this many times is dead-lettered and the rest of its
+        # batch is processed. None or 0 keeps abandoning it with the rest of the batch until Service Bus gives up.
+        self.max_delivery_attempts = max_delivery_attempts
+        self._poison_failures: OrderedDict[Any, int] = OrderedDict()
+        # Whether to send how long each complete, abandon or dead-letter took, as the "settle" stage of the senders'
+        # stage timing. Only the senders time their stages, so the other services leave it off.
+        self.time_settling = time_settling
 
         resolved_workflow_id = self._resolve_metric_dimension(
             explicit_value=workflow_id,
@@ -92,19 +141,47 @@ class MessageReceiverClient:
 
         return default
 
-    def receive_messages(self, num_of_messages: int, message_processor: Callable[[ServiceBusMessage], bool]) -> None:
-        """Process messages one at a time, stopping and abandoning on the first failure."""
+    def receive_messages(
+        self,
+        num_of_messages: int,
+        message_processor: Callable[[ServiceBusMessage], bool],
+        on_batch_received: Optional[Callable[[int], None]] = None,
+        on_messages_released: Optional[Callable[[list[ServiceBusReceivedMessage]], None]] = None,
+    ) -> None:
+        """
+        Process messages one at a time, stopping and abandoning on the first failure.
+
+        ``on_batch_received`` is called with the number of messages received before the first is processed.
+        ``on_messages_released`` is called with the messages a ReleaseMessages hands back, before they are abandoned.
+
+        With max_delivery_attempts set, a message whose processor raises PoisonMessageError for the last allowed time
+        is dead-lettered instead, and the messages after it are processed. A processor that raises ReleaseMessages
+        has the message and those after it abandoned without delaying the next receive.
+        """
 
         def per_message_adapter(receiver: ServiceBusReceiver, messages: list[ServiceBusReceivedMessage]) -> bool:
+            if on_batch_received is not None:
+                on_batch_received(len(messages))
             for i, msg in enumerate(messages):
                 try:
                     is_success = self._invoke_with_trace_context(message_processor, msg)
+                except ReleaseMessages as exc:
+                    if on_messages_released is not None:
+                        on_messages_released(messages[i:])
+                    self._release_messages(receiver, messages[i:], exc)
+                    return True
+                except PoisonMessageError as exc:
+                    if self._isolate_poison_message(receiver, msg, exc):
+                        continue
+                    self._abort_message_processing(receiver, messages[i:])
+                    return False
                 except Exception:
                     logger.exception("Unexpected error processing message: %s", msg.message_id)
                     self._abort_message_processing(receiver, messages[i:])
                     return False
                 if is_success:
-                    receiver.complete_message(msg)
+                    self._complete_message(receiver, msg)
+                    self._forget_poison_failures(msg)
                     logger.debug("Message processed and completed: %s", msg.message_id)
                 else:
                     logger.error("Message processing failed, abandoning subsequent messages: %s", msg.message_id)
@@ -123,7 +200,7 @@ class MessageReceiverClient:
             is_success = batch_processor(messages)
             if is_success:
                 for msg in messages:
-                    receiver.complete_message(msg)
+                    self._complete_message(receiver, msg)
                     logger.debug("Message completed: %s", msg.message_id)
                 logger.debug("Batch of %d message(s) completed", len(messages))
             else:
@@ -133,6 +210,64 @@ class MessageReceiverClient:
 
         self._receive_and_process(num_of_messages, batch_adapter)
 
+    def receive_messages_batch_partial(
+        self, num_of_messages: int, batch_processor: Callable[[list[ServiceBusReceivedMessage]], int]
+    ) -> None:
+        """
+        Process all received messages together, settling them by how far the batch got.
+
+        The processor returns how many leading messages it handled. Those are completed and the rest are
+        abandoned, which matches receive_messages stopping at the first failure.
+
+        A processor that stops at a poison message raises PoisonMessageError with ``handled`` set instead. Once that
+        message is dead-lettered, the processor is called again with the messages after it. A processor that raises
+        ReleaseMessages has the rest abandoned without delaying the next receive.
+        """
+
+        def partial_batch_adapter(receiver: ServiceBusReceiver, messages: list[ServiceBusReceivedMessage]) -> bool:
+            remaining = messages
+            while remaining:
+                poison_error: Optional[PoisonMessageError] = None
+                try:
+                    handled = max(0, min(batch_processor(remaining), len(remaining)))
+                except ReleaseMessages as exc:
+                    handled = max(0, min(exc.handled, len(remaining)))
+                    for msg in remaining[:handled]:
+                        self._complete_message(receiver, msg)
+                        self._forget_poison_failures(msg)
+                    self._release_messages(receiver, remaining[handled:], exc)
+                    return True
+                except PoisonMessageError as exc:
+                    poison_error = exc
+                    handled = max(0, min(exc.handled, len(remaining) - 1))
+                for msg in remaining[:handled]:
+                    self._complete_message(receiver, msg)
+                    self._forget_poison_failures(msg)
+                    logger.debug("Message completed: %s", msg.message_id)
+                if handled == len(remaining):
+                    break
+                if poison_error is not None and self._isolate_poison_message(
+                    receiver, remaining[handled], poison_error
+                ):
+                    remaining = remaining[handled + 1:]
+                    continue
+                logger.error(
+                    "Batch processing stopped after %d of %d message(s), abandoning the rest from: %s",
+                    len(messages) - len(remaining) + handled,
+                    len(messages),
+                    remaining[handled].message_id,
+                )
+                self._abort_message_processing(receiver, remaining[handled:])
+                return False
+            logger.debug("Batch of %d message(s) completed", len(messages))
+            return True
+
+        self._receive_and_process(num_of_messages, partial_batch_adapter)
+
+    def clear_retry_delay(self) -> None:
+        """Forget the backoff left by earlier failures, so the next receive is not delayed."""
+        self._clear_retry_state()
+
     def _invoke_with_trace_context(
         self, handler: Callable[[ServiceBusReceivedMessage], bool], msg: ServiceBusReceivedMessage
     ) -> bool:
@@ -175,7 +310,7 @@ class MessageReceiverClient:
         processor: Callable[[ServiceBusReceiver, list[ServiceBusReceivedMessage]], bool],
     ) -> None:
         """
-        Shared scaffolding for both receive_messages and receive_messages_batch.
+        Shared scaffolding for receive_messages, receive_messages_batch and receive_messages_batch_partial.
 
         Handles receiver lifecycle, auto-lock renewal, empty-queue short-circuit,
         retry scheduling, and SessionCannotBeLockedError recovery. The caller
@@ -227,6 +362,13 @@ class MessageReceiverClient:
         except SessionCannotBeLockedError:
             logger.warning("Session %s cannot be locked currently. Will retry later.", self.session_id)
             time.sleep(self.MAX_WAIT_TIME_SECONDS)
+        except OperationTimeoutError as exc:
+            if self.session_id is not NEXT_AVAILABLE_SESSION:
+                logger.warning("Transient Service Bus error, will retry later: %s", exc)
+                self._set_delay_before_retry()
+            else:
+                # No session had messages within MAX_WAIT_TIME_SECONDS, which is an idle subscription, not a failure.
+                logger.debug("No session available on '%s': %s", self.queue_name, exc)
         except ServiceBusError as exc:
             # Transient AMQP-level errors (e.g. session not yet established, connection dropped)
             # are surfaced as ServiceBusError. Treat them as recoverable and retry after a delay.
@@ -299,14 +441,90 @@ class MessageReceiverClient:
         self.delay = self.INITIAL_DELAY_SECONDS
         self.next_retry_time = None
 
+    def _isolate_poison_message(
+        self, receiver: ServiceBusReceiver, msg: ServiceBusReceivedMessage, error: PoisonMessageError
+    ) -> bool:
+        """
+        Record a poison failure of *msg* and dead-letter it once it has failed max_delivery_attempts times.
+
+        Failures are counted here rather than read from the message's delivery_count, because abandoning the
+        messages after a failed one raises their delivery counts too. The counts are lost on restart, which only
+        gives a message more attempts. Returns True if the message was dead-lettered.
+        """
+        if not self.max_delivery_attempts:
+            logger.error("Poison message %s, abandoning it and subsequent messages: %s", msg.message_id, error)
+            return False
+
+        key = self._poison_message_key(msg)
+        failures = self._poison_failures.pop(key, 0) + 1
+        if failures < self.max_delivery_attempts:
+            self._poison_failures[key] = failures
+            while len(self._poison_failures) > self.MAX_TRACKED_POISON_MESSAGES:
+                self._poison_failures.popitem(last=False)
+            logger.error(
+                "Poison message %s failed attempt %d of %d, abandoning it and subsequent messages: %s",
+                msg.message_id,
+                failures,
+                self.max_delivery_attempts,
+                error,
+            )
+            return False
+
+        description = f"Failed {failures} attempt(s): {error}"[: self.DEAD_LETTER_DESCRIPTION_MAX_LENGTH]
+        settle_started_at = time.perf_counter()
+        receiver.dead_letter_message(msg, reason=error.reason, error_description=description)
+        self._record_settle_time(time.perf_counter() - settle_started_at)
+        logger.error("Poison message %s dead-lettered after %d attempt(s): %s", msg.message_id, failures, error)
+        self.metric_sender.send_metric(
+            key="messages_dead_lettered",
+            attributes={"queue": self.queue_name, "reason": error.reason},
+        )
+        return True
+
+    def _forget_poison_failures(self, msg: ServiceBusReceivedMessage) -> None:
+        if self._poison_failures:
+            self._poison_failures.pop(self._poison_message_key(msg), None)
+
+    @staticmethod
+    def _poison_message_key(msg: ServiceBusReceivedMessage) -> Any:
+        # The sequence number is unique within the entity and kept across redeliveries; message ids are optional.
+        sequence_number = getattr(msg, "sequence_number", None)
+        return sequence_number if sequence_number is not None else msg.message_id
+
+    def _release_messages(
+        self, receiver: ServiceBusReceiver, messages: list[ServiceBusReceivedMessage], reason: ReleaseMessages
+    ) -> None:
+        if not messages:
+            return
+        logger.warning(
+            "Releasing %d unprocessed message(s) from: %s (%s)", len(messages), messages[0].message_id, reason
+        )
+        self._abort_message_processing(receiver, messages)
+
     def _abort_message_processing(
         self, receiver: ServiceBusReceiver, messages_to_abandon: list[ServiceBusReceivedMessage]
     ) -> None:
 
         for msg in messages_to_abandon:
+            settle_started_at = time.perf_counter()
             receiver.abandon_message(msg)
+            self._record_settle_time(time.perf_counter() - settle_started_at)
             logger.debug("Message abandoned: %s", msg.message_id)
 
+    def _complete_message(self, receiver: ServiceBusReceiver, msg: ServiceBusReceivedMessage) -> None:
+        settle_started_at = time.perf_counter()
+        receiver.complete_message(msg)
+        self._record_settle_time(time.perf_counter() - settle_started_at)
+
+    def _record_settle_time(self, seconds: float) -> None:
+        """Send how long settling a message took, as the "settle" stage of the senders' stage timing."""
+        if not self.time_settling:
+            return
+        try:
+            self.metric_sender.send_gauge_metric(key=self.STAGE_METRIC, value=seconds, attributes={"stage": "settle"})
+        except Exception as exc:
+            logger.warning("Failed to send %s metric: %s", self.STAGE_METRIC, exc)
+
     def _set_delay_before_retry(self) -> None:
         self.next_retry_time = time.time() + self.delay
 
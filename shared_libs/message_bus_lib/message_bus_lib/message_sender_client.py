@@ -1,9 +1,9 @@
 import logging
-from threading import Lock
+from threading import RLock
 from types import TracebackType
 from typing import Any, Callable, Dict, Optional, Sequence
 
-from azure.servicebus import ServiceBusMessage, ServiceBusSender
+from azure.servicebus import ServiceBusMessage, ServiceBusMessageBatch, ServiceBusSender
 from azure.servicebus.exceptions import (
     MessageSizeExceededError,
     OperationTimeoutError,
@@ -30,7 +30,8 @@ class MessageSenderClient:
         self.message_destination = message_destination
         self.propagate_trace_context = propagate_trace_context
         self._recreate_sender = recreate_sender
-        self._lock = Lock()
+        # Reentrant, so send_message_batch can keep hold of the sender across the retries of each sub-batch.
+        self._lock = RLock()
 
     @staticmethod
     def _is_stale_amqp_sender_error(exc: Exception) -> bool:
@@ -57,12 +58,13 @@ class MessageSenderClient:
             logger.warning("Failed to recreate Service Bus sender for '%s': %s", self.message_destination, recreate_exc)
             return False
 
-    def send_message(
+    def build_message(
         self,
-        message_data: bytes,
+        message_data: bytes | str,
         custom_properties: Optional[Dict[str, Any]] = None,
         message_id: Optional[str] = None,
-    ) -> None:
+    ) -> ServiceBusMessage:
+        """Build the ServiceBusMessage that send_message would send, for use with send_message_batch."""
         props: Dict[str, Any] = dict(custom_properties) if custom_properties else {}
 
         if self.propagate_trace_context:
@@ -71,20 +73,30 @@ class MessageSenderClient:
             except ImportError:
                 pass  # otel_lib not installed — skip trace propagation
 
-        message = ServiceBusMessage(
+        return ServiceBusMessage(
             body=message_data,
             application_properties=props if props else None,  # type: ignore[arg-type]
             session_id=self.session_id,
             message_id=message_id,
         )
 
+    def send_message(
+        self,
+        message_data: bytes,
+        custom_properties: Optional[Dict[str, Any]] = None,
+        message_id: Optional[str] = None,
+    ) -> None:
+        message = self.build_message(message_data, custom_properties, message_id)
+        self._send_with_retries(message)
+        logger.debug("Message sent successfully to: %s", self.message_destination)
+
+    def _send_with_retries(self, message: ServiceBusMessage | ServiceBusMessageBatch) -> None:
         last_error = None
         for _ in range(MAX_SERVICE_BUS_RETRIES):
             try:
                 # Acquire lock to ensure thread-safe access to the sender
                 with self._lock:
                     self.sender.send_messages(message)
-                logger.debug("Message sent successfully to: %s", self.message_destination)
                 return
             except OperationTimeoutError:
                 continue
@@ -114,7 +126,12 @@ class MessageSenderClient:
     ) -> None:
         self.send_message(message_text.encode('utf-8'), custom_properties, message_id=message_id)
 
-    def send_message_batch(self, messages: Sequence[ServiceBusMessage]) -> int:
+    def send_message_batch(
+        self,
+        messages: Sequence[ServiceBusMessage],
+        retry_transient_errors: bool = False,
+        on_sub_batch_sent: Optional[Callable[[int], None]] = None,
+    ) -> int:
         """Send pre-built ServiceBusMessages using SDK-level batching with auto-split.
 
         Creates a ServiceBusMessageBatch and adds messages one by one. When a message
@@ -124,6 +141,10 @@ class MessageSenderClient:
 
         Args:
             messages: Pre-constructed ServiceBusMessage objects to send.
+            retry_transient_errors: Send each sub-batch with send_message's retries, so a
+                transient error resends only the sub-batch that failed.
+            on_sub_batch_sent: Called with the number of messages in each sub-batch once
+                it is sent, so a caller can tell how many were sent before a failure.
 
         Returns:
             The total number of messages sent.
@@ -146,7 +167,7 @@ class MessageSenderClient:
                             f"Single message exceeds Service Bus max message size for '{self.message_destination}'"
                         )
                     # Flush current batch and start a new one
-                    self.sender.send_messages(batch)
+                    self._send_sub_batch(batch, messages_in_batch, retry_transient_errors, on_sub_batch_sent)
                     total_sent += messages_in_batch
                     logger.debug("Sent sub-batch of %d messages to '%s'", messages_in_batch, self.message_destination)
                     batch = self.sender.create_message_batch()
@@ -154,12 +175,26 @@ class MessageSenderClient:
                     messages_in_batch = 1
 
             if messages_in_batch > 0:
-                self.sender.send_messages(batch)
+                self._send_sub_batch(batch, messages_in_batch, retry_transient_errors, on_sub_batch_sent)
                 total_sent += messages_in_batch
                 logger.debug("Sent final sub-batch of %d messages to '%s'", messages_in_batch, self.message_destination)
 
             return total_sent
 
+    def _send_sub_batch(
+        self,
+        batch: ServiceBusMessageBatch,
+        message_count: int,
+        retry_transient_errors: bool,
+        on_sub_batch_sent: Optional[Callable[[int], None]],
+    ) -> None:
+        if retry_transient_errors:
+            self._send_with_retries(batch)
+        else:
+            self.sender.send_messages(batch)
+        if on_sub_batch_sent is not None:
+            on_sub_batch_sent(message_count)
+
     def __enter__(self) -> "MessageSenderClient":
         return self
 
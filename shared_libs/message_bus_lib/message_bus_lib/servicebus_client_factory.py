@@ -3,6 +3,7 @@ import os
 from types import TracebackType
 from typing import Optional
 
+from azure.core.credentials import TokenCredential
 from azure.identity import DefaultAzureCredential
 from azure.servicebus import (
     ServiceBusClient,
@@ -10,7 +11,7 @@ from azure.servicebus import (
 )
 
 from message_bus_lib.connection_config import ConnectionConfig
-from message_bus_lib.message_receiver_client import MessageReceiverClient
+from message_bus_lib.message_receiver_client import MessageReceiverClient, SessionId
 from message_bus_lib.message_sender_client import MessageSenderClient
 from message_bus_lib.message_store_client import MessageStoreClient
 from message_bus_lib.subscription_receiver_client import SubscriptionReceiverClient
@@ -35,9 +36,10 @@ def _read_bool_env(name: str, default: bool) -> bool:
 
 
 class ServiceBusClientFactory:
-    def __init__(self, config: ConnectionConfig):
+    def __init__(self, config: ConnectionConfig, credential: Optional[TokenCredential] = None):
         self.logger = logging.getLogger(__name__)
         self.config = config
+        self._credential = credential
         self.servicebus_client = self._build_service_bus_client()
 
     def _build_service_bus_client(self) -> ServiceBusClient:
@@ -48,8 +50,18 @@ class ServiceBusClientFactory:
             )
         else:
             fully_qualified_namespace = self.config.service_bus_namespace + SERVICEBUS_NAMESPACE_SUFFIX  # type: ignore
-            credential = DefaultAzureCredential()
-            return ServiceBusClient(fully_qualified_namespace, credential, keep_alive=AMQP_KEEP_ALIVE_INTERVAL)
+            if self._credential is None:
+                self._credential = DefaultAzureCredential()
+            return ServiceBusClient(fully_qualified_namespace, self._credential, keep_alive=AMQP_KEEP_ALIVE_INTERVAL)
+
+    def create_worker_factory(self) -> "ServiceBusClientFactory":
+        """Return a factory for another worker thread in this process.
+
+        The new factory has its own ServiceBusClient, because a client is not thread-safe and rebuilding it closes
+        every receiver and sender made from it. It shares this factory's configuration and credential, so the
+        process fetches and caches one token however many workers it runs.
+        """
+        return ServiceBusClientFactory(self.config, credential=self._credential)
 
     def create_topic_sender_client(self, topic_name: str, session_id: Optional[str] = None) -> MessageSenderClient:
         self.logger.debug("Creating message sender client for topic '%s' with session_id '%s'", topic_name, session_id)
@@ -80,7 +92,11 @@ class ServiceBusClientFactory:
         return self.servicebus_client.get_topic_sender(topic_name=topic_name)
 
     def create_message_receiver_client(
-        self, queue_name: str, session_id: Optional[str] = None
+        self,
+        queue_name: str,
+        session_id: Optional[SessionId] = None,
+        max_delivery_attempts: Optional[int] = None,
+        time_settling: bool = False,
     ) -> MessageReceiverClient:
         self.logger.debug(
             "Creating message receiver client for queue '%s' with session_id '%s'", queue_name, session_id
@@ -90,10 +106,17 @@ class ServiceBusClientFactory:
             queue_name,
             session_id,
             recreate_sb_client=self._rebuild_servicebus_client,
+            max_delivery_attempts=max_delivery_attempts,
+            time_settling=time_settling,
         )
 
     def create_subscription_receiver_client(
-        self, topic_name: str, subscription_name: str, session_id: Optional[str] = None
+        self,
+        topic_name: str,
+        subscription_name: str,
+        session_id: Optional[SessionId] = None,
+        max_delivery_attempts: Optional[int] = None,
+        time_settling: bool = False,
     ) -> SubscriptionReceiverClient:
         self.logger.debug(
             "Creating message receiver client for topic '%s', subscription '%s' with session_id '%s'",
@@ -107,6 +130,8 @@ class ServiceBusClientFactory:
             subscription_name,
             session_id,
             recreate_sb_client=self._rebuild_servicebus_client,
+            max_delivery_attempts=max_delivery_attempts,
+            time_settling=time_settling,
         )
 
     def _rebuild_servicebus_client(self) -> ServiceBusClient:
@@ -9,7 +9,7 @@ from azure.servicebus import (
     ServiceBusReceiver,
 )
 
-from message_bus_lib.message_receiver_client import MessageReceiverClient
+from message_bus_lib.message_receiver_client import MessageReceiverClient, SessionId
 
 logger = logging.getLogger(__name__)
 
@@ -20,14 +20,18 @@ class SubscriptionReceiverClient(MessageReceiverClient):
         sb_client: ServiceBusClient,
         topic_name: str,
         subscription_name: str,
-        session_id: Optional[str] = None,
+        session_id: Optional[SessionId] = None,
         recreate_sb_client: Optional[Callable[[], ServiceBusClient]] = None,
+        max_delivery_attempts: Optional[int] = None,
+        time_settling: bool = False,
     ):
         super().__init__(
             sb_client,
             queue_name=f"{topic_name}/{subscription_name}",
             session_id=session_id,
             recreate_sb_client=recreate_sb_client,
+            max_delivery_attempts=max_delivery_attempts,
+            time_settling=time_settling,
         )
         self.topic_name = topic_name
         self.subscription_name = subscription_name
@@ -1,11 +1,12 @@
+import time
 import unittest
 from typing import Any
 from unittest.mock import MagicMock, patch
 
-from azure.servicebus import ServiceBusMessage
-from azure.servicebus.exceptions import ServiceBusError, SessionCannotBeLockedError
+from azure.servicebus import NEXT_AVAILABLE_SESSION, ServiceBusMessage
+from azure.servicebus.exceptions import OperationTimeoutError, ServiceBusError, SessionCannotBeLockedError
 
-from message_bus_lib.message_receiver_client import MessageReceiverClient
+from message_bus_lib.message_receiver_client import MessageReceiverClient, PoisonMessageError, ReleaseMessages
 
 
 def create_message(message_id: str) -> MagicMock:
@@ -106,6 +107,63 @@ class TestMessageReceiverClient(unittest.TestCase):
         self.service_bus_receiver_client.abandon_message.assert_any_call(message3)
         self.assertIsNotNone(self.message_receiver_client.next_retry_time)
 
+    @patch("time.sleep", return_value=None)
+    def test_receive_messages_records_the_time_taken_to_settle_each_message(self, sleep_mock: MagicMock) -> None:
+        # Arrange
+        metric_sender = MagicMock()
+        self.message_receiver_client.metric_sender = metric_sender
+        self.message_receiver_client.time_settling = True
+        message1 = create_message("123")
+        message2 = create_message("456")
+        self.service_bus_receiver_client.receive_messages.return_value = [message1, message2]
+
+        # Act
+        self.message_receiver_client.receive_messages(2, lambda msg: msg.message_id == "123")
+
+        # Assert
+        settle_calls = [
+            call for call in metric_sender.send_gauge_metric.call_args_list
+            if call.kwargs["key"] == MessageReceiverClient.STAGE_METRIC
+        ]
+        self.assertEqual(len(settle_calls), 2)  # one completed, one abandoned
+        for call in settle_calls:
+            self.assertEqual(call.kwargs["attributes"], {"stage": "settle"})
+            self.assertGreaterEqual(call.kwargs["value"], 0)
+
+    @patch("time.sleep", return_value=None)
+    def test_receive_messages_does_not_time_settling_by_default(self, sleep_mock: MagicMock) -> None:
+        # Arrange
+        metric_sender = MagicMock()
+        self.message_receiver_client.metric_sender = metric_sender
+        message1 = create_message("123")
+        message2 = create_message("456")
+        self.service_bus_receiver_client.receive_messages.return_value = [message1, message2]
+
+        # Act
+        self.message_receiver_client.receive_messages(2, lambda msg: msg.message_id == "123")
+
+        # Assert
+        self.assertFalse(self.message_receiver_client.time_settling)
+        for call in metric_sender.send_gauge_metric.call_args_list:
+            self.assertNotEqual(call.kwargs.get("key"), MessageReceiverClient.STAGE_METRIC)
+
+    @patch("time.sleep", return_value=None)
+    def test_clear_retry_delay_lets_the_next_receive_happen_at_once(self, sleep_mock: MagicMock) -> None:
+        # Arrange
+        self.message_receiver_client.retry_attempt = 3
+        self.message_receiver_client.next_retry_time = time.time() + 60
+        self.message_receiver_client.delay = 40
+        self.service_bus_receiver_client.receive_messages.return_value = []
+
+        # Act
+        self.message_receiver_client.clear_retry_delay()
+        self.message_receiver_client.receive_messages(1, lambda msg: True)
+
+        # Assert
+        self.service_bus_receiver_client.receive_messages.assert_called_once()
+        self.assertEqual(self.message_receiver_client.delay, MessageReceiverClient.INITIAL_DELAY_SECONDS)
+        sleep_mock.assert_not_called()
+
     @patch("time.sleep", return_value=None)
     def test_receiveMessages_backoff_doubles_delay_on_each_retry(self, sleep_mock: MagicMock) -> None:
         # Arrange
@@ -161,6 +219,29 @@ class TestMessageReceiverClient(unittest.TestCase):
         self.assertEqual(self.message_receiver_client.delay, self.message_receiver_client.INITIAL_DELAY_SECONDS * 2)
         self.assertIsNotNone(self.message_receiver_client.next_retry_time)
 
+    @patch("time.sleep", return_value=None)
+    def test_no_available_session_is_not_a_failure(self, sleep_mock: MagicMock) -> None:
+        client = MessageReceiverClient(self.service_bus_client, "test-queue", NEXT_AVAILABLE_SESSION)
+        self.service_bus_client.get_queue_receiver.return_value.__enter__.side_effect = OperationTimeoutError(
+            message="No session available"
+        )
+
+        client.receive_messages(1, lambda msg: True)
+
+        self.assertIs(self.service_bus_client.get_queue_receiver.call_args.kwargs["session_id"], NEXT_AVAILABLE_SESSION)
+        self.assertEqual(client.retry_attempt, 0)
+        self.assertIsNone(client.next_retry_time)
+        sleep_mock.assert_not_called()
+
+    @patch("time.sleep", return_value=None)
+    def test_operation_timeout_on_a_named_session_sets_retry_delay(self, _sleep_mock: MagicMock) -> None:
+        self.service_bus_receiver_client.receive_messages.side_effect = OperationTimeoutError(message="Timed out")
+
+        self.message_receiver_client.receive_messages(1, lambda msg: True)
+
+        self.assertEqual(self.message_receiver_client.retry_attempt, 1)
+        self.assertIsNotNone(self.message_receiver_client.next_retry_time)
+
     @patch("time.sleep", return_value=None)
     def test_receive_messages_recreates_client_on_stale_session_error(self, _sleep_mock: MagicMock) -> None:
         # Arrange
@@ -298,6 +379,223 @@ class TestReceiveMessagesBatch(unittest.TestCase):
         self.sb_receiver.abandon_message.assert_not_called()
 
 
+class TestReceiveMessagesBatchPartial(unittest.TestCase):
+    """Tests for MessageReceiverClient.receive_messages_batch_partial."""
+
+    def setUp(self) -> None:
+        self.service_bus_client = MagicMock()
+        self.sb_receiver = self.service_bus_client.get_queue_receiver.return_value.__enter__.return_value
+        self.message_receiver_client = MessageReceiverClient(self.service_bus_client, "test-queue")
+
+    @patch("time.sleep", return_value=None)
+    def test_completes_all_when_whole_batch_is_handled(self, sleep_mock: MagicMock) -> None:
+        messages = [create_message("1"), create_message("2")]
+        self.sb_receiver.receive_messages.return_value = messages
+
+        self.message_receiver_client.receive_messages_batch_partial(10, len)
+
+        self.assertEqual([c.args[0] for c in self.sb_receiver.complete_message.call_args_list], messages)
+        self.sb_receiver.abandon_message.assert_not_called()
+        self.assertIsNone(self.message_receiver_client.next_retry_time)
+
+    @patch("time.sleep", return_value=None)
+    def test_completes_handled_prefix_and_abandons_the_rest(self, sleep_mock: MagicMock) -> None:
+        messages = [create_message("1"), create_message("2"), create_message("3")]
+        self.sb_receiver.receive_messages.return_value = messages
+
+        self.message_receiver_client.receive_messages_batch_partial(10, lambda msgs: 1)
+
+        self.sb_receiver.complete_message.assert_called_once_with(messages[0])
+        self.assertEqual([c.args[0] for c in self.sb_receiver.abandon_message.call_args_list], messages[1:])
+        self.assertIsNotNone(self.message_receiver_client.next_retry_time)
+
+    @patch("time.sleep", return_value=None)
+    def test_abandons_all_on_exception(self, sleep_mock: MagicMock) -> None:
+        messages = [create_message("1"), create_message("2")]
+        self.sb_receiver.receive_messages.return_value = messages
+
+        def processor(msgs: list) -> int:
+            raise RuntimeError("Processing failed")
+
+        self.message_receiver_client.receive_messages_batch_partial(10, processor)
+
+        self.assertEqual(self.sb_receiver.abandon_message.call_count, 2)
+        self.sb_receiver.complete_message.assert_not_called()
+
+
+class TestPoisonMessageIsolation(unittest.TestCase):
+    """Tests for dead-lettering messages whose processor raises PoisonMessageError."""
+
+    def setUp(self) -> None:
+        self.service_bus_client = MagicMock()
+        self.sb_receiver = self.service_bus_client.get_queue_receiver.return_value.__enter__.return_value
+        self.message_receiver_client = MessageReceiverClient(
+            self.service_bus_client, "test-queue", max_delivery_attempts=3
+        )
+
+    def _receive(self, messages: list, processor: Any, attempts: int = 1, partial: bool = False) -> None:
+        receive = (
+            self.message_receiver_client.receive_messages_batch_partial
+            if partial
+            else self.message_receiver_client.receive_messages
+        )
+        for _ in range(attempts):
+            self.sb_receiver.receive_messages.return_value = list(messages)
+            self.message_receiver_client._clear_retry_state()
+            receive(10, processor)
+
+    @staticmethod
+    def _poison_processor(msg: Any) -> bool:
+        if msg.message_id == "bad":
+            raise PoisonMessageError("cannot parse", reason="ParseFailed")
+        return True
+
+    @patch("time.sleep", return_value=None)
+    def test_poison_message_is_abandoned_with_the_rest_until_the_last_attempt(self, sleep_mock: MagicMock) -> None:
+        messages = [create_message("1"), create_message("bad"), create_message("3")]
+
+        self._receive(messages, self._poison_processor, attempts=2)
+
+        self.sb_receiver.dead_letter_message.assert_not_called()
+        self.assertEqual([c.args[0] for c in self.sb_receiver.abandon_message.call_args_list], messages[1:] * 2)
+        self.assertIsNotNone(self.message_receiver_client.next_retry_time)
+
+    @patch("time.sleep", return_value=None)
+    def test_poison_message_is_dead_lettered_and_the_batch_continues(self, sleep_mock: MagicMock) -> None:
+        messages = [create_message("1"), create_message("bad"), create_message("3")]
+
+        self._receive(messages, self._poison_processor, attempts=3)
+
+        self.sb_receiver.dead_letter_message.assert_called_once_with(
+            messages[1], reason="ParseFailed", error_description="Failed 3 attempt(s): cannot parse"
+        )
+        self.assertEqual(self.sb_receiver.complete_message.call_args_list[-1].args[0], messages[2])
+        self.assertIsNone(self.message_receiver_client.next_retry_time)
+
+    @patch("time.sleep", return_value=None)
+    def test_other_failures_are_not_counted(self, sleep_mock: MagicMock) -> None:
+        messages = [create_message("1")]
+
+        self._receive(messages, lambda msg: False, attempts=5)
+
+        self.sb_receiver.dead_letter_message.assert_not_called()
+        self.assertEqual(self.sb_receiver.abandon_message.call_count, 5)
+
+    @patch("time.sleep", return_value=None)
+    def test_success_resets_the_failure_count(self, sleep_mock: MagicMock) -> None:
+        messages = [create_message("flaky")]
+        outcomes = iter([False, False, True, False, False])
+
+        def processor(msg: Any) -> bool:
+            if not next(outcomes):
+                raise PoisonMessageError("cannot parse")
+            return True
+
+        self._receive(messages, processor, attempts=5)
+
+        self.sb_receiver.dead_letter_message.assert_not_called()
+
+    @patch("time.sleep", return_value=None)
+    def test_failures_are_counted_per_sequence_number(self, sleep_mock: MagicMock) -> None:
+        first, second = create_message("same-id"), create_message("same-id")
+        first.sequence_number, second.sequence_number = 1, 2
+
+        def processor(msg: Any) -> bool:
+            raise PoisonMessageError("cannot parse")
+
+        self._receive([first], processor, attempts=2)
+        self._receive([second], processor, attempts=1)
+
+        self.sb_receiver.dead_letter_message.assert_not_called()
+
+    @patch("time.sleep", return_value=None)
+    def test_poison_messages_are_abandoned_when_isolation_is_off(self, sleep_mock: MagicMock) -> None:
+        self.message_receiver_client.max_delivery_attempts = None
+        messages = [create_message("bad"), create_message("2")]
+
+        self._receive(messages, self._poison_processor, attempts=5)
+
+        self.sb_receiver.dead_letter_message.assert_not_called()
+        self.assertEqual(self.sb_receiver.abandon_message.call_count, 10)
+
+    @patch("time.sleep", return_value=None)
+    def test_partial_batch_resumes_after_the_dead_lettered_message(self, sleep_mock: MagicMock) -> None:
+        messages = [create_message("1"), create_message("bad"), create_message("3"), create_message("4")]
+        batches: list[list[str]] = []
+
+        def batch_processor(msgs: list) -> int:
+            batches.append([msg.message_id for msg in msgs])
+            ids = [msg.message_id for msg in msgs]
+            if "bad" in ids:
+                raise PoisonMessageError("cannot parse", handled=ids.index("bad"))
+            return len(msgs)
+
+        self._receive(messages, batch_processor, attempts=3, partial=True)
+
+        self.assertEqual(batches[-2:], [["1", "bad", "3", "4"], ["3", "4"]])
+        self.sb_receiver.dead_letter_message.assert_called_once()
+        self.assertIs(self.sb_receiver.dead_letter_message.call_args.args[0], messages[1])
+        self.assertEqual(
+            [c.args[0] for c in self.sb_receiver.complete_message.call_args_list[-3:]],
+            [messages[0], messages[2], messages[3]],
+        )
+        self.assertEqual([c.args[0] for c in self.sb_receiver.abandon_message.call_args_list], messages[1:] * 2)
+        self.assertIsNone(self.message_receiver_client.next_retry_time)
+
+
+class TestReleaseMessages(unittest.TestCase):
+    """Tests for processors handing messages back with ReleaseMessages."""
+
+    def setUp(self) -> None:
+        self.service_bus_client = MagicMock()
+        self.sb_receiver = self.service_bus_client.get_queue_receiver.return_value.__enter__.return_value
+        self.message_receiver_client = MessageReceiverClient(self.service_bus_client, "test-queue")
+        self.messages = [create_message("1"), create_message("2"), create_message("3")]
+        self.sb_receiver.receive_messages.return_value = self.messages
+
+    def test_released_messages_are_abandoned_without_a_retry_delay(self) -> None:
+        def processor(msg: Any) -> bool:
+            if msg.message_id == "2":
+                raise ReleaseMessages("lock window")
+            return True
+
+        on_batch_received = MagicMock()
+
+        self.message_receiver_client.receive_messages(10, processor, on_batch_received)
+
+        on_batch_received.assert_called_once_with(3)
+        self.sb_receiver.complete_message.assert_called_once_with(self.messages[0])
+        self.assertEqual([c.args[0] for c in self.sb_receiver.abandon_message.call_args_list], self.messages[1:])
+        self.assertIsNone(self.message_receiver_client.next_retry_time)
+
+    def test_released_messages_are_reported_before_they_are_abandoned(self) -> None:
+        def processor(msg: Any) -> bool:
+            if msg.message_id == "2":
+                raise ReleaseMessages("lock window")
+            return True
+
+        def on_messages_released(msgs: list) -> None:
+            self.assertEqual(msgs, self.messages[1:])
+            self.sb_receiver.abandon_message.assert_not_called()
+
+        on_released = MagicMock(side_effect=on_messages_released)
+
+        self.message_receiver_client.receive_messages(10, processor, on_messages_released=on_released)
+
+        on_released.assert_called_once()
+        self.assertEqual(self.sb_receiver.abandon_message.call_count, 2)
+
+    def test_partial_batch_completes_the_handled_messages_before_releasing(self) -> None:
+        def batch_processor(msgs: list) -> int:
+            raise ReleaseMessages("lock window", handled=1)
+
+        self.message_receiver_client.receive_messages_batch_partial(10, batch_processor)
+
+        self.sb_receiver.complete_message.assert_called_once_with(self.messages[0])
+        self.assertEqual([c.args[0] for c in self.sb_receiver.abandon_message.call_args_list], self.messages[1:])
+        self.assertIsNone(self.message_receiver_client.next_retry_time)
+
+
 class TestAutoLockRenewerLifecycle(unittest.TestCase):
     """
     Tests that AutoLockRenewer.close() is always called when a session_id is provided,
@@ -196,6 +196,15 @@ class TestMessageSenderClient(unittest.TestCase):
         message_sent = self.service_bus_sender_client.send_messages.call_args[0][0]
         self.assertNotEqual(message_sent.message_id, "custom-id")
 
+    def test_build_message_matches_send_message(self) -> None:
+        message = self.message_sender_client.build_message("MSH|^~\\&|", {"key": "value"}, message_id="MSG-1")
+
+        self.assertEqual(b"".join(message.body), b"MSH|^~\\&|")
+        self.assertEqual(message.application_properties, {"key": "value"})
+        self.assertEqual(message.message_id, "MSG-1")
+        self.assertIsNone(message.session_id)
+        self.service_bus_sender_client.send_messages.assert_not_called()
+
     def test_send_message_raises_message_size_exceeded_error(self) -> None:
         # Arrange
         message = b"Test Message"
@@ -375,6 +384,33 @@ class TestSendMessageBatch(unittest.TestCase):
         # batch_1 (containing message A) was flushed before the error
         self.service_bus_sender.send_messages.assert_called_once_with(mock_batch_1)
 
+    def test_send_message_batch_retries_only_the_sub_batch_that_failed(self) -> None:
+        mock_batch_1 = MagicMock()
+        mock_batch_1.add_message.side_effect = [None, MessageSizeExceededError()]
+        mock_batch_2 = MagicMock()
+        self.service_bus_sender.create_message_batch.side_effect = [mock_batch_1, mock_batch_2]
+        self.service_bus_sender.send_messages.side_effect = [None, ServiceBusError("server busy"), None]
+        on_sub_batch_sent = MagicMock()
+
+        total = self.client.send_message_batch(
+            self._make_messages(2), retry_transient_errors=True, on_sub_batch_sent=on_sub_batch_sent
+        )
+
+        self.assertEqual(total, 2)
+        self.assertEqual(
+            [c.args[0] for c in self.service_bus_sender.send_messages.call_args_list],
+            [mock_batch_1, mock_batch_2, mock_batch_2],
+        )
+        self.assertEqual([c.args[0] for c in on_sub_batch_sent.call_args_list], [1, 1])
+
+    def test_send_message_batch_does_not_retry_by_default(self) -> None:
+        self.service_bus_sender.send_messages.side_effect = ServiceBusError("server busy")
+
+        with self.assertRaises(ServiceBusError):
+            self.client.send_message_batch(self._make_messages(1))
+
+        self.service_bus_sender.send_messages.assert_called_once()
+
     def test_send_message_batch_returns_zero_for_empty_list(self) -> None:
         mock_batch = MagicMock()
         self.service_bus_sender.create_message_batch.return_value = mock_batch
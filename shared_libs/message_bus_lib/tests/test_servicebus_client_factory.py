@@ -71,6 +71,21 @@ class TestServiceBusClientFactoryClose(unittest.TestCase):
         call_kwargs = mock_sb_cls.from_connection_string.call_args[1]
         self.assertIn("keep_alive", call_kwargs)
 
+    @patch("message_bus_lib.servicebus_client_factory.ServiceBusClient")
+    @patch("message_bus_lib.servicebus_client_factory.DefaultAzureCredential")
+    def test_worker_factory_shares_credential(self, mock_credential_cls: MagicMock, mock_sb_cls: MagicMock) -> None:
+        factory = ServiceBusClientFactory(ConnectionConfig(connection_string=None, service_bus_namespace="ns"))
+        mock_sb_cls.side_effect = lambda *args, **kwargs: MagicMock()
+
+        worker_factory = factory.create_worker_factory()
+        worker_factory._rebuild_servicebus_client()
+
+        mock_credential_cls.assert_called_once_with()
+        self.assertIsNot(worker_factory.servicebus_client, factory.servicebus_client)
+        factory.servicebus_client.close.assert_not_called()  # type: ignore[attr-defined]
+        for call in mock_sb_cls.call_args_list:
+            self.assertEqual(call.args, ("ns.servicebus.windows.net", mock_credential_cls.return_value))
+
 class TestCreateMessageStoreClient(unittest.TestCase):
     """Tests for ServiceBusClientFactory.create_message_store_client."""
 
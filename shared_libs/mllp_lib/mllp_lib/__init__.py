@@ -0,0 +1,7 @@
+from .mllp_connection_pool import MLLPConnectionPool
+from .socket_utils import is_socket_closed
+
+__all__ = [
+    "MLLPConnectionPool",
+    "is_socket_closed",
+]
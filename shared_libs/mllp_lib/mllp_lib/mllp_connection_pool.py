@@ -0,0 +1,168 @@
+import logging
+import socket
+import threading
+import time
+from collections import deque
+from types import TracebackType
+from typing import Optional, Type
+
+from hl7.client import MLLPClient
+
+from .socket_utils import is_socket_closed
+
+logger = logging.getLogger(__name__)
+
+
+class MLLPConnectionPool:
+    """
+    Keeps connections to one MLLP receiver open and checked, so sends do not have to check them first.
+
+    A background thread probes the idle connections every ``probe_interval_seconds``. It closes any that the receiver
+    has closed or that have been idle longer than ``idle_timeout_seconds``, then connects ahead until ``size``
+    connections are waiting. TCP keepalive is enabled on every connection, so a receiver that disappears without
+    closing the connection is noticed by the kernel too.
+    """
+
+    KEEPALIVE_INTERVAL_SECONDS = 10
+    KEEPALIVE_PROBE_COUNT = 3
+
+    def __init__(
+        self,
+        receiver_mllp_hostname: str,
+        receiver_mllp_port: int,
+        ack_timeout_seconds: int,
+        size: int = 1,
+        idle_timeout_seconds: float = 300,
+        probe_interval_seconds: float = 10,
+        keepalive_idle_seconds: int = 60,
+    ):
+        if size < 1:
+            raise ValueError(f"size must be at least 1, got {size}")
+        self.receiver_mllp_hostname = receiver_mllp_hostname
+        self.receiver_mllp_port = receiver_mllp_port
+        self.ack_timeout_seconds = ack_timeout_seconds
+        self.size = size
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.probe_interval_seconds = probe_interval_seconds
+        self.keepalive_idle_seconds = keepalive_idle_seconds
+        # Idle connections with the time they were last used, most recently used last.
+        self._idle: deque[tuple[MLLPClient, float]] = deque()
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._prober: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Connect the warm connections and start probing them in the background."""
+        self.probe()
+        self._prober = threading.Thread(target=self._probe_until_closed, name="mllp-pool-prober", daemon=True)
+        self._prober.start()
+
+    def acquire(self) -> MLLPClient:
+        """Take the most recently used idle connection, or connect a new one if none is waiting."""
+        with self._lock:
+            if self._idle:
+                mllp_client, _ = self._idle.pop()
+                return mllp_client
+        logger.info(
+            "No idle MLLP connection, connecting to %s:%s", self.receiver_mllp_hostname, self.receiver_mllp_port
+        )
+        return self._connect()
+
+    def release(self, mllp_client: MLLPClient) -> None:
+        """Return a connection that is still usable after a send."""
+        with self._lock:
+            if not self._closed.is_set() and len(self._idle) < self.size:
+                self._idle.append((mllp_client, time.monotonic()))
+                return
+        self._close(mllp_client)
+
+    def discard(self, mllp_client: MLLPClient) -> None:
+        """Close a connection that failed, instead of returning it."""
+        self._close(mllp_client)
+
+    def probe(self) -> None:
+        """Close dead and long-idle connections, then connect ahead until the pool is full."""
+        evicted = []
+        now = time.monotonic()
+        with self._lock:
+            for mllp_client, last_used in list(self._idle):
+                if now - last_used > self.idle_timeout_seconds or is_socket_closed(mllp_client.socket):
+                    self._idle.remove((mllp_client, last_used))
+                    evicted.append(mllp_client)
+            missing = self.size - len(self._idle)
+        for mllp_client in evicted:
+            logger.info("Closing idle or dead MLLP connection")
+            self._close(mllp_client)
+
+        for _ in range(missing):
+            if self._closed.is_set():
+                return
+            try:
+                mllp_client = self._connect()
+            except OSError as e:
+                logger.warning(
+                    "Failed to connect ahead to %s:%s: %s", self.receiver_mllp_hostname, self.receiver_mllp_port, e
+                )
+                return
+            # Spares go to the front, so the connection used last is still handed out first.
+            with self._lock:
+                if self._closed.is_set() or len(self._idle) >= self.size:
+                    spare = mllp_client
+                else:
+                    self._idle.appendleft((mllp_client, time.monotonic()))
+                    spare = None
+            if spare is not None:
+                self._close(spare)
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._prober is not None:
+            self._prober.join()
+        with self._lock:
+            idle = [mllp_client for mllp_client, _ in self._idle]
+            self._idle.clear()
+        for mllp_client in idle:
+            self._close(mllp_client)
+
+    def _probe_until_closed(self) -> None:
+        while not self._closed.wait(self.probe_interval_seconds):
+            try:
+                self.probe()
+            except Exception:
+                logger.exception("Unexpected error probing MLLP connections")
+
+    def _connect(self) -> MLLPClient:
+        mllp_client = MLLPClient(self.receiver_mllp_hostname, self.receiver_mllp_port)
+        mllp_client.socket.settimeout(self.ack_timeout_seconds)
+        self._enable_keepalive(mllp_client.socket)
+        return mllp_client
+
+    def _enable_keepalive(self, sock: socket.socket) -> None:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        # The timing options are platform specific; where they are missing the system defaults apply.
+        for option, value in (
+            ("TCP_KEEPIDLE", self.keepalive_idle_seconds),
+            ("TCP_KEEPINTVL", self.KEEPALIVE_INTERVAL_SECONDS),
+            ("TCP_KEEPCNT", self.KEEPALIVE_PROBE_COUNT),
+        ):
+            if hasattr(socket, option):
+                sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+
+    @staticmethod
+    def _close(mllp_client: MLLPClient) -> None:
+        try:
+            mllp_client.close()
+        except Exception as e:
+            logger.error(f"Error closing socket: {e}")
+
+    def __enter__(self) -> "MLLPConnectionPool":
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
@@ -0,0 +1,26 @@
+import logging
+import os
+import select
+import socket
+
+logger = logging.getLogger(__name__)
+WINDOWS_OS = "nt"
+
+
+def is_socket_closed(sock: socket.socket) -> bool:
+    try:
+        # Check if the socket is readable (may indicate data or EOF)
+        readable, _, _ = select.select([sock], [], [], 0)
+        if readable:
+            # this will try to read bytes without blocking and also without removing them from buffer (peek only)
+            flags = socket.MSG_PEEK if os.name == WINDOWS_OS else socket.MSG_DONTWAIT | socket.MSG_PEEK
+            data = sock.recv(16, flags)
+            return len(data) == 0
+        return False  # no data, but socket is fine
+    except BlockingIOError:
+        return False  # socket is open and reading from it would block
+    except ConnectionResetError:
+        return True  # socket was closed for some other reason
+    except Exception:
+        logger.exception("unexpected exception when checking if a socket is closed")
+        return False
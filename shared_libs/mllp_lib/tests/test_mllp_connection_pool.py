@@ -0,0 +1,156 @@
+import socket
+import threading
+import time
+import unittest
+
+from mllp_lib import MLLPConnectionPool
+
+ACK = b"\x0bMSH|^~\\&|RECEIVER||SENDER||20250101000000||ACK|1|P|2.5\rMSA|AA|1\x1c\r"
+
+
+class _AckingReceiver:
+    """Accepts MLLP connections on a local port and answers every message with an ACK."""
+
+    def __init__(self) -> None:
+        self.server = socket.create_server(("127.0.0.1", 0))
+        self.port = self.server.getsockname()[1]
+        self.connections: list[socket.socket] = []
+        self._thread = threading.Thread(target=self._accept, daemon=True)
+        self._thread.start()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                connection, _ = self.server.accept()
+            except OSError:
+                return
+            self.connections.append(connection)
+            threading.Thread(target=self._answer, args=(connection,), daemon=True).start()
+
+    @staticmethod
+    def _answer(connection: socket.socket) -> None:
+        try:
+            while connection.recv(65536):
+                connection.sendall(ACK)
+        except OSError:
+            pass
+
+    def wait_for_connections(self, count: int) -> None:
+        deadline = time.monotonic() + 5
+        while len(self.connections) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def close(self) -> None:
+        # Closing alone does not wake the accept() in the other thread, which would keep accepting connections.
+        try:
+            self.server.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.server.close()
+        for connection in self.connections:
+            connection.close()
+
+
+class TestMLLPConnectionPool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.receiver = _AckingReceiver()
+        self.addCleanup(self.receiver.close)
+
+    def _pool(self, size: int = 1, idle_timeout_seconds: float = 300) -> MLLPConnectionPool:
+        # The background prober is left to its own test; these tests call probe() themselves.
+        pool = MLLPConnectionPool(
+            "127.0.0.1",
+            self.receiver.port,
+            5,
+            size,
+            idle_timeout_seconds=idle_timeout_seconds,
+            probe_interval_seconds=60,
+        )
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_start_connects_ahead_and_connections_are_reused(self) -> None:
+        pool = self._pool(size=2)
+        pool.start()
+        self.receiver.wait_for_connections(2)
+
+        mllp_client = pool.acquire()
+        self.assertEqual(mllp_client.send_message("MSH|^~\\&|1"), ACK)
+        pool.release(mllp_client)
+
+        self.assertIs(pool.acquire(), mllp_client)
+        self.assertEqual(len(self.receiver.connections), 2)
+
+    def test_connections_have_keepalive_and_the_ack_timeout(self) -> None:
+        mllp_client = self._pool().acquire()
+        self.addCleanup(mllp_client.close)
+
+        self.assertEqual(mllp_client.socket.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE), 1)
+        self.assertEqual(mllp_client.socket.gettimeout(), 5)
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            self.assertEqual(mllp_client.socket.getsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE), 60)
+
+    def test_probe_replaces_connections_closed_by_the_receiver(self) -> None:
+        pool = self._pool()
+        pool.start()
+        self.receiver.wait_for_connections(1)
+        closed_client = pool.acquire()
+        pool.release(closed_client)
+
+        self.receiver.connections[0].shutdown(socket.SHUT_RDWR)
+        time.sleep(0.05)
+        pool.probe()
+        self.receiver.wait_for_connections(2)
+
+        mllp_client = pool.acquire()
+        self.assertIsNot(mllp_client, closed_client)
+        self.assertEqual(mllp_client.send_message("MSH|^~\\&|1"), ACK)
+
+    def test_probe_replaces_connections_idle_for_too_long(self) -> None:
+        pool = self._pool(idle_timeout_seconds=0)
+        pool.start()
+        first = pool.acquire()
+        pool.release(first)
+
+        time.sleep(0.01)
+        pool.probe()
+
+        self.assertIsNot(pool.acquire(), first)
+
+    def test_release_closes_connections_beyond_the_pool_size(self) -> None:
+        pool = self._pool()
+        first, second = pool.acquire(), pool.acquire()
+
+        pool.release(first)
+        pool.release(second)
+
+        self.assertIs(pool.acquire(), first)
+        self.assertEqual(second.socket.fileno(), -1)
+
+    def test_connect_ahead_failure_does_not_raise(self) -> None:
+        self.receiver.close()
+        pool = self._pool()
+
+        with self.assertLogs("mllp_lib.mllp_connection_pool", level="WARNING"):
+            pool.start()
+        with self.assertRaises(OSError):
+            pool.acquire()
+
+    def test_background_prober_replaces_dead_connections(self) -> None:
+        pool = MLLPConnectionPool("127.0.0.1", self.receiver.port, 5, probe_interval_seconds=0.05)
+        with pool:
+            self.receiver.wait_for_connections(1)
+            self.receiver.connections[0].shutdown(socket.SHUT_RDWR)
+            self.receiver.wait_for_connections(2)
+
+            self.assertEqual(pool.acquire().send_message("MSH|^~\\&|1"), ACK)
+        # Connect-ahead may open further connections before the pool closes; only the replacement matters here.
+        self.assertGreaterEqual(len(self.receiver.connections), 2)
+
+    def test_size_must_be_positive(self) -> None:
+        with self.assertRaises(ValueError):
+            MLLPConnectionPool("127.0.0.1", self.receiver.port, 5, size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import os
+import socket
+import unittest
+from unittest.mock import Mock, patch
+
+from mllp_lib import is_socket_closed
+
+WINDOWS_OS = "nt"
+
+
+class TestIsSocketClosed(unittest.TestCase):
+    @patch("mllp_lib.socket_utils.select.select")
+    def test_socket_not_readable_no_data_available(self, mock_select: Mock) -> None:
+
+        mock_socket = Mock(spec=socket.socket)
+        # Simulate select.select returning empty readable list (no data available)
+        mock_select.return_value = ([], [], [])
+
+
+        result = is_socket_closed(mock_socket)
+
+
+        self.assertFalse(result)
+        mock_select.assert_called_once_with([mock_socket], [], [], 0)
+        # recv should not be called when socket is not readable
+        mock_socket.recv.assert_not_called()
+
+    @patch("mllp_lib.socket_utils.select.select")
+    def test_socket_readable_with_data_socket_open(self, mock_select: Mock) -> None:
+
+        mock_socket = Mock(spec=socket.socket)
+        # Simulate select.select returning the socket in readable list
+        mock_select.return_value = ([mock_socket], [], [])
+        mock_socket.recv.return_value = b"some data here"
+
+
+        result = is_socket_closed(mock_socket)
+
+
+        self.assertFalse(result)
+        mock_select.assert_called_once_with([mock_socket], [], [], 0)
+        if os.name == WINDOWS_OS:
+            mock_socket.recv.assert_called_once_with(16, socket.MSG_PEEK)
+        else:
+            mock_socket.recv.assert_called_once_with(16, socket.MSG_DONTWAIT | socket.MSG_PEEK)  # type: ignore
+
+    @patch("mllp_lib.socket_utils.select.select")
+    def test_socket_readable_with_empty_data_socket_closed(self, mock_select: Mock) -> None:
+
+        mock_socket = Mock(spec=socket.socket)
+        # Simulate select.select returning the socket in readable list
+        mock_select.return_value = ([mock_socket], [], [])
+        # Simulate recv returning empty data (EOF - socket closed)
+        mock_socket.recv.return_value = b""
+
+
+        result = is_socket_closed(mock_socket)
+
+
+        self.assertTrue(result)
+        mock_select.assert_called_once_with([mock_socket], [], [], 0)
+        if os.name == WINDOWS_OS:
+            mock_socket.recv.assert_called_once_with(16, socket.MSG_PEEK)
+        else:
+            mock_socket.recv.assert_called_once_with(16, socket.MSG_DONTWAIT | socket.MSG_PEEK)  # type: ignore
+
+    @patch("mllp_lib.socket_utils.select.select")
+    def test_socket_recv_raises_blocking_io_error(self, mock_select: Mock) -> None:
+
+        mock_socket = Mock(spec=socket.socket)
+        mock_select.return_value = ([mock_socket], [], [])
+        mock_socket.recv.side_effect = BlockingIOError
+
+
+        result = is_socket_closed(mock_socket)
+
+
+        self.assertFalse(result)
+        mock_select.assert_called_once_with([mock_socket], [], [], 0)
+
+    @patch("mllp_lib.socket_utils.select.select")
+    def test_socket_recv_raises_connection_reset_error(self, mock_select: Mock) -> None:
+
+        mock_socket = Mock(spec=socket.socket)
+        mock_select.return_value = ([mock_socket], [], [])
+        mock_socket.recv.side_effect = ConnectionResetError
+
+
+        result = is_socket_closed(mock_socket)
+
+
+        self.assertTrue(result)
+        mock_select.assert_called_once_with([mock_socket], [], [], 0)
+
+    @patch("mllp_lib.socket_utils.select.select")
+    def test_socket_unexpected_exception_during_check(self, mock_select: Mock) -> None:
+
+        mock_socket = Mock(spec=socket.socket)
+        mock_select.return_value = ([mock_socket], [], [])
+        mock_socket.recv.side_effect = RuntimeError("Some unexpected error")
+
+
+        with self.assertLogs("mllp_lib.socket_utils", level="ERROR") as log:
+            result = is_socket_closed(mock_socket)
+
+            self.assertFalse(result)
+            self.assertIn("unexpected exception", log.output[0])
+
+        mock_select.assert_called_once_with([mock_socket], [], [], 0)
+
+    @patch("mllp_lib.socket_utils.select.select")
+    def test_select_itself_raises_exception(self, mock_select: Mock) -> None:
+
+        mock_socket = Mock(spec=socket.socket)
+        mock_select.side_effect = OSError("select failed")
+
+
+        with self.assertLogs("mllp_lib.socket_utils", level="ERROR") as log:
+            result = is_socket_closed(mock_socket)
+
+            self.assertFalse(result)
+            self.assertIn("unexpected exception", log.output[0])
+
+        mock_select.assert_called_once_with([mock_socket], [], [], 0)
+
+    @patch("mllp_lib.socket_utils.os.name", "nt")
+    @patch("mllp_lib.socket_utils.select.select")
+    def test_socket_readable_uses_msg_peek_only_on_windows(self, mock_select: Mock) -> None:
+        """Test that Windows OS uses MSG_PEEK flag only (without MSG_DONTWAIT)."""
+        mock_socket = Mock(spec=socket.socket)
+        mock_select.return_value = ([mock_socket], [], [])
+        mock_socket.recv.return_value = b"data"
+
+        result = is_socket_closed(mock_socket)
+
+        self.assertFalse(result)
+        # Verify Windows uses only MSG_PEEK (no MSG_DONTWAIT)
+        mock_socket.recv.assert_called_once_with(16, socket.MSG_PEEK)
+
+    @patch("mllp_lib.socket_utils.os.name", "posix")
+    @patch("mllp_lib.socket_utils.select.select")
+    def test_socket_readable_uses_msg_peek_and_dontwait_on_non_windows(self, mock_select: Mock) -> None:
+        """Test that non-Windows OS uses MSG_PEEK | MSG_DONTWAIT flags."""
+        mock_socket = Mock(spec=socket.socket)
+        mock_select.return_value = ([mock_socket], [], [])
+        mock_socket.recv.return_value = b"data"
+
+        result = is_socket_closed(mock_socket)
+
+        self.assertFalse(result)
+        # Verify non-Windows uses MSG_PEEK | MSG_DONTWAIT
+        mock_socket.recv.assert_called_once_with(16, socket.MSG_DONTWAIT | socket.MSG_PEEK)  # type: ignore
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,14 @@
+from .circuit_breaker import CircuitBreaker, CircuitState
 from .processor_manager import ProcessorManager
+from .rate_control import AimdRateController, MessageThrottler, TokenBucket
+from .stage_timer import StageTimer
 
-__all__ = ["ProcessorManager"]
-
-
+__all__ = [
+    "AimdRateController",
+    "CircuitBreaker",
+    "CircuitState",
+    "MessageThrottler",
+    "ProcessorManager",
+    "StageTimer",
+    "TokenBucket",
+]
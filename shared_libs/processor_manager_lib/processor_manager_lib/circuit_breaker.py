@@ -0,0 +1,124 @@
+import logging
+import threading
+import time
+from enum import Enum
+from typing import Callable, Optional
+
+from .rate_control import GaugeMetricSender
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stops a sender taking messages while its destination is down.
+
+    The breaker opens after ``failure_threshold`` consecutive failed sends. While it is open the sender calls
+    wait_until_closed instead of receiving, which calls ``probe`` every ``probe_interval_seconds`` until it returns
+    True. The breaker is then half open. The next send closes it if it succeeds and opens it again at once if it
+    fails, so a destination that accepts connections but still cannot take messages is not retried message by
+    message.
+
+    Only failures that mean the destination is unreachable, such as timeouts and connection errors, should be
+    recorded. A negative ACK shows the destination is up.
+
+    A breaker can be shared by several sender threads. While it is open, one of them probes at a time.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        probe: Callable[[], bool],
+        probe_interval_seconds: float = 5,
+        metric_sender: Optional[GaugeMetricSender] = None,
+    ):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.probe = probe
+        self.probe_interval_seconds = probe_interval_seconds
+        self._metric_sender = metric_sender
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._lock = threading.Lock()
+        self._probe_lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        return self._state is CircuitState.OPEN
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._consecutive_failures = 0
+            closing = self._state is not CircuitState.CLOSED
+            self._state = CircuitState.CLOSED
+        if closing:
+            logger.info("Destination is healthy again, closing the circuit breaker")
+            self._send_state_metric(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            failures = self._consecutive_failures
+            opening = self._state is CircuitState.HALF_OPEN or (
+                self._state is CircuitState.CLOSED and failures >= self.failure_threshold
+            )
+            if opening:
+                self._state = CircuitState.OPEN
+        if opening:
+            logger.warning("Opening the circuit breaker after %d consecutive failed send(s)", failures)
+            self._send_state_metric(CircuitState.OPEN)
+
+    def wait_until_closed(
+        self, is_running: Callable[[], bool] = lambda: True, on_closed: Optional[Callable[[], None]] = None
+    ) -> bool:
+        """
+        While the breaker is open, probe the destination until it is healthy.
+
+        ``on_closed`` is called when a probe lets messages through again, for example to clear a receive backoff
+        left by the failures that opened the breaker. It is not called if the breaker was not open.
+
+        Returns True once sends may be attempted again, or False if ``is_running`` turned False first.
+        """
+        if self._state is not CircuitState.OPEN:
+            return True
+        # Threads that find the breaker open wait here while another probes, and see it half open when they get in.
+        with self._probe_lock:
+            while self._state is CircuitState.OPEN:
+                if not is_running():
+                    return False
+                if self._probe():
+                    logger.info("Destination probe succeeded, letting messages through")
+                    with self._lock:
+                        self._state = CircuitState.HALF_OPEN
+                    self._send_state_metric(CircuitState.HALF_OPEN)
+                    break
+                time.sleep(self.probe_interval_seconds)
+        if on_closed is not None:
+            on_closed()
+        return True
+
+    def _probe(self) -> bool:
+        try:
+            return self.probe()
+        except Exception as e:
+            logger.debug("Destination probe failed: %s", e)
+            return False
+
+    def _send_state_metric(self, state: CircuitState) -> None:
+        if self._metric_sender is None:
+            return
+        try:
+            self._metric_sender.send_gauge_metric("circuit_breaker_open", 1 if state is CircuitState.OPEN else 0)
+        except Exception as e:
+            logger.warning("Failed to send circuit_breaker_open metric: %s", e)
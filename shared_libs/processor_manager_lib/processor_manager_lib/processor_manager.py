@@ -1,10 +1,12 @@
 import logging
 import signal
 from types import FrameType
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Optional, TypeVar
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class ProcessorManager:
 
@@ -30,10 +32,10 @@ class ProcessorManager:
 
     def wrap_handler(
         self,
-        handler: Callable[[Any], bool],
+        handler: Callable[[Any], T],
         service_name: str,
         queue_name: str,
-    ) -> Callable[[Any], bool]:
+    ) -> Callable[[Any], T]:
         """Return a version of *handler* wrapped in an OTel span.
 
         If ``otel_lib`` is not installed or OTel has not been configured, the
@@ -61,7 +63,7 @@ class ProcessorManager:
             tracer = get_tracer(__name__)
             span_name = f"{service_name}.process_message"
 
-            def _wrapped(message: Any) -> bool:
+            def _wrapped(message: Any) -> T:
                 with tracer.start_as_current_span(span_name) as span:
                     span.set_attribute("messaging.system", "azure_service_bus")
                     span.set_attribute("messaging.destination", queue_name)
@@ -0,0 +1,194 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_MINUTE = 60
+
+
+class GaugeMetricSender(Protocol):
+    def send_gauge_metric(self, key: str, value: float, attributes: Optional[Dict[str, Any]] = None) -> None: ...
+
+
+class TokenBucket:
+    """
+    Token bucket holding up to ``burst`` tokens and refilled at ``rate_per_second``.
+
+    The bucket is kept as the time its next token is due, so taking a token reads the clock once, and the rate can
+    be changed between tokens.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int = 1):
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self._rate_per_second = rate_per_second
+        self.burst = burst
+        self._next_token_due: Optional[float] = None
+
+    @property
+    def rate_per_second(self) -> float:
+        return self._rate_per_second
+
+    @rate_per_second.setter
+    def rate_per_second(self, value: float) -> None:
+        if value <= 0:
+            raise ValueError("rate_per_second must be positive")
+        self._rate_per_second = value
+
+    def take(self) -> float:
+        """Take a token and return how many seconds the caller must wait before using it."""
+        now = time.monotonic()
+        interval = 1 / self._rate_per_second
+        if self._next_token_due is None:
+            self._next_token_due = now
+
+        # Up to burst - 1 further tokens may already be due; an idle bucket refills no further than that.
+        wait_time = max(0.0, self._next_token_due - (self.burst - 1) * interval - now)
+        self._next_token_due = max(self._next_token_due, now) + interval
+        return wait_time
+
+
+class AimdRateController:
+    """
+    Adjusts a token bucket's rate by additive increase and multiplicative decrease.
+
+    Each success with an ACK latency within ``latency_threshold_seconds`` raises the rate by a fixed step, so it
+    climbs from the minimum back to the maximum over ``INCREASE_STEPS`` healthy ACKs. A slow ACK holds the rate, and
+    a failure such as a NACK or timeout halves it, never going outside the minimum and maximum.
+    """
+
+    INCREASE_STEPS = 20
+    DECREASE_FACTOR = 0.5
+
+    def __init__(
+        self,
+        bucket: TokenBucket,
+        min_rate_per_second: float,
+        max_rate_per_second: float,
+        latency_threshold_seconds: float,
+    ):
+        if not 0 < min_rate_per_second <= max_rate_per_second:
+            raise ValueError("min_rate_per_second must be positive and no more than max_rate_per_second")
+        self.bucket = bucket
+        self.min_rate_per_second = min_rate_per_second
+        self.max_rate_per_second = max_rate_per_second
+        self.latency_threshold_seconds = latency_threshold_seconds
+        self._increase_step = (max_rate_per_second - min_rate_per_second) / self.INCREASE_STEPS
+
+    def record_success(self, latency_seconds: Optional[float] = None) -> bool:
+        """Record a successful send, returning True if the rate changed. A latency of None counts as healthy."""
+        if latency_seconds is not None and latency_seconds > self.latency_threshold_seconds:
+            return False
+        return self._set_rate(min(self.max_rate_per_second, self.bucket.rate_per_second + self._increase_step))
+
+    def record_failure(self) -> bool:
+        """Record a failed send, returning True if the rate changed."""
+        return self._set_rate(max(self.min_rate_per_second, self.bucket.rate_per_second * self.DECREASE_FACTOR))
+
+    def _set_rate(self, rate_per_second: float) -> bool:
+        if rate_per_second == self.bucket.rate_per_second:
+            return False
+        self.bucket.rate_per_second = rate_per_second
+        return True
+
+
+class MessageThrottler:
+    """
+    Limits a sender to ``max_messages_per_minute``, allowing up to ``burst`` messages at once after an idle spell.
+
+    With ``min_messages_per_minute`` set the rate is adaptive. It starts at the maximum, is halved on each NACK or
+    timeout reported to record_ack, and climbs back while ACKs arrive within ``latency_threshold_seconds``.
+
+    Time spent waiting and changes of rate are sent as the ``throttle_wait_seconds`` and
+    ``throttle_rate_per_minute`` gauge metrics when a metric sender is given. A throttler may be shared by threads
+    sending at the same time, and spaces their messages as it would one thread's.
+    """
+
+    def __init__(
+        self,
+        max_messages_per_minute: Optional[int],
+        burst: int = 1,
+        min_messages_per_minute: Optional[int] = None,
+        latency_threshold_seconds: float = 5,
+        metric_sender: Optional[GaugeMetricSender] = None,
+    ):
+        if max_messages_per_minute is not None and max_messages_per_minute <= 0:
+            raise ValueError("max_messages_per_minute must be a positive integer when set")
+        if min_messages_per_minute is not None and (
+            max_messages_per_minute is None or not 0 < min_messages_per_minute <= max_messages_per_minute
+        ):
+            raise ValueError("min_messages_per_minute must be positive and no more than max_messages_per_minute")
+
+        self._max_messages_per_minute = max_messages_per_minute
+        self._metric_sender = metric_sender
+        self._lock = threading.Lock()
+        self._bucket = (
+            TokenBucket(max_messages_per_minute / SECONDS_PER_MINUTE, burst)
+            if max_messages_per_minute
+            else None
+        )
+        self._controller = (
+            AimdRateController(
+                self._bucket,
+                min_messages_per_minute / SECONDS_PER_MINUTE,
+                self._bucket.rate_per_second,
+                latency_threshold_seconds,
+            )
+            if self._bucket is not None and min_messages_per_minute is not None
+            else None
+        )
+
+    @property
+    def interval_seconds(self) -> Optional[float]:
+        """The longest interval the throttler may put between messages, or None when it is disabled."""
+        if self._controller is not None:
+            return 1 / self._controller.min_rate_per_second
+        if self._bucket is not None:
+            return 1 / self._bucket.rate_per_second
+        return None
+
+    @property
+    def messages_per_minute(self) -> Optional[float]:
+        """The current rate limit, or None when the throttler is disabled."""
+        return self._bucket.rate_per_second * SECONDS_PER_MINUTE if self._bucket is not None else None
+
+    def wait_if_needed(self) -> None:
+        if self._bucket is None:
+            return
+
+        with self._lock:
+            wait_time = self._bucket.take()
+        if wait_time > 0:
+            logger.debug(
+                "Throttling: waiting %.2f seconds to maintain %.1f messages/minute rate",
+                wait_time,
+                self.messages_per_minute,
+            )
+            time.sleep(wait_time)
+            self._send_metric("throttle_wait_seconds", wait_time)
+
+    def record_ack(self, success: bool, latency_seconds: Optional[float] = None) -> None:
+        """Report the outcome of a send, so an adaptive throttler can adjust its rate."""
+        if self._controller is None:
+            return
+
+        with self._lock:
+            if success:
+                changed = self._controller.record_success(latency_seconds)
+            else:
+                changed = self._controller.record_failure()
+        if changed:
+            logger.info("Throttle rate changed to %.1f messages/minute", self.messages_per_minute)
+            self._send_metric("throttle_rate_per_minute", self.messages_per_minute or 0)
+
+    def _send_metric(self, key: str, value: float) -> None:
+        if self._metric_sender is None:
+            return
+        try:
+            self._metric_sender.send_gauge_metric(key, value)
+        except Exception as e:
+            logger.warning("Failed to send %s metric: %s", key, e)
@@ -0,0 +1,75 @@
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+import opentelemetry.context as otel_context
+import opentelemetry.trace as otel_trace
+
+from .rate_control import GaugeMetricSender
+
+logger = logging.getLogger(__name__)
+
+STAGE_METRIC = "message_stage_seconds"
+
+
+class StageTimer:
+    """
+    Times the stages of processing one message, reading ``time.perf_counter`` once per stage.
+
+    Each ``mark(stage)`` puts the time since the previous mark, or since the timer was created, down to ``stage``,
+    so the stages add up to the time spent on the message. A stage marked more than once is summed.
+
+    ``finish`` sends each stage's total to the ``message_stage_seconds`` histogram, with the stage as its ``stage``
+    attribute. Once OpenTelemetry tracing is configured, it also adds a span for each marked interval, under the
+    span that was current when the timer was created. The spans are made afterwards from the recorded times, so
+    nothing is traced while the message is being processed, and a timer may be marked on another thread.
+    """
+
+    def __init__(self, metric_sender: Optional[GaugeMetricSender] = None):
+        self._metric_sender = metric_sender
+        self._tracer: Optional[otel_trace.Tracer] = None
+        self._parent_context: Optional[otel_context.Context] = None
+        if not isinstance(otel_trace.get_tracer_provider(), otel_trace.ProxyTracerProvider):
+            self._tracer = otel_trace.get_tracer(__name__)
+            self._parent_context = otel_context.get_current()
+            self._started_at_ns = time.time_ns()
+        self._started_at = self._marked_at = time.perf_counter()
+        self._intervals: List[Tuple[str, float, float]] = []
+        self._finished = False
+
+    def mark(self, stage: str) -> None:
+        """End ``stage`` now; it started at the previous mark."""
+        now = time.perf_counter()
+        self._intervals.append((stage, self._marked_at, now))
+        self._marked_at = now
+
+    @property
+    def durations(self) -> Dict[str, float]:
+        """Seconds spent in each stage so far, in the order the stages were first marked."""
+        durations: Dict[str, float] = {}
+        for stage, started_at, ended_at in self._intervals:
+            durations[stage] = durations.get(stage, 0.0) + ended_at - started_at
+        return durations
+
+    def finish(self) -> None:
+        """Send the stage durations, once; later calls do nothing."""
+        if self._finished:
+            return
+        self._finished = True
+
+        if self._metric_sender is not None:
+            for stage, seconds in self.durations.items():
+                try:
+                    self._metric_sender.send_gauge_metric(STAGE_METRIC, seconds, {"stage": stage})
+                except Exception as e:
+                    logger.warning("Failed to send %s metric for stage %s: %s", STAGE_METRIC, stage, e)
+
+        if self._tracer is not None:
+            for stage, started_at, ended_at in self._intervals:
+                span = self._tracer.start_span(
+                    stage, context=self._parent_context, start_time=self._to_time_ns(started_at)
+                )
+                span.end(end_time=self._to_time_ns(ended_at))
+
+    def _to_time_ns(self, perf_counter_time: float) -> int:
+        return self._started_at_ns + int((perf_counter_time - self._started_at) * 1e9)
@@ -0,0 +1,120 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from processor_manager_lib import CircuitBreaker, CircuitState
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.probe = MagicMock(return_value=True)
+        self.metric_sender = MagicMock()
+        self.breaker = CircuitBreaker(3, self.probe, probe_interval_seconds=5, metric_sender=self.metric_sender)
+
+    def test_threshold_must_be_positive(self) -> None:
+        with self.assertRaises(ValueError):
+            CircuitBreaker(0, self.probe)
+
+    def test_opens_after_consecutive_failures_only(self) -> None:
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+        self.breaker.record_failure()
+
+        self.assertTrue(self.breaker.is_open)
+        self.metric_sender.send_gauge_metric.assert_called_once_with("circuit_breaker_open", 1)
+
+    def test_wait_until_closed_returns_at_once_when_closed(self) -> None:
+        self.assertTrue(self.breaker.wait_until_closed())
+
+        self.probe.assert_not_called()
+
+    @patch("processor_manager_lib.circuit_breaker.time")
+    def test_probes_until_the_destination_is_healthy(self, mock_time: MagicMock) -> None:
+        self.probe.side_effect = [False, ConnectionRefusedError("refused"), True]
+        for _ in range(3):
+            self.breaker.record_failure()
+
+        self.assertTrue(self.breaker.wait_until_closed())
+
+        self.assertEqual(self.probe.call_count, 3)
+        self.assertEqual(mock_time.sleep.call_count, 2)
+        mock_time.sleep.assert_called_with(5)
+        self.assertEqual(self.breaker.state, CircuitState.HALF_OPEN)
+
+    def test_on_closed_is_called_only_after_the_breaker_was_open(self) -> None:
+        on_closed = MagicMock()
+        self.assertTrue(self.breaker.wait_until_closed(on_closed=on_closed))
+        on_closed.assert_not_called()
+
+        for _ in range(3):
+            self.breaker.record_failure()
+
+        self.assertTrue(self.breaker.wait_until_closed(on_closed=on_closed))
+        on_closed.assert_called_once_with()
+
+    def test_one_thread_probes_while_the_others_wait(self) -> None:
+        for _ in range(3):
+            self.breaker.record_failure()
+        probing, healthy = threading.Event(), threading.Event()
+
+        def probe() -> bool:
+            probing.set()
+            return healthy.wait(5)
+
+        self.probe.side_effect = probe
+        results: list[bool] = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.breaker.wait_until_closed())) for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        self.assertTrue(probing.wait(5))
+        healthy.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(results, [True, True, True])
+        self.probe.assert_called_once_with()
+        self.assertEqual(self.breaker.state, CircuitState.HALF_OPEN)
+
+    def test_half_open_closes_on_success_and_reopens_on_failure(self) -> None:
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.breaker.wait_until_closed()
+
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.is_open)
+
+        self.breaker.wait_until_closed()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+        self.assertEqual(
+            [call.args for call in self.metric_sender.send_gauge_metric.call_args_list],
+            [("circuit_breaker_open", value) for value in (1, 0, 1, 0, 0)],
+        )
+
+    @patch("processor_manager_lib.circuit_breaker.time")
+    def test_wait_until_closed_stops_when_no_longer_running(self, mock_time: MagicMock) -> None:
+        self.probe.return_value = False
+        for _ in range(3):
+            self.breaker.record_failure()
+        running = iter([True, True, False])
+
+        on_closed = MagicMock()
+
+        self.assertFalse(self.breaker.wait_until_closed(lambda: next(running), on_closed=on_closed))
+
+        on_closed.assert_not_called()
+
+        self.assertEqual(self.probe.call_count, 2)
+        self.assertTrue(self.breaker.is_open)
+
+
+if __name__ == "__main__":
+    unittest.main()
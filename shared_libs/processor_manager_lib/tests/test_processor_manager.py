@@ -111,6 +111,19 @@ class TestWrapHandler(unittest.TestCase):
         self.assertTrue(result)
         handler.assert_called_once_with(msg)
 
+    def test_wrap_handler_returns_the_handlers_result(self) -> None:
+        from opentelemetry.sdk.trace import TracerProvider  # noqa: PLC0415
+        from otel_lib import get_tracer  # noqa: PLC0415
+
+        def batch_handler(messages: list[object]) -> int:
+            return len(messages)
+
+        with patch("opentelemetry.trace.get_tracer_provider", return_value=TracerProvider()):
+            with patch("otel_lib.get_tracer", wraps=get_tracer):
+                wrapped = self.pm.wrap_handler(batch_handler, "my-service", "my-queue")
+
+        self.assertEqual(wrapped([MagicMock(), MagicMock()]), 2)
+
     def test_wrap_handler_records_exception_and_reraises(self) -> None:
         from opentelemetry.sdk.trace import TracerProvider  # noqa: PLC0415
         from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: PLC0415
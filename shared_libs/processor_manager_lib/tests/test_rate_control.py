@@ -0,0 +1,190 @@
+"""Tests for the token bucket, AIMD controller and MessageThrottler built on them."""
+import unittest
+from unittest.mock import MagicMock, patch
+
+from processor_manager_lib import AimdRateController, MessageThrottler, TokenBucket
+
+
+class TestMessageThrottler(unittest.TestCase):
+
+    def test_zero_value_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            MessageThrottler(max_messages_per_minute=0)
+
+    def test_negative_value_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            MessageThrottler(max_messages_per_minute=-1)
+
+    def test_no_throttling_when_disabled(self) -> None:
+        throttler = MessageThrottler(max_messages_per_minute=None)
+        with patch("processor_manager_lib.rate_control.time") as mock_time:
+            mock_time.monotonic.return_value = 1000.0
+            for _ in range(100):
+                throttler.wait_if_needed()
+            mock_time.sleep.assert_not_called()
+
+    def test_interval_seconds_none_when_disabled(self) -> None:
+        throttler = MessageThrottler(max_messages_per_minute=None)
+        self.assertIsNone(throttler.interval_seconds)
+
+    def test_interval_seconds_calculated_correctly(self) -> None:
+        throttler = MessageThrottler(max_messages_per_minute=30)
+        self.assertAlmostEqual(throttler.interval_seconds or 0, 2.0)
+
+    @patch("processor_manager_lib.rate_control.time")
+    def test_first_message_not_throttled(self, mock_time: unittest.mock.Mock) -> None:
+        throttler = MessageThrottler(max_messages_per_minute=30)
+        mock_time.monotonic.return_value = 1000.0
+        throttler.wait_if_needed()
+        mock_time.sleep.assert_not_called()
+
+    @patch("processor_manager_lib.rate_control.time")
+    def test_throttles_when_interval_not_elapsed(self, mock_time: unittest.mock.Mock) -> None:
+        throttler = MessageThrottler(max_messages_per_minute=30)  # 2s interval
+        mock_time.monotonic.side_effect = [1000.0, 1000.5]
+        throttler.wait_if_needed()  # sets last_message_time to 1000.0
+        throttler.wait_if_needed()
+        mock_time.sleep.assert_called_once()
+        self.assertAlmostEqual(mock_time.sleep.call_args[0][0], 1.5, places=1)
+
+    @patch("processor_manager_lib.rate_control.time")
+    def test_no_throttle_when_interval_elapsed(self, mock_time: unittest.mock.Mock) -> None:
+        throttler = MessageThrottler(max_messages_per_minute=30)  # 2s interval
+        mock_time.monotonic.side_effect = [1000.0, 1002.5]
+        throttler.wait_if_needed()  # sets last_message_time to 1000.0
+        throttler.wait_if_needed()
+        mock_time.sleep.assert_not_called()
+
+    @patch("processor_manager_lib.rate_control.time")
+    def test_throttle_calculates_correct_wait_time(self, mock_time: unittest.mock.Mock) -> None:
+        throttler = MessageThrottler(max_messages_per_minute=60)  # 1s interval
+        mock_time.monotonic.side_effect = [1000.0, 1000.3, 1001.0]
+        throttler.wait_if_needed()
+        throttler.wait_if_needed()
+        mock_time.sleep.assert_called_once()
+        self.assertAlmostEqual(mock_time.sleep.call_args[0][0], 0.7, places=1)
+
+    @patch("processor_manager_lib.rate_control.time")
+    def test_multiple_messages_at_correct_rate(self, mock_time: unittest.mock.Mock) -> None:
+        throttler = MessageThrottler(max_messages_per_minute=30)  # 2s interval
+        mock_time.monotonic.side_effect = [1000.0, 1001.0, 1004.0]
+        throttler.wait_if_needed()
+        mock_time.sleep.assert_not_called()
+        throttler.wait_if_needed()
+        mock_time.sleep.assert_called_once()
+        self.assertAlmostEqual(mock_time.sleep.call_args[0][0], 1.0, places=1)
+        mock_time.sleep.reset_mock()
+        throttler.wait_if_needed()
+        mock_time.sleep.assert_not_called()
+
+    @patch("processor_manager_lib.rate_control.time")
+    def test_burst_is_allowed_after_an_idle_spell(self, mock_time: unittest.mock.Mock) -> None:
+        throttler = MessageThrottler(max_messages_per_minute=30, burst=3)  # 2 seconds between messages
+
+        mock_time.monotonic.side_effect = [1000.0, 1000.0, 1000.0, 1000.0, 1100.0, 1100.0, 1100.0, 1100.0]
+        for _ in range(3):
+            throttler.wait_if_needed()
+        mock_time.sleep.assert_not_called()
+
+        throttler.wait_if_needed()
+        self.assertAlmostEqual(mock_time.sleep.call_args[0][0], 2.0)
+        mock_time.sleep.reset_mock()
+
+        for _ in range(3):
+            throttler.wait_if_needed()  # idle long enough to refill, but no further than the burst
+        mock_time.sleep.assert_not_called()
+        throttler.wait_if_needed()
+        mock_time.sleep.assert_called_once()
+
+    def test_min_rate_must_not_exceed_max_rate(self) -> None:
+        with self.assertRaises(ValueError):
+            MessageThrottler(max_messages_per_minute=30, min_messages_per_minute=60)
+        with self.assertRaises(ValueError):
+            MessageThrottler(max_messages_per_minute=None, min_messages_per_minute=10)
+
+    def test_adaptive_interval_is_the_minimum_rate_interval(self) -> None:
+        throttler = MessageThrottler(max_messages_per_minute=60, min_messages_per_minute=6)
+
+        self.assertAlmostEqual(throttler.interval_seconds or 0, 10.0)
+        self.assertAlmostEqual(throttler.messages_per_minute or 0, 60.0)
+
+    def test_adaptive_rate_halves_on_failure_and_climbs_on_healthy_acks(self) -> None:
+        metric_sender = MagicMock()
+        throttler = MessageThrottler(
+            max_messages_per_minute=60,
+            min_messages_per_minute=20,
+            latency_threshold_seconds=1,
+            metric_sender=metric_sender,
+        )
+
+        throttler.record_ack(False)
+        self.assertAlmostEqual(throttler.messages_per_minute or 0, 30.0)
+        throttler.record_ack(False)
+        self.assertAlmostEqual(throttler.messages_per_minute or 0, 20.0)  # held at the minimum
+
+        throttler.record_ack(True, latency_seconds=5)  # slow ACKs hold the rate
+        self.assertAlmostEqual(throttler.messages_per_minute or 0, 20.0)
+        throttler.record_ack(True, latency_seconds=0.1)
+        self.assertAlmostEqual(throttler.messages_per_minute or 0, 22.0)
+
+        self.assertEqual(
+            [call.args for call in metric_sender.send_gauge_metric.call_args_list],
+            [("throttle_rate_per_minute", rate) for rate in (30.0, 20.0, 22.0)],
+        )
+
+    def test_record_ack_ignored_when_not_adaptive(self) -> None:
+        metric_sender = MagicMock()
+        throttler = MessageThrottler(max_messages_per_minute=60, metric_sender=metric_sender)
+
+        throttler.record_ack(False)
+
+        self.assertEqual(throttler.messages_per_minute, 60)
+        metric_sender.send_gauge_metric.assert_not_called()
+
+    @patch("processor_manager_lib.rate_control.time")
+    def test_wait_time_metric_failure_does_not_raise(self, mock_time: unittest.mock.Mock) -> None:
+        metric_sender = MagicMock()
+        metric_sender.send_gauge_metric.side_effect = RuntimeError("monitor unavailable")
+        throttler = MessageThrottler(max_messages_per_minute=60, metric_sender=metric_sender)
+
+        mock_time.monotonic.side_effect = [1000.0, 1000.5]
+        throttler.wait_if_needed()
+        with self.assertLogs("processor_manager_lib.rate_control", level="WARNING"):
+            throttler.wait_if_needed()
+
+        metric_sender.send_gauge_metric.assert_called_once_with("throttle_wait_seconds", 0.5)
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_invalid_settings_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+        with self.assertRaises(ValueError):
+            TokenBucket(1, burst=0)
+
+    @patch("processor_manager_lib.rate_control.time")
+    def test_sub_second_intervals(self, mock_time: unittest.mock.Mock) -> None:
+        bucket = TokenBucket(rate_per_second=20)
+
+        mock_time.monotonic.side_effect = [1000.0, 1000.01, 1000.2]
+
+        self.assertEqual(bucket.take(), 0)
+        self.assertAlmostEqual(bucket.take(), 0.04)
+        self.assertEqual(bucket.take(), 0)
+
+    @patch("processor_manager_lib.rate_control.time")
+    def test_rate_change_applies_to_the_next_token(self, mock_time: unittest.mock.Mock) -> None:
+        bucket = TokenBucket(rate_per_second=1)
+        controller = AimdRateController(bucket, 0.25, 1, latency_threshold_seconds=1)
+
+        mock_time.monotonic.side_effect = [1000.0, 1001.0, 1002.0]
+        bucket.take()
+        controller.record_failure()
+        bucket.take()  # at the halved rate the next token is due 2 seconds later
+
+        self.assertAlmostEqual(bucket.take(), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
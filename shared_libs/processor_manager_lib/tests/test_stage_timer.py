@@ -0,0 +1,82 @@
+"""Tests for StageTimer's stage durations, histogram metrics and spans."""
+import unittest
+from unittest.mock import MagicMock, patch
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from processor_manager_lib import StageTimer
+from processor_manager_lib.stage_timer import STAGE_METRIC
+
+
+class TestStageTimer(unittest.TestCase):
+
+    @patch("processor_manager_lib.stage_timer.time")
+    def test_marks_divide_the_time_between_stages(self, mock_time: MagicMock) -> None:
+        mock_time.perf_counter.side_effect = [10.0, 10.5, 12.0, 12.25, 13.0]
+        timer = StageTimer()
+
+        timer.mark("prepare")
+        timer.mark("ack_wait")
+        timer.mark("prepare")
+        timer.mark("record")
+
+        self.assertEqual(timer.durations, {"prepare": 0.75, "ack_wait": 1.5, "record": 0.75})
+
+    @patch("processor_manager_lib.stage_timer.time")
+    def test_finish_sends_each_stage_once(self, mock_time: MagicMock) -> None:
+        mock_time.perf_counter.side_effect = [0.0, 1.0, 3.0, 4.0]
+        metric_sender = MagicMock()
+        timer = StageTimer(metric_sender)
+        timer.mark("throttle")
+        timer.mark("ack_wait")
+        timer.mark("throttle")
+
+        timer.finish()
+        timer.finish()
+
+        metric_sender.send_gauge_metric.assert_any_call(STAGE_METRIC, 2.0, {"stage": "throttle"})
+        metric_sender.send_gauge_metric.assert_any_call(STAGE_METRIC, 2.0, {"stage": "ack_wait"})
+        self.assertEqual(metric_sender.send_gauge_metric.call_count, 2)
+
+    def test_metric_failure_is_not_raised(self) -> None:
+        metric_sender = MagicMock()
+        metric_sender.send_gauge_metric.side_effect = RuntimeError("exporter down")
+        timer = StageTimer(metric_sender)
+        timer.mark("ack_wait")
+
+        timer.finish()
+
+    def test_no_spans_without_a_configured_tracer(self) -> None:
+        timer = StageTimer()
+        timer.mark("ack_wait")
+
+        self.assertIsNone(timer._tracer)
+        timer.finish()
+
+    def test_spans_are_children_of_the_current_span(self) -> None:
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+
+        with patch("opentelemetry.trace.get_tracer_provider", return_value=provider):
+            with provider.get_tracer(__name__).start_as_current_span("process_message") as parent:
+                timer = StageTimer()
+            timer.mark("throttle")
+            timer.mark("ack_wait")
+            timer.finish()
+
+        spans = {span.name: span for span in exporter.get_finished_spans()}
+        self.assertEqual(set(spans), {"process_message", "throttle", "ack_wait"})
+        for name in ("throttle", "ack_wait"):
+            span_parent = spans[name].parent
+            assert span_parent is not None
+            self.assertEqual(span_parent.span_id, parent.get_span_context().span_id)
+        throttle_end, ack_wait_start = spans["throttle"].end_time, spans["ack_wait"].start_time
+        assert throttle_end is not None and ack_wait_start is not None
+        self.assertLessEqual(throttle_end, ack_wait_start)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,10 @@
+import os
+import tempfile
 import unittest
 from typing import Optional
 from unittest.mock import MagicMock, patch
 
-from transformer_base_lib.app_config import AppConfig
+from transformer_base_lib.app_config import AppConfig, TransformerConfig
 
 
 class TestAppConfig(unittest.TestCase):
@@ -47,5 +49,38 @@ class TestAppConfig(unittest.TestCase):
         self.assertIn("Missing required configuration", str(context.exception))
 
 
+
+class TestTransformerConfig(unittest.TestCase):
+    def _config(self, contents: str) -> TransformerConfig:
+        with tempfile.TemporaryDirectory() as directory:
+            config_path = os.path.join(directory, "config.ini")
+            with open(config_path, "w") as f:
+                f.write(contents)
+            with patch("transformer_base_lib.app_config.AppConfig.read_env_config") as mock_read_env_config:
+                mock_read_env_config.return_value = AppConfig(*([None] * 10))
+                return TransformerConfig.from_env_and_config_file(config_path)
+
+    def test_batch_publish_defaults_to_off(self) -> None:
+        config = self._config("[DEFAULT]\nMAX_BATCH_SIZE = 10\n")
+
+        self.assertEqual(config.MAX_BATCH_SIZE, 10)
+        self.assertFalse(config.BATCH_PUBLISH)
+
+    def test_batch_publish_is_read_from_config_file(self) -> None:
+        self.assertTrue(self._config("[DEFAULT]\nBATCH_PUBLISH = true\n").BATCH_PUBLISH)
+        self.assertFalse(self._config("[DEFAULT]\nBATCH_PUBLISH = maybe\n").BATCH_PUBLISH)
+
+    def test_worker_processes_are_read_from_config_file(self) -> None:
+        self.assertEqual(self._config("[DEFAULT]\n").WORKER_PROCESSES, 1)
+        self.assertEqual(self._config("[DEFAULT]\nWORKER_PROCESSES = 4\n").WORKER_PROCESSES, 4)
+        self.assertEqual(self._config("[DEFAULT]\nWORKER_PROCESSES = 0\n").WORKER_PROCESSES, os.cpu_count() or 1)
+        self.assertEqual(self._config("[DEFAULT]\nWORKER_PROCESSES = -2\n").WORKER_PROCESSES, 1)
+
+    def test_max_delivery_attempts_are_read_from_config_file(self) -> None:
+        self.assertEqual(self._config("[DEFAULT]\n").MAX_DELIVERY_ATTEMPTS, 0)
+        self.assertEqual(self._config("[DEFAULT]\nMAX_DELIVERY_ATTEMPTS = 3\n").MAX_DELIVERY_ATTEMPTS, 3)
+        self.assertEqual(self._config("[DEFAULT]\nMAX_DELIVERY_ATTEMPTS = -1\n").MAX_DELIVERY_ATTEMPTS, 0)
+        self.assertEqual(self._config("[DEFAULT]\nMAX_DELIVERY_ATTEMPTS = lots\n").MAX_DELIVERY_ATTEMPTS, 0)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,166 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from hl7apy.parser import parse_message
+
+from transformer_base_lib import (
+    CopyFields,
+    DefaultField,
+    FieldChange,
+    MapField,
+    MappingPlan,
+    MessageMapping,
+    SegmentMapping,
+    compile_mapping,
+)
+from transformer_base_lib.er7_mapping import PASS_THROUGH_CACHE_SIZE
+
+MSH = "MSH|^~\\&|SENDER|FAC|RECEIVER|FAC|20250101101010||ADT^A31^ADT_A05|MSG1|P|2.5"
+
+
+def _plan(*segments: SegmentMapping, **kwargs: Any) -> MappingPlan:
+    return compile_mapping(MessageMapping(version="2.5", segments=segments, **kwargs))
+
+
+class TestEr7Mapping(unittest.TestCase):
+    def test_copies_whole_message_by_default(self) -> None:
+        message = "\r".join([MSH, "PID|1||123^^^252^PI||DOE^JOHN", "PV1||I"])
+
+        result = _plan(SegmentMapping("MSH")).apply(message)
+
+        self.assertEqual(result.er7, message)
+        self.assertEqual(result.changes, ())
+
+    def test_copies_field_ranges_only(self) -> None:
+        plan = _plan(SegmentMapping("MSH", (CopyFields(3, 4), CopyFields(9, 10))), pass_through=False)
+
+        result = plan.apply(MSH + "\rPID|1")
+
+        self.assertEqual(result.er7, "MSH|^~\\&|SENDER|FAC|||||ADT^A31^ADT_A05|MSG1")
+
+    def test_composite_fields_are_normalised_like_hl7apy(self) -> None:
+        message = MSH + "\rPID|1||123^^^252&  &^PI^^~^^^||A^B^^  ^||19870101|M|^^"
+
+        result = _plan(SegmentMapping("MSH")).apply(message)
+
+        self.assertEqual(result.er7.split("\r")[1], "PID|1||123^^^252^PI~||A^B||19870101|M|")
+
+    def test_trailing_empty_fields_can_be_dropped(self) -> None:
+        message = MSH + "\rEVN|A31||^^| "
+
+        kept = _plan(SegmentMapping("MSH"), SegmentMapping("EVN")).apply(message)
+        dropped = _plan(SegmentMapping("MSH"), SegmentMapping("EVN", (CopyFields(1, keep_empty=False),))).apply(message)
+
+        self.assertEqual(kept.er7.split("\r")[1], "EVN|A31||")
+        self.assertEqual(dropped.er7.split("\r")[1], "EVN|A31")
+
+    def test_primitive_and_unknown_fields_are_copied_verbatim(self) -> None:
+        message = MSH + "\rOBX|1|ST|CODE^^||a^^b^||||||F\rZAB|1^^|  x"
+
+        result = _plan(SegmentMapping("MSH")).apply(message)
+
+        self.assertEqual(result.er7.split("\r")[1:], ["OBX|1|ST|CODE||a^^b^||||||F", "ZAB|1^^|  x"])
+
+    def test_repetitions_can_be_duplicated(self) -> None:
+        message = MSH + "\rAL1|1||A^^~B|x~~y"
+        rules = (CopyFields(1, duplicate_repetitions=True),)
+
+        copied = _plan(SegmentMapping("MSH")).apply(message)
+        duplicated = _plan(SegmentMapping("MSH"), pass_through_rules=rules).apply(message)
+
+        self.assertEqual(copied.er7.split("\r")[1], "AL1|1||A~B|x~~y")
+        self.assertEqual(duplicated.er7.split("\r")[1], "AL1|1||A~B~A~B|x~~y~x~~y~x~~y")
+
+    def test_map_field_records_changes(self) -> None:
+        plan = _plan(SegmentMapping("MSH", (CopyFields(3), MapField(7, lambda value: value[:8]))))
+
+        result = plan.apply(MSH + "^S")
+
+        self.assertTrue(result.er7.startswith("MSH|^~\\&|SENDER|FAC|RECEIVER|FAC|20250101||"))
+        self.assertEqual(result.changes, (FieldChange("MSH", 7, "20250101101010", "20250101"),))
+
+    def test_map_field_uses_default_for_blank_values(self) -> None:
+        plan = _plan(SegmentMapping("MSH", (MapField(7, str.lower, default=lambda: "NOW"),)))
+
+        result = plan.apply("MSH|^~\\&|A||||  ")
+
+        self.assertEqual(result.er7, "MSH|^~\\&|||||NOW")
+        self.assertEqual(result.changes, ())
+
+    def test_map_field_errors_propagate(self) -> None:
+        def reject(value: str) -> str:
+            raise ValueError(f"bad value {value}")
+
+        plan = _plan(SegmentMapping("MSH", (MapField(7, reject),)))
+
+        with self.assertRaises(ValueError):
+            plan.apply(MSH)
+
+    def test_default_field_only_fills_empty_fields(self) -> None:
+        plan = _plan(SegmentMapping("MSH", (CopyFields(3), DefaultField(12, "2.5"), DefaultField(3, "X"))))
+
+        self.assertTrue(plan.apply("MSH|^~\\&|A").er7.endswith("|2.5"))
+        self.assertTrue(plan.apply("MSH|^~\\&|A").er7.startswith("MSH|^~\\&|A|"))
+
+    def test_mapped_segments_come_first_and_repeats_are_dropped(self) -> None:
+        plan = _plan(SegmentMapping("MSH"), SegmentMapping("PID"), drop_segments=("Z*",))
+        message = "\r".join([MSH, "PV1||I", "ZAB|1", "PID|1", "OBX|1", "PID|2"])
+
+        result = plan.apply(message)
+
+        self.assertEqual(result.er7.split("\r")[1:], ["PID|1", "PV1||I", "OBX|1"])
+
+    def test_input_encoding_characters_are_kept(self) -> None:
+        message = "MSH#:*\\@#A:B::#F\rPID#1##123::::PI::*X"
+
+        result = _plan(SegmentMapping("MSH")).apply(message)
+
+        self.assertEqual(result.er7, "MSH#:*\\@#A:B#F\rPID#1##123::::PI*X")
+
+    def test_rejects_messages_without_msh(self) -> None:
+        with self.assertRaises(ValueError):
+            _plan(SegmentMapping("MSH")).apply("PID|1")
+
+    def test_rejects_invalid_mappings(self) -> None:
+        with self.assertRaises(ValueError):
+            _plan(SegmentMapping("PID"))
+        with self.assertRaises(ValueError):
+            _plan(SegmentMapping("MSH"), SegmentMapping("PID"), SegmentMapping("PID"))
+
+    def test_map_message_returns_message_serialising_to_mapped_er7(self) -> None:
+        plan = _plan(SegmentMapping("MSH", (CopyFields(3), MapField(7, lambda value: value[:8]))))
+        message = "\r".join([MSH + "||||||||^", "PID|1||123^^^252^PI||DOE^ B |||", "PV1||I"])
+
+        mapped, changes = plan.map_message(parse_message(message))
+
+        self.assertEqual(
+            mapped.to_er7(),
+            "\r".join(["MSH|^~\\&|SENDER|FAC|RECEIVER|FAC|20250101||ADT^A31^ADT_A05|MSG1|P|2.5||||||||^",
+                       "PID|1||123^^^252^PI||DOE^ B ", "PV1||I"]),
+        )
+        self.assertEqual(changes, (FieldChange("MSH", 7, "20250101101010", "20250101"),))
+
+    def test_unmapped_segments_are_cached_across_threads(self) -> None:
+        plan = _plan(SegmentMapping("MSH"))
+        message = "\r".join([MSH] + [f"Z{index:02d}|1|A^B" for index in range(20)])
+
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(plan.apply, [message] * 32))
+
+        self.assertEqual({result.er7 for result in results}, {message})
+        self.assertEqual(plan._pass_through.cache_info().currsize, 20)
+
+    def test_unmapped_segment_cache_is_bounded(self) -> None:
+        plan = _plan(SegmentMapping("MSH"))
+        names = [f"Z{index:03d}" for index in range(PASS_THROUGH_CACHE_SIZE + 50)]
+        message = "\r".join([MSH] + [f"{name}|1" for name in names])
+
+        result = plan.apply(message)
+
+        self.assertEqual(result.er7, message)
+        self.assertEqual(plan._pass_through.cache_info().currsize, PASS_THROUGH_CACHE_SIZE)
+
+
+if __name__ == "__main__":
+    unittest.main()
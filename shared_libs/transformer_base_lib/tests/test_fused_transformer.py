@@ -0,0 +1,133 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from hl7apy.core import Message
+from hl7apy.parser import parse_message
+
+from transformer_base_lib import BaseTransformer, FusedTransformer, FusedTransformError
+
+MESSAGE_BODY = "MSH|^~\\&|252|252|100|100|20250505232332||ADT^A31^ADT_A05|{}|P|2.5\rPID|1"
+PROPERTIES = {"CorrelationId": "correlation-1", "WorkflowID": "phw-to-mpi", "SourceSystem": "252"}
+
+
+class FlatTransformer(BaseTransformer):
+    find_groups = False
+
+    def __init__(self) -> None:
+        super().__init__("Flat")
+        self.inputs: list[Message] = []
+
+    def transform_message(self, hl7_msg: Message) -> Message:
+        if hl7_msg.msh.msh_10.value == "BAD":
+            raise ValueError("invalid message")
+        self.inputs.append(hl7_msg)
+        new_message = parse_message(hl7_msg.to_er7(), find_groups=False)
+        new_message.pid.pid_1 = "2"
+        return new_message
+
+    def get_processed_audit_text(self, hl7_msg: Message) -> str:
+        return f"Flat transformation applied to {hl7_msg.msh.msh_10.value}"
+
+
+class GroupedTransformer(FlatTransformer):
+    find_groups = True
+
+
+class TestFusedTransformer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sender_client = MagicMock()
+        self.event_logger = MagicMock()
+
+    def test_output_is_sent_and_audited_as_the_transformer_service_does(self) -> None:
+        fused = FusedTransformer(FlatTransformer(), self.event_logger)
+
+        fused.transform_and_send(MESSAGE_BODY.format("CONTROL1"), PROPERTIES, self.sender_client, message_id="CONTROL1")
+
+        output = MESSAGE_BODY.format("CONTROL1").replace("PID|1", "PID|2")
+        self.sender_client.send_text_message.assert_called_once_with(
+            output, custom_properties=PROPERTIES, message_id="CONTROL1"
+        )
+        self.event_logger.log_message_received.assert_called_once_with(
+            MESSAGE_BODY.format("CONTROL1"), "Message received for Flat transformation", correlation_id="correlation-1"
+        )
+        self.event_logger.log_message_processed.assert_called_once_with(
+            output, "Flat transformation applied to CONTROL1", correlation_id="correlation-1"
+        )
+
+    def test_flat_message_is_reused_only_by_flat_transformers(self) -> None:
+        flat_message = parse_message(MESSAGE_BODY.format("CONTROL1"), find_groups=False)
+        flat_transformer = FlatTransformer()
+        grouped_transformer = GroupedTransformer()
+
+        for transformer in (flat_transformer, grouped_transformer):
+            FusedTransformer(transformer, self.event_logger).transform_and_send(
+                MESSAGE_BODY.format("CONTROL1"), PROPERTIES, self.sender_client, flat_message=flat_message
+            )
+
+        self.assertIs(flat_transformer.inputs[0], flat_message)
+        self.assertIsNot(grouped_transformer.inputs[0], flat_message)
+
+    def test_failure_is_audited_and_raised(self) -> None:
+        fused = FusedTransformer(FlatTransformer(), self.event_logger)
+
+        with self.assertRaises(FusedTransformError):
+            fused.transform_and_send(MESSAGE_BODY.format("BAD"), PROPERTIES, self.sender_client)
+
+        self.sender_client.send_text_message.assert_not_called()
+        self.event_logger.log_message_failed.assert_called_once_with(
+            MESSAGE_BODY.format("BAD"),
+            "Failed to transform Flat message: invalid message",
+            "Flat transformation failed",
+            correlation_id="correlation-1",
+        )
+
+    def test_send_failure_is_raised(self) -> None:
+        self.sender_client.send_text_message.side_effect = RuntimeError("Service Bus unavailable")
+        fused = FusedTransformer(FlatTransformer(), self.event_logger)
+
+        with self.assertRaises(FusedTransformError):
+            fused.transform_and_send(MESSAGE_BODY.format("CONTROL1"), PROPERTIES, self.sender_client)
+
+        self.event_logger.log_message_processed.assert_not_called()
+        self.event_logger.log_message_failed.assert_called_once()
+
+    def test_messages_are_transformed_one_at_a_time(self) -> None:
+        active = 0
+        overlaps = []
+
+        class SlowTransformer(FlatTransformer):
+            def transform_message(self, hl7_msg: Message) -> Message:
+                nonlocal active
+                active += 1
+                overlaps.append(active)
+                threading.Event().wait(0.01)
+                active -= 1
+                return super().transform_message(hl7_msg)
+
+        fused = FusedTransformer(SlowTransformer(), self.event_logger)
+        threads = [
+            threading.Thread(
+                target=fused.transform_and_send, args=(MESSAGE_BODY.format(index), PROPERTIES, self.sender_client)
+            )
+            for index in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(overlaps, [1, 1, 1, 1])
+        self.assertEqual(self.sender_client.send_text_message.call_count, 4)
+
+    @patch("transformer_base_lib.fused_transformer.EventLogger")
+    def test_load_audits_under_the_transformer_microservice_id(self, mock_event_logger: MagicMock) -> None:
+        fused = FusedTransformer.load(f"{__name__}:FlatTransformer", "phw-to-mpi", "phw_hl7_transformer")
+
+        self.assertIsInstance(fused.transformer, FlatTransformer)
+        self.assertEqual(fused.name, "Flat")
+        mock_event_logger.assert_called_once_with("phw-to-mpi", "phw_hl7_transformer")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from hl7apy.core import Message
+
+from transformer_base_lib import BaseTransformer
+from transformer_base_lib.golden_corpus import (
+    CorpusMessage,
+    CorpusReport,
+    generate_variants,
+    load_corpus,
+    main,
+    run_corpus,
+    transform_er7,
+)
+
+MESSAGE_BODY = (
+    "MSH|^~\\&|252|252|100|100|20250505232332||ADT^A31^ADT_A05|{}|P|2.5\r"
+    "PID|||8888888^^^252^PI~4444444444^^^NHS^NH||SURNAME^First^\\T\\^^MR||19990101|M|||1 ROAD^^\"\"^^SA99 1XX"
+)
+
+
+class NameTransformer(BaseTransformer):
+    def __init__(self, suffix: str = "") -> None:
+        super().__init__("NameTransformer")
+        self.suffix = suffix
+
+    def transform_message(self, hl7_msg: Message) -> Message:
+        if hl7_msg.msh.msh_10.value == "BAD":
+            raise ValueError("invalid message")
+        hl7_msg.pid.pid_8 = "U" + self.suffix
+        return hl7_msg
+
+
+def _corpus(*control_ids: str) -> list[CorpusMessage]:
+    return [CorpusMessage(f"message-{control_id}", MESSAGE_BODY.format(control_id)) for control_id in control_ids]
+
+
+class TestLoadCorpus(unittest.TestCase):
+    def test_loads_files_and_directories(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            corpus_dir = Path(directory, "corpus")
+            corpus_dir.mkdir()
+            Path(corpus_dir, "b.hl7").write_text("MSH|^~\\&|B\r\nPID|1\r\n")
+            Path(corpus_dir, "a.hl7").write_text("MSH|^~\\&|A\nPID|1\n\n")
+            Path(corpus_dir, "notes.txt").write_text("not a message")
+            single = Path(directory, "single.txt")
+            single.write_text("MSH|^~\\&|C\rPID|1")
+
+            messages = load_corpus([corpus_dir, single])
+
+        self.assertEqual(
+            messages,
+            [
+                CorpusMessage("a", "MSH|^~\\&|A\rPID|1"),
+                CorpusMessage("b", "MSH|^~\\&|B\rPID|1"),
+                CorpusMessage("single", "MSH|^~\\&|C\rPID|1"),
+            ],
+        )
+
+
+class TestGenerateVariants(unittest.TestCase):
+    def test_variants_are_deterministic_and_keep_the_message_shape(self) -> None:
+        variants = generate_variants(_corpus("CONTROL1"), 3, seed=1)
+
+        self.assertEqual(
+            [variant.name for variant in variants],
+            ["message-CONTROL1.v01", "message-CONTROL1.v02", "message-CONTROL1.v03"],
+        )
+        self.assertEqual(variants, generate_variants(_corpus("CONTROL1"), 3, seed=1))
+        self.assertNotEqual(variants, generate_variants(_corpus("CONTROL1"), 3, seed=2))
+        self.assertEqual(len({variant.er7 for variant in variants}), 3)
+
+        original_pid = MESSAGE_BODY.format("CONTROL1").split("\r")[1].split("|")
+        for variant in variants:
+            with self.subTest(variant=variant.name):
+                msh, pid = variant.er7.split("\r")
+                self.assertRegex(msh.split("|")[9], "^[A-Z]{7}[0-9]$")
+                fields = pid.split("|")
+                self.assertEqual([len(field) for field in fields], [len(field) for field in original_pid])
+                self.assertEqual(fields[7:9], ["19990101", "M"])
+                self.assertRegex(fields[3], "^[0-9]{7}\\^\\^\\^252\\^PI~[0-9]{10}\\^\\^\\^NHS\\^NH$")
+                self.assertRegex(fields[5], "^[A-Z]{7}\\^[A-Z][a-z]{4}\\^\\\\T\\\\\\^\\^MR$")
+                self.assertRegex(fields[11], '^[0-9] [A-Z]{4}\\^\\^""\\^\\^[A-Z]{2}[0-9]{2} [0-9][A-Z]{2}$')
+
+
+class TestRunCorpus(unittest.TestCase):
+    def test_outputs_match_the_golden_files_they_were_written_to(self) -> None:
+        messages = _corpus("CONTROL1", "BAD")
+        with tempfile.TemporaryDirectory() as golden_dir:
+            run_corpus(NameTransformer(), messages, golden_dir, repeat=1, update_golden=True)
+            report = run_corpus(NameTransformer(), messages, golden_dir, repeat=2)
+            golden = Path(golden_dir, "message-CONTROL1.hl7").read_text()
+            failure = Path(golden_dir, "message-BAD.hl7").read_text()
+
+        self.assertEqual(report.mismatches, ())
+        self.assertEqual(report.messages, 2)
+        self.assertEqual(len(report.latencies), 2)
+        self.assertGreater(report.messages_per_second, 0)
+        self.assertGreater(report.peak_memory_bytes, 0)
+        self.assertGreater(report.allocated_blocks, 0)
+        self.assertEqual(set(report.stage_seconds), {"parse", "transform", "serialise"})
+        self.assertEqual(golden.splitlines()[1].split("|")[8], "U")
+        self.assertEqual(failure, "ERROR ValueError: invalid message\n")
+
+    def test_changed_and_missing_outputs_are_reported(self) -> None:
+        with tempfile.TemporaryDirectory() as golden_dir:
+            run_corpus(NameTransformer(), _corpus("CONTROL1"), golden_dir, repeat=1, update_golden=True)
+            report = run_corpus(NameTransformer(suffix="X"), _corpus("CONTROL1", "CONTROL2"), golden_dir, repeat=1)
+
+        self.assertEqual([mismatch.name for mismatch in report.mismatches], ["message-CONTROL1", "message-CONTROL2"])
+        changed, missing = report.mismatches
+        self.assertIn("segment 2 differs", changed.description)
+        self.assertIn("|19990101|UX|", changed.description)
+        self.assertEqual(missing.description, "message-CONTROL2: no golden output")
+
+    def test_ignored_fields_are_left_out_of_the_comparison(self) -> None:
+        with tempfile.TemporaryDirectory() as golden_dir:
+            run_corpus(NameTransformer(), _corpus("CONTROL1"), golden_dir, repeat=1, update_golden=True)
+            changed = run_corpus(NameTransformer(suffix="X"), _corpus("CONTROL1"), golden_dir, repeat=1)
+            ignored = run_corpus(
+                NameTransformer(suffix="X"), _corpus("CONTROL1"), golden_dir, repeat=1, ignore_fields=["PID.8"]
+            )
+
+        self.assertEqual(len(changed.mismatches), 1)
+        self.assertEqual(ignored.mismatches, ())
+
+    def test_invalid_arguments_are_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            run_corpus(NameTransformer(), _corpus("CONTROL1"), repeat=0)
+        with self.assertRaises(ValueError):
+            run_corpus(NameTransformer(), _corpus("CONTROL1", "CONTROL1"))
+
+    def test_transform_er7_returns_output_and_timings(self) -> None:
+        output, timings = transform_er7(NameTransformer(), MESSAGE_BODY.format("CONTROL1"))
+
+        self.assertTrue(output.startswith("MSH|^~\\&|252|"))
+        self.assertEqual(set(timings), {"parse", "transform", "serialise"})
+
+    def test_latency_percentiles(self) -> None:
+        report = CorpusReport(
+            messages=10,
+            seconds=1.0,
+            latencies=tuple(index / 100 for index in range(10, 0, -1)),
+            stage_seconds={},
+            peak_memory_bytes=0,
+        )
+
+        self.assertEqual(report.latency_percentile(50), 0.05)
+        self.assertEqual(report.latency_percentile(90), 0.09)
+        self.assertEqual(report.latency_percentile(99), 0.1)
+        self.assertEqual(report.messages_per_second, 10)
+
+
+class TestMain(unittest.TestCase):
+    def test_exit_code_reflects_the_golden_comparison(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            corpus = Path(directory, "message.hl7")
+            corpus.write_text(MESSAGE_BODY.format("CONTROL1"))
+            golden_dir = Path(directory, "golden")
+            transformer = f"{__name__}:NameTransformer"
+            arguments = [transformer, str(corpus), "--golden", str(golden_dir), "--variants", "2", "--repeat", "1"]
+
+            with redirect_stdout(io.StringIO()) as output:
+                missing = main(arguments)
+                updated = main(arguments + ["--update-golden"])
+                matching = main(arguments)
+            golden_files = sorted(path.name for path in golden_dir.iterdir())
+
+        self.assertEqual((missing, updated, matching), (1, 0, 0))
+        self.assertEqual(golden_files, ["message.hl7", "message.v01.hl7", "message.v02.hl7"])
+        self.assertIn("messages:      3", output.getvalue())
+        self.assertIn("latency (ms):  p50=", output.getvalue())
+        self.assertRegex(output.getvalue(), r"peak memory:   \d+ KiB per message, \d+ allocated blocks")
+
+    def test_transformer_must_be_a_base_transformer(self) -> None:
+        with self.assertRaises(ValueError):
+            main(["collections:OrderedDict", "corpus.hl7"])
+        with self.assertRaises(ValueError):
+            main(["NameTransformer", "corpus.hl7"])
+
+
+if __name__ == "__main__":
+    unittest.main()
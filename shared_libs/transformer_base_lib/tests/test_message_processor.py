@@ -1,9 +1,12 @@
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import ANY, MagicMock, patch
 
 from azure.servicebus import ServiceBusMessage
+from azure.servicebus.exceptions import MessageSizeExceededError, ServiceBusError
+from message_bus_lib.message_receiver_client import PoisonMessageError
+from message_bus_lib.message_sender_client import MessageSenderClient
 
-from transformer_base_lib.message_processor import process_message
+from transformer_base_lib.message_processor import process_message, process_message_batch
 
 
 class TestMessageProcessor(unittest.TestCase):
@@ -39,8 +42,8 @@ class TestMessageProcessor(unittest.TestCase):
         )
 
         self.assertTrue(result)
-        mock_sender.send_message.assert_called_once()
-        call_args = mock_sender.send_message.call_args
+        mock_sender.send_text_message.assert_called_once()
+        call_args = mock_sender.send_text_message.call_args
         self.assertEqual(call_args[0][0], mock_transformed_msg.to_er7.return_value)
         self.assertEqual(call_args[1]["custom_properties"], test_properties)
 
@@ -73,10 +76,309 @@ class TestMessageProcessor(unittest.TestCase):
                 )
 
                 self.assertTrue(result)
-                mock_sender.send_message.assert_called_once()
-                call_args = mock_sender.send_message.call_args
+                mock_sender.send_text_message.assert_called_once()
+                call_args = mock_sender.send_text_message.call_args
                 self.assertEqual(call_args[1]["custom_properties"], None)
 
+    @patch("transformer_base_lib.transform_context.parse_message")
+    def test_process_message_parses_and_serialises_once(self, mock_parse_message: MagicMock) -> None:
+        mock_sender = MagicMock()
+        mock_event_logger = MagicMock()
+        mock_transformed_msg = MagicMock()
+        mock_transformed_msg.to_er7.return_value = "MSH|^~\\&|OUT\r"
+        mock_transform = MagicMock(return_value=mock_transformed_msg)
+        audit_builder = MagicMock(return_value="Test processed")
+
+        mock_message = MagicMock(spec=ServiceBusMessage)
+        mock_message.body = [b"MSH|^~\\&|252|252|100|100|20250505232332||ADT^A31^ADT_A05|1|P|2.5\r"]
+        mock_message.application_properties = None
+
+        result = process_message(
+            message=mock_message,
+            sender_client=mock_sender,
+            event_logger=mock_event_logger,
+            transform=mock_transform,
+            transformer_display_name="TestTransformer",
+            received_audit_text="Test received",
+            processed_audit_text_builder=audit_builder,
+            failed_audit_text="Test failed",
+            find_groups=False,
+        )
+
+        self.assertTrue(result)
+        mock_parse_message.assert_called_once()
+        self.assertFalse(mock_parse_message.call_args.kwargs["find_groups"])
+        mock_transform.assert_called_once_with(mock_parse_message.return_value)
+        audit_builder.assert_called_once_with(mock_parse_message.return_value)
+        mock_transformed_msg.to_er7.assert_called_once()
+        mock_sender.send_text_message.assert_called_once_with(
+            "MSH|^~\\&|OUT\r", custom_properties=None, message_id=None
+        )
+        self.assertEqual(mock_event_logger.log_message_processed.call_args.args[0], "MSH|^~\\&|OUT\r")
+
+    @patch("transformer_base_lib.transform_context.parse_message")
+    def test_transform_failure_raises_poison_error_when_asked(self, mock_parse_message: MagicMock) -> None:
+        mock_parse_message.return_value = MagicMock(**{"msh.msh_10.value": "BAD"})
+        mock_sender = MagicMock()
+        mock_event_logger = MagicMock()
+
+        def process(raise_poison_errors: bool) -> bool:
+            return process_message(
+                message=_batch_message("BAD"),
+                sender_client=mock_sender,
+                event_logger=mock_event_logger,
+                transform=_transform_to_control_id,
+                transformer_display_name="TestTransformer",
+                received_audit_text="Test received",
+                processed_audit_text_builder=lambda msg: "Test processed",
+                failed_audit_text="Test failed",
+                raise_poison_errors=raise_poison_errors,
+            )
+
+        self.assertFalse(process(raise_poison_errors=False))
+        with self.assertRaises(PoisonMessageError) as raised:
+            process(raise_poison_errors=True)
+
+        self.assertEqual(raised.exception.reason, "TransformationFailed")
+        self.assertEqual(str(raised.exception), "TestTransformer transformation failed: ValueError: invalid message")
+        self.assertEqual(mock_event_logger.log_message_failed.call_count, 2)
+        mock_sender.send_text_message.assert_not_called()
+
+    @patch("transformer_base_lib.transform_context.parse_message")
+    def test_send_failure_is_not_a_poison_error(self, mock_parse_message: MagicMock) -> None:
+        mock_parse_message.return_value = MagicMock(**{"msh.msh_10.value": "1"})
+        mock_sender = MagicMock()
+        mock_sender.send_text_message.side_effect = RuntimeError("service bus down")
+
+        result = process_message(
+            message=_batch_message("1"),
+            sender_client=mock_sender,
+            event_logger=MagicMock(),
+            transform=_transform_to_control_id,
+            transformer_display_name="TestTransformer",
+            received_audit_text="Test received",
+            processed_audit_text_builder=lambda msg: "Test processed",
+            failed_audit_text="Test failed",
+            raise_poison_errors=True,
+        )
+
+        self.assertFalse(result)
+
+
+
+def _batch_message(message_id: str) -> MagicMock:
+    message = MagicMock(spec=ServiceBusMessage)
+    message.body = [f"MSH|^~\\&|252|252|100|100|20250505232332||ADT^A31^ADT_A05|{message_id}|P|2.5\r".encode()]
+    message.application_properties = {"CorrelationId": message_id}
+    return message
+
+
+def _transform_to_control_id(hl7_msg: MagicMock) -> MagicMock:
+    control_id = hl7_msg.msh.msh_10.value
+    if control_id == "BAD":
+        raise ValueError("invalid message")
+    return MagicMock(**{"to_er7.return_value": f"OUT|{control_id}"})
+
+
+class TestProcessMessageBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sender = MagicMock()
+        self.sender.build_message.side_effect = lambda er7, props: (er7, props)
+        self.event_logger = MagicMock()
+
+    def _process(self, messages: list[MagicMock], raise_poison_errors: bool = False) -> int:
+        return process_message_batch(
+            messages,
+            sender_client=self.sender,
+            event_logger=self.event_logger,
+            transform=_transform_to_control_id,
+            transformer_display_name="TestTransformer",
+            received_audit_text="Test received",
+            processed_audit_text_builder=lambda msg: "Test processed",
+            failed_audit_text="Test failed",
+            raise_poison_errors=raise_poison_errors,
+        )
+
+    @patch("transformer_base_lib.transform_context.parse_message")
+    def test_publishes_whole_batch_in_order_with_one_send(self, mock_parse_message: MagicMock) -> None:
+        mock_parse_message.side_effect = lambda body, find_groups: MagicMock(
+            **{"msh.msh_10.value": body.split("|")[9]}
+        )
+
+        handled = self._process([_batch_message("1"), _batch_message("2"), _batch_message("3")])
+
+        self.assertEqual(handled, 3)
+        self.sender.send_message_batch.assert_called_once_with(
+            [("OUT|1", {"CorrelationId": "1"}), ("OUT|2", {"CorrelationId": "2"}), ("OUT|3", {"CorrelationId": "3"})],
+            retry_transient_errors=True,
+            on_sub_batch_sent=ANY,
+        )
+        self.sender.send_text_message.assert_not_called()
+        self.assertEqual(
+            [c.args[0] for c in self.event_logger.log_message_processed.call_args_list], ["OUT|1", "OUT|2", "OUT|3"]
+        )
+
+    @patch("transformer_base_lib.transform_context.parse_message")
+    def test_stops_at_first_failure_and_publishes_the_messages_before_it(self, mock_parse_message: MagicMock) -> None:
+        mock_parse_message.side_effect = lambda body, find_groups: MagicMock(
+            **{"msh.msh_10.value": body.split("|")[9]}
+        )
+
+        handled = self._process([_batch_message("1"), _batch_message("BAD"), _batch_message("3")])
+
+        self.assertEqual(handled, 1)
+        self.sender.send_message_batch.assert_called_once_with(
+            [("OUT|1", {"CorrelationId": "1"})], retry_transient_errors=True, on_sub_batch_sent=ANY
+        )
+        self.assertEqual(mock_parse_message.call_count, 2)
+        self.event_logger.log_message_failed.assert_called_once()
+        self.assertEqual(self.event_logger.log_message_failed.call_args.args[2], "Test failed")
+        self.event_logger.log_message_processed.assert_called_once()
+
+    @patch("transformer_base_lib.transform_context.parse_message")
+    def test_audit_text_is_built_after_each_transform(self, mock_parse_message: MagicMock) -> None:
+        mock_parse_message.side_effect = lambda body, find_groups: MagicMock(
+            **{"msh.msh_10.value": body.split("|")[9]}
+        )
+        last_transformed: list[str] = []
+
+        def transform(hl7_msg: MagicMock) -> MagicMock:
+            last_transformed[:] = [hl7_msg.msh.msh_10.value]
+            return _transform_to_control_id(hl7_msg)
+
+        process_message_batch(
+            [_batch_message("1"), _batch_message("2")],
+            sender_client=self.sender,
+            event_logger=self.event_logger,
+            transform=transform,
+            transformer_display_name="TestTransformer",
+            received_audit_text="Test received",
+            processed_audit_text_builder=lambda msg: f"Transformed {last_transformed[0]}",
+            failed_audit_text="Test failed",
+        )
+
+        self.assertEqual(
+            [c.args[1] for c in self.event_logger.log_message_processed.call_args_list],
+            ["Transformed 1", "Transformed 2"],
+        )
+
+    @patch("transformer_base_lib.transform_context.parse_message")
+    def test_nothing_is_published_when_the_first_message_fails(self, mock_parse_message: MagicMock) -> None:
+        mock_parse_message.return_value = MagicMock(**{"msh.msh_10.value": "BAD"})
+
+        self.assertEqual(self._process([_batch_message("BAD"), _batch_message("2")]), 0)
+        self.sender.send_message_batch.assert_not_called()
+
+    @patch("transformer_base_lib.transform_context.parse_message")
+    def test_send_failure_fails_every_transformed_message(self, mock_parse_message: MagicMock) -> None:
+        mock_parse_message.side_effect = lambda body, find_groups: MagicMock(
+            **{"msh.msh_10.value": body.split("|")[9]}
+        )
+        self.sender.send_message_batch.side_effect = RuntimeError("service bus down")
+
+        handled = self._process([_batch_message("1"), _batch_message("2")])
+
+        self.assertEqual(handled, 0)
+        self.assertEqual(self.event_logger.log_message_failed.call_count, 2)
+        self.assertEqual(self.event_logger.log_message_failed.call_args.args[2], "Unexpected processing error")
+        self.event_logger.log_message_processed.assert_not_called()
+
+    @patch("transformer_base_lib.transform_context.parse_message")
+    def test_poison_error_is_raised_after_the_messages_before_it_are_published(
+        self, mock_parse_message: MagicMock
+    ) -> None:
+        mock_parse_message.side_effect = lambda body, find_groups: MagicMock(
+            **{"msh.msh_10.value": body.split("|")[9]}
+        )
+
+        with self.assertRaises(PoisonMessageError) as raised:
+            self._process([_batch_message("1"), _batch_message("BAD"), _batch_message("3")], raise_poison_errors=True)
+
+        self.assertEqual(raised.exception.handled, 1)
+        self.sender.send_message_batch.assert_called_once_with(
+            [("OUT|1", {"CorrelationId": "1"})], retry_transient_errors=True, on_sub_batch_sent=ANY
+        )
+        self.event_logger.log_message_processed.assert_called_once()
+
+    @patch("transformer_base_lib.transform_context.parse_message")
+    def test_poison_error_is_not_raised_when_publishing_fails(self, mock_parse_message: MagicMock) -> None:
+        mock_parse_message.side_effect = lambda body, find_groups: MagicMock(
+            **{"msh.msh_10.value": body.split("|")[9]}
+        )
+        self.sender.send_message_batch.side_effect = RuntimeError("service bus down")
+
+        handled = self._process([_batch_message("1"), _batch_message("BAD")], raise_poison_errors=True)
+
+        self.assertEqual(handled, 0)
+
+
+class _SubBatch(list):
+    """A ServiceBusMessageBatch that holds two messages."""
+
+    def add_message(self, message: ServiceBusMessage) -> None:
+        if len(self) == 2:
+            raise MessageSizeExceededError()
+        self.append(message)
+
+
+@patch(
+    "transformer_base_lib.transform_context.parse_message",
+    side_effect=lambda body, find_groups: MagicMock(**{"msh.msh_10.value": body.split("|")[9]}),
+)
+class TestPublishBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.service_bus_sender = MagicMock()
+        self.service_bus_sender.create_message_batch.side_effect = _SubBatch
+        self.published: list[list[str]] = []
+        self.send_errors: list[Exception | None] = []
+        self.service_bus_sender.send_messages.side_effect = self._send_messages
+        self.sender = MessageSenderClient(self.service_bus_sender, "test-topic", propagate_trace_context=False)
+        self.event_logger = MagicMock()
+
+    def _send_messages(self, batch: _SubBatch) -> None:
+        error = self.send_errors.pop(0) if self.send_errors else None
+        if error is not None:
+            raise error
+        self.published.append([b"".join(message.body).decode() for message in batch])
+
+    def _process(self, messages: list[MagicMock]) -> int:
+        return process_message_batch(
+            messages,
+            sender_client=self.sender,
+            event_logger=self.event_logger,
+            transform=_transform_to_control_id,
+            transformer_display_name="TestTransformer",
+            received_audit_text="Test received",
+            processed_audit_text_builder=lambda msg: "Test processed",
+            failed_audit_text="Test failed",
+        )
+
+    def test_transient_error_resends_only_the_sub_batch_that_failed(self, _mock_parse_message: MagicMock) -> None:
+        self.send_errors = [None, ServiceBusError("server busy")]
+
+        handled = self._process([_batch_message("1"), _batch_message("2"), _batch_message("3")])
+
+        self.assertEqual(handled, 3)
+        self.assertEqual(self.published, [["OUT|1", "OUT|2"], ["OUT|3"]])
+        self.event_logger.log_message_failed.assert_not_called()
+
+    def test_sub_batches_sent_before_a_failure_are_not_republished_on_redelivery(
+        self, _mock_parse_message: MagicMock
+    ) -> None:
+        self.send_errors = [None] + [ServiceBusError("server busy")] * 3
+        messages = [_batch_message("1"), _batch_message("2"), _batch_message("3")]
+
+        handled = self._process(messages)
+
+        self.assertEqual(handled, 2)
+        self.assertEqual(
+            [c.args[0] for c in self.event_logger.log_message_processed.call_args_list], ["OUT|1", "OUT|2"]
+        )
+        self.assertEqual(self.event_logger.log_message_failed.call_count, 1)
+
+        # The receiver completes the handled messages, so only the rest are redelivered.
+        self.assertEqual(self._process(messages[handled:]), 1)
+        self.assertEqual(self.published, [["OUT|1", "OUT|2"], ["OUT|3"]])
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from azure.servicebus import ServiceBusMessage
+
+from transformer_base_lib.transform_context import TransformContext
+
+MESSAGE_BODY = "MSH|^~\\&|252|252|100|100|20250505232332||ADT^A31^ADT_A05|202505052323364444|P|2.5\rPID|1"
+
+
+class TestTransformContext(unittest.TestCase):
+    @patch("transformer_base_lib.transform_context.parse_message")
+    def test_input_is_parsed_once(self, mock_parse_message: MagicMock) -> None:
+        context = TransformContext(MESSAGE_BODY, find_groups=False)
+
+        first = context.input_message
+        second = context.input_message
+
+        self.assertIs(first, second)
+        mock_parse_message.assert_called_once_with(MESSAGE_BODY, find_groups=False)
+        self.assertIn("parse", context.timings)
+
+    def test_output_is_serialised_once(self) -> None:
+        context = TransformContext(MESSAGE_BODY)
+        output_message = MagicMock()
+        output_message.to_er7.return_value = "MSH|^~\\&|OUT"
+
+        context.output_message = output_message
+
+        self.assertEqual(context.output_er7, "MSH|^~\\&|OUT")
+        self.assertEqual(context.output_er7, "MSH|^~\\&|OUT")
+        output_message.to_er7.assert_called_once()
+        self.assertIn("serialise", context.timings)
+
+    def test_setting_a_new_output_clears_the_serialised_er7(self) -> None:
+        context = TransformContext(MESSAGE_BODY)
+        context.output_message = MagicMock(**{"to_er7.return_value": "first"})
+        self.assertEqual(context.output_er7, "first")
+
+        context.output_message = MagicMock(**{"to_er7.return_value": "second"})
+
+        self.assertEqual(context.output_er7, "second")
+
+    def test_output_must_be_set_before_serialising(self) -> None:
+        with self.assertRaises(ValueError):
+            _ = TransformContext(MESSAGE_BODY).output_er7
+
+    def test_timed_accumulates_per_stage(self) -> None:
+        context = TransformContext(MESSAGE_BODY)
+
+        with context.timed("transform"):
+            pass
+        first = context.timings["transform"]
+        with context.timed("transform"):
+            pass
+
+        self.assertGreaterEqual(context.timings["transform"], first)
+        self.assertRegex(context.format_timings(), r"^transform=\d+\.\d{2}ms$")
+
+    def test_from_service_bus_message_reads_body_and_metadata(self) -> None:
+        message = MagicMock(spec=ServiceBusMessage)
+        message.body = [MESSAGE_BODY[:10].encode("utf-8"), MESSAGE_BODY[10:].encode("utf-8")]
+        message.application_properties = {"CorrelationId": "abc", "WorkflowID": "wf"}
+
+        context = TransformContext.from_service_bus_message(message, find_groups=False)
+
+        self.assertEqual(context.body, MESSAGE_BODY)
+        self.assertEqual(context.properties, {"CorrelationId": "abc", "WorkflowID": "wf"})
+        self.assertEqual(context.correlation_id, "abc")
+        self.assertEqual(context.metadata["workflow_id"], "wf")
+        self.assertFalse(context.find_groups)
+
+    def test_correlation_id_is_none_without_metadata(self) -> None:
+        self.assertIsNone(TransformContext(MESSAGE_BODY).correlation_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
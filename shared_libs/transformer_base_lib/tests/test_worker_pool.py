@@ -0,0 +1,131 @@
+import os
+import unittest
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import ANY, MagicMock
+
+from azure.servicebus import ServiceBusMessage
+from hl7apy.core import Message
+from message_bus_lib.message_receiver_client import PoisonMessageError
+
+from transformer_base_lib import BaseTransformer, TransformerWorkerPool, WorkerResult
+from transformer_base_lib.message_processor import process_message_batch_in_workers
+
+MESSAGE_BODY = "MSH|^~\\&|252|252|100|100|20250505232332||ADT^A31^ADT_A05|{}|P|2.5\rPID|1"
+
+
+class PidTransformer(BaseTransformer):
+    def __init__(self) -> None:
+        super().__init__("PidTransformer")
+
+    def transform_message(self, hl7_msg: Message) -> Message:
+        if hl7_msg.msh.msh_10.value == "BAD":
+            raise ValueError("invalid message")
+        hl7_msg.pid.pid_1 = str(os.getpid())
+        return hl7_msg
+
+
+def _message(control_id: str) -> MagicMock:
+    message = MagicMock(spec=ServiceBusMessage)
+    message.body = [MESSAGE_BODY.format(control_id).encode("utf-8")]
+    message.application_properties = {"CorrelationId": control_id}
+    return message
+
+
+def _done(result: WorkerResult | Exception) -> Future:
+    future: Future = Future()
+    if isinstance(result, Exception):
+        future.set_exception(result)
+    else:
+        future.set_result(result)
+    return future
+
+
+class TestTransformerWorkerPool(unittest.TestCase):
+    def test_messages_are_transformed_in_worker_processes(self) -> None:
+        with TransformerWorkerPool(PidTransformer(), processes=2) as pool:
+            futures = [pool.submit(MESSAGE_BODY.format(index), find_groups=False) for index in range(4)]
+            results = [future.result(timeout=60) for future in futures]
+            with self.assertRaises(ValueError):
+                pool.submit(MESSAGE_BODY.format("BAD")).result(timeout=60)
+
+        for index, result in enumerate(results):
+            segments = result.output_er7.split("\r")
+            self.assertEqual(segments[0].split("|")[9], str(index))
+            self.assertNotEqual(segments[1], f"PID|{os.getpid()}")
+            self.assertEqual(result.processed_audit_text, "PidTransformer transformation applied for SENDING_APP: 252")
+            self.assertIn("transform", result.timings)
+
+    def test_processes_must_be_positive(self) -> None:
+        with self.assertRaises(ValueError):
+            TransformerWorkerPool(PidTransformer(), processes=0)
+
+
+class TestProcessMessageBatchInWorkers(unittest.TestCase):
+    def setUp(self) -> None:
+        self.pool = MagicMock()
+        self.sender = MagicMock()
+        self.sender.build_message.side_effect = lambda er7, props: (er7, props)
+        self.event_logger = MagicMock()
+
+    def _process(self, messages: list[MagicMock], raise_poison_errors: bool = False) -> int:
+        return process_message_batch_in_workers(
+            messages,
+            self.pool,
+            sender_client=self.sender,
+            event_logger=self.event_logger,
+            transformer_display_name="PidTransformer",
+            received_audit_text="Test received",
+            failed_audit_text="Test failed",
+            raise_poison_errors=raise_poison_errors,
+        )
+
+    def test_results_are_published_in_received_order(self) -> None:
+        self.pool.submit.side_effect = [
+            _done(WorkerResult("OUT|1", "audit 1", {"parse": 0.1})),
+            _done(WorkerResult("OUT|2", "audit 2", {"parse": 0.2})),
+        ]
+
+        self.assertEqual(self._process([_message("1"), _message("2")]), 2)
+
+        self.assertEqual(
+            [c.args[0] for c in self.pool.submit.call_args_list], [MESSAGE_BODY.format(1), MESSAGE_BODY.format(2)]
+        )
+        self.sender.send_message_batch.assert_called_once_with(
+            [("OUT|1", {"CorrelationId": "1"}), ("OUT|2", {"CorrelationId": "2"})],
+            retry_transient_errors=True,
+            on_sub_batch_sent=ANY,
+        )
+        self.assertEqual(
+            [c.args[1] for c in self.event_logger.log_message_processed.call_args_list], ["audit 1", "audit 2"]
+        )
+
+    def test_first_failure_stops_the_batch_and_cancels_the_rest(self) -> None:
+        pending: Future = Future()
+        self.pool.submit.side_effect = [
+            _done(WorkerResult("OUT|1", "audit 1", {})),
+            _done(ValueError("invalid message")),
+            pending,
+        ]
+
+        self.assertEqual(self._process([_message("1"), _message("BAD"), _message("3")]), 1)
+
+        self.assertTrue(pending.cancelled())
+        self.sender.send_message_batch.assert_called_once_with(
+            [("OUT|1", {"CorrelationId": "1"})], retry_transient_errors=True, on_sub_batch_sent=ANY
+        )
+        self.event_logger.log_message_failed.assert_called_once()
+        self.assertEqual(self.event_logger.log_message_received.call_count, 2)
+
+    def test_transform_failure_is_a_poison_error_but_a_dead_worker_is_not(self) -> None:
+        self.pool.submit.side_effect = [_done(WorkerResult("OUT|1", "audit 1", {})), _done(ValueError("invalid"))]
+        with self.assertRaises(PoisonMessageError) as raised:
+            self._process([_message("1"), _message("BAD")], raise_poison_errors=True)
+        self.assertEqual(raised.exception.handled, 1)
+
+        self.pool.submit.side_effect = [_done(BrokenProcessPool("worker died"))]
+        self.assertEqual(self._process([_message("1")], raise_poison_errors=True), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,50 @@
 from .app_config import AppConfig, TransformerConfig
-from .base_transformer import BaseTransformer
-from .message_processor import process_message
+from .base_transformer import BaseTransformer, load_transformer
+from .er7_mapping import (
+    CopyFields,
+    DefaultField,
+    FieldChange,
+    MapField,
+    MappingPlan,
+    MappingResult,
+    MessageMapping,
+    SegmentMapping,
+    compile_mapping,
+)
+from .fused_transformer import FusedTransformer, FusedTransformError
+from .message_processor import (
+    process_context,
+    process_message,
+    process_message_batch,
+    process_message_batch_in_workers,
+)
 from .run_transformer import run_transformer_app
+from .transform_context import TransformContext
+from .worker_pool import TransformerWorkerPool, WorkerResult
 
 __all__ = [
     "AppConfig",
     "TransformerConfig",
     "BaseTransformer",
+    "FusedTransformer",
+    "FusedTransformError",
+    "load_transformer",
     "run_transformer_app",
+    "process_context",
     "process_message",
+    "process_message_batch",
+    "process_message_batch_in_workers",
+    "TransformContext",
+    "TransformerWorkerPool",
+    "WorkerResult",
+    "CopyFields",
+    "DefaultField",
+    "FieldChange",
+    "MapField",
+    "MappingPlan",
+    "MappingResult",
+    "MessageMapping",
+    "SegmentMapping",
+    "compile_mapping",
 ]
 
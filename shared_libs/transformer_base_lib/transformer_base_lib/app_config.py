@@ -42,6 +42,9 @@ class AppConfig:
 @dataclass
 class TransformerConfig(AppConfig):
     MAX_BATCH_SIZE: int
+    BATCH_PUBLISH: bool = False
+    WORKER_PROCESSES: int = 1
+    MAX_DELIVERY_ATTEMPTS: int = 0
 
     @classmethod
     def from_env_and_config_file(cls, config_path: str) -> "TransformerConfig":
@@ -69,7 +72,51 @@ class TransformerConfig(AppConfig):
                 "MAX_BATCH_SIZE not found in config file, using default value of 1"
             )
 
-        return cls(**asdict(app_config), MAX_BATCH_SIZE=MAX_BATCH_SIZE)
+        BATCH_PUBLISH = False
+        if config.has_option("DEFAULT", "BATCH_PUBLISH"):
+            try:
+                BATCH_PUBLISH = config.getboolean("DEFAULT", "BATCH_PUBLISH")
+                logger.debug(f"BATCH_PUBLISH set to {BATCH_PUBLISH} from config file")
+            except ValueError as e:
+                logger.warning(
+                    f"Failed to parse BATCH_PUBLISH from config file, publishing messages one at a time: {e}"
+                )
+
+        WORKER_PROCESSES = 1
+        if config.has_option("DEFAULT", "WORKER_PROCESSES"):
+            try:
+                WORKER_PROCESSES = config.getint("DEFAULT", "WORKER_PROCESSES")
+                if WORKER_PROCESSES == 0:
+                    WORKER_PROCESSES = os.cpu_count() or 1
+                if WORKER_PROCESSES < 0:
+                    raise ValueError(f"expected 0 or more, got {WORKER_PROCESSES}")
+                logger.debug(f"WORKER_PROCESSES set to {WORKER_PROCESSES} from config file")
+            except ValueError as e:
+                WORKER_PROCESSES = 1
+                logger.warning(
+                    f"Failed to parse WORKER_PROCESSES from config file, transforming in-process: {e}"
+                )
+
+        MAX_DELIVERY_ATTEMPTS = 0
+        if config.has_option("DEFAULT", "MAX_DELIVERY_ATTEMPTS"):
+            try:
+                MAX_DELIVERY_ATTEMPTS = config.getint("DEFAULT", "MAX_DELIVERY_ATTEMPTS")
+                if MAX_DELIVERY_ATTEMPTS < 0:
+                    raise ValueError(f"expected 0 or more, got {MAX_DELIVERY_ATTEMPTS}")
+                logger.debug(f"MAX_DELIVERY_ATTEMPTS set to {MAX_DELIVERY_ATTEMPTS} from config file")
+            except ValueError as e:
+                MAX_DELIVERY_ATTEMPTS = 0
+                logger.warning(
+                    f"Failed to parse MAX_DELIVERY_ATTEMPTS from config file, not dead-lettering poison messages: {e}"
+                )
+
+        return cls(
+            **asdict(app_config),
+            MAX_BATCH_SIZE=MAX_BATCH_SIZE,
+            BATCH_PUBLISH=BATCH_PUBLISH,
+            WORKER_PROCESSES=WORKER_PROCESSES,
+            MAX_DELIVERY_ATTEMPTS=MAX_DELIVERY_ATTEMPTS,
+        )
 
 
 def _read_env(name: str, required: bool = False) -> str | None:
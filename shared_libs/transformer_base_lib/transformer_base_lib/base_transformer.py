@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import importlib
 import os
 from abc import ABC, abstractmethod
 from typing import Optional
@@ -11,8 +12,13 @@ class BaseTransformer(ABC):
     """Abstract base class for HL7 transformers.
 
     Provides a standardised interface for creating HL7 message transformers.
+
+    Set ``find_groups = False`` on a subclass whose mappers read segments directly from the message root;
+    the incoming message is then parsed flat, skipping hl7apy's group resolution.
     """
 
+    find_groups: bool = True
+
     def __init__(self, transformer_name: str, config_path: Optional[str] = None):
         self.transformer_name = transformer_name
         self.config_path = config_path or self._get_default_config_path()
@@ -42,3 +48,14 @@ class BaseTransformer(ABC):
         from .run_transformer import run_transformer_app  # noqa: PLC0415
 
         run_transformer_app(self)
+
+
+def load_transformer(spec: str) -> BaseTransformer:
+    """Import and instantiate a transformer named as ``package.module:ClassName``."""
+    module_name, _, class_name = spec.partition(":")
+    if not module_name or not class_name:
+        raise ValueError(f"Transformer must be given as 'package.module:ClassName', not '{spec}'")
+    transformer = getattr(importlib.import_module(module_name), class_name)()
+    if not isinstance(transformer, BaseTransformer):
+        raise ValueError(f"'{spec}' is not a BaseTransformer")
+    return transformer
@@ -0,0 +1,363 @@
+"""
+Declarative ER7-to-ER7 message mappings.
+
+A mapping is described with dataclasses (which segments to map, which fields to copy, transform or default)
+and compiled once into a MappingPlan. The plan rewrites the ER7 text directly: the message is split into
+segments and fields, and no hl7apy tree is built for the input or the output.
+
+Copied values are normalised the way hl7apy serialises them, so a plan produces the same ER7 as a mapper
+that copies the same fields between hl7apy messages: whitespace-only values are dropped and trailing empty
+components (and sub-components of composite components) are removed from composite fields, while primitive
+and ``varies`` fields are copied verbatim. The composite/primitive shape of every field is read from the
+hl7apy reference for the mapping's version when the plan is compiled.
+"""
+
+import fnmatch
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
+
+from hl7apy import load_reference
+from hl7apy.core import Message, Segment
+from hl7apy.exceptions import ChildNotFound
+from hl7apy.parser import parse_segment
+
+# None is a primitive (or unknown) element, a tuple holds the shapes of a composite element's children.
+Shape = Optional[Tuple["Shape", ...]]
+
+SEGMENT_SEPARATOR = "\r"
+DEFAULT_ENCODING_CHARACTERS = "^~\\&"
+# Unmapped segment names come from the incoming messages, so the compiled pass-through segments are bounded.
+PASS_THROUGH_CACHE_SIZE = 128
+
+
+@dataclass(frozen=True)
+class CopyFields:
+    """
+    Copy fields ``start`` to ``end`` (inclusive, or to the last field when ``end`` is None).
+
+    With ``keep_empty``, a field that is present in the input but normalises to an empty value still counts
+    towards the segment's length, as when hl7apy copies fields one by one. Without it, trailing empty fields are
+    dropped, as when a whole hl7apy segment is copied.
+
+    With ``duplicate_repetitions``, a field with n repetitions is written n times over, as when every repetition of
+    an hl7apy field is added once for each of its repetitions.
+    """
+
+    start: int
+    end: Optional[int] = None
+    keep_empty: bool = True
+    duplicate_repetitions: bool = False
+
+
+@dataclass(frozen=True)
+class MapField:
+    """
+    Replace a field with ``transform`` applied to the first component of its first repetition.
+
+    Blank source values are not transformed; the field is set from ``default`` instead when one is given.
+    """
+
+    field: int
+    transform: Callable[[str], str]
+    default: Optional[Callable[[], str]] = None
+
+
+@dataclass(frozen=True)
+class DefaultField:
+    """Set a field to ``value`` when the mapped output would otherwise leave it empty."""
+
+    field: int
+    value: str
+
+
+FieldRule = Union[CopyFields, MapField, DefaultField]
+
+
+@dataclass(frozen=True)
+class SegmentMapping:
+    """
+    Rules for the first occurrence of a segment; further occurrences are dropped.
+
+    The default copies every field. MSH-1 and MSH-2 are always taken from the input message.
+    """
+
+    segment: str
+    rules: Tuple[FieldRule, ...] = (CopyFields(1),)
+
+
+@dataclass(frozen=True)
+class MessageMapping:
+    """
+    A whole-message mapping.
+
+    Mapped segments are written first, in the order given (MSH must be first). Unmapped segments are then
+    copied in input order with ``pass_through_rules`` when ``pass_through`` is set, except those matching a
+    ``drop_segments`` pattern (fnmatch syntax, e.g. ``"Z*"``).
+    """
+
+    version: str
+    segments: Tuple[SegmentMapping, ...]
+    pass_through: bool = True
+    drop_segments: Tuple[str, ...] = ()
+    pass_through_rules: Tuple[FieldRule, ...] = (CopyFields(1),)
+
+
+@dataclass(frozen=True)
+class FieldChange:
+    segment: str
+    field: int
+    original: str
+    transformed: str
+
+
+@dataclass(frozen=True)
+class MappingResult:
+    er7: str
+    changes: Tuple[FieldChange, ...] = field(default_factory=tuple)
+
+
+@dataclass(frozen=True)
+class _Separators:
+    field: str
+    component: str
+    repetition: str
+    subcomponent: str
+
+
+def _shape_from_reference(reference: Tuple) -> Shape:
+    if reference[0] != "sequence":
+        return None
+    return tuple(_shape_from_reference(child[1]) for child in reference[1])
+
+
+@lru_cache(maxsize=256)
+def _segment_shapes(segment: str, version: str) -> Tuple[Shape, ...]:
+    """Shapes of the segment's fields, indexed from field 1; unknown segments have no shapes (copied verbatim)."""
+    try:
+        reference = load_reference(segment, "Segment", version)
+    except ChildNotFound:
+        return ()
+    return tuple(_shape_from_reference(child[1]) for child in reference[1])
+
+
+def _strip_trailing(parts: List[str]) -> List[str]:
+    while parts and not parts[-1]:
+        parts.pop()
+    return parts
+
+
+def _normalise_component(value: str, shape: Shape, separators: _Separators) -> str:
+    if not value.strip():
+        return ""
+    if shape is None or separators.subcomponent not in value:
+        return value
+    parts = [part if part.strip() else "" for part in value.split(separators.subcomponent)]
+    return separators.subcomponent.join(_strip_trailing(parts))
+
+
+def _normalise_repetition(value: str, shape: Tuple[Shape, ...], separators: _Separators) -> str:
+    components = value.split(separators.component)
+    normalised = [
+        _normalise_component(component, shape[index] if index < len(shape) else None, separators)
+        for index, component in enumerate(components)
+    ]
+    return separators.component.join(_strip_trailing(normalised))
+
+
+def _normalise_field(value: str, shape: Shape, separators: _Separators) -> str:
+    if not value.strip():
+        return ""
+    if shape is None:
+        return value
+    if (
+        separators.component not in value
+        and separators.repetition not in value
+        and separators.subcomponent not in value
+    ):
+        return value
+    return separators.repetition.join(
+        _normalise_repetition(repetition, shape, separators) for repetition in value.split(separators.repetition)
+    )
+
+
+def _parse_segment(er7: str, version: str, encoding_chars: Dict[str, str]) -> Segment:
+    # parse_segment leaves out trailing empty fields, which a mapped segment keeps as present.
+    segment = parse_segment(er7, version=version, encoding_chars=encoding_chars)
+    held = max((int(child.name.rsplit("_", 1)[1]) for child in segment.children if child.name), default=0)
+    # MSH-1 is the field separator itself, so MSH holds one more field than it has separators.
+    fields = er7.count(encoding_chars["FIELD"]) + (1 if segment.name == "MSH" else 0)
+    for index in range(held + 1, fields + 1):
+        segment.add_field(f"{segment.name.lower()}_{index}")
+    return segment
+
+
+def _first_component(value: str, separators: _Separators) -> str:
+    return value.split(separators.repetition, 1)[0].split(separators.component, 1)[0]
+
+
+class _CompiledSegment:
+    def __init__(self, mapping: SegmentMapping, version: str) -> None:
+        self.name = mapping.segment
+        self.rules = mapping.rules
+        self.shapes = _segment_shapes(mapping.segment, version)
+
+    def _shape(self, index: int) -> Shape:
+        return self.shapes[index - 1] if index <= len(self.shapes) else None
+
+    def apply(
+        self, fields: List[str], separators: _Separators, changes: List[FieldChange], from_hl7apy: bool = False
+    ) -> List[str]:
+        first_field = 3 if self.name == "MSH" else 1
+        output: Dict[int, str] = {}
+        # Fields that count towards the segment's length; trailing fields outside this set are dropped.
+        present: Set[int] = set()
+        for rule in self.rules:
+            if isinstance(rule, CopyFields):
+                end = len(fields) - 1 if rule.end is None else min(rule.end, len(fields) - 1)
+                for index in range(max(rule.start, first_field), end + 1):
+                    value = fields[index]
+                    if value.strip() or from_hl7apy:
+                        normalised = _normalise_field(value, self._shape(index), separators)
+                        if rule.duplicate_repetitions and separators.repetition in value:
+                            repetitions = value.count(separators.repetition) + 1
+                            normalised = separators.repetition.join([normalised] * repetitions)
+                        output[index] = normalised
+                        if normalised or rule.keep_empty:
+                            present.add(index)
+                        else:
+                            present.discard(index)
+                    else:
+                        output.pop(index, None)
+                        present.discard(index)
+            elif isinstance(rule, MapField):
+                source = fields[rule.field] if rule.field < len(fields) else ""
+                original = _first_component(source, separators)
+                if original.strip():
+                    transformed = rule.transform(original)
+                    output[rule.field] = transformed
+                    present.add(rule.field)
+                    changes.append(FieldChange(self.name, rule.field, original, transformed))
+                elif rule.default is not None:
+                    output[rule.field] = rule.default()
+                    present.add(rule.field)
+            elif not output.get(rule.field):
+                output[rule.field] = rule.value
+                present.add(rule.field)
+
+        last = max(present, default=0)
+        if self.name == "MSH":
+            return [self.name, separators.field, fields[2]] + [output.get(index, "") for index in range(3, last + 1)]
+        return [self.name] + [output.get(index, "") for index in range(1, last + 1)]
+
+
+class MappingPlan:
+    """A compiled MessageMapping; apply() rewrites ER7 messages and is safe to share between threads."""
+
+    def __init__(self, mapping: MessageMapping) -> None:
+        if not mapping.segments or mapping.segments[0].segment != "MSH":
+            raise ValueError("A message mapping must map MSH first")
+        names = [segment.segment for segment in mapping.segments]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Segments mapped more than once: {', '.join(sorted(set(names)))}")
+
+        self.mapping = mapping
+        self._segments = [_CompiledSegment(segment, mapping.version) for segment in mapping.segments]
+        self._mapped_names = frozenset(names)
+        self._drop_patterns = mapping.drop_segments
+        # Unmapped segment names are only known once seen, so they are compiled on first use and kept in an LRU.
+        self._pass_through = lru_cache(maxsize=PASS_THROUGH_CACHE_SIZE)(self._compile_pass_through)
+
+    def _compile_pass_through(self, name: str) -> Optional[_CompiledSegment]:
+        if any(fnmatch.fnmatchcase(name, pattern) for pattern in self._drop_patterns):
+            return None
+        return _CompiledSegment(SegmentMapping(name, self.mapping.pass_through_rules), self.mapping.version)
+
+    def apply(self, er7: str, from_hl7apy: bool = False) -> MappingResult:
+        """
+        Map one ER7 message.
+
+        Args:
+            er7: The input message with '\\r' segment separators
+            from_hl7apy: The message was serialised from a parsed hl7apy message. Its segments are not stripped
+                again, and every field it holds counts as present, since hl7apy only serialises the fields it holds.
+
+        Returns:
+            The mapped ER7 (with the input's encoding characters) and the field transformations applied
+
+        Raises:
+            ValueError: If the message does not start with an MSH segment, or a field transform rejects a value
+        """
+        segments = [
+            segment if from_hl7apy else segment.strip()
+            for segment in er7.lstrip().split(SEGMENT_SEPARATOR)
+            if segment.strip()
+        ]
+        if not segments or not segments[0].startswith("MSH") or len(segments[0]) < 4:
+            raise ValueError("Message does not start with an MSH segment")
+
+        field_separator = segments[0][3]
+        encoding = segments[0][4:].split(field_separator, 1)[0]
+        encoding += DEFAULT_ENCODING_CHARACTERS[len(encoding):]
+        separators = _Separators(field_separator, encoding[0], encoding[1], encoding[3])
+
+        first_occurrence: Dict[str, List[str]] = {}
+        unmapped: List[List[str]] = []
+        for segment in segments:
+            fields = segment.split(field_separator)
+            name = fields[0]
+            if name == "MSH":
+                fields = [name, field_separator] + fields[1:]
+            if name in self._mapped_names:
+                first_occurrence.setdefault(name, fields)
+            elif self.mapping.pass_through:
+                unmapped.append(fields)
+
+        changes: List[FieldChange] = []
+        output: List[str] = []
+        for compiled in self._segments:
+            if compiled.name in first_occurrence:
+                output.append(
+                    self._join(
+                        compiled.apply(first_occurrence[compiled.name], separators, changes, from_hl7apy), separators
+                    )
+                )
+
+        for fields in unmapped:
+            compiled_pass_through = self._pass_through(fields[0])
+            if compiled_pass_through is not None:
+                output.append(
+                    self._join(compiled_pass_through.apply(fields, separators, changes, from_hl7apy), separators)
+                )
+
+        return MappingResult(SEGMENT_SEPARATOR.join(output), tuple(changes))
+
+    def map_message(self, hl7_msg: Message) -> Tuple[Message, Tuple[FieldChange, ...]]:
+        """
+        Map a parsed hl7apy message, for transformers whose transform_message returns one.
+
+        Returns:
+            A new message that serialises to the mapped ER7, and the field transformations applied
+
+        Raises:
+            ValueError: If the message does not start with an MSH segment, or a field transform rejects a value
+        """
+        result = self.apply(hl7_msg.to_er7(), from_hl7apy=True)
+        encoding_chars = hl7_msg.encoding_chars
+        message = Message(version=self.mapping.version, encoding_chars=encoding_chars)
+        segments = result.er7.split(SEGMENT_SEPARATOR)
+        message.msh = _parse_segment(segments[0], self.mapping.version, encoding_chars)
+        for segment in segments[1:]:
+            message.add(_parse_segment(segment, self.mapping.version, encoding_chars))
+        return message, result.changes
+
+    @staticmethod
+    def _join(fields: List[str], separators: _Separators) -> str:
+        if fields[0] == "MSH":
+            return "MSH" + separators.field + separators.field.join(fields[2:])
+        return separators.field.join(fields)
+
+
+def compile_mapping(mapping: MessageMapping) -> MappingPlan:
+    """Compile a MessageMapping into a reusable MappingPlan."""
+    return MappingPlan(mapping)
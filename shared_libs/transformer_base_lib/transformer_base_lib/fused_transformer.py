@@ -0,0 +1,90 @@
+import logging
+import threading
+from typing import Optional
+
+from event_logger_lib import EventLogger
+from hl7apy.core import Message
+from message_bus_lib.message_sender_client import MessageSenderClient
+
+from .base_transformer import BaseTransformer, load_transformer
+from .message_processor import process_context
+from .transform_context import TransformContext
+
+logger = logging.getLogger(__name__)
+
+
+class FusedTransformError(Exception):
+    """Raised when a fused transformer could not transform or publish a message."""
+
+
+class FusedTransformer:
+    """
+    Runs a transformer inside another service, such as the HL7 server, in place of the transformer service.
+
+    Each message is transformed and the output sent exactly as process_message does it, with the same audit
+    events under the transformer's own microservice id. The caller passes the message body and properties it
+    would otherwise have published for the transformer to receive, so one broker hop is skipped. A message the
+    caller has already parsed flat is reused by transformers that also parse flat.
+
+    The transformer is shared by every caller thread and keeps per-message state for its audit text, so
+    messages are transformed one at a time, as in the transformer service.
+    """
+
+    def __init__(self, transformer: BaseTransformer, event_logger: EventLogger) -> None:
+        self.transformer = transformer
+        self.event_logger = event_logger
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, spec: str, workflow_id: str, microservice_id: str) -> "FusedTransformer":
+        """Load the transformer named as ``package.module:ClassName``, auditing as ``microservice_id``."""
+        return cls(load_transformer(spec), EventLogger(workflow_id, microservice_id))
+
+    @property
+    def name(self) -> str:
+        return self.transformer.transformer_name
+
+    def transform_and_send(
+        self,
+        body: str,
+        properties: dict[str, str],
+        sender_client: MessageSenderClient,
+        flat_message: Optional[Message] = None,
+        message_id: Optional[str] = None,
+    ) -> None:
+        """
+        Transform one message and send the output with ``properties``.
+
+        Args:
+            body: The ER7 message
+            properties: Tracking and routing properties, as the transformer service would have received them
+            sender_client: Client for the transformer's egress
+            flat_message: ``body`` already parsed with ``find_groups=False``, if the caller has it
+            message_id: Service Bus message id for the output, as the caller would have sent the original with
+
+        Raises:
+            FusedTransformError: If the message could not be transformed or sent. The transformer's failure audit
+                event has already been written.
+        """
+        transformer = self.transformer
+        context = TransformContext(
+            body,
+            properties,
+            find_groups=transformer.find_groups,
+            input_message=None if transformer.find_groups else flat_message,
+        )
+        with self._lock:
+            sent = process_context(
+                context,
+                sender_client,
+                self.event_logger,
+                transformer.transform_message,
+                transformer.transformer_name,
+                transformer.get_received_audit_text(),
+                transformer.get_processed_audit_text,
+                f"{transformer.transformer_name} transformation failed",
+                message_id=message_id,
+            )
+        if not sent:
+            raise FusedTransformError(f"{transformer.transformer_name} transformation failed")
+        logger.debug("Fused %s stage timings: %s", transformer.transformer_name, context.format_timings())
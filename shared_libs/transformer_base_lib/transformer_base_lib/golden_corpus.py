@@ -0,0 +1,405 @@
+"""
+Golden-corpus equivalence and performance harness for transformers.
+
+Run from a transformer directory, naming the transformer class and the corpus files or directories:
+
+    python -m transformer_base_lib.golden_corpus hl7_phw_transformer.phw_transformer:PhwTransformer \\
+        tests/corpus --variants 20 --golden tests/golden
+
+Each message is parsed, transformed and serialised the way the Service Bus loop does it. The output ER7 is
+compared to the golden file stored for that message, and the command exits non-zero if any output differs or
+has no golden file. Per-message latency percentiles, messages per second, peak traced memory and the memory blocks
+each message holds allocated are reported as well. ``--update-golden`` rewrites the golden files after an
+intentional change to the output.
+"""
+
+import argparse
+import logging
+import math
+import random
+import string
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .base_transformer import BaseTransformer, load_transformer
+from .transform_context import TransformContext
+
+logger = logging.getLogger(__name__)
+
+CORPUS_PATTERN = "*.hl7"
+ERROR_PREFIX = "ERROR "
+DEFAULT_REPEAT = 3
+PERCENTILES = (50, 90, 99)
+
+# Identifiers, names and addresses that vary between real messages: (segment, field, component). Changing them
+# keeps a message's structure, so every variant exercises the same mappings with different values.
+VARIANT_COMPONENTS = (
+    ("MSH", 10, 1),
+    ("PID", 2, 1),
+    ("PID", 3, 1),
+    ("PID", 5, 1),
+    ("PID", 5, 2),
+    ("PID", 5, 3),
+    ("PID", 11, 1),
+    ("PID", 11, 2),
+    ("PID", 11, 3),
+    ("PID", 11, 5),
+    ("PID", 13, 1),
+)
+
+_CHARACTER_KINDS = (string.digits, string.ascii_uppercase, string.ascii_lowercase)
+
+PathLike = Union[str, Path]
+
+
+@dataclass(frozen=True)
+class CorpusMessage:
+    name: str
+    er7: str
+
+
+@dataclass(frozen=True)
+class GoldenMismatch:
+    name: str
+    expected: Optional[str]
+    actual: str
+
+    @property
+    def description(self) -> str:
+        if self.expected is None:
+            return f"{self.name}: no golden output"
+        expected_segments = self.expected.split("\r")
+        actual_segments = self.actual.split("\r")
+        for index in range(max(len(expected_segments), len(actual_segments))):
+            expected = expected_segments[index] if index < len(expected_segments) else "<missing>"
+            actual = actual_segments[index] if index < len(actual_segments) else "<missing>"
+            if expected != actual:
+                return f"{self.name}: segment {index + 1} differs\n  expected: {expected}\n  actual:   {actual}"
+        return f"{self.name}: output differs"
+
+
+@dataclass(frozen=True)
+class CorpusReport:
+    messages: int
+    seconds: float
+    latencies: Tuple[float, ...]
+    stage_seconds: Dict[str, float]
+    peak_memory_bytes: int
+    allocated_blocks: int = 0
+    mismatches: Tuple[GoldenMismatch, ...] = ()
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.messages / self.seconds if self.seconds > 0 else 0.0
+
+    def latency_percentile(self, percentile: float) -> float:
+        """Nearest-rank percentile of the per-message latencies, in seconds."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        rank = max(1, math.ceil(percentile / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+
+def _normalise_er7(text: str) -> str:
+    # Corpus and golden files are kept with one segment per line, so they diff and review like any text file.
+    return "\r".join(line for line in text.replace("\r\n", "\n").replace("\r", "\n").split("\n") if line.strip())
+
+
+def load_corpus(paths: Iterable[PathLike], pattern: str = CORPUS_PATTERN) -> List[CorpusMessage]:
+    """
+    Load one message per file from the given files, and from the files matching ``pattern`` in given directories.
+
+    Messages are named after their file without the final suffix and returned in path order.
+    """
+    files: List[Path] = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.glob(pattern)) if path.is_dir() else [path])
+    return [CorpusMessage(name=file.stem, er7=_normalise_er7(file.read_text(encoding="utf-8"))) for file in files]
+
+
+def _scramble(value: str, rng: random.Random) -> str:
+    characters = []
+    for character in value:
+        kind = next((kind for kind in _CHARACTER_KINDS if character in kind), None)
+        characters.append(rng.choice(kind) if kind else character)
+    return "".join(characters)
+
+
+def _variant(er7: str, rng: random.Random) -> str:
+    segments = er7.split("\r")
+    if not segments[0].startswith("MSH") or len(segments[0]) < 8:
+        return er7
+    field_separator = segments[0][3]
+    component_separator, repetition_separator, escape_character = segments[0][4], segments[0][5], segments[0][6]
+
+    for index, segment in enumerate(segments):
+        fields = segment.split(field_separator)
+        for segment_name, field_number, component_number in VARIANT_COMPONENTS:
+            # MSH-1 is the field separator itself, so MSH field numbers are one ahead of their split index.
+            field_index = field_number - 1 if segment_name == "MSH" else field_number
+            if fields[0] != segment_name or field_index >= len(fields):
+                continue
+            repetitions = fields[field_index].split(repetition_separator)
+            for repetition_index, repetition in enumerate(repetitions):
+                components = repetition.split(component_separator)
+                if component_number > len(components):
+                    continue
+                component = components[component_number - 1]
+                # Escape sequences and explicit nulls ("") keep their meaning only if left as they are.
+                if escape_character not in component and component != '""':
+                    components[component_number - 1] = _scramble(component, rng)
+                repetitions[repetition_index] = component_separator.join(components)
+            fields[field_index] = repetition_separator.join(repetitions)
+        segments[index] = field_separator.join(fields)
+    return "\r".join(segments)
+
+
+def generate_variants(messages: Iterable[CorpusMessage], count: int, seed: int = 0) -> List[CorpusMessage]:
+    """
+    Generate ``count`` variants of each message, with new values in the VARIANT_COMPONENTS.
+
+    Digits and letters are replaced by random characters of the same kind, so lengths and formats are kept.
+    The same message, count and seed always give the same variants, named ``<name>.v01``, ``<name>.v02``, ...
+    """
+    variants = []
+    for message in messages:
+        for number in range(1, count + 1):
+            rng = random.Random(f"{message.name}:{seed}:{number}")
+            variants.append(CorpusMessage(name=f"{message.name}.v{number:02d}", er7=_variant(message.er7, rng)))
+    return variants
+
+
+def transform_er7(transformer: BaseTransformer, er7: str) -> Tuple[str, Dict[str, float]]:
+    """
+    Parse, transform and serialise one message as the Service Bus loop does.
+
+    Returns the output ER7, or ``ERROR <type>: <message>`` if the transformer raises, with the stage timings.
+    Failures are part of a transformer's behaviour, so they are compared to the golden output like any other.
+    """
+    context, output = _transform_context(transformer, er7)
+    return output, context.timings
+
+
+def _transform_context(transformer: BaseTransformer, er7: str) -> Tuple[TransformContext, str]:
+    context = TransformContext(er7, find_groups=transformer.find_groups)
+    try:
+        hl7_msg = context.input_message
+        with context.timed("transform"):
+            context.output_message = transformer.transform_message(hl7_msg)
+        return context, context.output_er7
+    except Exception as e:
+        return context, f"{ERROR_PREFIX}{type(e).__name__}: {e}"
+
+
+def _golden_path(golden_dir: Path, name: str) -> Path:
+    return golden_dir / f"{name}.hl7"
+
+
+def _mask_fields(er7: str, ignore_fields: Sequence[str]) -> str:
+    if not ignore_fields or er7.startswith(ERROR_PREFIX):
+        return er7
+    ignored: Dict[str, List[int]] = {}
+    for key in ignore_fields:
+        segment_name, _, number = key.partition(".")
+        ignored.setdefault(segment_name, []).append(int(number))
+
+    field_separator = er7[3]
+    segments = er7.split("\r")
+    for index, segment in enumerate(segments):
+        fields = segment.split(field_separator)
+        for field_number in ignored.get(fields[0], []):
+            field_index = field_number - 1 if fields[0] == "MSH" else field_number
+            if field_index < len(fields):
+                fields[field_index] = ""
+        segments[index] = field_separator.join(fields)
+    return "\r".join(segments)
+
+
+def read_golden(golden_dir: PathLike, name: str) -> Optional[str]:
+    path = _golden_path(Path(golden_dir), name)
+    if not path.is_file():
+        return None
+    text = path.read_text(encoding="utf-8")
+    return text.strip() if text.startswith(ERROR_PREFIX) else _normalise_er7(text)
+
+
+def write_golden(golden_dir: PathLike, name: str, output: str) -> None:
+    path = _golden_path(Path(golden_dir), name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(output.replace("\r", "\n") + "\n", encoding="utf-8")
+
+
+def compare_to_golden(
+    outputs: Dict[str, str], golden_dir: PathLike, ignore_fields: Sequence[str] = ()
+) -> List[GoldenMismatch]:
+    """
+    Compare transformer outputs, keyed by message name, to the golden files in ``golden_dir``.
+
+    Args:
+        outputs: Output ER7 (or ERROR text) per message name
+        golden_dir: Directory holding ``<name>.hl7`` golden files
+        ignore_fields: Fields blanked on both sides before comparing, as ``SEG.N`` (e.g. ``MSH.7`` when inputs
+            carry no timestamp and hl7apy stamps the current time)
+
+    Returns:
+        The messages whose output differs or has no golden file, in ``outputs`` order
+    """
+    mismatches = []
+    for name, actual in outputs.items():
+        expected = read_golden(golden_dir, name)
+        if expected is None or _mask_fields(expected, ignore_fields) != _mask_fields(actual, ignore_fields):
+            mismatches.append(GoldenMismatch(name, expected, actual))
+    return mismatches
+
+
+def _measure_memory(transformer: BaseTransformer, messages: Sequence[CorpusMessage]) -> Tuple[int, int]:
+    """
+    Return the most memory traced while transforming one message, and the most memory blocks allocated for one.
+
+    The blocks are counted from a snapshot's statistics once the message is serialised, while its input and output
+    messages are still held, so they count the objects a message takes rather than the temporaries freed on the way.
+    """
+    tracemalloc.start()
+    try:
+        peak = blocks = 0
+        for message in messages:
+            tracemalloc.reset_peak()
+            context, _ = _transform_context(transformer, message.er7)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            statistics = tracemalloc.take_snapshot().statistics("filename")
+            blocks = max(blocks, sum(statistic.count for statistic in statistics))
+            del context
+        return peak, blocks
+    finally:
+        tracemalloc.stop()
+
+
+def run_corpus(
+    transformer: BaseTransformer,
+    messages: Sequence[CorpusMessage],
+    golden_dir: Optional[PathLike] = None,
+    repeat: int = DEFAULT_REPEAT,
+    ignore_fields: Sequence[str] = (),
+    update_golden: bool = False,
+) -> CorpusReport:
+    """
+    Transform every message, compare the outputs to the golden files and measure performance.
+
+    The first pass is untimed, so hl7apy's reference tables and other one-off caches are excluded, and its
+    outputs are the ones compared. Each message's latency is the fastest of ``repeat`` timed passes.
+
+    Args:
+        transformer: Transformer under test
+        messages: Corpus from load_corpus and generate_variants
+        golden_dir: Directory of golden outputs; outputs are not compared when None
+        repeat: Timed passes over the corpus
+        ignore_fields: Fields left out of the comparison, see compare_to_golden
+        update_golden: Write the outputs to ``golden_dir`` instead of comparing them
+
+    Returns:
+        A CorpusReport; its mismatches are empty when every output matches
+    """
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1")
+    names = [message.name for message in messages]
+    if len(set(names)) != len(names):
+        raise ValueError("Corpus message names must be unique")
+
+    outputs = {message.name: transform_er7(transformer, message.er7)[0] for message in messages}
+
+    mismatches: List[GoldenMismatch] = []
+    if golden_dir is not None:
+        if update_golden:
+            for name, output in outputs.items():
+                write_golden(golden_dir, name, output)
+            logger.info("Golden outputs for %d message(s) written to %s", len(outputs), golden_dir)
+        else:
+            mismatches = compare_to_golden(outputs, golden_dir, ignore_fields)
+
+    latencies = [math.inf] * len(messages)
+    best_pass = math.inf
+    best_stages: Dict[str, float] = {}
+    for _ in range(repeat):
+        stages: Dict[str, float] = {}
+        pass_start = time.perf_counter()
+        for index, message in enumerate(messages):
+            start = time.perf_counter()
+            _, timings = transform_er7(transformer, message.er7)
+            latencies[index] = min(latencies[index], time.perf_counter() - start)
+            for stage, seconds in timings.items():
+                stages[stage] = stages.get(stage, 0.0) + seconds
+        pass_seconds = time.perf_counter() - pass_start
+        if pass_seconds < best_pass:
+            best_pass, best_stages = pass_seconds, stages
+
+    peak_memory_bytes, allocated_blocks = _measure_memory(transformer, messages)
+    return CorpusReport(
+        messages=len(messages),
+        seconds=best_pass if messages else 0.0,
+        latencies=tuple(latencies),
+        stage_seconds=best_stages,
+        peak_memory_bytes=peak_memory_bytes,
+        allocated_blocks=allocated_blocks,
+        mismatches=tuple(mismatches),
+    )
+
+
+def format_report(report: CorpusReport) -> str:
+    lines = [
+        f"messages:      {report.messages}",
+        f"throughput:    {report.messages_per_second:.1f} msg/s",
+        "latency (ms):  "
+        + ", ".join(f"p{percentile}={report.latency_percentile(percentile) * 1000:.2f}" for percentile in PERCENTILES)
+        + f", max={max(report.latencies, default=0.0) * 1000:.2f}",
+        "stages (ms):   "
+        + ", ".join(f"{stage}={seconds * 1000:.1f}" for stage, seconds in report.stage_seconds.items()),
+        f"peak memory:   {report.peak_memory_bytes // 1024} KiB per message, "
+        f"{report.allocated_blocks} allocated blocks",
+    ]
+    return "\n".join(lines)
+
+
+def _parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("transformer", help="transformer class as package.module:ClassName")
+    parser.add_argument("corpus", nargs="+", type=Path, help="message files, or directories of *.hl7 files")
+    parser.add_argument("--golden", type=Path, help="directory of golden outputs to compare against")
+    parser.add_argument("--update-golden", action="store_true", help="write the outputs to --golden")
+    parser.add_argument("--variants", type=int, default=0, help="generated variants per corpus message")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed passes; the fastest is reported")
+    parser.add_argument(
+        "--ignore-field", action="append", default=[], metavar="SEG.N", help="field left out of the comparison"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    transformer = load_transformer(args.transformer)
+    messages = load_corpus(args.corpus)
+    messages += generate_variants(messages, args.variants, args.seed)
+    report = run_corpus(
+        transformer,
+        messages,
+        golden_dir=args.golden,
+        repeat=args.repeat,
+        ignore_fields=args.ignore_field,
+        update_golden=args.update_golden,
+    )
+    sys.stdout.write(format_report(report) + "\n")
+
+    for mismatch in report.mismatches:
+        logger.error(mismatch.description)
+    return 1 if report.mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
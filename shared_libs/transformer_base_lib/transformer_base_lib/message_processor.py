@@ -1,12 +1,17 @@
 import logging
-from typing import Callable
+import time
+from concurrent.futures import CancelledError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional, Sequence
 
 from azure.servicebus import ServiceBusMessage
 from event_logger_lib import EventLogger
 from hl7apy.core import Message
-from hl7apy.parser import parse_message
+from message_bus_lib.message_receiver_client import PoisonMessageError
 from message_bus_lib.message_sender_client import MessageSenderClient
-from message_bus_lib.metadata_utils import correlation_id_for_logger, extract_metadata, get_metadata_log_values
+
+from .transform_context import TransformContext
+from .worker_pool import TransformerWorkerPool
 
 logger = logging.getLogger(__name__)
 
@@ -20,60 +25,265 @@ def process_message(
     received_audit_text: str,
     processed_audit_text_builder: Callable[[Message], str],
     failed_audit_text: str,
+    find_groups: bool = True,
+    raise_poison_errors: bool = False,
 ) -> bool:
-    message_body = b"".join(message.body).decode("utf-8")
-    incoming_props: dict[str, str] | None = extract_metadata(message)
-    meta = get_metadata_log_values(incoming_props)
-    if incoming_props:
-        logger.info(
-            "Received message with metadata - CorrelationId: %s, WorkflowID: %s, SourceSystem: %s, "
-            "MessageReceivedAt: %s",
-            meta["correlation_id"],
-            meta["workflow_id"],
-            meta["source_system"],
-            meta["message_received_at"],
-        )
-    else:
-        logger.warning("No application_properties found on message")
+    context = TransformContext.from_service_bus_message(message, find_groups=find_groups)
+    return process_context(
+        context,
+        sender_client,
+        event_logger,
+        transform,
+        transformer_display_name,
+        received_audit_text,
+        processed_audit_text_builder,
+        failed_audit_text,
+        raise_poison_errors=raise_poison_errors,
+    )
+
+
+def process_context(
+    context: TransformContext,
+    sender_client: MessageSenderClient,
+    event_logger: EventLogger,
+    transform: Callable[[Message], Message],
+    transformer_display_name: str,
+    received_audit_text: str,
+    processed_audit_text_builder: Callable[[Message], str],
+    failed_audit_text: str,
+    raise_poison_errors: bool = False,
+    message_id: Optional[str] = None,
+) -> bool:
+    """
+    Transform one message and send the output, writing the same audit events as process_message.
+
+    For callers that already hold the message body and its properties rather than a ServiceBusMessage.
 
-    correlation_id_opt = correlation_id_for_logger(meta)
+    With ``raise_poison_errors``, a message that cannot be parsed, transformed or serialised raises
+    PoisonMessageError once its failure is audited, so the receiver can dead-letter it. Other failures return False.
+    The output is sent with ``message_id``, if given, so Service Bus duplicate detection applies to it.
+    """
+    message_body = context.body
+    incoming_props = context.properties
+    _log_received_metadata(context)
+
+    correlation_id_opt = context.correlation_id
+    transforming = False
     try:
         event_logger.log_message_received(message_body, received_audit_text, correlation_id=correlation_id_opt)
 
-        hl7_msg = parse_message(message_body)
-        msh_segment = hl7_msg.msh
-        logger.debug(f"Message ID: {msh_segment.msh_10.value}")
-
-        transformed_hl7_message = transform(hl7_msg)
+        transforming = True
+        hl7_msg = _transform(context, transform)
+        output_er7 = context.output_er7
+        transforming = False
 
-        sender_client.send_message(transformed_hl7_message.to_er7(), custom_properties=incoming_props)
+        with context.timed("send"):
+            sender_client.send_text_message(output_er7, custom_properties=incoming_props, message_id=message_id)
 
         event_logger.log_message_processed(
-            transformed_hl7_message.to_er7(),
+            context.output_er7,
             processed_audit_text_builder(hl7_msg),
             correlation_id=correlation_id_opt,
         )
 
+        logger.debug("Message stage timings: %s", context.format_timings())
         return True
 
-    except ValueError as e:
-        error_msg = f"Failed to transform {transformer_display_name} message: {e}"
-        logger.error(error_msg)
+    except Exception as e:
+        _log_failure(context, e, event_logger, transformer_display_name, failed_audit_text)
+        if transforming and raise_poison_errors:
+            raise _poison_error(transformer_display_name, e) from e
+        return False
 
-        event_logger.log_message_failed(
-            message_body, error_msg, failed_audit_text, correlation_id=correlation_id_opt
-        )
 
-        return False
+def process_message_batch(
+    messages: Sequence[ServiceBusMessage],
+    sender_client: MessageSenderClient,
+    event_logger: EventLogger,
+    transform: Callable[[Message], Message],
+    transformer_display_name: str,
+    received_audit_text: str,
+    processed_audit_text_builder: Callable[[Message], str],
+    failed_audit_text: str,
+    find_groups: bool = True,
+    raise_poison_errors: bool = False,
+) -> int:
+    """
+    Transform a received batch in order and publish the outputs with one send_message_batch call.
+
+    Transformation stops at the first message that fails, as process_message would when called per message, and
+    only the messages before it are published. Returns the number of leading messages that were published, so
+    the caller can complete those and abandon the rest.
+
+    With ``raise_poison_errors``, a message that could not be transformed raises PoisonMessageError instead, once
+    the messages before it are published. Its ``handled`` attribute holds what would have been returned.
+    """
+    transformed: list[tuple[TransformContext, str, str]] = []
+    poison: Optional[Exception] = None
+    for message in messages:
+        context = TransformContext.from_service_bus_message(message, find_groups=find_groups)
+        _log_received_metadata(context)
+        transforming = False
+        try:
+            event_logger.log_message_received(context.body, received_audit_text, correlation_id=context.correlation_id)
+            transforming = True
+            hl7_msg = _transform(context, transform)
+            # Transformers record per-message details while transforming, so the audit text is built straight away.
+            transformed.append((context, context.output_er7, processed_audit_text_builder(hl7_msg)))
+        except Exception as e:
+            _log_failure(context, e, event_logger, transformer_display_name, failed_audit_text)
+            if transforming:
+                poison = e
+            break
+
+    handled = _publish_batch(transformed, sender_client, event_logger, transformer_display_name, failed_audit_text)
+    if raise_poison_errors and poison is not None and handled == len(transformed):
+        raise _poison_error(transformer_display_name, poison, handled) from poison
+    return handled
 
+
+def process_message_batch_in_workers(
+    messages: Sequence[ServiceBusMessage],
+    pool: TransformerWorkerPool,
+    sender_client: MessageSenderClient,
+    event_logger: EventLogger,
+    transformer_display_name: str,
+    received_audit_text: str,
+    failed_audit_text: str,
+    find_groups: bool = True,
+    raise_poison_errors: bool = False,
+) -> int:
+    """
+    Like process_message_batch, but the whole batch is handed to the pool's worker processes at once.
+
+    Results are collected in the order the messages were received, so ordering, the stop-at-first-failure rule,
+    the return value and ``raise_poison_errors`` are the same as for process_message_batch. A worker that dies is
+    not treated as a poison message, since the message it was transforming cannot be told apart from the others.
+    """
+    contexts = [TransformContext.from_service_bus_message(message, find_groups=find_groups) for message in messages]
+    futures = [pool.submit(context.body, find_groups) for context in contexts]
+
+    transformed: list[tuple[TransformContext, str, str]] = []
+    poison: Optional[Exception] = None
+    for index, (context, future) in enumerate(zip(contexts, futures)):
+        _log_received_metadata(context)
+        transforming = False
+        try:
+            event_logger.log_message_received(context.body, received_audit_text, correlation_id=context.correlation_id)
+            transforming = True
+            result = future.result()
+        except Exception as e:
+            _log_failure(context, e, event_logger, transformer_display_name, failed_audit_text)
+            if transforming and not isinstance(e, (BrokenProcessPool, CancelledError)):
+                poison = e
+            for pending in futures[index + 1:]:
+                pending.cancel()
+            break
+        context.timings.update(result.timings)
+        transformed.append((context, result.output_er7, result.processed_audit_text))
+
+    handled = _publish_batch(transformed, sender_client, event_logger, transformer_display_name, failed_audit_text)
+    if raise_poison_errors and poison is not None and handled == len(transformed):
+        raise _poison_error(transformer_display_name, poison, handled) from poison
+    return handled
+
+
+def _publish_batch(
+    transformed: list[tuple[TransformContext, str, str]],
+    sender_client: MessageSenderClient,
+    event_logger: EventLogger,
+    transformer_display_name: str,
+    failed_audit_text: str,
+) -> int:
+    """
+    Publish the transformed outputs and return how many of them were sent.
+
+    Transient Service Bus errors are retried as send_message retries them. If a sub-batch still fails, the ones
+    before it were sent, so their messages count as handled and are completed rather than published again when
+    the batch is redelivered.
+    """
+    if not transformed:
+        return 0
+
+    sent = 0
+
+    def count_sent(message_count: int) -> None:
+        nonlocal sent
+        sent += message_count
+
+    start = time.perf_counter()
+    try:
+        sender_client.send_message_batch(
+            [sender_client.build_message(output_er7, context.properties) for context, output_er7, _ in transformed],
+            retry_transient_errors=True,
+            on_sub_batch_sent=count_sent,
+        )
     except Exception as e:
-        error_msg = f"Unexpected error during message processing: {e}"
-        logger.error(error_msg)
+        for context, _, _ in transformed[sent:]:
+            _log_failure(context, e, event_logger, transformer_display_name, failed_audit_text)
+    else:
+        sent = len(transformed)
+    send_seconds = time.perf_counter() - start
 
-        event_logger.log_message_failed(
-            message_body, error_msg, "Unexpected processing error", correlation_id=correlation_id_opt
+    for context, output_er7, processed_audit_text in transformed[:sent]:
+        event_logger.log_message_processed(
+            output_er7,
+            processed_audit_text,
+            correlation_id=context.correlation_id,
         )
+        logger.debug("Message stage timings: %s", context.format_timings())
+    logger.debug("Published batch of %d message(s) in %.2fms", sent, send_seconds * 1000)
+    return sent
 
-        return False
+
+def _log_received_metadata(context: TransformContext) -> None:
+    meta = context.metadata
+    if context.properties:
+        logger.info(
+            "Received message with metadata - CorrelationId: %s, WorkflowID: %s, SourceSystem: %s, "
+            "MessageReceivedAt: %s",
+            meta["correlation_id"],
+            meta["workflow_id"],
+            meta["source_system"],
+            meta["message_received_at"],
+        )
+    else:
+        logger.warning("No application_properties found on message")
+
+
+def _transform(context: TransformContext, transform: Callable[[Message], Message]) -> Message:
+    hl7_msg = context.input_message
+    msh_segment = hl7_msg.msh
+    logger.debug(f"Message ID: {msh_segment.msh_10.value}")
+
+    with context.timed("transform"):
+        context.output_message = transform(hl7_msg)
+    return hl7_msg
+
+
+def _poison_error(transformer_display_name: str, error: Exception, handled: int = 0) -> PoisonMessageError:
+    return PoisonMessageError(
+        f"{transformer_display_name} transformation failed: {type(error).__name__}: {error}",
+        reason="TransformationFailed",
+        handled=handled,
+    )
+
+
+def _log_failure(
+    context: TransformContext,
+    error: Exception,
+    event_logger: EventLogger,
+    transformer_display_name: str,
+    failed_audit_text: str,
+) -> None:
+    if isinstance(error, ValueError):
+        error_msg = f"Failed to transform {transformer_display_name} message: {error}"
+        audit_text = failed_audit_text
+    else:
+        error_msg = f"Unexpected error during message processing: {error}"
+        audit_text = "Unexpected processing error"
+    logger.error(error_msg)
+
+    event_logger.log_message_failed(context.body, error_msg, audit_text, correlation_id=context.correlation_id)
 
 
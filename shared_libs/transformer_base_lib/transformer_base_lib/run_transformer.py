@@ -2,17 +2,22 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import TYPE_CHECKING
+from contextlib import nullcontext
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Optional, TypedDict
 
-from azure.servicebus import ServiceBusMessage
+from azure.servicebus import ServiceBusMessage, ServiceBusReceivedMessage
 from event_logger_lib import EventLogger
 from health_check_lib.health_check_server import TCPHealthCheckServer
+from hl7apy.core import Message
 from message_bus_lib.connection_config import ConnectionConfig
+from message_bus_lib.message_sender_client import MessageSenderClient
 from message_bus_lib.servicebus_client_factory import ServiceBusClientFactory
 from processor_manager_lib import ProcessorManager
 
 from .app_config import TransformerConfig
-from .message_processor import process_message
+from .message_processor import process_message, process_message_batch, process_message_batch_in_workers
+from .worker_pool import TransformerWorkerPool
 
 if TYPE_CHECKING:
     from .base_transformer import BaseTransformer
@@ -21,6 +26,20 @@ logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
 
+class _ProcessorArgs(TypedDict):
+    """The arguments process_message and process_message_batch share, after the message or batch."""
+
+    sender_client: MessageSenderClient
+    event_logger: EventLogger
+    transform: Callable[[Message], Message]
+    transformer_display_name: str
+    received_audit_text: str
+    processed_audit_text_builder: Callable[[Message], str]
+    failed_audit_text: str
+    find_groups: bool
+    raise_poison_errors: bool
+
+
 def run_transformer_app(transformer: BaseTransformer) -> None:
     from .base_transformer import BaseTransformer  # noqa: PLC0415
 
@@ -42,19 +61,30 @@ def run_transformer_app(transformer: BaseTransformer) -> None:
             config.egress_queue_name, config.egress_session_id
         ) as sender_client,
         factory.create_message_receiver_client(
-            config.ingress_queue_name, config.ingress_session_id
+            config.ingress_queue_name,
+            config.ingress_session_id,
+            max_delivery_attempts=config.MAX_DELIVERY_ATTEMPTS,
         ) as receiver_client,
         TCPHealthCheckServer(
             config.health_check_hostname, config.health_check_port
         ) as health_check_server,
+        (
+            TransformerWorkerPool(transformer, config.WORKER_PROCESSES)
+            if config.WORKER_PROCESSES > 1
+            else nullcontext()
+        ) as worker_pool,
     ):
         batch_size = config.MAX_BATCH_SIZE
 
         logger.info(
-            "%s Transformer initialised with max_batch_size=%s (the parsed max_batch_size config value=%s)",
+            "%s Transformer initialised with max_batch_size=%s (the parsed max_batch_size config value=%s), "
+            "batch_publish=%s, worker_processes=%s, max_delivery_attempts=%s",
             transformer.transformer_name,
             batch_size,
             config.MAX_BATCH_SIZE,
+            config.BATCH_PUBLISH,
+            config.WORKER_PROCESSES,
+            config.MAX_DELIVERY_ATTEMPTS,
         )
 
         logger.info(
@@ -63,17 +93,45 @@ def run_transformer_app(transformer: BaseTransformer) -> None:
         )
         health_check_server.start()
 
-        def message_processor(message: ServiceBusMessage) -> bool:
-            return process_message(
-                message=message,
+        processor_kwargs = _ProcessorArgs(
+            sender_client=sender_client,
+            event_logger=event_logger,
+            transform=transformer.transform_message,
+            transformer_display_name=transformer.transformer_name,
+            received_audit_text=transformer.get_received_audit_text(),
+            processed_audit_text_builder=transformer.get_processed_audit_text,
+            failed_audit_text=f"{transformer.transformer_name} transformation failed",
+            find_groups=transformer.find_groups,
+            raise_poison_errors=config.MAX_DELIVERY_ATTEMPTS > 0,
+        )
+
+        batch_processor: Optional[Callable[[list[ServiceBusReceivedMessage]], int]] = None
+        if worker_pool is not None:
+            # Workers build the audit text themselves, so only the Service Bus and audit arguments are passed on.
+            batch_processor = partial(
+                process_message_batch_in_workers,
+                pool=worker_pool,
                 sender_client=sender_client,
                 event_logger=event_logger,
-                transform=transformer.transform_message,
                 transformer_display_name=transformer.transformer_name,
                 received_audit_text=transformer.get_received_audit_text(),
-                processed_audit_text_builder=transformer.get_processed_audit_text,
                 failed_audit_text=f"{transformer.transformer_name} transformation failed",
+                find_groups=transformer.find_groups,
+                raise_poison_errors=config.MAX_DELIVERY_ATTEMPTS > 0,
+            )
+        elif config.BATCH_PUBLISH:
+            batch_processor = partial(process_message_batch, **processor_kwargs)
+
+        if batch_processor is not None:
+            wrapped_batch_processor = processor_manager.wrap_handler(
+                batch_processor, transformer.transformer_name, config.ingress_queue_name
             )
+            while processor_manager.is_running:
+                receiver_client.receive_messages_batch_partial(batch_size, wrapped_batch_processor)
+            return
+
+        def message_processor(message: ServiceBusMessage) -> bool:
+            return process_message(message, **processor_kwargs)
 
         wrapped_processor = processor_manager.wrap_handler(
             message_processor, transformer.transformer_name, config.ingress_queue_name
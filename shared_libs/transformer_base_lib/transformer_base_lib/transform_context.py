@@ -0,0 +1,80 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from azure.servicebus import ServiceBusMessage
+from hl7apy.core import Message
+from hl7apy.parser import parse_message
+from message_bus_lib.metadata_utils import correlation_id_for_logger, extract_metadata, get_metadata_log_values
+
+
+class TransformContext:
+    """
+    Per-message state for one pass through a transformer.
+
+    The incoming body is parsed at most once and the transformed message is serialised at most once, however
+    many times the parsed input or the output ER7 are read. The time spent in each stage is recorded in
+    ``timings`` (seconds, keyed by stage name). An ``input_message`` already parsed from ``body`` with the same
+    ``find_groups`` setting is used instead of parsing the body again.
+    """
+
+    def __init__(
+        self,
+        body: str,
+        properties: Optional[dict[str, str]] = None,
+        find_groups: bool = True,
+        input_message: Optional[Message] = None,
+    ) -> None:
+        self.body = body
+        self.properties = properties
+        self.find_groups = find_groups
+        self.metadata = get_metadata_log_values(properties)
+        self.timings: Dict[str, float] = {}
+        self._input_message: Optional[Message] = input_message
+        self._output_message: Optional[Message] = None
+        self._output_er7: Optional[str] = None
+
+    @classmethod
+    def from_service_bus_message(cls, message: ServiceBusMessage, find_groups: bool = True) -> "TransformContext":
+        body = b"".join(message.body).decode("utf-8")
+        return cls(body, extract_metadata(message), find_groups)
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage] = self.timings.get(stage, 0.0) + time.perf_counter() - start
+
+    @property
+    def correlation_id(self) -> Optional[str]:
+        return correlation_id_for_logger(self.metadata)
+
+    @property
+    def input_message(self) -> Message:
+        if self._input_message is None:
+            with self.timed("parse"):
+                self._input_message = parse_message(self.body, find_groups=self.find_groups)
+        return self._input_message
+
+    @property
+    def output_message(self) -> Message:
+        if self._output_message is None:
+            raise ValueError("No transformed message has been set")
+        return self._output_message
+
+    @output_message.setter
+    def output_message(self, message: Message) -> None:
+        self._output_message = message
+        self._output_er7 = None
+
+    @property
+    def output_er7(self) -> str:
+        if self._output_er7 is None:
+            with self.timed("serialise"):
+                self._output_er7 = self.output_message.to_er7()
+        return self._output_er7
+
+    def format_timings(self) -> str:
+        return ", ".join(f"{stage}={seconds * 1000:.2f}ms" for stage, seconds in self.timings.items())
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from types import TracebackType
+from typing import TYPE_CHECKING, Dict, Optional
+
+from hl7apy import get_default_version, load_library
+
+from .transform_context import TransformContext
+
+if TYPE_CHECKING:
+    from .base_transformer import BaseTransformer
+
+logger = logging.getLogger(__name__)
+
+# The transformer each worker process was started with; set by _initialise_worker.
+_worker_transformer: Optional[BaseTransformer] = None
+
+
+@dataclass(frozen=True)
+class WorkerResult:
+    output_er7: str
+    processed_audit_text: str
+    timings: Dict[str, float]
+
+
+def _initialise_worker(transformer: BaseTransformer) -> None:
+    global _worker_transformer  # noqa: PLW0603
+    _worker_transformer = transformer
+    # Import the hl7apy reference tables up front rather than on the first message each worker parses.
+    load_library(get_default_version())
+
+
+def _transform_in_worker(body: str, find_groups: bool) -> WorkerResult:
+    if _worker_transformer is None:
+        raise RuntimeError("Worker process was not initialised with a transformer")
+    context = TransformContext(body, find_groups=find_groups)
+    hl7_msg = context.input_message
+    with context.timed("transform"):
+        context.output_message = _worker_transformer.transform_message(hl7_msg)
+    output_er7 = context.output_er7
+    return WorkerResult(output_er7, _worker_transformer.get_processed_audit_text(hl7_msg), context.timings)
+
+
+class TransformerWorkerPool:
+    """
+    A pool of worker processes that each hold a copy of the transformer.
+
+    Workers parse, transform and serialise message bodies; the Service Bus clients and the audit log stay in the
+    process that owns the pool. Workers are started with the ``spawn`` method so they do not inherit the parent's
+    AMQP connections or threads, which means the transformer must be picklable.
+    """
+
+    def __init__(self, transformer: BaseTransformer, processes: int):
+        if processes < 1:
+            raise ValueError(f"processes must be at least 1, got {processes}")
+        self.transformer = transformer
+        self.processes = processes
+        self._executor = self._create_executor()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialise_worker,
+            initargs=(self.transformer,),
+        )
+
+    def submit(self, body: str, find_groups: bool = True) -> Future[WorkerResult]:
+        try:
+            return self._executor.submit(_transform_in_worker, body, find_groups)
+        except BrokenProcessPool:
+            # A worker died (for example, it was OOM-killed). The futures it held have already failed; start a
+            # fresh pool for this and later messages.
+            logger.warning("Transformer worker pool is broken, restarting %d worker process(es)", self.processes)
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._create_executor()
+            return self._executor.submit(_transform_in_worker, body, find_groups)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        logger.debug("Transformer worker pool closed.")
+
+    def __enter__(self) -> TransformerWorkerPool:
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_value: BaseException | None, exc_traceback: TracebackType | None
+    ) -> None:
+        self.close()
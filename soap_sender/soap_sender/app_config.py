@@ -35,6 +35,14 @@ class AppConfig:
     peer_service: str
     # Throttling
     max_messages_per_minute: int | None
+    throttle_burst: int = 1
+    min_messages_per_minute: int | None = None
+    throttle_latency_threshold_seconds: int = 5
+    circuit_breaker_failure_threshold: int | None = None
+    circuit_breaker_probe_interval_seconds: int = 5
+    circuit_breaker_probe_message: str | None = None
+    # Delivery
+    soap_gzip_requests: bool = False
 
     @staticmethod
     def read_env_config() -> AppConfig:
@@ -56,6 +64,15 @@ class AppConfig:
             health_board=_read_required_env("HEALTH_BOARD"),
             peer_service=_read_required_env("PEER_SERVICE"),
             max_messages_per_minute=_read_positive_int_env("MAX_MESSAGES_PER_MINUTE"),
+            throttle_burst=_read_positive_int_env("THROTTLE_BURST") or 1,
+            min_messages_per_minute=_read_positive_int_env("MIN_MESSAGES_PER_MINUTE"),
+            throttle_latency_threshold_seconds=_read_positive_int_env("THROTTLE_LATENCY_THRESHOLD_SECONDS") or 5,
+            circuit_breaker_failure_threshold=_read_positive_int_env("CIRCUIT_BREAKER_FAILURE_THRESHOLD"),
+            circuit_breaker_probe_interval_seconds=(
+                _read_positive_int_env("CIRCUIT_BREAKER_PROBE_INTERVAL_SECONDS") or 5
+            ),
+            circuit_breaker_probe_message=_read_env("CIRCUIT_BREAKER_PROBE_MESSAGE"),
+            soap_gzip_requests=os.getenv("SOAP_GZIP_REQUESTS", "false").lower() == "true",
         )
 
 
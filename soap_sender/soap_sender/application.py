@@ -14,6 +14,8 @@ from __future__ import annotations
 import configparser
 import logging
 import os
+import time
+from typing import Callable
 
 from azure.servicebus import ServiceBusMessage
 from event_logger_lib import EventLogger
@@ -34,10 +36,9 @@ from message_bus_lib.metadata_utils import (
 from message_bus_lib.servicebus_client_factory import ServiceBusClientFactory
 from metric_sender_lib.metric_sender import MetricSender
 from otel_lib import configure_otel
-from processor_manager_lib import ProcessorManager
+from processor_manager_lib import CircuitBreaker, MessageThrottler, ProcessorManager, StageTimer
 
 from soap_sender.app_config import AppConfig
-from soap_sender.message_throttler import MessageThrottler
 from soap_sender.soap_ack_processor import get_ack_result
 from soap_sender.soap_sender_client import SOAPSenderClient
 
@@ -89,7 +90,13 @@ def main() -> None:
     metric_sender = MetricSender(
         app_config.workflow_id, app_config.microservice_id, app_config.health_board, app_config.peer_service
     )
-    throttler = MessageThrottler(app_config.max_messages_per_minute)
+    throttler = MessageThrottler(
+        app_config.max_messages_per_minute,
+        burst=app_config.throttle_burst,
+        min_messages_per_minute=app_config.min_messages_per_minute,
+        latency_threshold_seconds=app_config.throttle_latency_threshold_seconds,
+        metric_sender=metric_sender,
+    )
 
     message_store_client = factory.create_message_store_client(
         app_config.message_store_queue_name, app_config.microservice_id, app_config.peer_service
@@ -104,13 +111,14 @@ def main() -> None:
 
     with (
         factory.create_message_receiver_client(
-            app_config.ingress_queue_name, app_config.ingress_session_id
+            app_config.ingress_queue_name, app_config.ingress_session_id, time_settling=True
         ) as receiver_client,
         SOAPSenderClient(
             app_config.soap_endpoint_url,
             app_config.soap_timeout_seconds,
             app_config.soap_api_key,
             app_config.soap_client_cert_path,
+            gzip_requests=app_config.soap_gzip_requests,
         ) as soap_sender_client,
         TCPHealthCheckServer(app_config.health_check_hostname, app_config.health_check_port) as health_check_server,
         message_store_client,
@@ -119,18 +127,40 @@ def main() -> None:
         health_check_server.start()
 
         batch_size = _calculate_batch_size(throttler)
+        circuit_breaker = (
+            CircuitBreaker(
+                app_config.circuit_breaker_failure_threshold,
+                _destination_probe(soap_sender_client, app_config.circuit_breaker_probe_message),
+                probe_interval_seconds=app_config.circuit_breaker_probe_interval_seconds,
+                metric_sender=metric_sender,
+            )
+            if app_config.circuit_breaker_failure_threshold
+            else None
+        )
 
         def message_processor(message: ServiceBusMessage) -> bool:
             return _process_message(
                 message, soap_sender_client, event_logger, metric_sender,
-                throttler, message_store_client, app_config.ingress_session_id,
+                throttler, message_store_client, app_config.ingress_session_id, circuit_breaker,
             )
 
         wrapped_processor = processor_manager.wrap_handler(
             message_processor, "soap-sender", app_config.ingress_queue_name
         )
         while processor_manager.is_running:
-            receiver_client.receive_messages(batch_size, wrapped_processor)
+            if circuit_breaker is None or circuit_breaker.wait_until_closed(
+                lambda: processor_manager.is_running, on_closed=receiver_client.clear_retry_delay
+            ):
+                receiver_client.receive_messages(batch_size, wrapped_processor)
+
+
+def _destination_probe(soap_sender_client: SOAPSenderClient, probe_message: str | None) -> Callable[[], bool]:
+    """Check the endpoint by connecting to it, or by sending ``probe_message`` and expecting success."""
+    if probe_message is None:
+        return soap_sender_client.check_connection
+    # Segments may be separated by newlines in the environment variable.
+    er7 = "\r".join(probe_message.splitlines())
+    return lambda: get_ack_result(*soap_sender_client.send_message(er7))
 
 
 def _process_message(
@@ -141,7 +171,9 @@ def _process_message(
     throttler: MessageThrottler,
     message_store_client: MessageStoreClient,
     session_id: str,
+    circuit_breaker: CircuitBreaker | None = None,
 ) -> bool:
+    stage_timer = StageTimer(metric_sender)
     message_body = b"".join(message.body).decode("utf-8")
     metadata: dict[str, str] | None = extract_metadata(message)
     meta = get_metadata_log_values(metadata)
@@ -164,18 +196,30 @@ def _process_message(
         logger.info("Message ID: %s", message_id)
 
         if _is_first_delivery_attempt(message):
+            stage_timer.mark("prepare")
             _send_to_message_store(message_store_client, event_logger, message_body, metadata, session_id)
+            stage_timer.mark("store")
         else:
             logger.info(
                 "Skipping message store on retry — CorrelationId: %s, DeliveryCount: %s",
                 meta["correlation_id"],
                 getattr(message, "delivery_count", "N/A"),
             )
+        stage_timer.mark("prepare")
 
         throttler.wait_if_needed()
+        stage_timer.mark("throttle")
+        sent_at = time.monotonic()
+        # The session connects when it has no idle connection, so connecting is part of the ACK wait here.
         status_code, response_body = soap_sender_client.send_message(message_body)
+        latency_seconds = time.monotonic() - sent_at
+        stage_timer.mark("ack_wait")
 
         ack_success = get_ack_result(status_code, response_body)
+        stage_timer.mark("ack_parse")
+        throttler.record_ack(ack_success, latency_seconds)
+        if circuit_breaker is not None:
+            circuit_breaker.record_success()
 
         if ack_success:
             metric_sender.send_message_sent_metric()
@@ -186,15 +230,21 @@ def _process_message(
             correlation_id=correlation_id_opt,
         )
         logger.info("SOAP send complete — message_id=%s, success=%s", message_id, ack_success)
+        stage_timer.mark("record")
         return ack_success
 
     except (TimeoutError, ConnectionError) as e:
+        stage_timer.mark("ack_wait")
+        throttler.record_ack(False)
+        if circuit_breaker is not None:
+            circuit_breaker.record_failure()
         error_msg = f"Failed to send message via SOAP: {e}"
         logger.error(error_msg)
         event_logger.log_message_failed(
             message_body, error_msg, "SOAP send failed — connection/timeout error",
             correlation_id=correlation_id_opt,
         )
+        stage_timer.mark("record")
         return False
 
     except Exception as e:
@@ -206,6 +256,9 @@ def _process_message(
         )
         return False
 
+    finally:
+        stage_timer.finish()
+
 
 def _is_first_delivery_attempt(message: ServiceBusMessage) -> bool:
     delivery_count = getattr(message, "delivery_count", 0)
@@ -6,16 +6,40 @@ so ``application.py`` can map these to Service Bus abandon/retry unchanged.
 """
 from __future__ import annotations
 
+import gzip
 import logging
+import socket
 from typing import Any, Optional, Type
+from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
 # SOAP 1.1 namespace — default until endpoint requirements confirm otherwise.
 _SOAP_NS = "http://schemas.xmlsoap.org/soap/envelope/"
 
+# Compression level for gzip request bodies. ER7 compresses well at low levels, which cost far less CPU than the
+# default of 9.
+_GZIP_LEVEL = 5
+
+# The envelope around the HL7 payload is the same for every message, so it is built once.
+_ENVELOPE_PREFIX = (
+    f'<?xml version="1.0" encoding="UTF-8"?>\n'
+    f'<soapenv:Envelope xmlns:soapenv="{_SOAP_NS}">\n'
+    f"  <soapenv:Header/>\n"
+    f"  <soapenv:Body>\n"
+    f"    <SendHL7Message>\n"
+    f"      <hl7Message>"
+)
+_ENVELOPE_SUFFIX = (
+    "</hl7Message>\n"
+    "    </SendHL7Message>\n"
+    "  </soapenv:Body>\n"
+    "</soapenv:Envelope>"
+)
+
 
 class SOAPSenderClient:
     """HTTP client that wraps HL7 ER7 in a SOAP envelope and POSTs to an endpoint.
@@ -25,6 +49,8 @@ class SOAPSenderClient:
         timeout_seconds: HTTP request timeout.  Matches hl7_sender ACK timeout semantics.
         api_key: Optional API key — added as ``Authorization: ApiKey <key>`` header.
         client_cert_path: Optional path to a PEM client certificate for mTLS.
+        pool_size: Connections kept open to the endpoint, which should be at least the number of threads sending.
+        gzip_requests: Send request bodies gzip-compressed, for endpoints that accept ``Content-Encoding: gzip``.
     """
 
     def __init__(
@@ -33,17 +59,29 @@ class SOAPSenderClient:
         timeout_seconds: int = 30,
         api_key: str | None = None,
         client_cert_path: str | None = None,
+        pool_size: int = 1,
+        gzip_requests: bool = False,
     ) -> None:
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
         self.endpoint_url = endpoint_url
         self.timeout_seconds = timeout_seconds
         self.client_cert_path = client_cert_path
-        self._session = self._create_session(api_key)
+        self.gzip_requests = gzip_requests
+        self._session = self._create_session(api_key, pool_size)
 
-    def _create_session(self, api_key: str | None) -> requests.Session:
+    def _create_session(self, api_key: str | None, pool_size: int) -> requests.Session:
         session = requests.Session()
         session.headers.update({"Content-Type": "text/xml; charset=utf-8"})
+        if self.gzip_requests:
+            session.headers.update({"Content-Encoding": "gzip"})
         if api_key:
             session.headers.update({"Authorization": f"ApiKey {api_key}"})
+        # One pool for the single endpoint. Threads wait for a free connection rather than opening extra ones that
+        # would be closed again, and retries are left to send_message.
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0, pool_block=True)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
         return session
 
     def send_message(self, hl7_message: str, _retry_attempted: bool = False) -> tuple[int, str]:
@@ -60,9 +98,11 @@ class SOAPSenderClient:
             TimeoutError: No response within ``timeout_seconds``.
             ConnectionError: Network-level failure.
         """
-        envelope = _build_soap_envelope(hl7_message)
+        body = _build_soap_envelope(hl7_message).encode("utf-8")
+        if self.gzip_requests:
+            body = gzip.compress(body, compresslevel=_GZIP_LEVEL)
         kwargs: dict[str, Any] = {
-            "data": envelope.encode("utf-8"),
+            "data": body,
             "timeout": self.timeout_seconds,
         }
         if self.client_cert_path:
@@ -75,17 +115,25 @@ class SOAPSenderClient:
 
         except requests.exceptions.Timeout:
             if not _retry_attempted:
-                logger.warning("SOAP request timed out — retrying with a fresh session...")
-                self._session.close()
-                self._session = self._create_session(
-                    self._session.headers.get("Authorization", "").replace("ApiKey ", "") or None
-                )
+                # The pool discards the timed out connection, so the retry goes out on a fresh one.
+                logger.warning("SOAP request timed out — retrying on a new connection...")
                 return self.send_message(hl7_message, _retry_attempted=True)
             raise TimeoutError(f"No SOAP response within {self.timeout_seconds} seconds")
 
         except requests.exceptions.ConnectionError as exc:
             raise ConnectionError(f"SOAP connection error: {exc}") from exc
 
+    def check_connection(self) -> bool:
+        """Return whether a TCP connection to the endpoint's host can be opened, without sending a request."""
+        url = urlparse(self.endpoint_url)
+        port = url.port or (443 if url.scheme == "https" else 80)
+        try:
+            socket.create_connection((url.hostname, port), timeout=self.timeout_seconds).close()
+        except OSError as exc:
+            logger.debug("Connection check failed: %s", exc)
+            return False
+        return True
+
     def close(self) -> None:
         self._session.close()
 
@@ -113,14 +161,4 @@ def _build_soap_envelope(hl7_message: str) -> str:
         .replace("<", "&lt;")
         .replace(">", "&gt;")
     )
-    return (
-        f'<?xml version="1.0" encoding="UTF-8"?>\n'
-        f'<soapenv:Envelope xmlns:soapenv="{_SOAP_NS}">\n'
-        f"  <soapenv:Header/>\n"
-        f"  <soapenv:Body>\n"
-        f"    <SendHL7Message>\n"
-        f"      <hl7Message>{escaped}</hl7Message>\n"
-        f"    </SendHL7Message>\n"
-        f"  </soapenv:Body>\n"
-        f"</soapenv:Envelope>"
-    )
+    return _ENVELOPE_PREFIX + escaped + _ENVELOPE_SUFFIX
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import unittest
 
-from soap_sender.soap_ack_processor import get_ack_result
+from soap_sender.soap_ack_processor import get_ack_result, parse_soap_ack
 
 _SOAP_ACK_AA = """\
 <?xml version="1.0" encoding="UTF-8"?>
@@ -31,6 +31,44 @@ _SOAP_FAULT = """\
   </soapenv:Body>
 </soapenv:Envelope>"""
 
+# Response shapes produced by http_mock_receiver's soap_response_builder.
+_MOCK_ACK = """\
+<?xml version="1.0" encoding="UTF-8"?>
+<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/">
+  <soapenv:Header/>
+  <soapenv:Body>
+    <AcknowledgementResponse>
+      <Status>AA</Status>
+      <MessageControlID>MSG001</MessageControlID>
+      <Detail>Message accepted by HTTP mock receiver</Detail>
+    </AcknowledgementResponse>
+  </soapenv:Body>
+</soapenv:Envelope>"""
+
+_MOCK_FAULT_11 = """\
+<?xml version="1.0" encoding="UTF-8"?>
+<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/">
+  <soapenv:Body>
+    <soapenv:Fault>
+      <faultcode>soapenv:Client</faultcode>
+      <faultstring>Message processing failed</faultstring>
+      <detail>Message rejected by mock receiver</detail>
+    </soapenv:Fault>
+  </soapenv:Body>
+</soapenv:Envelope>"""
+
+_MOCK_FAULT_12 = """\
+<?xml version="1.0" encoding="UTF-8"?>
+<soapenv:Envelope xmlns:soapenv="http://www.w3.org/2003/05/soap-envelope">
+  <soapenv:Body>
+    <soapenv:Fault>
+      <soapenv:Code><soapenv:Value>soapenv:Receiver</soapenv:Value></soapenv:Code>
+      <soapenv:Reason><soapenv:Text>Message processing failed</soapenv:Text></soapenv:Reason>
+      <soapenv:Detail>Message rejected by mock receiver</soapenv:Detail>
+    </soapenv:Fault>
+  </soapenv:Body>
+</soapenv:Envelope>"""
+
 _EMPTY_200 = ""
 _NON_XML = "OK"
 
@@ -71,5 +109,105 @@ class TestGetAckResult(unittest.TestCase):
         self.assertTrue(get_ack_result(202, _SOAP_ACK_AA))
 
 
+class TestParseSoapAck(unittest.TestCase):
+
+    def test_mock_receiver_ack(self) -> None:
+        result = parse_soap_ack(200, _MOCK_ACK)
+
+        self.assertEqual(result.ack_code, "AA")
+        self.assertEqual(result.message_control_id, "MSG001")
+        self.assertFalse(result.is_fault)
+        self.assertTrue(result.success)
+
+    def test_mock_receiver_soap_11_fault(self) -> None:
+        result = parse_soap_ack(500, _MOCK_FAULT_11)
+
+        self.assertTrue(result.is_fault)
+        self.assertEqual(result.fault_reason, "Message processing failed")
+        self.assertIsNone(result.ack_code)
+        self.assertFalse(result.success)
+
+    def test_mock_receiver_soap_12_fault(self) -> None:
+        result = parse_soap_ack(500, _MOCK_FAULT_12)
+
+        self.assertTrue(result.is_fault)
+        self.assertEqual(result.fault_reason, "Message processing failed")
+        self.assertFalse(result.success)
+
+    def test_negative_ack_is_not_success(self) -> None:
+        result = parse_soap_ack(200, _SOAP_ACK_AE)
+
+        self.assertEqual(result.ack_code, "AE")
+        self.assertFalse(result.success)
+
+    def test_namespace_qualified_status_is_found(self) -> None:
+        body = (
+            '<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/" xmlns:a="urn:ack">'
+            "<s:Body><a:Ack><a:Status>CA</a:Status></a:Ack></s:Body></s:Envelope>"
+        )
+
+        result = parse_soap_ack(200, body)
+
+        self.assertEqual(result.ack_code, "CA")
+        self.assertIsNone(result.message_control_id)
+        self.assertTrue(result.success)
+
+    def test_fault_after_the_ack_is_a_fault(self) -> None:
+        body = (
+            "<Envelope><Body><Ack><Status>AA</Status><MessageControlID>1</MessageControlID></Ack>"
+            "<Fault><faultstring>boom</faultstring></Fault></Body></Envelope>"
+        )
+
+        result = parse_soap_ack(200, body)
+
+        self.assertEqual(result.ack_code, "AA")
+        self.assertTrue(result.is_fault)
+        self.assertEqual(result.fault_reason, "boom")
+        self.assertFalse(get_ack_result(200, body))
+
+    def test_reads_a_large_detail_and_stops_when_the_body_closes(self) -> None:
+        # Everything after the Body is malformed, so it would fail to parse if it were read.
+        body = _MOCK_ACK.replace("<Detail>", "<Detail>" + "<line>x</line>" * 10_000)
+        body = body.replace("</soapenv:Body>", "</soapenv:Body><unclosed>")
+
+        with self.assertNoLogs("soap_sender.soap_ack_processor", level="WARNING"):
+            result = parse_soap_ack(200, body)
+
+        self.assertEqual(result.message_control_id, "MSG001")
+        self.assertTrue(result.success)
+
+    def test_stops_parsing_after_the_fault_reason(self) -> None:
+        body = _MOCK_FAULT_11.replace("<detail>", "<detail>" + "<frame>" * 10_000)
+
+        with self.assertNoLogs("soap_sender.soap_ack_processor", level="WARNING"):
+            result = parse_soap_ack(500, body)
+
+        self.assertEqual(result.fault_reason, "Message processing failed")
+
+    def test_status_without_control_id_stops_when_the_body_closes(self) -> None:
+        body = _SOAP_ACK_AA.replace("<MessageControlID>MSG001</MessageControlID>", "")
+        body = body.replace("</soapenv:Body>", "</soapenv:Body><trailing>")
+
+        with self.assertNoLogs("soap_sender.soap_ack_processor", level="WARNING"):
+            result = parse_soap_ack(200, body)
+
+        self.assertEqual(result.ack_code, "AA")
+        self.assertIsNone(result.message_control_id)
+
+    def test_non_xml_body_mentioning_fault_is_a_fault(self) -> None:
+        result = parse_soap_ack(200, "Fault: upstream unavailable")
+
+        self.assertTrue(result.is_fault)
+        self.assertIsNone(result.fault_reason)
+        self.assertFalse(result.success)
+
+    def test_empty_body_has_no_ack(self) -> None:
+        result = parse_soap_ack(202, _EMPTY_200)
+
+        self.assertIsNone(result.ack_code)
+        self.assertFalse(result.is_fault)
+        self.assertTrue(result.success)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -6,9 +6,16 @@ No MessageStoreClient — consistent with the existing subscription sender.
 """
 from __future__ import annotations
 
+import json
 import os
+from collections.abc import Mapping
 from dataclasses import dataclass
 
+# Settings every destination in a process shares.
+SHARED_SETTINGS = frozenset(
+    {"SERVICE_BUS_CONNECTION_STRING", "SERVICE_BUS_NAMESPACE", "HEALTH_CHECK_HOST", "HEALTH_CHECK_PORT"}
+)
+
 
 @dataclass
 class AppConfig:
@@ -35,48 +42,107 @@ class AppConfig:
     peer_service: str
     # Throttling
     max_messages_per_minute: int | None
+    throttle_burst: int = 1
+    min_messages_per_minute: int | None = None
+    throttle_latency_threshold_seconds: int = 5
+    circuit_breaker_failure_threshold: int | None = None
+    circuit_breaker_probe_interval_seconds: int = 5
+    circuit_breaker_probe_message: str | None = None
+    # Delivery
+    soap_max_concurrent_requests: int | None = None
+    soap_gzip_requests: bool = False
 
     @staticmethod
-    def read_env_config() -> AppConfig:
-        return AppConfig(
-            connection_string=_read_env("SERVICE_BUS_CONNECTION_STRING"),
-            service_bus_namespace=_read_env("SERVICE_BUS_NAMESPACE"),
-            ingress_topic_name=_read_required_env("INGRESS_TOPIC_NAME"),
-            ingress_subscription_name=_read_required_env("INGRESS_SUBSCRIPTION_NAME"),
-            ingress_session_id=_read_env("INGRESS_SESSION_ID"),
-            soap_endpoint_url=_read_required_env("SOAP_ENDPOINT_URL"),
-            soap_timeout_seconds=_read_int_env("SOAP_TIMEOUT_SECONDS") or 30,
-            soap_api_key=_read_env("SOAP_API_KEY"),
-            soap_client_cert_path=_read_env("SOAP_CLIENT_CERT_PATH"),
-            ws_security_enabled=os.getenv("WS_SECURITY_ENABLED", "false").lower() == "true",
-            health_check_hostname=_read_env("HEALTH_CHECK_HOST"),
-            health_check_port=_read_int_env("HEALTH_CHECK_PORT"),
-            workflow_id=_read_required_env("WORKFLOW_ID"),
-            microservice_id=_read_required_env("MICROSERVICE_ID"),
-            health_board=_read_required_env("HEALTH_BOARD"),
-            peer_service=_read_required_env("PEER_SERVICE"),
-            max_messages_per_minute=_read_positive_int_env("MAX_MESSAGES_PER_MINUTE"),
+    def read_env_config(overrides: Mapping[str, str] | None = None) -> AppConfig:
+        """Read the configuration from the environment, with ``overrides`` taking precedence over it."""
+        config = AppConfig(
+            connection_string=_read_env("SERVICE_BUS_CONNECTION_STRING", overrides),
+            service_bus_namespace=_read_env("SERVICE_BUS_NAMESPACE", overrides),
+            ingress_topic_name=_read_required_env("INGRESS_TOPIC_NAME", overrides),
+            ingress_subscription_name=_read_required_env("INGRESS_SUBSCRIPTION_NAME", overrides),
+            ingress_session_id=_read_env("INGRESS_SESSION_ID", overrides),
+            soap_endpoint_url=_read_required_env("SOAP_ENDPOINT_URL", overrides),
+            soap_timeout_seconds=_read_int_env("SOAP_TIMEOUT_SECONDS", overrides) or 30,
+            soap_api_key=_read_env("SOAP_API_KEY", overrides),
+            soap_client_cert_path=_read_env("SOAP_CLIENT_CERT_PATH", overrides),
+            ws_security_enabled=(_read_env("WS_SECURITY_ENABLED", overrides) or "false").lower() == "true",
+            health_check_hostname=_read_env("HEALTH_CHECK_HOST", overrides),
+            health_check_port=_read_int_env("HEALTH_CHECK_PORT", overrides),
+            workflow_id=_read_required_env("WORKFLOW_ID", overrides),
+            microservice_id=_read_required_env("MICROSERVICE_ID", overrides),
+            health_board=_read_required_env("HEALTH_BOARD", overrides),
+            peer_service=_read_required_env("PEER_SERVICE", overrides),
+            max_messages_per_minute=_read_positive_int_env("MAX_MESSAGES_PER_MINUTE", overrides),
+            throttle_burst=_read_positive_int_env("THROTTLE_BURST", overrides) or 1,
+            min_messages_per_minute=_read_positive_int_env("MIN_MESSAGES_PER_MINUTE", overrides),
+            throttle_latency_threshold_seconds=(
+                _read_positive_int_env("THROTTLE_LATENCY_THRESHOLD_SECONDS", overrides) or 5
+            ),
+            circuit_breaker_failure_threshold=_read_positive_int_env("CIRCUIT_BREAKER_FAILURE_THRESHOLD", overrides),
+            circuit_breaker_probe_interval_seconds=(
+                _read_positive_int_env("CIRCUIT_BREAKER_PROBE_INTERVAL_SECONDS", overrides) or 5
+            ),
+            circuit_breaker_probe_message=_read_env("CIRCUIT_BREAKER_PROBE_MESSAGE", overrides),
+            soap_max_concurrent_requests=_read_positive_int_env("SOAP_MAX_CONCURRENT_REQUESTS", overrides),
+            soap_gzip_requests=(_read_env("SOAP_GZIP_REQUESTS", overrides) or "false").lower() == "true",
         )
+        # Concurrent requests come from receivers that each lock the next available session.
+        if (config.soap_max_concurrent_requests or 1) > 1 and config.ingress_session_id is not None:
+            raise ValueError("SOAP_MAX_CONCURRENT_REQUESTS above 1 cannot be used with INGRESS_SESSION_ID")
+        return config
+
+    @staticmethod
+    def read_destination_configs() -> list[AppConfig]:
+        """
+        Read one configuration per destination.
+
+        ``DESTINATIONS`` holds a JSON list of objects, each mapping environment variable names to the values that
+        destination uses instead of the environment's, for example its subscription, endpoint and throttle rate.
+        Service Bus and health check settings are shared, so they cannot be overridden. Without ``DESTINATIONS`` the
+        environment describes a single destination.
+        """
+        destinations = _read_env("DESTINATIONS")
+        if destinations is None:
+            return [AppConfig.read_env_config()]
+
+        try:
+            entries = json.loads(destinations)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"DESTINATIONS is not valid JSON: {e}")
+        if not isinstance(entries, list) or not entries or not all(isinstance(entry, dict) for entry in entries):
+            raise ValueError("DESTINATIONS must be a non-empty JSON list of objects")
+        for entry in entries:
+            shared = SHARED_SETTINGS.intersection(entry)
+            if shared:
+                raise ValueError(f"DESTINATIONS cannot override shared settings: {', '.join(sorted(shared))}")
+
+        configs = [AppConfig.read_env_config({name: str(value) for name, value in entry.items()}) for entry in entries]
+        subscriptions = [(c.ingress_topic_name, c.ingress_subscription_name, c.ingress_session_id) for c in configs]
+        if len(set(subscriptions)) != len(subscriptions):
+            raise ValueError("DESTINATIONS must not read the same subscription more than once")
+        return configs
 
 
-def _read_env(name: str) -> str | None:
+def _read_env(name: str, overrides: Mapping[str, str] | None = None) -> str | None:
+    if overrides is not None and name in overrides:
+        return overrides[name]
     return os.getenv(name)
 
 
-def _read_required_env(name: str) -> str:
-    value = os.getenv(name)
+def _read_required_env(name: str, overrides: Mapping[str, str] | None = None) -> str:
+    value = _read_env(name, overrides)
     if value is None or value.strip() == "":
         raise RuntimeError(f"Missing required configuration: {name}")
     return value
 
 
-def _read_int_env(name: str) -> int | None:
-    value = os.getenv(name)
+def _read_int_env(name: str, overrides: Mapping[str, str] | None = None) -> int | None:
+    value = _read_env(name, overrides)
     return int(value) if value is not None else None
 
 
-def _read_positive_int_env(name: str) -> int | None:
-    value = _read_int_env(name)
+def _read_positive_int_env(name: str, overrides: Mapping[str, str] | None = None) -> int | None:
+    value = _read_int_env(name, overrides)
     if value is None:
         return None
     if value <= 0:
@@ -9,8 +9,11 @@ Mirrors ``hl7_subscription_sender/application.py`` exactly except:
 import configparser
 import logging
 import os
+import threading
+import time
+from typing import Callable
 
-from azure.servicebus import ServiceBusMessage
+from azure.servicebus import NEXT_AVAILABLE_SESSION, ServiceBusMessage
 from event_logger_lib import EventLogger
 from health_check_lib.health_check_server import TCPHealthCheckServer
 from message_bus_lib.connection_config import ConnectionConfig
@@ -18,10 +21,9 @@ from message_bus_lib.metadata_utils import correlation_id_for_logger, extract_me
 from message_bus_lib.servicebus_client_factory import ServiceBusClientFactory
 from message_bus_lib.subscription_receiver_client import SubscriptionReceiverClient
 from metric_sender_lib.metric_sender import MetricSender
-from processor_manager_lib import ProcessorManager
+from processor_manager_lib import CircuitBreaker, MessageThrottler, ProcessorManager, StageTimer
 
 from soap_subscription_sender.app_config import AppConfig
-from soap_subscription_sender.message_throttler import MessageThrottler
 from soap_subscription_sender.soap_ack_processor import get_ack_result
 from soap_subscription_sender.soap_subscription_sender_client import SOAPSubscriptionSenderClient
 
@@ -66,14 +68,79 @@ def _calculate_batch_size(throttler: MessageThrottler) -> int:
 def main() -> None:
     processor_manager = ProcessorManager()
 
-    app_config = AppConfig.read_env_config()
-    client_config = ConnectionConfig(app_config.connection_string, app_config.service_bus_namespace)
+    app_configs = AppConfig.read_destination_configs()
+    # Service Bus and health check settings are the same for every destination.
+    shared_config = app_configs[0]
+    client_config = ConnectionConfig(shared_config.connection_string, shared_config.service_bus_namespace)
     factory = ServiceBusClientFactory(client_config)
+
+    with TCPHealthCheckServer(
+        shared_config.health_check_hostname, shared_config.health_check_port
+    ) as health_check_server:
+        health_check_server.start()
+        if len(app_configs) == 1:
+            _run_destination(shared_config, factory, processor_manager)
+        else:
+            _run_destinations(app_configs, factory, processor_manager)
+
+
+def _run_destinations(
+    app_configs: list[AppConfig], factory: ServiceBusClientFactory, processor_manager: ProcessorManager
+) -> None:
+    """Run each destination on its own thread, stopping them all if any of them fails."""
+
+    def destination_worker(app_config: AppConfig) -> Callable[[ServiceBusClientFactory], None]:
+        return lambda worker_factory: _run_destination(app_config, worker_factory, processor_manager)
+
+    _run_workers(
+        [(app_config.ingress_subscription_name, destination_worker(app_config)) for app_config in app_configs],
+        factory,
+        processor_manager,
+    )
+
+
+def _run_workers(
+    workers: list[tuple[str, Callable[[ServiceBusClientFactory], None]]],
+    factory: ServiceBusClientFactory,
+    processor_manager: ProcessorManager,
+) -> None:
+    """
+    Run each named worker on its own thread with its own Service Bus client, stopping them all if any of them fails.
+    """
+    failures: list[Exception] = []
+
+    def run(name: str, worker: Callable[[ServiceBusClientFactory], None]) -> None:
+        try:
+            with factory.create_worker_factory() as worker_factory:
+                worker(worker_factory)
+        except Exception as e:
+            logger.exception("Worker %s failed, stopping", name)
+            failures.append(e)
+            processor_manager.stop()
+
+    threads = [threading.Thread(target=run, args=(name, worker), name=name) for name, worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if failures:
+        raise RuntimeError(f"{len(failures)} of {len(threads)} worker(s) failed") from failures[0]
+
+
+def _run_destination(
+    app_config: AppConfig, factory: ServiceBusClientFactory, processor_manager: ProcessorManager
+) -> None:
     event_logger = EventLogger(app_config.workflow_id, app_config.microservice_id)
     metric_sender = MetricSender(
         app_config.workflow_id, app_config.microservice_id, app_config.health_board, app_config.peer_service
     )
-    throttler = MessageThrottler(app_config.max_messages_per_minute)
+    throttler = MessageThrottler(
+        app_config.max_messages_per_minute,
+        burst=app_config.throttle_burst,
+        min_messages_per_minute=app_config.min_messages_per_minute,
+        latency_threshold_seconds=app_config.throttle_latency_threshold_seconds,
+        metric_sender=metric_sender,
+    )
 
     logger.info(
         "Connecting to Azure Service Bus subscription: %s/%s, SOAP endpoint: %s",
@@ -81,36 +148,83 @@ def main() -> None:
         app_config.ingress_subscription_name,
         app_config.soap_endpoint_url,
     )
-    with (
-        factory.create_subscription_receiver_client(
-            app_config.ingress_topic_name,
-            app_config.ingress_subscription_name,
-            app_config.ingress_session_id,
-        ) as subscription_receiver_client,
-        SOAPSubscriptionSenderClient(
-            app_config.soap_endpoint_url,
-            app_config.soap_timeout_seconds,
-            app_config.soap_api_key,
-            app_config.soap_client_cert_path,
-        ) as soap_client,
-        TCPHealthCheckServer(app_config.health_check_hostname, app_config.health_check_port) as health_check_server,
-    ):
-        logger.info("SOAP subscription sender started.")
-        health_check_server.start()
-
+    session_workers = app_config.soap_max_concurrent_requests or 1
+    with SOAPSubscriptionSenderClient(
+        app_config.soap_endpoint_url,
+        app_config.soap_timeout_seconds,
+        app_config.soap_api_key,
+        app_config.soap_client_cert_path,
+        pool_size=session_workers,
+        gzip_requests=app_config.soap_gzip_requests,
+    ) as soap_client:
         batch_size = _calculate_batch_size(throttler)
-
-        while processor_manager.is_running:
-            subscription_receiver_client.receive_messages(
-                batch_size,
-                lambda message: _process_message(
-                    message,
-                    soap_client,
-                    event_logger,
-                    metric_sender,
-                    throttler,
-                ),
+        circuit_breaker = (
+            CircuitBreaker(
+                app_config.circuit_breaker_failure_threshold,
+                _destination_probe(soap_client, app_config.circuit_breaker_probe_message),
+                probe_interval_seconds=app_config.circuit_breaker_probe_interval_seconds,
+                metric_sender=metric_sender,
             )
+            if app_config.circuit_breaker_failure_threshold
+            else None
+        )
+
+        def receive(subscription_receiver_client: SubscriptionReceiverClient) -> None:
+            while processor_manager.is_running:
+                if circuit_breaker is None or circuit_breaker.wait_until_closed(
+                    lambda: processor_manager.is_running, on_closed=subscription_receiver_client.clear_retry_delay
+                ):
+                    subscription_receiver_client.receive_messages(
+                        batch_size,
+                        lambda message: _process_message(
+                            message,
+                            soap_client,
+                            event_logger,
+                            metric_sender,
+                            throttler,
+                            circuit_breaker=circuit_breaker,
+                        ),
+                    )
+
+        if session_workers == 1:
+            with factory.create_subscription_receiver_client(
+                app_config.ingress_topic_name,
+                app_config.ingress_subscription_name,
+                app_config.ingress_session_id,
+                time_settling=True,
+            ) as subscription_receiver_client:
+                logger.info("SOAP subscription sender started.")
+                receive(subscription_receiver_client)
+            return
+
+        def run_session_worker(worker_factory: ServiceBusClientFactory) -> None:
+            # Each receive locks whichever session next has messages, so no two workers send from the same session.
+            with worker_factory.create_subscription_receiver_client(
+                app_config.ingress_topic_name,
+                app_config.ingress_subscription_name,
+                NEXT_AVAILABLE_SESSION,
+                time_settling=True,
+            ) as subscription_receiver_client:
+                receive(subscription_receiver_client)
+
+        logger.info("SOAP subscription sender started, sending from up to %d session(s) at once.", session_workers)
+        _run_workers(
+            [
+                (f"{app_config.ingress_subscription_name}-session-worker-{index}", run_session_worker)
+                for index in range(session_workers)
+            ],
+            factory,
+            processor_manager,
+        )
+
+
+def _destination_probe(soap_client: SOAPSubscriptionSenderClient, probe_message: str | None) -> Callable[[], bool]:
+    """Check the endpoint by connecting to it, or by sending ``probe_message`` and expecting success."""
+    if probe_message is None:
+        return soap_client.check_connection
+    # Segments may be separated by newlines in the environment variable.
+    er7 = "\r".join(probe_message.splitlines())
+    return lambda: get_ack_result(*soap_client.send_message(er7))
 
 
 def _process_message(
@@ -119,11 +233,69 @@ def _process_message(
     event_logger: EventLogger,
     metric_sender: MetricSender,
     throttler: MessageThrottler,
+    circuit_breaker: CircuitBreaker | None = None,
 ) -> bool:
+    stage_timer = StageTimer(metric_sender)
+    message_body, correlation_id_opt = _read_message(message)
+
+    message_id = "UNKNOWN"
+    try:
+        message_id = _audit_message(message_body, event_logger, correlation_id_opt)
+        stage_timer.mark("prepare")
+
+        status_code, ack_success, latency_seconds = _send_message(message_body, soap_client, throttler, stage_timer)
+        ack_success = _record_response(
+            message_body,
+            message_id,
+            status_code,
+            ack_success,
+            latency_seconds,
+            event_logger,
+            metric_sender,
+            throttler,
+            circuit_breaker,
+            correlation_id_opt,
+        )
+        stage_timer.mark("record")
+        return ack_success
+
+    except (TimeoutError, ConnectionError) as e:
+        stage_timer.mark("ack_wait")
+        _record_send_failure(message_body, message_id, e, event_logger, throttler, circuit_breaker, correlation_id_opt)
+        stage_timer.mark("record")
+        return False
+
+    except Exception as e:
+        _log_unexpected_error(message_body, e, event_logger, correlation_id_opt)
+        return False
+
+    finally:
+        stage_timer.finish()
+
+
+def _send_message(
+    message_body: str,
+    soap_client: SOAPSubscriptionSenderClient,
+    throttler: MessageThrottler,
+    stage_timer: StageTimer,
+) -> tuple[int, bool, float]:
+    """Send one message once the throttler allows, returning its status code, ACK result and latency."""
+    throttler.wait_if_needed()
+    stage_timer.mark("throttle")
+    sent_at = time.monotonic()
+    # The session connects when it has no idle connection, so connecting is part of the ACK wait here.
+    status_code, response_body = soap_client.send_message(message_body)
+    latency_seconds = time.monotonic() - sent_at
+    stage_timer.mark("ack_wait")
+    ack_success = get_ack_result(status_code, response_body)
+    stage_timer.mark("ack_parse")
+    return status_code, ack_success, latency_seconds
+
+
+def _read_message(message: ServiceBusMessage) -> tuple[str, str | None]:
     message_body = b"".join(message.body).decode("utf-8")
     metadata: dict[str, str] | None = extract_metadata(message)
     meta = get_metadata_log_values(metadata)
-    correlation_id_opt = correlation_id_for_logger(meta)
     logger.info(
         "Message received for SOAP sending - CorrelationId: %s, WorkflowID: %s, "
         "SourceSystem: %s, MessageReceivedAt: %s",
@@ -132,58 +304,87 @@ def _process_message(
         meta["source_system"],
         meta["message_received_at"],
     )
+    return message_body, correlation_id_for_logger(meta)
+
 
+def _audit_message(message_body: str, event_logger: EventLogger, correlation_id_opt: str | None) -> str:
+    """Audit the received message and return its message control id."""
+    event_logger.log_message_received(
+        message_body, "Message received for SOAP sending", correlation_id=correlation_id_opt
+    )
+
+    # Extract message ID from MSH-10 for logging — no hl7apy dependency.
     message_id = "UNKNOWN"
-    try:
-        event_logger.log_message_received(
-            message_body, "Message received for SOAP sending", correlation_id=correlation_id_opt
-        )
+    segments = message_body.splitlines()
+    if segments:
+        msh_fields = segments[0].split("|")
+        message_id = msh_fields[9] if len(msh_fields) > 9 else "UNKNOWN"
+    logger.info("Message ID: %s", message_id)
+    return message_id
+
 
-        # Extract message ID from MSH-10 for logging — no hl7apy dependency.
-        segments = message_body.splitlines()
-        if segments:
-            msh_fields = segments[0].split("|")
-            message_id = msh_fields[9] if len(msh_fields) > 9 else "UNKNOWN"
-        logger.info("Message ID: %s", message_id)
+def _record_response(
+    message_body: str,
+    message_id: str,
+    status_code: int,
+    ack_success: bool,
+    latency_seconds: float,
+    event_logger: EventLogger,
+    metric_sender: MetricSender,
+    throttler: MessageThrottler,
+    circuit_breaker: CircuitBreaker | None,
+    correlation_id_opt: str | None,
+) -> bool:
+    throttler.record_ack(ack_success, latency_seconds)
+    if circuit_breaker is not None:
+        circuit_breaker.record_success()
 
-        throttler.wait_if_needed()
-        status_code, response_body = soap_client.send_message(message_body)
-        ack_success = get_ack_result(status_code, response_body)
+    if ack_success:
+        metric_sender.send_message_sent_metric()
 
-        if ack_success:
-            metric_sender.send_message_sent_metric()
+    event_logger.log_message_processed(
+        message_body,
+        f"SOAP send result: HTTP {status_code}, success={ack_success}",
+        correlation_id=correlation_id_opt,
+    )
+    logger.info("Sent message: %s", message_id)
 
-        event_logger.log_message_processed(
-            message_body,
-            f"SOAP send result: HTTP {status_code}, success={ack_success}",
-            correlation_id=correlation_id_opt,
-        )
-        logger.info("Sent message: %s", message_id)
+    return ack_success
 
-        return ack_success
 
-    except (TimeoutError, ConnectionError) as e:
-        error_msg = f"Failed to send message {message_id}: {e}"
-        logger.error(error_msg)
-        event_logger.log_message_failed(
-            message_body,
-            error_msg,
-            "Message sending failed - connection/timeout error",
-            correlation_id=correlation_id_opt,
-        )
-        return False
+def _record_send_failure(
+    message_body: str,
+    message_id: str,
+    error: Exception,
+    event_logger: EventLogger,
+    throttler: MessageThrottler,
+    circuit_breaker: CircuitBreaker | None,
+    correlation_id_opt: str | None,
+) -> None:
+    throttler.record_ack(False)
+    if circuit_breaker is not None:
+        circuit_breaker.record_failure()
+    error_msg = f"Failed to send message {message_id}: {error}"
+    logger.error(error_msg)
+    event_logger.log_message_failed(
+        message_body,
+        error_msg,
+        "Message sending failed - connection/timeout error",
+        correlation_id=correlation_id_opt,
+    )
 
-    except Exception as e:
-        error_msg = f"Unexpected error while processing message: {e}"
-        logger.error(error_msg)
-        event_logger.log_message_failed(
-            message_body,
-            error_msg,
-            "Unexpected processing error",
-            correlation_id=correlation_id_opt,
-        )
-        return False
 
+def _log_unexpected_error(
+    message_body: str, error: Exception, event_logger: EventLogger, correlation_id_opt: str | None
+) -> None:
+    error_msg = f"Unexpected error while processing message: {error}"
+    logger.error(error_msg)
+    event_logger.log_message_failed(
+        message_body,
+        error_msg,
+        "Unexpected processing error",
+        correlation_id=correlation_id_opt,
+    )
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,154 @@
+"""
+Throughput benchmark for SOAP delivery, without Service Bus.
+
+Start the http_mock_receiver, then run from the service directory:
+
+    python -m soap_subscription_sender.benchmark --endpoint http://localhost:8080/soap --concurrency 1 4 8
+
+Each concurrency level sends the same generated messages through ``SOAPSubscriptionSenderClient`` from that many
+worker threads, as the application does with ``SOAP_MAX_CONCURRENT_REQUESTS`` set. The messages are spread over
+``--sessions`` sessions. Each worker takes the next session no other worker holds, sends up to ``--batch-size`` of
+its messages in order, and releases it, as a receiver on the next available session does. Failures are counted,
+not sent again. With ``--sessions 1`` every message is sent in order, as with ``INGRESS_SESSION_ID`` set.
+"""
+
+import argparse
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional, Sequence
+
+from soap_subscription_sender.soap_ack_processor import get_ack_result
+from soap_subscription_sender.soap_subscription_sender_client import SOAPSubscriptionSenderClient
+
+DEFAULT_CONCURRENCY = (1, 4, 8)
+DEFAULT_MESSAGES = 500
+DEFAULT_SESSIONS = 8
+DEFAULT_BATCH_SIZE = 10
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    concurrency: int
+    gzip_requests: bool
+    messages: int
+    failures: int
+    seconds: float
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.messages / self.seconds if self.seconds > 0 else 0.0
+
+
+def generate_messages(count: int) -> List[str]:
+    """ADT^A28 messages with unique control ids and a few PID/PV1 segments, around 1 KB each."""
+    return [
+        "\r".join(
+            [
+                f"MSH|^~\\&|BENCH|252|HUB|100|20250101000000||ADT^A28^ADT_A05|BENCH{index:08d}|P|2.5|||AL|NE",
+                "EVN|A28|20250101000000",
+                f"PID|1||{index:010d}^^^NHS^NH||TEST^PATIENT^{index}||19800101|U|||1 TEST STREET^^CARDIFF^^CF10 1AA",
+                "PD1|||TEST PRACTICE^^W00000",
+                "PV1|1|O|||||G0000000^TEST^GP",
+            ]
+            + [f"NTE|{line}|L|Benchmark padding line {line} for message {index}" for line in range(1, 8)]
+        )
+        for index in range(count)
+    ]
+
+
+def run_benchmark(
+    endpoint_url: str,
+    messages: Sequence[str],
+    concurrency: int,
+    gzip_requests: bool = False,
+    sessions: int = DEFAULT_SESSIONS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    timeout_seconds: int = 30,
+) -> BenchmarkResult:
+    if sessions < 1:
+        raise ValueError("sessions must be at least 1")
+
+    # Sessions waiting for a worker, each with its messages in order.
+    available: Deque[Deque[str]] = deque(
+        deque(messages[index] for index in range(session, len(messages), sessions))
+        for session in range(min(sessions, len(messages)))
+    )
+    lock = threading.Lock()
+    failures = 0
+
+    with SOAPSubscriptionSenderClient(
+        endpoint_url, timeout_seconds, pool_size=concurrency, gzip_requests=gzip_requests
+    ) as client:
+
+        def send_from_sessions() -> None:
+            nonlocal failures
+            while True:
+                with lock:
+                    if not available:
+                        return
+                    session = available.popleft()
+                for _ in range(min(batch_size, len(session))):
+                    if not get_ack_result(*client.send_message(session.popleft())):
+                        with lock:
+                            failures += 1
+                if session:
+                    with lock:
+                        available.append(session)
+
+        # Warm up the connection pool so connection setup is not measured.
+        warm_up = [threading.Thread(target=client.send_message, args=(messages[0],)) for _ in range(concurrency)]
+        for thread in warm_up:
+            thread.start()
+        for thread in warm_up:
+            thread.join()
+
+        started_at = time.perf_counter()
+        workers = [threading.Thread(target=send_from_sessions) for _ in range(concurrency)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        seconds = time.perf_counter() - started_at
+
+    return BenchmarkResult(concurrency, gzip_requests, len(messages), failures, seconds)
+
+
+def format_results(results: Sequence[BenchmarkResult]) -> str:
+    lines = [f"{'concurrency':>11}  {'gzip':>5}  {'messages':>8}  {'failures':>8}  {'msg/s':>9}"]
+    for result in results:
+        lines.append(
+            f"{result.concurrency:>11}  {str(result.gzip_requests):>5}  {result.messages:>8}  "
+            f"{result.failures:>8}  {result.messages_per_second:>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoint", required=True, help="SOAP endpoint URL, e.g. http://localhost:8080/soap")
+    parser.add_argument("--messages", type=int, default=DEFAULT_MESSAGES, help="messages per run")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=list(DEFAULT_CONCURRENCY))
+    parser.add_argument("--gzip", action="store_true", help="also run each level with gzip request bodies")
+    parser.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS, help="sessions to spread messages over")
+    parser.add_argument(
+        "--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="messages a worker sends before releasing a session"
+    )
+    args = parser.parse_args(argv)
+    if args.sessions < 1:
+        parser.error("--sessions must be at least 1")
+
+    messages = generate_messages(args.messages)
+    results = [
+        run_benchmark(args.endpoint, messages, concurrency, gzip_requests, args.sessions, args.batch_size)
+        for concurrency in args.concurrency
+        for gzip_requests in ((False, True) if args.gzip else (False,))
+    ]
+    print(format_results(results))
+    return 1 if any(result.failures for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
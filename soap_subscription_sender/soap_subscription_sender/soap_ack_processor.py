@@ -6,12 +6,98 @@ from __future__ import annotations
 
 import logging
 import xml.etree.ElementTree as ET
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import cast
 
 logger = logging.getLogger(__name__)
 
 _SUCCESS_CODES = ("AA", "CA")
 _HTTP_SUCCESS = (200, 202)
 
+# Characters first fed to the pull parser. Each later chunk is twice as long, so a short response is read in
+# small steps that stop soon after a Fault, and a long one in few feed calls.
+_CHUNK_SIZE = 1024
+
+# Fault reason elements: <faultstring> in SOAP 1.1, <Reason><Text> in SOAP 1.2.
+_FAULT_REASON_TAGS = ("faultstring", "Text")
+
+
+@dataclass(frozen=True)
+class SoapAckResult:
+    status_code: int                  # HTTP response status code
+    ack_code: str | None              # <Status> value, e.g. "AA" (if found)
+    message_control_id: str | None    # <MessageControlID> value (if found)
+    is_fault: bool                    # True when the body contains a SOAP Fault
+    fault_reason: str | None          # <faultstring> or <Reason><Text> value (if found)
+
+    @property
+    def success(self) -> bool:
+        if self.status_code not in _HTTP_SUCCESS or self.is_fault:
+            return False
+        return self.ack_code is None or self.ack_code in _SUCCESS_CODES
+
+
+def parse_soap_ack(status_code: int, response_body: str) -> SoapAckResult:
+    """Extract the acknowledgement from a SOAP response body without parsing more of it than needed.
+
+    Elements are matched by local name, so a namespace-qualified ``Status`` or
+    ``Fault`` is found as well as an unqualified one. A Fault anywhere in the
+    SOAP Body makes the response a fault, so the whole Body is read, even after
+    the ACK elements, but each element is dropped once it has been read. Parsing
+    stops when the Body closes, and once a Fault's reason has been read or the
+    Fault closes. Without a Body element the whole document is read.
+
+    If the body is not well-formed XML, whatever was found before the error is
+    kept, and a body with no Fault element is treated as a fault if it contains
+    the text "Fault", as a plain-text error page from the endpoint would.
+
+    Args:
+        status_code: HTTP response status code.
+        response_body: Raw response body string.
+
+    Returns:
+        A ``SoapAckResult`` describing the acknowledgement.
+    """
+    ack_code: str | None = None
+    message_control_id: str | None = None
+    is_fault = False
+    fault_reason: str | None = None
+
+    body_depth = fault_depth = 0
+    depth = 0
+    if response_body.strip():
+        try:
+            for event, element in _iter_parse_events(response_body):
+                name = element.tag.rpartition("}")[2]
+                if event == "start":
+                    depth += 1
+                    if name == "Body" and not body_depth:
+                        body_depth = depth
+                    elif name == "Fault" and not is_fault:
+                        is_fault, fault_depth = True, depth
+                    continue
+
+                if name == "Status" and ack_code is None:
+                    ack_code = (element.text or "").strip()
+                elif name == "MessageControlID" and message_control_id is None:
+                    message_control_id = (element.text or "").strip()
+                elif is_fault and name in _FAULT_REASON_TAGS and fault_reason is None:
+                    fault_reason = (element.text or "").strip()
+                depth -= 1
+                # Whatever was needed from the element has been read, so its content, such as a Detail, is not kept.
+                element.clear()
+
+                if is_fault and (fault_reason is not None or depth < fault_depth):
+                    break
+                if body_depth and depth < body_depth:
+                    break
+        except ET.ParseError:
+            logger.warning("Could not parse SOAP response as XML — body:\n%s", response_body[:200])
+            is_fault = is_fault or "Fault" in response_body
+
+    return SoapAckResult(status_code, ack_code, message_control_id, is_fault, fault_reason)
+
 
 def get_ack_result(status_code: int, response_body: str) -> bool:
     """Evaluate a SOAP HTTP response and return True on success."""
@@ -19,22 +105,36 @@ def get_ack_result(status_code: int, response_body: str) -> bool:
         logger.error("SOAP endpoint returned HTTP %s — treating as failure.", status_code)
         return False
 
-    if "Fault" in response_body:
-        logger.error("SOAP fault received:\n%s", response_body[:500])
+    result = parse_soap_ack(status_code, response_body)
+
+    if result.is_fault:
+        logger.error("SOAP fault received — %s:\n%s", result.fault_reason, response_body[:500])
         return False
 
-    try:
-        root = ET.fromstring(response_body)
-        for elem in root.iter("Status"):
-            status_value = (elem.text or "").strip()
-            if status_value in _SUCCESS_CODES:
-                logger.info("SOAP ACK received — Status: %s", status_value)
-                return True
-            else:
-                logger.error("SOAP negative ACK — Status: %s", status_value)
-                return False
-    except ET.ParseError:
-        logger.warning("Could not parse SOAP response as XML — body:\n%s", response_body[:200])
+    if result.ack_code is not None:
+        if result.success:
+            logger.info("SOAP ACK received — Status: %s", result.ack_code)
+        else:
+            logger.error("SOAP negative ACK — Status: %s", result.ack_code)
+        return result.success
 
     logger.info("HTTP %s received with no fault or status element — treating as success.", status_code)
     return True
+
+
+def _iter_parse_events(response_body: str) -> Iterator[tuple[str, ET.Element]]:
+    """Yield start and end events, feeding the parser in growing chunks so the caller can stop early."""
+    parser: ET.XMLPullParser[ET.Element] = ET.XMLPullParser(events=("start", "end"))
+    offset, chunk_size = 0, _CHUNK_SIZE
+    while offset < len(response_body):
+        parser.feed(response_body[offset:offset + chunk_size])
+        yield from _read_events(parser)
+        offset += chunk_size
+        chunk_size *= 2
+    parser.close()
+    yield from _read_events(parser)
+
+
+def _read_events(parser: ET.XMLPullParser[ET.Element]) -> Iterator[tuple[str, ET.Element]]:
+    # Only start and end events are requested, and both carry the element.
+    return cast("Iterator[tuple[str, ET.Element]]", parser.read_events())
@@ -0,0 +1,212 @@
+import json
+import unittest
+from typing import Optional
+from unittest.mock import Mock, patch
+
+from soap_subscription_sender.app_config import AppConfig
+
+
+def _required_values() -> dict[str, str]:
+    return {
+        "INGRESS_TOPIC_NAME": "test-topic",
+        "INGRESS_SUBSCRIPTION_NAME": "test-subscription",
+        "SOAP_ENDPOINT_URL": "https://example.test/hl7",
+        "WORKFLOW_ID": "test-workflow",
+        "MICROSERVICE_ID": "test-microservice",
+        "HEALTH_BOARD": "test health board",
+        "PEER_SERVICE": "test-service",
+    }
+
+
+class TestAppConfig(unittest.TestCase):
+    @patch("soap_subscription_sender.app_config.os.getenv")
+    def test_read_env_config_returns_config(self, mock_getenv: Mock) -> None:
+        def getenv_side_effect(name: str) -> Optional[str]:
+            values = {
+                **_required_values(),
+                "SERVICE_BUS_CONNECTION_STRING": "conn_str",
+                "SERVICE_BUS_NAMESPACE": "namespace",
+                "INGRESS_SESSION_ID": "ingress_session",
+                "SOAP_TIMEOUT_SECONDS": "10",
+                "SOAP_API_KEY": "api-key",
+                "WS_SECURITY_ENABLED": "TRUE",
+                "HEALTH_CHECK_HOST": "localhost",
+                "HEALTH_CHECK_PORT": "9000",
+            }
+            return values.get(name)
+
+        mock_getenv.side_effect = getenv_side_effect
+
+        config = AppConfig.read_env_config()
+        self.assertEqual(config.connection_string, "conn_str")
+        self.assertEqual(config.service_bus_namespace, "namespace")
+        self.assertEqual(config.ingress_topic_name, "test-topic")
+        self.assertEqual(config.ingress_subscription_name, "test-subscription")
+        self.assertEqual(config.ingress_session_id, "ingress_session")
+        self.assertEqual(config.soap_endpoint_url, "https://example.test/hl7")
+        self.assertEqual(config.soap_timeout_seconds, 10)
+        self.assertEqual(config.soap_api_key, "api-key")
+        self.assertIsNone(config.soap_client_cert_path)
+        self.assertTrue(config.ws_security_enabled)
+        self.assertEqual(config.health_check_hostname, "localhost")
+        self.assertEqual(config.health_check_port, 9000)
+        self.assertEqual(config.workflow_id, "test-workflow")
+        self.assertEqual(config.microservice_id, "test-microservice")
+        self.assertEqual(config.health_board, "test health board")
+        self.assertEqual(config.peer_service, "test-service")
+        self.assertIsNone(config.max_messages_per_minute)
+        self.assertEqual(config.throttle_burst, 1)
+        self.assertIsNone(config.circuit_breaker_failure_threshold)
+        self.assertIsNone(config.soap_max_concurrent_requests)
+        self.assertFalse(config.soap_gzip_requests)
+
+    @patch("soap_subscription_sender.app_config.os.getenv")
+    def test_read_env_config_defaults(self, mock_getenv: Mock) -> None:
+        mock_getenv.side_effect = _required_values().get
+
+        config = AppConfig.read_env_config()
+
+        self.assertEqual(config.soap_timeout_seconds, 30)
+        self.assertFalse(config.ws_security_enabled)
+        self.assertIsNone(config.ingress_session_id)
+        self.assertIsNone(config.health_check_port)
+
+    @patch("soap_subscription_sender.app_config.os.getenv")
+    def test_read_env_config_delivery(self, mock_getenv: Mock) -> None:
+        values = {**_required_values(), "SOAP_MAX_CONCURRENT_REQUESTS": "4", "SOAP_GZIP_REQUESTS": "true"}
+        mock_getenv.side_effect = values.get
+
+        config = AppConfig.read_env_config()
+
+        self.assertEqual(config.soap_max_concurrent_requests, 4)
+        self.assertTrue(config.soap_gzip_requests)
+
+        values["SOAP_MAX_CONCURRENT_REQUESTS"] = "0"
+        with self.assertRaises(ValueError):
+            AppConfig.read_env_config()
+
+        values.update({"SOAP_MAX_CONCURRENT_REQUESTS": "4", "INGRESS_SESSION_ID": "session"})
+        with self.assertRaises(ValueError):
+            AppConfig.read_env_config()
+
+        values["SOAP_MAX_CONCURRENT_REQUESTS"] = "1"
+        self.assertEqual(AppConfig.read_env_config().ingress_session_id, "session")
+
+    @patch("soap_subscription_sender.app_config.os.getenv")
+    def test_read_env_config_throttle_and_circuit_breaker(self, mock_getenv: Mock) -> None:
+        values = {
+            **_required_values(),
+            "MAX_MESSAGES_PER_MINUTE": "120",
+            "THROTTLE_BURST": "5",
+            "MIN_MESSAGES_PER_MINUTE": "30",
+            "THROTTLE_LATENCY_THRESHOLD_SECONDS": "2",
+            "CIRCUIT_BREAKER_FAILURE_THRESHOLD": "3",
+            "CIRCUIT_BREAKER_PROBE_INTERVAL_SECONDS": "10",
+            "CIRCUIT_BREAKER_PROBE_MESSAGE": "MSH|^~\\&|PROBE",
+        }
+        mock_getenv.side_effect = values.get
+
+        config = AppConfig.read_env_config()
+
+        self.assertEqual(config.max_messages_per_minute, 120)
+        self.assertEqual(config.throttle_burst, 5)
+        self.assertEqual(config.min_messages_per_minute, 30)
+        self.assertEqual(config.throttle_latency_threshold_seconds, 2)
+        self.assertEqual(config.circuit_breaker_failure_threshold, 3)
+        self.assertEqual(config.circuit_breaker_probe_interval_seconds, 10)
+        self.assertEqual(config.circuit_breaker_probe_message, "MSH|^~\\&|PROBE")
+
+        values["THROTTLE_BURST"] = "0"
+        with self.assertRaises(ValueError):
+            AppConfig.read_env_config()
+
+    @patch("soap_subscription_sender.app_config.os.getenv")
+    def test_read_env_config_missing_required_env_var_raises_error(self, mock_getenv: Mock) -> None:
+        mock_getenv.return_value = None
+        with self.assertRaises(RuntimeError) as context:
+            AppConfig.read_env_config()
+        self.assertIn("Missing required configuration", str(context.exception))
+
+    @patch("soap_subscription_sender.app_config.os.getenv")
+    def test_read_destination_configs_without_destinations(self, mock_getenv: Mock) -> None:
+        mock_getenv.side_effect = _required_values().get
+
+        configs = AppConfig.read_destination_configs()
+
+        self.assertEqual(configs, [AppConfig.read_env_config()])
+
+    @patch("soap_subscription_sender.app_config.os.getenv")
+    def test_read_destination_configs_overrides_the_environment(self, mock_getenv: Mock) -> None:
+        values = {
+            "WORKFLOW_ID": "test-workflow",
+            "MICROSERVICE_ID": "test-microservice",
+            "HEALTH_BOARD": "test health board",
+            "INGRESS_TOPIC_NAME": "test-topic",
+            "HEALTH_CHECK_PORT": "9000",
+            "MAX_MESSAGES_PER_MINUTE": "60",
+            "DESTINATIONS": json.dumps(
+                [
+                    {
+                        "INGRESS_SUBSCRIPTION_NAME": "sub-a",
+                        "SOAP_ENDPOINT_URL": "https://a.test/hl7",
+                        "SOAP_TIMEOUT_SECONDS": 5,
+                        "PEER_SERVICE": "service-a",
+                    },
+                    {
+                        "INGRESS_SUBSCRIPTION_NAME": "sub-b",
+                        "SOAP_ENDPOINT_URL": "https://b.test/hl7",
+                        "PEER_SERVICE": "service-b",
+                        "MAX_MESSAGES_PER_MINUTE": "600",
+                    },
+                ]
+            ),
+        }
+        mock_getenv.side_effect = values.get
+
+        first, second = AppConfig.read_destination_configs()
+
+        self.assertEqual(
+            (first.ingress_subscription_name, first.soap_endpoint_url, first.soap_timeout_seconds),
+            ("sub-a", "https://a.test/hl7", 5),
+        )
+        self.assertEqual(first.max_messages_per_minute, 60)
+        self.assertEqual(second.peer_service, "service-b")
+        self.assertEqual(second.soap_timeout_seconds, 30)
+        self.assertEqual(second.max_messages_per_minute, 600)
+        self.assertEqual(first.health_check_port, second.health_check_port)
+
+    @patch("soap_subscription_sender.app_config.os.getenv")
+    def test_read_destination_configs_rejects_invalid_destinations(self, mock_getenv: Mock) -> None:
+        destination = {
+            "INGRESS_SUBSCRIPTION_NAME": "sub-a",
+            "SOAP_ENDPOINT_URL": "https://a.test/hl7",
+            "PEER_SERVICE": "service-a",
+        }
+        values = {
+            "WORKFLOW_ID": "test-workflow",
+            "MICROSERVICE_ID": "test-microservice",
+            "HEALTH_BOARD": "test health board",
+            "INGRESS_TOPIC_NAME": "test-topic",
+        }
+        mock_getenv.side_effect = values.get
+
+        for destinations in (
+            "not json",
+            "[]",
+            json.dumps(destination),
+            json.dumps([destination, destination]),
+            json.dumps([{**destination, "HEALTH_CHECK_PORT": "9001"}]),
+            json.dumps([{**destination, "SERVICE_BUS_NAMESPACE": "other"}]),
+        ):
+            with self.subTest(destinations=destinations):
+                values["DESTINATIONS"] = destinations
+                with self.assertRaises(ValueError):
+                    AppConfig.read_destination_configs()
+
+        values["DESTINATIONS"] = json.dumps([{"INGRESS_SUBSCRIPTION_NAME": "sub-a"}])
+        with self.assertRaises(RuntimeError):
+            AppConfig.read_destination_configs()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,326 @@
+import threading
+import time
+import unittest
+from dataclasses import replace
+from unittest.mock import MagicMock, Mock, patch
+
+from azure.servicebus import NEXT_AVAILABLE_SESSION, ServiceBusMessage  # type: ignore
+from message_bus_lib.subscription_receiver_client import SubscriptionReceiverClient
+
+from soap_subscription_sender.app_config import AppConfig
+from soap_subscription_sender.application import (
+    _process_message,
+    _run_destination,
+    _run_destinations,
+    main,
+)
+
+HL7_MESSAGE = "MSH|^~\\&|SENDER|FAC|RECEIVER|FAC|20250101101010||ADT^A31^ADT_A05|MSGID1234|P|2.5\rPID|1"
+
+
+def _app_config() -> AppConfig:
+    return AppConfig(
+        connection_string=None,
+        service_bus_namespace=None,
+        ingress_topic_name="test-topic",
+        ingress_subscription_name="test-subscription",
+        ingress_session_id=None,
+        soap_endpoint_url="https://example.test/hl7",
+        soap_timeout_seconds=30,
+        soap_api_key=None,
+        soap_client_cert_path=None,
+        ws_security_enabled=False,
+        health_check_hostname="localhost",
+        health_check_port=9000,
+        workflow_id="test_workflow_id",
+        microservice_id="test_microservice_id",
+        health_board="test-health-board",
+        peer_service="test-service",
+        max_messages_per_minute=None,
+    )
+
+
+def _setup() -> tuple[ServiceBusMessage, MagicMock, MagicMock, MagicMock, MagicMock]:
+    service_bus_message = ServiceBusMessage(body=HL7_MESSAGE)
+    mock_soap_client = MagicMock()
+    mock_soap_client.send_message.return_value = (200, "<ack/>")
+    return service_bus_message, mock_soap_client, MagicMock(), MagicMock(), MagicMock()
+
+
+def _message_id(message_body: str) -> str:
+    return message_body.split("|")[9]
+
+
+class TestProcessMessage(unittest.TestCase):
+    @patch("soap_subscription_sender.application.get_ack_result")
+    def test_process_message_success(self, mock_ack_processor: Mock) -> None:
+        service_bus_message, mock_soap_client, mock_event_logger, mock_metric_sender, mock_throttler = _setup()
+        mock_ack_processor.return_value = True
+
+        result = _process_message(
+            service_bus_message, mock_soap_client, mock_event_logger, mock_metric_sender, mock_throttler
+        )
+
+        mock_soap_client.send_message.assert_called_once_with(HL7_MESSAGE)
+        mock_ack_processor.assert_called_once_with(200, "<ack/>")
+        mock_event_logger.log_message_received.assert_called_once()
+        mock_event_logger.log_message_processed.assert_called_once()
+        mock_metric_sender.send_message_sent_metric.assert_called_once()
+        mock_throttler.wait_if_needed.assert_called_once()
+        self.assertTrue(mock_throttler.record_ack.call_args.args[0])
+        self.assertTrue(result)
+
+    @patch("soap_subscription_sender.application.get_ack_result", return_value=False)
+    def test_process_message_negative_ack(self, _mock_ack_processor: Mock) -> None:
+        service_bus_message, mock_soap_client, mock_event_logger, mock_metric_sender, mock_throttler = _setup()
+
+        result = _process_message(
+            service_bus_message, mock_soap_client, mock_event_logger, mock_metric_sender, mock_throttler
+        )
+
+        mock_event_logger.log_message_processed.assert_called_once()
+        mock_metric_sender.send_message_sent_metric.assert_not_called()
+        self.assertFalse(mock_throttler.record_ack.call_args.args[0])
+        self.assertFalse(result)
+
+    def test_process_message_send_errors(self) -> None:
+        for error in (TimeoutError("No response within 30 seconds"), ConnectionError("Connection failed")):
+            with self.subTest(error=type(error).__name__):
+                service_bus_message, mock_soap_client, mock_event_logger, mock_metric_sender, mock_throttler = (
+                    _setup()
+                )
+                mock_soap_client.send_message.side_effect = error
+
+                result = _process_message(
+                    service_bus_message, mock_soap_client, mock_event_logger, mock_metric_sender, mock_throttler
+                )
+
+                mock_event_logger.log_message_failed.assert_called_once()
+                mock_metric_sender.send_message_sent_metric.assert_not_called()
+                mock_throttler.record_ack.assert_called_once_with(False)
+                self.assertFalse(result)
+
+    @patch("soap_subscription_sender.application.ConnectionConfig")
+    @patch("soap_subscription_sender.application.ServiceBusClientFactory")
+    @patch("soap_subscription_sender.application.AppConfig")
+    @patch("soap_subscription_sender.application.TCPHealthCheckServer")
+    @patch("soap_subscription_sender.application.SOAPSubscriptionSenderClient")
+    @patch("soap_subscription_sender.application.EventLogger")
+    def test_health_check_server_starts_and_stops(
+        self,
+        mock_event_logger: Mock,
+        mock_soap_client: Mock,
+        mock_health_check: Mock,
+        mock_app_config: Mock,
+        mock_factory: Mock,
+        mock_connection_config: Mock,
+    ) -> None:
+        mock_health_server = MagicMock()
+        mock_health_check_ctx = MagicMock()
+        mock_health_check_ctx.__enter__.return_value = mock_health_server
+        mock_health_check.return_value = mock_health_check_ctx
+        mock_app_config.read_destination_configs.return_value = [_app_config()]
+        with patch("soap_subscription_sender.application.ProcessorManager") as mock_processor_manager:
+            mock_processor_manager.return_value.is_running = False
+
+            main()
+
+            mock_health_check.assert_called_once_with("localhost", 9000)
+            mock_health_server.start.assert_called_once()
+            mock_health_check_ctx.__exit__.assert_called_once()
+            mock_soap_client.assert_called_once_with(
+                "https://example.test/hl7", 30, None, None, pool_size=1, gzip_requests=False
+            )
+
+    @patch("soap_subscription_sender.application._run_destinations")
+    @patch("soap_subscription_sender.application._run_destination")
+    @patch("soap_subscription_sender.application.ServiceBusClientFactory")
+    @patch("soap_subscription_sender.application.AppConfig")
+    @patch("soap_subscription_sender.application.TCPHealthCheckServer")
+    def test_main_runs_several_destinations_on_threads(
+        self,
+        mock_health_check: Mock,
+        mock_app_config: Mock,
+        mock_factory: Mock,
+        mock_run_destination: Mock,
+        mock_run_destinations: Mock,
+    ) -> None:
+        app_configs = [replace(_app_config(), ingress_subscription_name=name) for name in ("sub-a", "sub-b")]
+        mock_app_config.read_destination_configs.return_value = app_configs
+
+        with patch("soap_subscription_sender.application.ProcessorManager") as mock_processor_manager:
+            main()
+
+        mock_run_destination.assert_not_called()
+        mock_run_destinations.assert_called_once_with(
+            app_configs, mock_factory.return_value, mock_processor_manager.return_value
+        )
+        mock_health_check.assert_called_once_with("localhost", 9000)
+
+
+class TestRunDestinations(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app_configs = [replace(_app_config(), ingress_subscription_name=name) for name in ("sub-a", "sub-b")]
+        # A mock counts calls unsafely across threads, so each thread gets its own worker factory.
+        self.worker_factories = [MagicMock() for _ in self.app_configs]
+        self.factory = MagicMock()
+        self.factory.create_worker_factory.side_effect = self.worker_factories
+        self.processor_manager = MagicMock()
+
+    @patch("soap_subscription_sender.application._run_destination")
+    def test_each_destination_runs_with_its_own_worker_factory(self, mock_run_destination: Mock) -> None:
+        _run_destinations(self.app_configs, self.factory, self.processor_manager)
+
+        calls = mock_run_destination.call_args_list
+        self.assertCountEqual([c.args[0] for c in calls], self.app_configs)
+        self.assertCountEqual(
+            [id(c.args[1]) for c in calls], [id(factory.__enter__.return_value) for factory in self.worker_factories]
+        )
+        self.assertTrue(all(c.args[2] is self.processor_manager for c in calls))
+        self.processor_manager.stop.assert_not_called()
+
+    @patch("soap_subscription_sender.application._run_destination")
+    def test_a_failed_destination_stops_the_others(self, mock_run_destination: Mock) -> None:
+        def run_destination(app_config: AppConfig, *_: object) -> None:
+            if app_config.ingress_subscription_name == "sub-a":
+                raise ConnectionError("Service Bus unavailable")
+
+        mock_run_destination.side_effect = run_destination
+
+        with self.assertLogs("soap_subscription_sender.application", level="ERROR"):
+            with self.assertRaises(RuntimeError) as context:
+                _run_destinations(self.app_configs, self.factory, self.processor_manager)
+
+        self.assertIsInstance(context.exception.__cause__, ConnectionError)
+        self.processor_manager.stop.assert_called_once()
+        for worker_factory in self.worker_factories:
+            worker_factory.__exit__.assert_called_once()
+
+
+@patch("soap_subscription_sender.application.EventLogger")
+@patch("soap_subscription_sender.application.MetricSender")
+@patch("soap_subscription_sender.application.SOAPSubscriptionSenderClient")
+class TestRunDestination(unittest.TestCase):
+    def setUp(self) -> None:
+        self.factory = MagicMock()
+        self.processor_manager = MagicMock(is_running=False)
+
+    def test_without_concurrency_one_receiver_reads_the_configured_session(
+        self, mock_soap_client: Mock, *_: Mock
+    ) -> None:
+        _run_destination(replace(_app_config(), ingress_session_id="session"), self.factory, self.processor_manager)
+
+        self.factory.create_subscription_receiver_client.assert_called_once_with(
+            "test-topic", "test-subscription", "session", time_settling=True
+        )
+        self.factory.create_worker_factory.assert_not_called()
+        self.assertEqual(mock_soap_client.call_args.kwargs["pool_size"], 1)
+
+    def test_each_session_worker_locks_the_next_available_session(self, mock_soap_client: Mock, *_: Mock) -> None:
+        worker_factories = [MagicMock() for _ in range(3)]
+        self.factory.create_worker_factory.side_effect = [
+            MagicMock(**{"__enter__.return_value": worker_factory}) for worker_factory in worker_factories
+        ]
+
+        _run_destination(replace(_app_config(), soap_max_concurrent_requests=3), self.factory, self.processor_manager)
+
+        self.factory.create_subscription_receiver_client.assert_not_called()
+        for worker_factory in worker_factories:
+            worker_factory.create_subscription_receiver_client.assert_called_once_with(
+                "test-topic", "test-subscription", NEXT_AVAILABLE_SESSION, time_settling=True
+            )
+        self.assertEqual(mock_soap_client.call_args.kwargs["pool_size"], 3)
+
+    @patch("message_bus_lib.message_receiver_client.AutoLockRenewer")
+    @patch("soap_subscription_sender.application.get_ack_result", return_value=True)
+    def test_sessions_are_sent_at_once_and_each_in_order(
+        self, _mock_ack: Mock, _mock_renewer: Mock, mock_soap_client: Mock, *_: Mock
+    ) -> None:
+        sessions = {
+            "a": [ServiceBusMessage(body=HL7_MESSAGE.replace("MSGID1234", f"A{i}"), session_id="a") for i in range(3)],
+            "b": [ServiceBusMessage(body=HL7_MESSAGE.replace("MSGID1234", f"B{i}"), session_id="b") for i in range(3)],
+        }
+        # Each worker's Service Bus client hands it one session, as NEXT_AVAILABLE_SESSION would.
+        sb_receivers = []
+        worker_factories = []
+        for messages in sessions.values():
+            service_bus_client = MagicMock()
+            sb_receiver = service_bus_client.get_subscription_receiver.return_value.__enter__.return_value
+            sb_receiver.receive_messages.side_effect = [messages] + [[]] * 1000
+            sb_receivers.append(sb_receiver)
+            worker_factory = MagicMock()
+            worker_factory.create_subscription_receiver_client.side_effect = (
+                lambda topic, subscription, session_id, time_settling, client=service_bus_client: (
+                    SubscriptionReceiverClient(client, topic, subscription, session_id, time_settling=time_settling)
+                )
+            )
+            worker_factories.append(MagicMock(**{"__enter__.return_value": worker_factory}))
+        self.factory.create_worker_factory.side_effect = worker_factories
+
+        deadline = time.monotonic() + 5
+        type(self.processor_manager).is_running = property(
+            lambda _: time.monotonic() < deadline and sum(r.complete_message.call_count for r in sb_receivers) < 6
+        )
+        # The first message of each session waits for the other's, so they can only both get through together.
+        barrier = threading.Barrier(2, timeout=5)
+        sent: list[str] = []
+        sent_lock = threading.Lock()
+
+        def send_message(message_body: str) -> tuple[int, str]:
+            if _message_id(message_body).endswith("0"):
+                barrier.wait()
+            with sent_lock:
+                sent.append(_message_id(message_body))
+            return 200, "<ack/>"
+
+        mock_soap_client.return_value.__enter__.return_value.send_message.side_effect = send_message
+
+        _run_destination(replace(_app_config(), soap_max_concurrent_requests=2), self.factory, self.processor_manager)
+
+        self.assertEqual([message_id for message_id in sent if message_id.startswith("A")], ["A0", "A1", "A2"])
+        self.assertEqual([message_id for message_id in sent if message_id.startswith("B")], ["B0", "B1", "B2"])
+        for sb_receiver, messages in zip(sb_receivers, sessions.values()):
+            self.assertEqual([c.args[0] for c in sb_receiver.complete_message.call_args_list], messages)
+
+    def test_a_failed_session_worker_stops_the_others(self, *_: Mock) -> None:
+        worker_factory = self.factory.create_worker_factory.return_value.__enter__.return_value
+        worker_factory.create_subscription_receiver_client.side_effect = [
+            ConnectionError("Service Bus unavailable"),
+            MagicMock(),
+        ]
+
+        with self.assertLogs("soap_subscription_sender.application", level="ERROR"):
+            with self.assertRaises(RuntimeError):
+                _run_destination(
+                    replace(_app_config(), soap_max_concurrent_requests=2), self.factory, self.processor_manager
+                )
+
+        self.processor_manager.stop.assert_called_once()
+
+
+class TestStageTiming(unittest.TestCase):
+    def _stages(self, mock_metric_sender: MagicMock) -> list[str]:
+        return [
+            c.args[2]["stage"] for c in mock_metric_sender.send_gauge_metric.call_args_list
+            if c.args[0] == "message_stage_seconds"
+        ]
+
+    @patch("soap_subscription_sender.application.get_ack_result", return_value=True)
+    def test_each_stage_is_sent_as_a_histogram_metric(self, _mock_ack: Mock) -> None:
+        service_bus_message, mock_soap_client, mock_event_logger, mock_metric_sender, mock_throttler = _setup()
+
+        _process_message(service_bus_message, mock_soap_client, mock_event_logger, mock_metric_sender, mock_throttler)
+
+        self.assertEqual(self._stages(mock_metric_sender), ["prepare", "throttle", "ack_wait", "ack_parse", "record"])
+
+    def test_a_failed_send_is_timed_as_the_ack_wait(self) -> None:
+        service_bus_message, mock_soap_client, mock_event_logger, mock_metric_sender, mock_throttler = _setup()
+        mock_soap_client.send_message.side_effect = TimeoutError("No response")
+
+        _process_message(service_bus_message, mock_soap_client, mock_event_logger, mock_metric_sender, mock_throttler)
+
+        self.assertEqual(self._stages(mock_metric_sender), ["prepare", "throttle", "ack_wait", "record"])
+
+
+if __name__ == "__main__":
+    unittest.main()
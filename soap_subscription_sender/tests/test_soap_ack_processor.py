@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import unittest
 
-from soap_subscription_sender.soap_ack_processor import get_ack_result
+from soap_subscription_sender.soap_ack_processor import get_ack_result, parse_soap_ack
 
 _SOAP_ACK_AA = """\
 <?xml version="1.0" encoding="UTF-8"?>
@@ -31,6 +31,19 @@ _SOAP_FAULT = """\
   </soapenv:Body>
 </soapenv:Envelope>"""
 
+# Response shape produced by http_mock_receiver's soap_response_builder for SOAP 1.2.
+_MOCK_FAULT_12 = """\
+<?xml version="1.0" encoding="UTF-8"?>
+<soapenv:Envelope xmlns:soapenv="http://www.w3.org/2003/05/soap-envelope">
+  <soapenv:Body>
+    <soapenv:Fault>
+      <soapenv:Code><soapenv:Value>soapenv:Receiver</soapenv:Value></soapenv:Code>
+      <soapenv:Reason><soapenv:Text>Message processing failed</soapenv:Text></soapenv:Reason>
+      <soapenv:Detail>Message rejected by mock receiver</soapenv:Detail>
+    </soapenv:Fault>
+  </soapenv:Body>
+</soapenv:Envelope>"""
+
 
 class TestGetAckResult(unittest.TestCase):
 
@@ -65,5 +78,46 @@ class TestGetAckResult(unittest.TestCase):
         self.assertTrue(get_ack_result(202, _SOAP_ACK_AA))
 
 
+class TestParseSoapAck(unittest.TestCase):
+
+    def test_ack_fields(self) -> None:
+        result = parse_soap_ack(200, _SOAP_ACK_AA)
+
+        self.assertEqual((result.ack_code, result.message_control_id), ("AA", "MSG001"))
+        self.assertTrue(result.success)
+
+    def test_soap_12_fault_reason(self) -> None:
+        result = parse_soap_ack(500, _MOCK_FAULT_12)
+
+        self.assertTrue(result.is_fault)
+        self.assertEqual(result.fault_reason, "Message processing failed")
+        self.assertFalse(result.success)
+
+    def test_fault_after_the_ack_is_a_fault(self) -> None:
+        body = (
+            "<Envelope><Body><Ack><Status>AA</Status><MessageControlID>1</MessageControlID></Ack>"
+            "<Fault><faultstring>boom</faultstring></Fault></Body></Envelope>"
+        )
+
+        result = parse_soap_ack(200, body)
+
+        self.assertEqual(result.ack_code, "AA")
+        self.assertTrue(result.is_fault)
+        self.assertEqual(result.fault_reason, "boom")
+        self.assertFalse(get_ack_result(200, body))
+
+    def test_reads_a_large_detail_and_stops_when_the_body_closes(self) -> None:
+        body = _SOAP_ACK_AA.replace(
+            "</AcknowledgementResponse>", "<Detail>" + "<line>x</line>" * 10_000 + "</Detail></AcknowledgementResponse>"
+        )
+        body = body.replace("</soapenv:Body>", "</soapenv:Body><unclosed>")
+
+        with self.assertNoLogs("soap_subscription_sender.soap_ack_processor", level="WARNING"):
+            result = parse_soap_ack(200, body)
+
+        self.assertEqual(result.message_control_id, "MSG001")
+        self.assertTrue(result.success)
+
+
 if __name__ == "__main__":
     unittest.main()
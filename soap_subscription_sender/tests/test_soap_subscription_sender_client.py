@@ -1,6 +1,7 @@
 """Tests for SOAPSubscriptionSenderClient — envelope building and HTTP error mapping."""
 from __future__ import annotations
 
+import gzip
 import unittest
 import xml.etree.ElementTree as ET
 from unittest.mock import MagicMock, patch
@@ -84,5 +85,60 @@ class TestSOAPSubscriptionSenderClientSendMessage(unittest.TestCase):
             self.assertIsNotNone(client._session)
 
 
+class TestSOAPSubscriptionSenderClientDelivery(unittest.TestCase):
+
+    def test_connections_are_pooled_up_to_pool_size(self) -> None:
+        client = SOAPSubscriptionSenderClient("https://soap.example.nhs.wales/service", pool_size=8)
+
+        adapter = client._session.get_adapter("https://soap.example.nhs.wales/service")
+
+        self.assertEqual(adapter._pool_maxsize, 8)  # type: ignore[attr-defined]
+        self.assertTrue(adapter._pool_block)  # type: ignore[attr-defined]
+        self.assertIs(client._session.get_adapter("http://localhost/soap"), adapter)
+
+    def test_pool_size_must_be_positive(self) -> None:
+        with self.assertRaises(ValueError):
+            SOAPSubscriptionSenderClient("http://localhost/soap", pool_size=0)
+
+    def test_gzip_request_body(self) -> None:
+        client = SOAPSubscriptionSenderClient("http://localhost/soap", gzip_requests=True)
+        with patch.object(client._session, "post", return_value=MagicMock(status_code=200, text="<ACK/>")) as post:
+            client.send_message("MSH|test")
+
+        self.assertEqual(client._session.headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(post.call_args.kwargs["data"]).decode(), _build_soap_envelope("MSH|test"))
+
+    def test_timeout_is_retried_once_on_the_same_session(self) -> None:
+        client = SOAPSubscriptionSenderClient("http://localhost/soap")
+        session = client._session
+        response = MagicMock(status_code=200, text="<ACK/>")
+        with patch.object(session, "post", side_effect=[req.exceptions.Timeout, response]) as post:
+            self.assertEqual(client.send_message("MSH|test"), (200, "<ACK/>"))
+
+        self.assertEqual(post.call_count, 2)
+        self.assertIs(client._session, session)
+
+
+class TestSOAPSubscriptionSenderClientCheckConnection(unittest.TestCase):
+
+    @patch("soap_subscription_sender.soap_subscription_sender_client.socket.create_connection")
+    def test_connects_to_the_endpoint_host_and_default_port(self, mock_connect: MagicMock) -> None:
+        client = SOAPSubscriptionSenderClient("https://soap.example.nhs.wales/service", timeout_seconds=5)
+
+        self.assertTrue(client.check_connection())
+
+        mock_connect.assert_called_once_with(("soap.example.nhs.wales", 443), timeout=5)
+        mock_connect.return_value.close.assert_called_once()
+
+    @patch("soap_subscription_sender.soap_subscription_sender_client.socket.create_connection")
+    def test_returns_false_when_the_endpoint_refuses(self, mock_connect: MagicMock) -> None:
+        mock_connect.side_effect = ConnectionRefusedError("refused")
+        client = SOAPSubscriptionSenderClient("http://localhost:8080/soap", timeout_seconds=5)
+
+        self.assertFalse(client.check_connection())
+
+        mock_connect.assert_called_once_with(("localhost", 8080), timeout=5)
+
+
 if __name__ == "__main__":
     unittest.main()